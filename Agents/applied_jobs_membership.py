@@ -0,0 +1,233 @@
+"""
+Applied-jobs membership for duplicate-application filtering
+
+Discovery and continuous mode need to know "has this user already applied to
+this job?" for every candidate.  Instead of loading the full application
+history each session, applications are reduced to short hashes of
+
+  - the canonical job URL           ("u:" + 16 hex chars)
+  - normalized company|title        ("t:" + 16 hex chars)
+
+kept in an exact set (authoritative) behind a Bloom filter (first-stage
+check, so most non-members are rejected without touching the set).
+
+The server builds full or delta payloads with membership_delta(); clients
+keep an AppliedJobsMembership, cache it under ~/.launchway and only ask for
+rows changed since the cached version (sync_applied_jobs).  A key is removed
+in a delta only when no remaining applied application still maps to it (two
+applications can share a company|title key).  Removals are still best effort
+(e.g. deleted rows never show up in a delta), so clients resync in full every
+FULL_SYNC_SECONDS.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from job_dedup_index import canonicalize_job_url
+
+logger = logging.getLogger(__name__)
+
+# Statuses that count as "applied" for the CLI (failed applications can be retried)
+APPLIED_STATUSES = ("completed", "in_progress", "queued")
+FULL_SYNC_SECONDS = 24 * 3600
+DEFAULT_CACHE_DIR = Path.home() / ".launchway"
+
+_PLACEHOLDERS = {"", "unknown", "unknown company", "unknown position", "n/a", "na"}
+
+
+def _short_hash(value: str) -> str:
+    return hashlib.sha1(value.encode("utf-8")).hexdigest()[:16]
+
+
+def _normalize(value: Any) -> str:
+    return " ".join(str(value or "").lower().split())
+
+
+def membership_keys(job_url: Optional[str] = None, company: Optional[str] = None,
+                    title: Optional[str] = None) -> List[str]:
+    """Membership keys for a job: its canonical URL and/or company|title."""
+    keys = []
+    canonical = canonicalize_job_url(job_url or "")
+    if canonical:
+        keys.append("u:" + _short_hash(canonical))
+    company, title = _normalize(company), _normalize(title)
+    if company not in _PLACEHOLDERS and title not in _PLACEHOLDERS:
+        keys.append("t:" + _short_hash(f"{company}|{title}"))
+    return keys
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over string keys (double hashing on sha1)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.num_bits = max(64, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.capacity = capacity
+        self._bits = bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.sha1(key.encode("utf-8")).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+
+class AppliedJobsMembership:
+    """Exact key set + Bloom pre-check, with the sync version it reflects."""
+
+    def __init__(self, keys: Iterable[str] = (), version: Optional[str] = None, synced_at: float = 0.0):
+        self.keys = set(keys)
+        self.version = version
+        self.synced_at = synced_at
+        self._bloom: Optional[BloomFilter] = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _rebuild_bloom(self) -> BloomFilter:
+        bloom = BloomFilter(capacity=max(1024, 2 * len(self.keys)))
+        for key in self.keys:
+            bloom.add(key)
+        self._bloom = bloom
+        return bloom
+
+    def add_keys(self, keys: Iterable[str]) -> None:
+        bloom = self._bloom
+        for key in keys:
+            if key in self.keys:
+                continue
+            self.keys.add(key)
+            if bloom is not None:
+                bloom.add(key)
+        if bloom is not None and len(self.keys) > bloom.capacity:
+            self._bloom = None  # resized on next lookup
+
+    def discard_keys(self, keys: Iterable[str]) -> None:
+        # Bloom filters cannot forget; the stale bits only cost an extra set lookup
+        self.keys.difference_update(keys)
+
+    def contains(self, job_url: Optional[str] = None, company: Optional[str] = None,
+                 title: Optional[str] = None) -> bool:
+        bloom = self._bloom or self._rebuild_bloom()
+        return any(key in bloom and key in self.keys for key in membership_keys(job_url, company, title))
+
+    def apply_delta(self, payload: Dict[str, Any]) -> None:
+        """Apply a membership_delta() payload (full replacement or incremental)."""
+        if payload.get("full"):
+            self.keys = set()
+            self._bloom = None
+        else:
+            self.discard_keys(payload.get("removed", []))
+        self.add_keys(payload.get("added", []))
+        self.version = payload.get("version") or self.version
+        self.synced_at = time.time()
+
+    def needs_full_sync(self) -> bool:
+        return not self.version or time.time() - self.synced_at > FULL_SYNC_SECONDS
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_text(json.dumps({
+            "version": self.version,
+            "synced_at": self.synced_at,
+            "keys": sorted(self.keys),
+        }, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "AppliedJobsMembership":
+        """Cached membership from `path`, or an empty one (forcing a full sync)."""
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+            return cls(data.get("keys", []), data.get("version"), float(data.get("synced_at") or 0))
+        except FileNotFoundError:
+            return cls()
+        except Exception as e:
+            logger.warning(f"Applied-jobs cache unreadable, resyncing: {e}")
+            return cls()
+
+
+def membership_delta(
+    rows: Iterable[Tuple[Optional[str], Optional[str], Optional[str], Optional[str], Optional[datetime]]],
+    full: bool,
+    since: Optional[str] = None,
+    statuses: Optional[Iterable[str]] = APPLIED_STATUSES,
+    remaining: Optional[Callable[[], Iterable[Tuple]]] = None,
+) -> Dict[str, Any]:
+    """
+    Build a sync payload from (job_url, company, title, status, changed_at) rows.
+
+    `rows` are all of the user's applications for a full sync, or those changed
+    at/after `since` for a delta.  With statuses=None every row counts as applied.
+
+    `remaining` is called when a delta would remove keys.  It returns the
+    user's other applications in the same row shape (it may pre-filter to the
+    applied statuses).  A key that one of them still maps to is not removed.
+    """
+    statuses = set(statuses) if statuses is not None else None
+    added, removed = set(), set()
+    version = since
+    for job_url, company, title, status, changed_at in rows:
+        keys = membership_keys(job_url, company, title)
+        if statuses is None or status in statuses:
+            added.update(keys)
+        elif not full:
+            removed.update(keys)
+        if changed_at is not None:
+            stamp = changed_at.isoformat() if isinstance(changed_at, datetime) else str(changed_at)
+            version = max(version or stamp, stamp)
+    removed -= added
+    if removed and remaining is not None:
+        for job_url, company, title, status, _ in remaining():
+            if statuses is None or status in statuses:
+                removed.difference_update(membership_keys(job_url, company, title))
+    return {
+        "full": full,
+        "version": version,
+        "added": sorted(added),
+        "removed": sorted(removed),
+    }
+
+
+def sync_applied_jobs(
+    fetch_delta: Callable[[Optional[str]], Dict[str, Any]],
+    cache_path: Path,
+) -> AppliedJobsMembership:
+    """
+    Bring the cached membership at `cache_path` up to date.
+
+    `fetch_delta(since)` returns a membership_delta() payload; since=None asks
+    for a full sync.  On failure the cached (possibly empty) membership is used.
+    """
+    membership = AppliedJobsMembership.load(cache_path)
+    since = None if membership.needs_full_sync() else membership.version
+    try:
+        payload = fetch_delta(since)
+    except Exception as e:
+        logger.warning(f"Applied-jobs sync failed, using cached history: {e}")
+        return membership
+    membership.apply_delta(payload)
+    try:
+        membership.save(cache_path)
+    except Exception as e:
+        logger.debug(f"Could not cache applied jobs: {e}")
+    return membership
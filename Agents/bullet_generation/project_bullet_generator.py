@@ -8,6 +8,7 @@ import re
 import logging
 from typing import Dict, List, Optional
 from gemini_compat import genai
+from gemini_batching import chunk_by_tokens, parse_json_items, run_chunks
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -52,21 +53,7 @@ class ProjectBulletGenerator:
             List of bullet strings
         """
         try:
-            # Build project context
-            project_context = f"""
-PROJECT NAME: {project.get('name', 'Unknown Project')}
-
-DESCRIPTION: {project.get('description', 'No description available')}
-
-TECHNOLOGIES: {', '.join(project.get('technologies', []))}
-
-FEATURES:
-{chr(10).join([f"- {f}" for f in project.get('features', [])])}
-"""
-
-            if project.get('detailed_bullets'):
-                project_context += f"\n\nEXISTING BULLETS (for reference):\n"
-                project_context += "\n".join([f"- {b}" for b in project.get('detailed_bullets', [])])
+            project_context = self._project_context(project)
 
             # Prepare additional context section (avoid backslash in f-string)
             additional_context = ""
@@ -121,39 +108,64 @@ Generate {target_bullet_count} bullets now:"""
                 if line and len(line) > 20:  # Minimum meaningful length
                     bullets.append(line)
 
-            # Validate bullet count
-            if len(bullets) < target_bullet_count:
-                self.logger.warning(f"Generated only {len(bullets)} bullets, expected {target_bullet_count}")
-            elif len(bullets) > target_bullet_count:
-                bullets = bullets[:target_bullet_count]
+            return self._finalize_bullets(bullets, target_bullet_count, char_limit_per_line)
 
-            # Validate bullet length (should be 2-3 lines)
-            validated_bullets = []
-            for bullet in bullets:
-                lines_count = len(bullet) // char_limit_per_line + (1 if len(bullet) % char_limit_per_line > 0 else 0)
+        except Exception as e:
+            self.logger.error(f"Failed to generate bullets: {e}")
+            return self._fallback_bullets(project, target_bullet_count)
 
-                if lines_count < 2:
-                    self.logger.warning(f"Bullet too short ({lines_count} lines): {bullet[:50]}...")
-                elif lines_count > 4:
-                    self.logger.warning(f"Bullet too long ({lines_count} lines): {bullet[:50]}...")
+    def _project_context(self, project: Dict) -> str:
+        """Project details as given to the model."""
+        project_context = f"""
+PROJECT NAME: {project.get('name', 'Unknown Project')}
 
-                validated_bullets.append(bullet)
+DESCRIPTION: {project.get('description', 'No description available')}
 
-            return validated_bullets
+TECHNOLOGIES: {', '.join(project.get('technologies', []))}
 
-        except Exception as e:
-            self.logger.error(f"Failed to generate bullets: {e}")
-            # Fallback: create basic bullets from project info
-            fallback_bullets = []
+FEATURES:
+{chr(10).join([f"- {f}" for f in project.get('features', [])])}
+"""
+
+        if project.get('detailed_bullets'):
+            project_context += f"\n\nEXISTING BULLETS (for reference):\n"
+            project_context += "\n".join([f"- {b}" for b in project.get('detailed_bullets', [])])
+        return project_context
+
+    def _finalize_bullets(self, bullets: List[str], target_bullet_count: int, char_limit_per_line: int) -> List[str]:
+        """Trim to the target count and warn about bullets outside 2-4 lines."""
+        # Validate bullet count
+        if len(bullets) < target_bullet_count:
+            self.logger.warning(f"Generated only {len(bullets)} bullets, expected {target_bullet_count}")
+        elif len(bullets) > target_bullet_count:
+            bullets = bullets[:target_bullet_count]
+
+        # Validate bullet length (should be 2-3 lines)
+        validated_bullets = []
+        for bullet in bullets:
+            lines_count = len(bullet) // char_limit_per_line + (1 if len(bullet) % char_limit_per_line > 0 else 0)
+
+            if lines_count < 2:
+                self.logger.warning(f"Bullet too short ({lines_count} lines): {bullet[:50]}...")
+            elif lines_count > 4:
+                self.logger.warning(f"Bullet too long ({lines_count} lines): {bullet[:50]}...")
 
-            if project.get('description'):
-                fallback_bullets.append(project['description'])
+            validated_bullets.append(bullet)
 
-            for feature in project.get('features', [])[:2]:
-                if len(fallback_bullets) < target_bullet_count:
-                    fallback_bullets.append(f"Implemented {feature} using {', '.join(project.get('technologies', [])[:2])}")
+        return validated_bullets
 
-            return fallback_bullets[:target_bullet_count]
+    def _fallback_bullets(self, project: Dict, target_bullet_count: int) -> List[str]:
+        """Basic bullets from the project info, for when generation fails."""
+        fallback_bullets = []
+
+        if project.get('description'):
+            fallback_bullets.append(project['description'])
+
+        for feature in project.get('features', [])[:2]:
+            if len(fallback_bullets) < target_bullet_count:
+                fallback_bullets.append(f"Implemented {feature} using {', '.join(project.get('technologies', [])[:2])}")
+
+        return fallback_bullets[:target_bullet_count]
 
     def regenerate_bullet(
         self,
@@ -211,38 +223,136 @@ Return ONLY the improved bullet text, no explanations."""
         projects: List[Dict],
         job_keywords: List[str],
         job_description: str,
-        bullets_per_project: int = 3
+        bullets_per_project: int = 3,
+        char_limit_per_line: int = 90,
+        max_projects_per_request: int = 5,
+        max_workers: Optional[int] = None
     ) -> Dict[str, List[str]]:
         """
         Generate bullets for multiple projects in batch.
 
+        Projects are packed into as few JSON-output requests as the prompt
+        token budget allows (see gemini_batching), run concurrently when there
+        is more than one. Projects missing from a reply, or answered with no
+        usable bullets, are generated with a single generate_bullets call.
+
         Args:
             projects: List of project dicts
             job_keywords: Keywords from job description
             job_description: Full job description
             bullets_per_project: Number of bullets per project
+            char_limit_per_line: Character limit per bullet line
+            max_projects_per_request: Cap on projects packed into one request
+            max_workers: Concurrent requests (default LAUNCHWAY_GEMINI_BATCH_WORKERS)
 
         Returns:
             Dict mapping project IDs/names to bullet lists
         """
-        results = {}
+        if not projects:
+            return {}
 
-        for project in projects:
-            project_id = project.get('id') or project.get('name', 'unknown')
+        contexts = [self._project_context(project) for project in projects]
+        chunks = chunk_by_tokens(contexts, max_items=max_projects_per_request)
 
-            bullets = self.generate_bullets(
-                project,
+        def generate_chunk(chunk: List[int]) -> Dict[int, List[str]]:
+            return self._generate_chunk(
+                [(index, contexts[index]) for index in chunk],
                 job_keywords,
                 job_description,
-                target_bullet_count=bullets_per_project
+                bullets_per_project,
+                char_limit_per_line
             )
 
+        generated: Dict[int, List[str]] = {}
+        for chunk_result in run_chunks(generate_chunk, chunks, max_workers=max_workers):
+            generated.update(chunk_result or {})
+
+        results = {}
+        for index, project in enumerate(projects):
+            project_id = project.get('id') or project.get('name', 'unknown')
+
+            bullets = generated.get(index)
+            if bullets is None:
+                bullets = self.generate_bullets(
+                    project,
+                    job_keywords,
+                    job_description,
+                    target_bullet_count=bullets_per_project,
+                    char_limit_per_line=char_limit_per_line
+                )
+
             results[str(project_id)] = bullets
 
             self.logger.info(f"Generated {len(bullets)} bullets for project: {project.get('name', 'Unknown')}")
 
+        self.logger.info(
+            f"Batched bullet generation: {len(projects)} projects, {len(chunks)} batch request(s), "
+            f"{len(projects) - len(generated)} single fallback(s)"
+        )
         return results
 
+    def _generate_chunk(
+        self,
+        items: List[tuple],
+        job_keywords: List[str],
+        job_description: str,
+        bullets_per_project: int,
+        char_limit_per_line: int
+    ) -> Dict[int, List[str]]:
+        """One request for several projects; {project index: bullets} for the usable answers."""
+        projects_text = "\n".join(
+            f"=== PROJECT id={local_id} ==={context}" for local_id, (_, context) in enumerate(items, 1)
+        )
+
+        prompt = f"""Generate {bullets_per_project} tailored resume bullet points for EACH of these projects.
+
+{projects_text}
+
+JOB DESCRIPTION EXCERPT:
+{job_description[:800]}
+
+KEY JOB REQUIREMENTS TO EMPHASIZE:
+{', '.join(job_keywords[:10])}
+
+REQUIREMENTS FOR BULLETS:
+1. Each bullet MUST be 2-3 lines long (approximately {char_limit_per_line * 2}-{char_limit_per_line * 3} characters)
+2. Start with strong action verbs (Built, Developed, Implemented, Designed, Created)
+3. Include quantified metrics where possible (users, performance, scale, etc.)
+4. Naturally incorporate relevant job keywords: {', '.join(job_keywords[:5])}
+5. Highlight technical skills and impact
+6. Be specific about technologies and methodologies used
+7. Follow the format: [Action] [What] using [Technologies] to achieve [Impact/Result]
+8. Use only the facts of the project the bullets belong to
+
+CRITICAL OUTPUT RULES:
+- Return EXACTLY {bullets_per_project} bullets per project
+- Plain bullet text: NO dashes, numbering or markdown
+- Return ONLY valid JSON in this shape, one entry per project id:
+{{"projects": [{{"id": 1, "bullets": ["...", "..."]}}]}}"""
+
+        response = self.model.generate_content(
+            prompt,
+            generation_config=genai.GenerationConfig(response_mime_type="application/json")
+        )
+        entries = parse_json_items(response.text, "projects")
+
+        generated = {}
+        for local_id, (index, _) in enumerate(items, 1):
+            raw = entries.get(local_id, {}).get('bullets')
+            if not isinstance(raw, list):
+                continue
+            bullets = []
+            for bullet in raw:
+                if not isinstance(bullet, str):
+                    continue
+                # Only real list markers: a leading figure ("50% faster") is content
+                bullet = re.sub(r'^(?:[-•*]|\d+[.)])\s+', '', bullet.strip())
+                if len(bullet) > 20:  # Minimum meaningful length
+                    bullets.append(bullet)
+            if bullets:
+                generated[index] = self._finalize_bullets(bullets, bullets_per_project, char_limit_per_line)
+        return generated
+
     def enhance_existing_bullets(
         self,
         project: Dict,
@@ -12,6 +12,8 @@ from typing import List, Dict, Any, Optional
 from dataclasses import dataclass, asdict
 from playwright.async_api import Page
 
+from components.page_settle import wait_for_settle
+
 logger = logging.getLogger(__name__)
 
 
@@ -439,8 +441,8 @@ class ActionReplay:
                     logger.warning(f"Failed to replay action {i}: {action.type}")
                     return False
 
-                # Small delay between actions for stability
-                await self.page.wait_for_timeout(100)
+                # Let the previous action's side effects land before the next
+                await wait_for_settle(self.page, quiet_ms=100, timeout_ms=2000, replaces_ms=100, reason="replay_step")
 
             logger.info("Action replay completed successfully")
             return True
@@ -454,7 +456,7 @@ class ActionReplay:
         try:
             if action.type == "navigate":
                 await self.page.goto(action.url, wait_until="domcontentloaded", timeout=30000)
-                await self.page.wait_for_timeout(1000)  # Let page settle
+                await wait_for_settle(self.page, timeout_ms=8000, replaces_ms=1000, reason="replay_navigate")
                 
             elif action.type == "fill_field" or action.type == "enhanced_field_fill":
                 # Handle both legacy and enhanced field fill actions
@@ -633,13 +635,14 @@ class ActionReplay:
                 # Scroll into view first
                 try:
                     await element.scroll_into_view_if_needed()
-                    await self.page.wait_for_timeout(300)
+                    await wait_for_settle(self.page, quiet_ms=100, timeout_ms=1000, network_idle=False,
+                                          replaces_ms=300, reason="replay_scroll")
                 except Exception:
                     pass
 
                 # Click to open dropdown
                 await element.click(force=True)
-                await self.page.wait_for_timeout(800)  # Wait for dropdown to open
+                await wait_for_settle(self.page, timeout_ms=3000, replaces_ms=800, reason="replay_dropdown_open")
 
                 option_found = False
 
@@ -3,6 +3,7 @@ import re
 from typing import Dict, List, Optional, Any
 from loguru import logger
 from gemini_compat import genai
+from gemini_response_cache import cache_gemini_responses
 import os
 
 class GeminiFieldMapper:
@@ -1500,9 +1501,10 @@ If no reasonable match exists, return:
 Your response (JSON only):
 """
             
-            from gemini_compat import genai
+            # The same option list on the same ATS gets the same answer
             model = genai.GenerativeModel(self.model_name)
-            response = model.generate_content(prompt)
+            with cache_gemini_responses("dropdown_option", ttl_seconds=7 * 86400):
+                response = await model.generate_content_async(prompt)
             
             # Parse the response
             result = self._parse_dropdown_response(response.text)
@@ -1,8 +1,12 @@
+import asyncio
 import base64
+import hashlib
 import json
 import re
 import os
-from typing import Dict, Any, Optional
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Any, Optional, Tuple
 from io import BytesIO
 from playwright.async_api import Page, Error
 from loguru import logger
@@ -12,11 +16,64 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Screenshots are downscaled to this width before they are sent (fewer tokens)
+MAX_SCREENSHOT_WIDTH = 1280
+# dHash grid: 16x16 = 256 bits, fine enough that a changed form section or
+# dialog flips bits while JPEG noise and a blinking caret do not
+HASH_SIZE = 16
+
+
+def perceptual_hash(image: Image.Image, hash_size: int = HASH_SIZE) -> int:
+    """Difference hash (dHash) of an image: one bit per horizontally adjacent pixel pair."""
+    small = image.convert("L").resize((hash_size + 1, hash_size), Image.Resampling.BILINEAR)
+    pixels = small.tobytes()
+    bits = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+def prepare_screenshot(screenshot_bytes: bytes, max_width: int = MAX_SCREENSHOT_WIDTH) -> Tuple[Dict[str, str], int]:
+    """
+    Decode, downscale and JPEG-encode a screenshot for Gemini.
+
+    CPU-bound (decode + LANCZOS resize + encode), so callers run it in a
+    worker thread. Returns (inline image part, perceptual hash).
+    """
+    image = Image.open(BytesIO(screenshot_bytes))
+    image.load()
+    if image.width > max_width:
+        ratio = max_width / image.width
+        image = image.resize((max_width, int(image.height * ratio)), Image.Resampling.LANCZOS)
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=80)
+    part = {"mime_type": "image/jpeg", "data": base64.b64encode(buffer.getvalue()).decode("ascii")}
+    return part, perceptual_hash(image)
+
+
 class GeminiPageAnalyzer:
-    """Uses Gemini Vision to classify unknown pages and determine the next strategic action."""
+    """Uses Gemini Vision to classify unknown pages and determine the next strategic action.
 
-    def __init__(self):
+    Screenshot analysis never blocks the event loop: image preparation runs in
+    a worker thread and the model call is awaited. Responses are cached per
+    (URL, prompt, perceptual hash of the screenshot), so an unchanged page is
+    not sent again; per-call timings are kept for get_stats().
+    """
+
+    def __init__(self, cache_ttl: float = 300.0, cache_size: int = 128, max_hash_distance: int = 0):
         self.model = None
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self.max_hash_distance = max_hash_distance
+        self._analysis_cache: "OrderedDict[Tuple[str, str], list]" = OrderedDict()
+        self.call_timings: deque = deque(maxlen=200)
+        self.stats = {
+            "calls": 0, "cache_hits": 0, "prepare_seconds": 0.0, "model_seconds": 0.0,
+        }
         self._configure_gemini()
 
     def _configure_gemini(self):
@@ -33,6 +90,78 @@ class GeminiPageAnalyzer:
         except Exception as e:
             logger.error(f"❌ Failed to configure Gemini Page Analyzer: {e}")
 
+    # ── Screenshot analysis ───────────────────────────────────────────────────
+
+    def _cached_text(self, key: Tuple[str, str], phash: int) -> Optional[str]:
+        entries = self._analysis_cache.get(key)
+        if not entries:
+            return None
+        now = time.monotonic()
+        entries[:] = [entry for entry in entries if now - entry[2] < self.cache_ttl]
+        for cached_hash, text, _ in entries:
+            if bin(cached_hash ^ phash).count("1") <= self.max_hash_distance:
+                self._analysis_cache.move_to_end(key)
+                return text
+        return None
+
+    def _remember(self, key: Tuple[str, str], phash: int, text: str) -> None:
+        entries = self._analysis_cache.setdefault(key, [])
+        entries.append((phash, text, time.monotonic()))
+        del entries[:-4]  # a few recent looks of the same page are enough
+        self._analysis_cache.move_to_end(key)
+        while len(self._analysis_cache) > self.cache_size:
+            self._analysis_cache.popitem(last=False)
+
+    async def analyze_screenshot(self, screenshot_bytes: bytes, prompt: str, url: str = "") -> Optional[str]:
+        """
+        Send a screenshot and prompt to Gemini Vision and return the response text.
+
+        Returns None when no model is configured. An unchanged page (same URL,
+        prompt and perceptual hash) is answered from the cache.
+        """
+        if not self.model:
+            return None
+
+        started = time.monotonic()
+        part, phash = await asyncio.to_thread(prepare_screenshot, screenshot_bytes)
+        prepared = time.monotonic()
+        key = (url, hashlib.sha256(prompt.encode("utf-8")).hexdigest())
+
+        text = self._cached_text(key, phash)
+        cached = text is not None
+        if not cached:
+            response = await self.model.generate_content_async([part, prompt])
+            text = response.text or ""
+            if text:
+                self._remember(key, phash, text)
+        finished = time.monotonic()
+
+        timing = {
+            "url": url,
+            "cached": cached,
+            "prepare_s": round(prepared - started, 3),
+            "model_s": 0.0 if cached else round(finished - prepared, 3),
+        }
+        self.call_timings.append(timing)
+        self.stats["calls"] += 1
+        self.stats["cache_hits"] += cached
+        self.stats["prepare_seconds"] += timing["prepare_s"]
+        self.stats["model_seconds"] += timing["model_s"]
+        logger.debug(
+            f"🧠 Vision call {'(cached) ' if cached else ''}prepare={timing['prepare_s']}s "
+            f"model={timing['model_s']}s"
+        )
+        return text
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Call counts and timings; loop_seconds_offloaded is time that used to block the event loop."""
+        stats = dict(self.stats)
+        stats["prepare_seconds"] = round(stats["prepare_seconds"], 2)
+        stats["model_seconds"] = round(stats["model_seconds"], 2)
+        stats["loop_seconds_offloaded"] = round(stats["prepare_seconds"] + stats["model_seconds"], 2)
+        stats["cache_hit_rate"] = round(stats["cache_hits"] / stats["calls"], 3) if stats["calls"] else 0.0
+        return stats
+
     async def analyze_page(self, page: Page) -> Dict[str, Any]:
         """
         Analyzes the current page using a screenshot and suggests the next action.
@@ -41,27 +170,16 @@ class GeminiPageAnalyzer:
             A dictionary containing the page type, confidence, and suggested next action.
         """
         if not self.model:
-            return self._fallback_analysis(page)
+            return await self._fallback_analysis(page)
 
         logger.info("🧠 Analyzing unknown page with Gemini Vision...")
         try:
             # Take screenshot with reduced quality to minimize token usage
             screenshot_bytes = await page.screenshot(quality=50, type='jpeg')
-            image = Image.open(BytesIO(screenshot_bytes))
-
-            # Resize image to max 1280px width to further reduce tokens
-            max_width = 1280
-            if image.width > max_width:
-                ratio = max_width / image.width
-                new_size = (max_width, int(image.height * ratio))
-                image = image.resize(new_size, Image.Resampling.LANCZOS)
-                logger.debug(f"Resized screenshot from {image.width}x{image.height} to {new_size[0]}x{new_size[1]}")
-
             prompt = self._create_analysis_prompt()
 
-            # Pass image and prompt as a list
-            response = await self.model.generate_content_async([image, prompt])
-            ai_result = self._parse_json_response(response.text)
+            response_text = await self.analyze_screenshot(screenshot_bytes, prompt, url=page.url)
+            ai_result = self._parse_json_response(response_text or "")
 
             if not ai_result:
                 logger.warning("AI analysis failed to produce a valid result. Using fallback.")
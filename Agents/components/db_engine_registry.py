@@ -0,0 +1,154 @@
+"""
+DB Engine Registry - One SQLAlchemy engine (and connection pool) per DSN per process
+
+Form fillers, pattern recorders and profilers are created per page or per
+application; each used to call create_engine itself, paying TCP+TLS+auth to
+Postgres for every instance and leaving idle pools behind.  Components now
+ask this registry for the shared engine / sessionmaker instead.
+
+Pool sizing targets the agent's concurrency (a few applications in flight,
+each with a handful of components); override with LAUNCHWAY_AGENT_DB_POOL_SIZE
+and LAUNCHWAY_AGENT_DB_MAX_OVERFLOW.  pool_stats() reports per-DSN checkouts,
+new connections, waits for a free connection and overflow.
+"""
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+from urllib.parse import quote_plus
+
+from loguru import logger
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+POOL_SIZE = int(os.getenv("LAUNCHWAY_AGENT_DB_POOL_SIZE", "3"))
+MAX_OVERFLOW = int(os.getenv("LAUNCHWAY_AGENT_DB_MAX_OVERFLOW", "4"))
+POOL_TIMEOUT_SECONDS = 10
+POOL_RECYCLE_SECONDS = 1800
+
+
+def database_url() -> str:
+    """Postgres DSN from the DB_* environment variables."""
+    db_host = os.getenv('DB_HOST', 'localhost')
+    db_port = os.getenv('DB_PORT', '5432')
+    db_name = os.getenv('DB_NAME', 'job_agent_db')
+    db_user = os.getenv('DB_USER', 'postgres')
+    db_password = quote_plus(os.getenv('DB_PASSWORD', ''))
+    return f"postgresql://{db_user}:{db_password}@{db_host}:{db_port}/{db_name}"
+
+
+@dataclass
+class PoolStats:
+    checkouts: int = 0
+    connects: int = 0          # new DBAPI connections (TCP+TLS+auth)
+    waits: int = 0             # checkouts that found the pool exhausted
+    wait_seconds: float = 0.0
+    overflow_peak: int = 0
+
+
+class _InstrumentedQueuePool(QueuePool):
+    """QueuePool that records checkouts which had to wait for a free connection.
+
+    Subclassed per engine with its PoolStats as a class attribute so the
+    stats survive engine.dispose() (which recreates the pool from its class).
+    """
+
+    stats: PoolStats
+    max_overflow_limit: int
+
+    def _do_get(self):
+        exhausted = self.checkedin() == 0 and self.overflow() >= self.max_overflow_limit
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if exhausted:
+                self.stats.waits += 1
+                self.stats.wait_seconds += time.perf_counter() - started
+
+
+_engines: Dict[str, Engine] = {}
+_stats: Dict[str, PoolStats] = {}
+_sessionmakers: Dict[str, sessionmaker] = {}
+_lock = threading.Lock()
+
+
+def _create_engine(url: str, stats: PoolStats) -> Engine:
+    kwargs: Dict[str, Any] = {"pool_pre_ping": True}
+    parsed = make_url(url)
+    # In-memory SQLite needs its single-connection pool
+    if parsed.get_backend_name() != "sqlite" or parsed.database not in (None, "", ":memory:"):
+        kwargs.update(
+            poolclass=type("InstrumentedQueuePool", (_InstrumentedQueuePool,),
+                           {"stats": stats, "max_overflow_limit": MAX_OVERFLOW}),
+            pool_size=POOL_SIZE,
+            max_overflow=MAX_OVERFLOW,
+            pool_timeout=POOL_TIMEOUT_SECONDS,
+            pool_recycle=POOL_RECYCLE_SECONDS,
+        )
+    engine = create_engine(url, **kwargs)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        stats.connects += 1
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        stats.checkouts += 1
+        if isinstance(engine.pool, QueuePool):
+            stats.overflow_peak = max(stats.overflow_peak, engine.pool.overflow())
+
+    return engine
+
+
+def get_engine(url: Optional[str] = None) -> Engine:
+    """The process-wide engine for `url` (default: database_url()), created on first use."""
+    url = url or database_url()
+    engine = _engines.get(url)
+    if engine is not None:
+        return engine
+    with _lock:
+        engine = _engines.get(url)
+        if engine is None:
+            _stats[url] = PoolStats()
+            engine = _create_engine(url, _stats[url])
+            _engines[url] = engine
+            logger.info(f"DB engine registry: created pool for {make_url(url).render_as_string(hide_password=True)}")
+        return engine
+
+
+def get_sessionmaker(url: Optional[str] = None) -> sessionmaker:
+    """The process-wide sessionmaker bound to get_engine(url)."""
+    url = url or database_url()
+    factory = _sessionmakers.get(url)
+    if factory is None:
+        engine = get_engine(url)
+        with _lock:
+            factory = _sessionmakers.setdefault(url, sessionmaker(bind=engine))
+    return factory
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-DSN pool metrics (passwords hidden)."""
+    report = {}
+    for url, engine in list(_engines.items()):
+        pool = engine.pool
+        entry = asdict(_stats.get(url, PoolStats()))
+        if isinstance(pool, QueuePool):
+            entry.update(size=pool.size(), checked_out=pool.checkedout(), overflow=max(0, pool.overflow()))
+        report[make_url(url).render_as_string(hide_password=True)] = entry
+    return report
+
+
+def dispose_all() -> None:
+    """Close every pooled connection and forget all engines (e.g. at shutdown or after fork)."""
+    with _lock:
+        engines = list(_engines.values())
+        _engines.clear()
+        _stats.clear()
+        _sessionmakers.clear()
+    for engine in engines:
+        engine.dispose()
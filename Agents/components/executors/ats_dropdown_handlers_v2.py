@@ -3,32 +3,22 @@ Enhanced V2 Dropdown Handlers with Iframe Support.
 Handles Greenhouse, Workday, Lever, and others with correct frame context.
 """
 import asyncio
-import random
-import time
 from typing import Any, Dict, List, Optional
 from playwright.async_api import Locator
 from loguru import logger
 
 
-def _gemini_call(client_models, **kwargs):
-    """Call client.models.generate_content with exponential backoff on 429."""
-    max_retries = 6
-    for attempt in range(max_retries):
-        try:
-            return client_models.generate_content(**kwargs)
-        except Exception as exc:
-            err = str(exc)
-            if "429" in err or "RESOURCE_EXHAUSTED" in err:
-                if attempt == max_retries - 1:
-                    raise
-                wait = (2 ** (attempt + 1)) + random.uniform(-0.5, 0.5)
-                logger.warning(
-                    f"Gemini 429 rate-limit — backing off {wait:.1f}s "
-                    f"(attempt {attempt + 1}/{max_retries})"
-                )
-                time.sleep(wait)
-            else:
-                raise
+async def _gemini_call(client_aio_models, **kwargs):
+    """Await client.aio.models.generate_content with exponential backoff on 429 (form-fill lane).
+
+    Awaited rather than called synchronously: these run on the browser's event
+    loop, and a blocking budget wait there would stall async Gemini callers
+    queued on the same loop.
+    """
+    from gemini_budget import gemini_lane
+    from gemini_compat import _call_with_backoff_async
+    with gemini_lane("form_fill"):
+        return await _call_with_backoff_async(client_aio_models.generate_content, **kwargs)
 
 from components.exceptions.field_exceptions import (
     DropdownInteractionError,
@@ -430,8 +420,8 @@ class ATSDropdownHandlerV2:
                         'explicitly names one (e.g. "Asian", "Hispanic"). Never infer from unrelated context.\n'
                         '- If nothing genuinely matches, reply with exactly: NO_MATCH'
                     )
-                    resp = _gemini_call(
-                        _client.models,
+                    resp = await _gemini_call(
+                        _client.aio.models,
                         model="gemini-2.5-flash",
                         contents=prompt
                     )
@@ -470,8 +460,8 @@ class ATSDropdownHandlerV2:
                         'Reply with ONLY the search terms, one per line, no numbering, no explanation.\n'
                         'If no useful search terms exist, reply with: NONE'
                     )
-                    resp = _gemini_call(
-                        _client.models,
+                    resp = await _gemini_call(
+                        _client.aio.models,
                         model="gemini-2.5-flash",
                         contents=prompt
                     )
@@ -995,7 +985,7 @@ class ATSDropdownHandlerV2:
                     + '\n\nReply with ONLY the exact option text as listed. '
                     'If truly nothing matches, reply NO_MATCH.'
                 )
-                resp = _gemini_call(_client.models, model="gemini-2.5-flash", contents=prompt)
+                resp = await _gemini_call(_client.aio.models, model="gemini-2.5-flash", contents=prompt)
                 ai_choice = resp.text.strip().strip('"').strip("'")
                 logger.info(f"  AI chose: '{ai_choice}'")
                 if ai_choice != "NO_MATCH":
@@ -1363,7 +1353,7 @@ class ATSDropdownHandlerV2:
                         + "\n".join(f"- {t}" for t in option_texts)
                         + '\n\nReply with ONLY the exact option text. If nothing matches, reply NO_MATCH.'
                     )
-                    resp = _gemini_call(_client.models, model="gemini-2.5-flash", contents=prompt)
+                    resp = await _gemini_call(_client.aio.models, model="gemini-2.5-flash", contents=prompt)
                     ai_choice = resp.text.strip().strip('"').strip("'")
                     logger.info(f"  AI chose: '{ai_choice}'")
                     if ai_choice != "NO_MATCH":
@@ -19,32 +19,35 @@ Relationship types recorded:
   placeholder       — field identified by placeholder text
   custom_class      — site-specific class pattern (e.g. Ashby, Greenhouse)
 
-Storage: JSON file at ~/.launchway/dom_patterns.json
-Format:
+Storage: SQLite (WAL) at ~/.launchway/dom_patterns.sqlite3, one row per
+(site_domain, normalized_label).  Each record() is a single short
+read-modify-write transaction, so several agent processes can write at once
+without losing each other's updates, and save cost does not grow with the
+number of sites.  Sites are loaded lazily, one domain at a time.  A legacy
+~/.launchway/dom_patterns.json is imported on first use.
+
+Entry format (as returned by get / get_all_for_site):
 {
-  "greenhouse.io": {
-    "first name": {
-      "relationship": "label_for",
-      "label_selector": "label[for]",
-      "field_selector_template": "input#{label_for_value}",
-      "field_type": "text",
-      "success_count": 4,
-      "failure_count": 0,
-      "last_seen": "2026-04-20T12:00:00"
-    },
-    ...
-  }
+  "relationship": "label_for",
+  "field_type": "text",
+  "success_count": 4,
+  "failure_count": 0,
+  "last_seen": "2026-04-20T12:00:00",
+  "extra": {"label_for_value": "first_name", "css_selector": "#first_name"}
 }
 """
 import json
 import re
-from datetime import datetime
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, Optional
 from loguru import logger
 
 
-_STORAGE_PATH = Path.home() / ".launchway" / "dom_patterns.json"
+_STORAGE_PATH = Path.home() / ".launchway" / "dom_patterns.sqlite3"
 _RELATIONSHIP_TYPES = {
     "label_for",
     "aria_labelledby",
@@ -54,6 +57,10 @@ _RELATIONSHIP_TYPES = {
     "placeholder",
     "custom_class",
 }
+# Compact (checkpoint the WAL, prune dead entries) every this many writes per process
+_COMPACT_EVERY = 500
+# Entries that never worked and have not been seen for this long are pruned
+_PRUNE_AFTER = timedelta(days=90)
 
 
 class DomPatternRecorder:
@@ -71,29 +78,177 @@ class DomPatternRecorder:
     """
 
     def __init__(self, storage_path: Optional[Path] = None):
-        self._path = storage_path or _STORAGE_PATH
-        self._data: Dict[str, Dict[str, Any]] = {}
-        self._dirty = False
-        self._load()
+        path = Path(storage_path or _STORAGE_PATH)
+        # Accept the old JSON location: keep the database next to it
+        self._path = path.with_suffix(".sqlite3") if path.suffix == ".json" else path
+        self._legacy_path = self._path.with_suffix(".json")
+        self._data: Dict[str, Dict[str, Any]] = {}  # lazily loaded domains
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._ready = False
+        self._init_storage()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self._path), timeout=10)
 
-    def _load(self) -> None:
+    def _init_storage(self) -> None:
         try:
-            if self._path.exists():
-                raw = self._path.read_text(encoding="utf-8")
-                self._data = json.loads(raw)
-                total = sum(len(v) for v in self._data.values())
-                logger.debug(f"DomPatternRecorder: loaded {total} patterns from {self._path}")
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with closing(self._connect()) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS dom_patterns ("
+                    " domain TEXT NOT NULL,"
+                    " label TEXT NOT NULL,"
+                    " relationship TEXT NOT NULL,"
+                    " field_type TEXT,"
+                    " success_count INTEGER NOT NULL DEFAULT 0,"
+                    " failure_count INTEGER NOT NULL DEFAULT 0,"
+                    " last_seen TEXT,"
+                    " extra TEXT NOT NULL DEFAULT '{}',"
+                    " PRIMARY KEY (domain, label))"
+                )
+                conn.commit()
+            self._ready = True
+            self._import_legacy_json()
         except Exception as e:
-            logger.warning(f"DomPatternRecorder: could not load patterns ({e}), starting fresh")
-            self._data = {}
+            logger.warning(f"DomPatternRecorder: could not open pattern store ({e}), patterns will not persist")
 
-    def _save(self) -> None:
+    def _import_legacy_json(self) -> None:
+        """One-time import of the old whole-file JSON store."""
+        if not self._legacy_path.exists():
+            return
         try:
-            self._path.parent.mkdir(parents=True, exist_ok=True)
-            self._path.write_text(json.dumps(self._data, indent=2), encoding="utf-8")
-            self._dirty = False
+            legacy = json.loads(self._legacy_path.read_text(encoding="utf-8"))
+            rows = [
+                (
+                    domain, label, entry.get("relationship", "ancestor_walk"), entry.get("field_type"),
+                    int(entry.get("success_count", 0)), int(entry.get("failure_count", 0)),
+                    entry.get("last_seen"), json.dumps(entry.get("extra") or {}),
+                )
+                for domain, site_patterns in legacy.items()
+                for label, entry in site_patterns.items()
+            ]
+            with closing(self._connect()) as conn:
+                with conn:
+                    # Rows already in the store are newer than the JSON file
+                    conn.executemany(
+                        "INSERT OR IGNORE INTO dom_patterns"
+                        " (domain, label, relationship, field_type, success_count, failure_count, last_seen, extra)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        rows,
+                    )
+            self._legacy_path.replace(self._legacy_path.with_suffix(".json.migrated"))
+            logger.info(f"DomPatternRecorder: imported {len(rows)} patterns from {self._legacy_path}")
+        except FileNotFoundError:
+            pass  # another process migrated it first
+        except Exception as e:
+            logger.warning(f"DomPatternRecorder: could not import legacy patterns ({e})")
+
+    @staticmethod
+    def _row_to_entry(row) -> Dict[str, Any]:
+        relationship, field_type, success_count, failure_count, last_seen, extra = row
+        try:
+            extra = json.loads(extra) if extra else {}
+        except ValueError:
+            extra = {}
+        return {
+            "relationship": relationship,
+            "field_type": field_type,
+            "success_count": success_count,
+            "failure_count": failure_count,
+            "last_seen": last_seen,
+            "extra": extra,
+        }
+
+    def _site(self, domain: str) -> Dict[str, Any]:
+        """Patterns for one domain, loaded from the store on first access."""
+        with self._lock:
+            site_patterns = self._data.get(domain)
+        if site_patterns is not None:
+            return site_patterns
+        site_patterns = {}
+        if self._ready:
+            try:
+                with closing(self._connect()) as conn:
+                    rows = conn.execute(
+                        "SELECT label, relationship, field_type, success_count, failure_count, last_seen, extra"
+                        " FROM dom_patterns WHERE domain = ?",
+                        (domain,),
+                    ).fetchall()
+                site_patterns = {row[0]: self._row_to_entry(row[1:]) for row in rows}
+                logger.debug(f"DomPatternRecorder: loaded {len(site_patterns)} patterns for {domain}")
+            except Exception as e:
+                logger.warning(f"DomPatternRecorder: could not load patterns for {domain}: {e}")
+        with self._lock:
+            return self._data.setdefault(domain, site_patterns)
+
+    def _write(self, domain: str, norm_label: str, relationship: str, field_type: str,
+               success: bool, extra: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Apply one observation atomically and return the stored entry."""
+        now = datetime.utcnow().isoformat()
+        with closing(self._connect()) as conn:
+            conn.execute("BEGIN IMMEDIATE")  # serialises writers across processes
+            try:
+                row = conn.execute(
+                    "SELECT relationship, field_type, success_count, failure_count, last_seen, extra"
+                    " FROM dom_patterns WHERE domain = ? AND label = ?",
+                    (domain, norm_label),
+                ).fetchone()
+                if row is None:
+                    entry = {
+                        "relationship": relationship,
+                        "field_type": field_type,
+                        "success_count": 0,
+                        "failure_count": 0,
+                        "last_seen": None,
+                        "extra": extra or {},
+                    }
+                else:
+                    entry = self._row_to_entry(row)
+                self._apply(entry, relationship, field_type, success, extra, now)
+                conn.execute(
+                    "INSERT OR REPLACE INTO dom_patterns"
+                    " (domain, label, relationship, field_type, success_count, failure_count, last_seen, extra)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (domain, norm_label, entry["relationship"], entry["field_type"], entry["success_count"],
+                     entry["failure_count"], entry["last_seen"], json.dumps(entry["extra"])),
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+        return entry
+
+    @staticmethod
+    def _apply(entry: Dict[str, Any], relationship: str, field_type: str, success: bool,
+               extra: Optional[Dict[str, Any]], now: str) -> None:
+        if success:
+            entry["success_count"] += 1
+            entry["relationship"] = relationship
+            entry["field_type"] = field_type
+            if extra:
+                entry["extra"].update(extra)
+        else:
+            entry["failure_count"] += 1
+        entry["last_seen"] = now
+
+    def compact(self) -> None:
+        """Prune entries that never worked and went stale, then checkpoint the WAL."""
+        if not self._ready:
+            return
+        cutoff = (datetime.utcnow() - _PRUNE_AFTER).isoformat()
+        try:
+            with closing(self._connect()) as conn:
+                with conn:
+                    pruned = conn.execute(
+                        "DELETE FROM dom_patterns WHERE success_count = 0 AND last_seen < ?", (cutoff,)
+                    ).rowcount
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            if pruned:
+                logger.debug(f"DomPatternRecorder: pruned {pruned} stale patterns")
         except Exception as e:
-            logger.warning(f"DomPatternRecorder: could not save patterns: {e}")
+            logger.debug(f"DomPatternRecorder: compaction skipped: {e}")
 
     @staticmethod
     def _normalize_label(label: str) -> str:
@@ -148,31 +303,28 @@ class DomPatternRecorder:
         if not domain or not norm_label:
             return False
 
-        site_patterns = self._data.setdefault(domain, {})
-        entry = site_patterns.get(norm_label)
-
-        if entry is None:
-            entry = {
+        try:
+            if not self._ready:
+                raise RuntimeError("pattern store unavailable")
+            entry = self._write(domain, norm_label, relationship, field_type, success, extra)
+        except Exception as e:
+            logger.warning(f"DomPatternRecorder: could not save pattern: {e}")
+            # Keep the observation for this process at least
+            entry = self._site(domain).get(norm_label) or {
                 "relationship": relationship,
                 "field_type": field_type,
                 "success_count": 0,
                 "failure_count": 0,
                 "last_seen": None,
-                "extra": extra or {},
+                "extra": {},
             }
-            site_patterns[norm_label] = entry
+            self._apply(entry, relationship, field_type, success, extra, datetime.utcnow().isoformat())
 
-        if success:
-            entry["success_count"] += 1
-            entry["relationship"] = relationship
-            entry["field_type"] = field_type
-            if extra:
-                entry["extra"].update(extra)
-        else:
-            entry["failure_count"] += 1
-
-        entry["last_seen"] = datetime.utcnow().isoformat()
-        self._dirty = True
+        site_patterns = self._site(domain)
+        with self._lock:
+            site_patterns[norm_label] = entry
+            self._writes += 1
+            compact_now = self._writes % _COMPACT_EVERY == 0
 
         total_s = entry["success_count"]
         total_f = entry["failure_count"]
@@ -181,14 +333,15 @@ class DomPatternRecorder:
             f"(success={total_s}, failure={total_f})"
         )
 
-        self._save()
+        if compact_now:
+            self.compact()
         return True
 
     def get(self, site_domain: str, label_text: str) -> Optional[Dict[str, Any]]:
         """Retrieve a DOM pattern entry (or None if not found / not reliable)."""
         domain = self._normalize_domain(site_domain)
         norm_label = self._normalize_label(label_text)
-        entry = self._data.get(domain, {}).get(norm_label)
+        entry = self._site(domain).get(norm_label)
         if entry is None:
             return None
         # Only return patterns that have worked more than they've failed
@@ -199,17 +352,22 @@ class DomPatternRecorder:
     def get_all_for_site(self, site_domain: str) -> Dict[str, Any]:
         """Return all recorded patterns for a site domain."""
         domain = self._normalize_domain(site_domain)
-        return dict(self._data.get(domain, {}))
+        return dict(self._site(domain))
 
     def stats(self) -> Dict[str, Any]:
         """Summary statistics."""
-        sites = len(self._data)
-        total = sum(len(v) for v in self._data.values())
-        relationships: Dict[str, int] = {}
-        for site_data in self._data.values():
-            for entry in site_data.values():
-                r = entry.get("relationship", "unknown")
-                relationships[r] = relationships.get(r, 0) + 1
+        sites, total, relationships = 0, 0, {}
+        if self._ready:
+            try:
+                with closing(self._connect()) as conn:
+                    sites, total = conn.execute(
+                        "SELECT COUNT(DISTINCT domain), COUNT(*) FROM dom_patterns"
+                    ).fetchone()
+                    relationships = dict(conn.execute(
+                        "SELECT relationship, COUNT(*) FROM dom_patterns GROUP BY relationship"
+                    ).fetchall())
+            except Exception as e:
+                logger.debug(f"DomPatternRecorder: stats unavailable: {e}")
         return {
             "sites": sites,
             "total_patterns": total,
@@ -6,32 +6,23 @@ import os
 import re
 import asyncio
 import hashlib
-import random
 import time
 from typing import Any, Dict, List, Optional, Tuple
 from playwright.async_api import Page, Frame, Locator
 from loguru import logger
 
 
-def _gemini_call(client_models, **kwargs):
-    """Call client.models.generate_content with exponential backoff on 429."""
-    max_retries = 6
-    for attempt in range(max_retries):
-        try:
-            return client_models.generate_content(**kwargs)
-        except Exception as exc:
-            err = str(exc)
-            if "429" in err or "RESOURCE_EXHAUSTED" in err:
-                if attempt == max_retries - 1:
-                    raise
-                wait = (2 ** (attempt + 1)) + random.uniform(-0.5, 0.5)
-                logger.warning(
-                    f"Gemini 429 rate-limit — backing off {wait:.1f}s "
-                    f"(attempt {attempt + 1}/{max_retries})"
-                )
-                time.sleep(wait)
-            else:
-                raise
+async def _gemini_call(client_aio_models, **kwargs):
+    """Await client.aio.models.generate_content with exponential backoff on 429 (form-fill lane).
+
+    Awaited rather than called synchronously: these run on the browser's event
+    loop, and a blocking budget wait there would stall async Gemini callers
+    queued on the same loop.
+    """
+    from gemini_budget import gemini_lane
+    from gemini_compat import _call_with_backoff_async
+    with gemini_lane("form_fill"):
+        return await _call_with_backoff_async(client_aio_models.generate_content, **kwargs)
 
 from components.exceptions.field_exceptions import (
     FieldInteractionError,
@@ -45,6 +36,209 @@ from components.exceptions.field_exceptions import (
 from components.executors.ats_dropdown_handlers_v2 import get_dropdown_handler
 
 
+# Data attribute used to tag elements found by the DOM snapshot scan so a Locator
+# can be built for each one without an extra round trip.  Ids are allocated from
+# a page-global counter and never reused, so locators from an earlier scan keep
+# pointing at the same node across rescans.
+_SNAPSHOT_FIELD_ATTR = 'data-lw-fid'
+
+# Single-round-trip field scan.  Mirrors the label-resolution waterfall of
+# FieldInteractorV2._probe_field_element (label[for] → aria-labelledby →
+# Greenhouse container label → aria-label/placeholder/name → ancestor walk →
+# Workday multiselect container → ATS-ID rescue) and flags records it cannot
+# resolve confidently as `ambiguous` so Python re-probes just those.
+_FIELD_SNAPSHOT_JS = r"""
+({ attr, extractOptions }) => {
+    const SELECTOR = 'input:not([type="hidden"]):not([type="submit"]):not([type="button"]), select, textarea';
+    const FILE_UI_WORDS = new Set(['attach', 'upload', 'browse', 'choose file', 'select file',
+                                   'add file', 'pick file', 'open file']);
+    const ATS_ID = /^([A-Z]{1,3}_\d{4,}|CA_\d+)$/;
+    const clean = (t) => (t || '').trim().replace(/\*/g, '').trim();
+
+    // Same visibility rule as Playwright's :visible - non-empty box, not visibility:hidden.
+    const isVisible = (el) => {
+        const style = window.getComputedStyle(el);
+        if (!style || style.visibility !== 'visible') return false;
+        const rect = el.getBoundingClientRect();
+        return rect.width > 0 && rect.height > 0;
+    };
+
+    // Collect candidates in document order, descending into open shadow roots
+    // (Playwright's CSS engine pierces them, so the legacy scan saw these too).
+    const found = [];
+    const walk = (root, inShadow) => {
+        for (const el of root.querySelectorAll(SELECTOR)) found.push([el, inShadow]);
+        for (const host of root.querySelectorAll('*')) {
+            if (host.shadowRoot) walk(host.shadowRoot, true);
+        }
+    };
+    walk(document, false);
+
+    const byIdText = (id) => {
+        if (!id) return '';
+        const node = document.getElementById(id);
+        return node ? clean(node.innerText) : '';
+    };
+
+    const ancestorLabel = (el) => {
+        let node = el.parentElement;
+        for (let depth = 0; depth < 7; depth++) {
+            if (!node || node === document.body) break;
+            for (const lbl of node.querySelectorAll(':scope > label, :scope > div > label')) {
+                const t = lbl.textContent.replace(/\*/g, '').trim();
+                if (t && t.length >= 2 && t.length <= 200) return t;
+            }
+            for (const lbl of node.querySelectorAll('label')) {
+                if (!lbl.contains(el)) {
+                    const t = lbl.textContent.replace(/\*/g, '').trim();
+                    if (t && t.length >= 2 && t.length <= 200) return t;
+                }
+            }
+            const prev = node.previousElementSibling;
+            if (prev && ['label', 'legend', 'h1', 'h2', 'h3', 'h4', 'p', 'span']
+                    .includes(prev.tagName.toLowerCase())) {
+                const t = prev.textContent.replace(/\*/g, '').trim();
+                if (t && t.length >= 2 && t.length <= 200) return t;
+            }
+            node = node.parentElement;
+        }
+        return '';
+    };
+
+    const rescueAtsLabel = (el) => {
+        const cleanText = (t) => (t || '').replace(/\*/g, '').replace(/\s+/g, ' ').trim();
+        const isReadable = (t) => t && t.length >= 4 && t.length <= 300 && !/^[A-Z]{1,3}_\d+$/.test(t);
+        let node = el.parentElement;
+        for (let d = 0; d < 10; d++) {
+            if (!node || node === document.body) break;
+            if (node.tagName === 'FIELDSET') {
+                const leg = node.querySelector('legend');
+                if (leg) { const t = cleanText(leg.textContent); if (isReadable(t)) return t; }
+            }
+            if (el.id) {
+                const lbl = document.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+                if (lbl) { const t = cleanText(lbl.textContent); if (isReadable(t)) return t; }
+            }
+            const candidates = node.querySelectorAll(
+                'label, legend, p[class*="label"], p[class*="question"], ' +
+                'div[class*="label"], div[class*="question"], ' +
+                'span[class*="label"], span[class*="question"], ' +
+                'div[class*="title"], span[class*="title"], ' +
+                'li[class*="label"], li[class*="question"]'
+            );
+            for (const c of candidates) {
+                if (!c.contains(el)) {
+                    const t = cleanText(c.textContent);
+                    if (isReadable(t)) return t;
+                }
+            }
+            const tid = node.getAttribute('data-testid') || '';
+            if (tid.startsWith('field-')) {
+                const al = node.getAttribute('aria-label');
+                if (al && isReadable(al)) return cleanText(al);
+            }
+            node = node.parentElement;
+        }
+        return '';
+    };
+
+    window.__lwFieldSeq = window.__lwFieldSeq || 0;
+    const records = [];
+    const seen = new Set();
+    for (const [el, inShadow] of found) {
+        if (!isVisible(el)) continue;
+        const get = (n) => el.getAttribute(n) || '';
+        const tag = el.tagName.toLowerCase();
+        const type = get('type') || 'text';
+        const name = get('name');
+        const id = get('id');
+        const placeholder = get('placeholder');
+        const ariaLabel = get('aria-label');
+        const role = get('role');
+
+        let category;
+        if (tag === 'select') category = 'dropdown';
+        else if (get('data-uxi-widget-type') === 'selectinput' && get('data-uxi-multiselect-id'))
+            category = 'workday_multiselect';
+        else if (role === 'combobox' && (get('aria-haspopup') === 'true' || get('aria-autocomplete') === 'list')) {
+            const parent = el.closest('.select__value-container');
+            category = parent && parent.className.includes('is-multi')
+                ? 'greenhouse_dropdown_multi' : 'greenhouse_dropdown';
+        }
+        else if (type === 'checkbox') category = 'checkbox';
+        else if (type === 'radio') category = 'radio';
+        else if (type === 'file') category = 'file_upload';
+        else if (tag === 'textarea') category = 'textarea';
+        else category = 'text_input';
+
+        // React Select inner type-ahead input - managed by the dropdown handler.
+        if (category === 'text_input' && (
+                el.closest('.select__value-container') ||
+                el.closest('.select__input-container') ||
+                el.closest('[class*="select__input"]'))) continue;
+
+        let label = '';
+        if (id) {
+            const lbl = document.querySelector(`label[for="${CSS.escape(id)}"]`);
+            if (lbl) {
+                label = clean(lbl.innerText);
+                if (type === 'file' && FILE_UI_WORDS.has(label.toLowerCase())) label = '';
+            }
+        }
+        if (!label) label = byIdText(get('aria-labelledby').split(/\s+/)[0]);
+        if (!label && (category === 'greenhouse_dropdown' || category === 'greenhouse_dropdown_multi')) {
+            const container = el.closest('.select__container') || el.closest('.select');
+            const lbl = container && container.querySelector('label.label');
+            if (lbl) label = clean(lbl.textContent);
+        }
+        if (!label) {
+            label = ariaLabel || placeholder || name;
+            if (type === 'file' && label && FILE_UI_WORDS.has(label.trim().toLowerCase())) label = '';
+        }
+        if (!label) label = clean(ancestorLabel(el));
+        if (!label && category === 'workday_multiselect') {
+            const container = document.querySelector(`[id="${CSS.escape(get('data-uxi-multiselect-id'))}"]`);
+            const ids = container ? (container.getAttribute('aria-labelledby') || '').split(/\s+/) : [];
+            for (const lblId of ids) {
+                const t = byIdText(lblId);
+                if (t) { label = t; break; }
+            }
+        }
+        if (!label || ATS_ID.test(label.trim())) {
+            const rescued = clean(rescueAtsLabel(el));
+            if (rescued) label = rescued;
+        }
+
+        let options = [];
+        if (extractOptions && category === 'dropdown') {
+            for (const opt of el.querySelectorAll('option')) {
+                const text = (opt.innerText || opt.textContent || '').trim();
+                if (text) options.push({ text, value: opt.getAttribute('value') || '' });
+            }
+        }
+
+        // Reuse an existing tag so earlier locators stay valid; re-tag if a
+        // framework cloned the node (and its attribute) into a second element.
+        let fid = el.getAttribute(attr);
+        if (!fid || seen.has(fid)) {
+            fid = String(++window.__lwFieldSeq);
+            el.setAttribute(attr, fid);
+        }
+        seen.add(fid);
+
+        records.push({
+            fid, tag_name: tag, input_type: type, name, id, placeholder,
+            aria_label: ariaLabel, category, label, options,
+            // Shadow-DOM fields and fields with no resolvable label are
+            // re-probed individually on the Python side.
+            ambiguous: inShadow || !label,
+        });
+    }
+    return records;
+}
+"""
+
+
 def create_clean_filename(original_path: str, profile: Optional[Dict[str, Any]] = None, file_type: str = "Resume") -> str:
     """
     Create a clean copy of a file with format: FirstName_LastName_FileType.ext
@@ -102,6 +296,9 @@ class FieldInteractorV2:
     STRATEGY_TIMEOUT_MS = 5000  # 5 seconds per strategy
     VERIFICATION_TIMEOUT_MS = 2000  # 2 seconds for verification
     MAX_TOTAL_TIME_PER_FIELD_MS = 20000  # 20 seconds total max per field
+    # Scan fields with one injected page.evaluate instead of 10+ awaited
+    # Playwright calls per element (see _FIELD_SNAPSHOT_JS).
+    USE_DOM_SNAPSHOT_SCAN = True
 
     def __init__(self, page: Page | Frame, action_recorder=None, site_url: str = ""):
         self.page = page
@@ -109,6 +306,7 @@ class FieldInteractorV2:
         self.site_url = site_url
         self.dropdown_handler = get_dropdown_handler()  # Fast v2 handler
         self._cached_fields: Optional[List[Dict[str, Any]]] = None
+        self.last_scan_stats: Dict[str, Any] = {}  # mode / fields / fallback_probes / elapsed_ms of last scan
         self.profile: Optional[Dict[str, Any]] = None  # Store profile for clean filenames
         self.created_clean_files: List[str] = []  # Track files created with clean names for cleanup
 
@@ -1038,7 +1236,7 @@ class FieldInteractorV2:
                         f'Available options:\n' + "\n".join(f"- {t}" for t in option_texts)
                         + '\n\nReply with ONLY the exact option text. If nothing fits, reply NO_MATCH.'
                     )
-                    resp = _gemini_call(_client.models, model="gemini-2.5-flash", contents=prompt)
+                    resp = await _gemini_call(_client.aio.models, model="gemini-2.5-flash", contents=prompt)
                     ai_choice = resp.text.strip().strip('"').strip("'")
                     logger.info(f"   AI radio pick: '{ai_choice}'")
                     if ai_choice != "NO_MATCH":
@@ -1989,410 +2187,64 @@ class FieldInteractorV2:
             logger.debug(f"Ashby schema extraction skipped: {e}")
             return {}
 
-    async def get_all_form_fields(self, extract_options: bool = True) -> List[Dict[str, Any]]:
+    async def get_all_form_fields(
+        self, extract_options: bool = True, use_snapshot: Optional[bool] = None
+    ) -> List[Dict[str, Any]]:
         """
         Detect all form fields on the page including inputs, selects, textareas, radio buttons, and checkboxes.
         
         Args:
             extract_options: If True, extract available options for dropdowns (slower but more accurate)
+            use_snapshot: Collect field metadata with a single injected script instead of
+                per-element probing.  Defaults to USE_DOM_SNAPSHOT_SCAN.
             
         Returns:
             List of field dictionaries with metadata
         """
         fields = []
+        scan_started = time.perf_counter()
+        if use_snapshot is None:
+            use_snapshot = self.USE_DOM_SNAPSHOT_SCAN
+        self.last_scan_stats = {'mode': 'probe', 'fields': 0, 'fallback_probes': 0, 'elapsed_ms': 0.0}
 
         # Try to read Ashby's embedded form schema - gives us exact field titles and types
         # keyed by the field path used as the DOM input's name attribute.
         ashby_schema = await self._extract_ashby_field_schema()
         
         try:
-            # Detect all standard form input types
-            input_selector = 'input:not([type="hidden"]):not([type="submit"]):not([type="button"]):visible, select:visible, textarea:visible'
-            elements = await self.page.locator(input_selector).all()
-            
-            for element in elements:
-                try:
-                    # Get basic attributes
-                    input_type = await element.get_attribute('type') or 'text'
-                    name = await element.get_attribute('name') or ''
-                    id_attr = await element.get_attribute('id') or ''
-                    placeholder = await element.get_attribute('placeholder') or ''
-                    aria_label = await element.get_attribute('aria-label') or ''
-                    tag_name = await element.evaluate('el => el.tagName.toLowerCase()')
-                    role = await element.get_attribute('role') or ''
-                    aria_haspopup = await element.get_attribute('aria-haspopup') or ''
-                    aria_autocomplete = await element.get_attribute('aria-autocomplete') or ''
-                    
-                    # Determine field category
-                    if tag_name == 'select':
-                        category = 'dropdown'
-                    # Workday multiselect: search input inside a multiselect container
-                    # Identified by data-uxi-widget-type="selectinput" + data-uxi-multiselect-id
-                    elif (await element.get_attribute('data-uxi-widget-type') == 'selectinput'
-                          and await element.get_attribute('data-uxi-multiselect-id')):
-                        category = 'workday_multiselect'
-                    # Greenhouse/React Select: input with role="combobox" and aria-haspopup="true"
-                    elif role == 'combobox' and (aria_haspopup == 'true' or aria_autocomplete == 'list'):
-                        # Check if this is a multi-select by looking at parent container classes
-                        try:
-                            parent_classes = await element.evaluate(
-                                'el => el.closest(".select__value-container")?.className || ""'
-                            )
-                            if 'is-multi' in parent_classes or '--is-multi' in parent_classes:
-                                category = 'greenhouse_dropdown_multi'
-                            else:
-                                category = 'greenhouse_dropdown'
-                        except:
-                            category = 'greenhouse_dropdown'
-                    elif input_type == 'checkbox':
-                        category = 'checkbox'
-                    elif input_type == 'radio':
-                        category = 'radio'
-                    elif input_type == 'file':
-                        category = 'file_upload'
-                    elif tag_name == 'textarea':
-                        category = 'textarea'
-                    else:
-                        category = 'text_input'
-
-                    # --- SKIP React Select inner search inputs ---
-                    # React Select renders an <input type="text"> INSIDE the dropdown
-                    # value container (.select__value-container) for type-ahead searching.
-                    # This internal input is NOT a real form field — it's already managed
-                    # by the greenhouse_dropdown handler.  Detecting it creates ghost fields
-                    # (e.g. a second "Country" text_input next to the Country dropdown) that
-                    # then get filled with the wrong value and corrupt the phone widget.
-                    # Detect by: element sits inside '.select__value-container' or
-                    # '.select__input-container' (React Select DOM class names).
-                    if category == 'text_input':
-                        try:
-                            is_react_select_inner = await element.evaluate('''
-                                el => !!(
-                                    el.closest('.select__value-container') ||
-                                    el.closest('.select__input-container') ||
-                                    el.closest('[class*="select__input"]')
-                                )
-                            ''')
-                            if is_react_select_inner:
-                                logger.debug(
-                                    f"  [field_scan] Skipping React Select inner input "
-                                    f"(name={name!r}, aria-label={aria_label!r})"
-                                )
-                                continue
-                        except Exception:
-                            pass
-                    
-                    # Try to find label (enhanced for Greenhouse/React Select)
-                    label_text = ''
-                    
-                    # Method 1: Check for label[for="id"]
-                    # NOTE: page.locator() is SYNCHRONOUS in Playwright - do NOT await it.
-                    # Awaiting a Locator object raises TypeError (silently caught), breaking
-                    # label detection for all fields that rely on this path (e.g. radio buttons).
-                    # For file inputs, <label for=id> is often the button text ("Attach",
-                    # "Upload") rather than the semantic field name ("Cover Letter") — we
-                    # discard those so the ancestor-walk can find the real label.
-                    _FILE_UI_WORDS = {'attach', 'upload', 'browse', 'choose file', 'select file',
-                                      'add file', 'pick file', 'open file'}
-                    if id_attr:
-                        try:
-                            label_element = self.page.locator(f'label[for="{id_attr}"]').first
-                            if await label_element.count() > 0:
-                                label_text = await label_element.inner_text()
-                                label_text = label_text.strip().replace('*', '').strip()
-                                # Discard generic UI words for file inputs — use ancestor walk instead
-                                if input_type == 'file' and label_text.lower() in _FILE_UI_WORDS:
-                                    label_text = ''
-                        except:
-                            pass
-                    
-                    # Method 2: Check aria-labelledby (common in Greenhouse)
-                    if not label_text:
-                        try:
-                            labelledby = await element.get_attribute('aria-labelledby')
-                            if labelledby:
-                                # Handle multiple IDs (space-separated) - take the first one
-                                label_id = labelledby.split()[0] if labelledby else None
-                                if label_id:
-                                    label_element = await self.page.locator(f'#{label_id}').first
-                                    if await label_element.count() > 0:
-                                        label_text = await label_element.inner_text()
-                                        label_text = label_text.strip().replace('*', '').strip()  # Remove asterisks
-                        except:
-                            pass
-                    
-                    # Method 2.5: For Greenhouse multi-selects, check parent label
-                    if not label_text and category in ['greenhouse_dropdown', 'greenhouse_dropdown_multi']:
-                        try:
-                            # Look for label in parent container
-                            parent_label = await element.evaluate('''
-                                el => {
-                                    const container = el.closest('.select__container') || el.closest('.select');
-                                    return container?.querySelector('label.label')?.textContent || '';
-                                }
-                            ''')
-                            if parent_label:
-                                label_text = parent_label.strip().replace('*', '').strip()
-                        except:
-                            pass
-                    
-                    # Method 3: Try aria-label, placeholder, or name
-                    if not label_text:
-                        try:
-                            label_text = aria_label or placeholder or name
-                            # For file inputs, discard generic UI action words from
-                            # aria-label too (Greenhouse sets aria-label="Attach" on the
-                            # file input button, hiding the semantic label "Cover Letter").
-                            if (input_type == 'file'
-                                    and label_text
-                                    and label_text.strip().lower() in _FILE_UI_WORDS):
-                                label_text = ''
-                        except:
-                            pass
-
-                    # Method 3.5: Ancestor-walk — find a label in the closest form-field
-                    # container. Handles Greenhouse file-upload fields ("Cover Letter") and
-                    # conditional fields whose <label> is not linked via `for=id`.
-                    if not label_text:
-                        try:
-                            ancestor_label = await element.evaluate(r'''
-                                el => {
-                                    // Walk up the DOM, look for a <label> sibling or container label
-                                    let node = el.parentElement;
-                                    for (let depth = 0; depth < 7; depth++) {
-                                        if (!node || node === document.body) break;
-
-                                        // Prefer a <label> that is a direct child of this container
-                                        // and does NOT wrap the input itself
-                                        const directLabels = Array.from(
-                                            node.querySelectorAll(':scope > label, :scope > div > label')
-                                        );
-                                        for (const lbl of directLabels) {
-                                            const t = lbl.textContent.replace(/\*/g, '').trim();
-                                            if (t && t.length >= 2 && t.length <= 200) return t;
-                                        }
-
-                                        // Any <label> inside the container that doesn't wrap the input
-                                        const allLabels = Array.from(node.querySelectorAll('label'));
-                                        for (const lbl of allLabels) {
-                                            if (!lbl.contains(el)) {
-                                                const t = lbl.textContent.replace(/\*/g, '').trim();
-                                                if (t && t.length >= 2 && t.length <= 200) return t;
-                                            }
-                                        }
-
-                                        // Preceding sibling that looks like a label/heading
-                                        const prev = node.previousElementSibling;
-                                        if (prev) {
-                                            const tag = prev.tagName.toLowerCase();
-                                            if (['label', 'legend', 'h1', 'h2', 'h3', 'h4', 'p', 'span'].includes(tag)) {
-                                                const t = prev.textContent.replace(/\*/g, '').trim();
-                                                if (t && t.length >= 2 && t.length <= 200) return t;
-                                            }
-                                        }
-
-                                        node = node.parentElement;
-                                    }
-                                    return '';
-                                }
-                            ''')
-                            if ancestor_label:
-                                label_text = ancestor_label.strip().replace('*', '').strip()
-                        except Exception:
-                            pass
-
-                    # Method 4: Workday multiselect - label lives on the container div
-                    # The input carries data-uxi-multiselect-id pointing to the container,
-                    # and the container has aria-labelledby pointing to the visible label.
-                    if not label_text and category == 'workday_multiselect':
-                        try:
-                            multiselect_id = await element.get_attribute('data-uxi-multiselect-id')
-                            if multiselect_id:
-                                container = self.page.locator(f'[id="{multiselect_id}"]').first
-                                if await container.count() > 0:
-                                    labelledby = await container.get_attribute('aria-labelledby')
-                                    if labelledby:
-                                        for lbl_id in labelledby.split():
-                                            lbl_el = self.page.locator(f'#{lbl_id}').first
-                                            if await lbl_el.count() > 0:
-                                                candidate = (await lbl_el.inner_text()).strip().replace('*', '').strip()
-                                                if candidate:
-                                                    label_text = candidate
-                                                    break
-                        except:
-                            pass
-
-                    # Method 5: ATS internal-ID rescue
-                    # If the label still looks like an opaque ATS field ID (e.g. Workable's
-                    # "QA_11314685" or "CA_29438"), the normal label extraction missed the
-                    # visible question text.  Do a wider DOM search specifically for these.
-                    _ATS_ID_PATTERN = re.compile(r'^([A-Z]{1,3}_\d{4,}|CA_\d+)$')
-                    if not label_text or _ATS_ID_PATTERN.match((label_text or '').strip()):
-                        try:
-                            rescued = await element.evaluate(r'''
-                                (el) => {
-                                    // Walk outward up to 10 levels looking for a label or
-                                    // heading element that contains readable question text.
-                                    function cleanText(t) {
-                                        return (t || '').replace(/\*/g, '').replace(/\s+/g, ' ').trim();
-                                    }
-                                    function isReadable(t) {
-                                        return t && t.length >= 4 && t.length <= 300
-                                            && !/^[A-Z]{1,3}_\d+$/.test(t);
-                                    }
-
-                                    // Check fieldset legend first (most semantic)
-                                    let node = el.parentElement;
-                                    for (let d = 0; d < 10; d++) {
-                                        if (!node || node === document.body) break;
-
-                                        // Legend inside fieldset
-                                        if (node.tagName === 'FIELDSET') {
-                                            const leg = node.querySelector('legend');
-                                            if (leg) { const t = cleanText(leg.textContent); if (isReadable(t)) return t; }
-                                        }
-
-                                        // label[for=id] at any ancestor level (Workable uses this pattern)
-                                        if (el.id) {
-                                            const lbl = document.querySelector(`label[for="${el.id}"]`);
-                                            if (lbl) { const t = cleanText(lbl.textContent); if (isReadable(t)) return t; }
-                                        }
-
-                                        // Any label/p/div/span that looks like a question heading
-                                        // and comes BEFORE this element in the container
-                                        const candidates = Array.from(node.querySelectorAll(
-                                            'label, legend, p[class*="label"], p[class*="question"], ' +
-                                            'div[class*="label"], div[class*="question"], ' +
-                                            'span[class*="label"], span[class*="question"], ' +
-                                            'div[class*="title"], span[class*="title"], ' +
-                                            'li[class*="label"], li[class*="question"]'
-                                        ));
-                                        for (const c of candidates) {
-                                            if (!c.contains(el)) {
-                                                const t = cleanText(c.textContent);
-                                                if (isReadable(t)) return t;
-                                            }
-                                        }
-
-                                        // data-testid attributes Workable adds to question containers
-                                        const tid = node.getAttribute('data-testid') || '';
-                                        if (tid.startsWith('field-')) {
-                                            // Try aria-label on the container
-                                            const al = node.getAttribute('aria-label');
-                                            if (al && isReadable(al)) return cleanText(al);
-                                        }
-
-                                        node = node.parentElement;
-                                    }
-                                    return null;
-                                }
-                            ''')
-                            if rescued and rescued.strip():
-                                rescued_clean = rescued.strip().replace('*', '').strip()
-                                logger.debug(
-                                    f"🔧 ATS-ID rescue: label '{label_text}' → '{rescued_clean[:60]}'"
-                                )
-                                label_text = rescued_clean
-                        except Exception:
-                            pass
+            snapshot = await self._snapshot_form_fields(extract_options) if use_snapshot else None
+
+            if snapshot is not None:
+                # Fast path: everything was collected in one page.evaluate.  Only the
+                # records the script could not resolve on its own (shadow DOM, no
+                # label found) are re-probed element by element.
+                self.last_scan_stats['mode'] = 'snapshot'
+                for record in snapshot:
+                    element = self.page.locator(f'[{_SNAPSHOT_FIELD_ATTR}="{record["fid"]}"]')
+                    try:
+                        if record.get('ambiguous'):
+                            self.last_scan_stats['fallback_probes'] += 1
+                            raw = await self._probe_field_element(element, extract_options)
+                        else:
+                            raw = record
+                        if raw:
+                            self._append_field(fields, element, raw, ashby_schema)
+                    except Exception as e:
+                        logger.debug(f"Error extracting field data: {e}")
+                        continue
+            else:
+                # Detect all standard form input types
+                input_selector = 'input:not([type="hidden"]):not([type="submit"]):not([type="button"]):visible, select:visible, textarea:visible'
+                elements = await self.page.locator(input_selector).all()
 
-                    # Extract options for dropdowns if requested
-                    available_options = []
-                    if extract_options and category == 'dropdown':
-                        try:
-                            option_elements = await element.locator('option').all()
-                            for opt in option_elements:
-                                opt_text = await opt.inner_text()
-                                opt_value = await opt.get_attribute('value') or ''
-                                if opt_text.strip():
-                                    available_options.append({
-                                        'text': opt_text.strip(),
-                                        'value': opt_value
-                                    })
-                        except:
-                            pass
-                    # Note: greenhouse_dropdown options are extracted dynamically when filling
-                    # because they're rendered in portals only after opening the dropdown
-                    
-                    # Build a stable_id that SURVIVES DOM re-renders.
-                    #
-                    # Priority (most → least stable):
-                    #   name        - set by form author, never changes
-                    #   aria_label  - semantic text attribute, never changes
-                    #   placeholder - visible hint text, never changes
-                    #   label hash  - derived from visible label, never changes
-                    #   id_attr     - LAST: React/Workday regenerate ids on every render
-                    #
-                    # Each variant uses an explicit prefix so _get_fresh_element can
-                    # reconstruct the right CSS selector without guessing.
-                    # IMPORTANT: We must ensure stable_id is UNIQUE per field so that
-                    # catalog/mapping never overwrites one field with another (which
-                    # caused wrong values in wrong fields, e.g. city in LinkedIn).
-                    if name:
-                        base_id = f"name:{name}"
-                    elif aria_label:
-                        base_id = f"aria_label:{aria_label}"
-                    elif placeholder:
-                        base_id = f"placeholder:{placeholder}"
-                    elif label_text:
-                        label_hash = hashlib.md5(label_text.encode()).hexdigest()[:8]
-                        base_id = f"label_hash:{label_hash}"
-                    elif id_attr:
-                        base_id = f"id:{id_attr}"
-                    else:
-                        base_id = f"pos:{len(fields)}"
-                    # Uniquify: if this base_id was already used, append _0, _1, ...
-                    existing_stable_ids = {f.get('stable_id') for f in fields}
-                    stable_id = base_id
-                    if stable_id in existing_stable_ids:
-                        suffix = 0
-                        while stable_id in existing_stable_ids:
-                            stable_id = f"{base_id}_{suffix}"
-                            suffix += 1
-                    # Ashby enrichment: if the field's `name` matches a path from
-                    # window.__appData, override the label (and options) with the
-                    # authoritative values from the schema - prevents any mislabeling
-                    # that can arise from DOM label-scraping on React SPAs.
-                    ashby_info = ashby_schema.get(name) or ashby_schema.get(id_attr) or {}
-                    if ashby_info:
-                        ashby_title = ashby_info.get('title', '').strip()
-                        if ashby_title:
-                            label_text = ashby_title
-                            logger.debug(f"🎯 Ashby schema override: '{name}' → '{ashby_title}'")
-                        # Carry Ashby options for ValueSelect fields (dropdown/radio)
-                        if ashby_info.get('options') and not available_options:
-                            available_options = ashby_info['options']
-                        # Map Ashby types to field categories
-                        ashby_type = ashby_info.get('type', '')
-                        if ashby_type == 'Boolean' and category not in ('radio', 'checkbox'):
-                            category = 'ashby_button_group'
-                        elif ashby_type == 'ValueSelect' and category == 'text_input':
-                            category = 'ashby_button_group'
-                        elif ashby_type == 'LongText' and category == 'text_input':
-                            category = 'textarea'
-
-                    field_data = {
-                        'element': element,
-                        'field_category': category,
-                        'input_type': input_type,
-                        'label': label_text.strip() if label_text else f"Field {len(fields) + 1}",
-                        'name': name,
-                        'id': id_attr,
-                        'placeholder': placeholder,
-                        'aria_label': aria_label,
-                        'stable_id': stable_id,
-                        'available_options': available_options,
-                        'tag_name': tag_name,
-                        # Scan-order index - used as last-resort position-based locator
-                        # when all attribute-based lookups fail after a DOM re-render.
-                        'position_index': len(fields),
-                    }
-                    
-                    fields.append(field_data)
-                    
-                except Exception as e:
-                    logger.debug(f"Error extracting field data: {e}")
-                    continue
+                for element in elements:
+                    try:
+                        raw = await self._probe_field_element(element, extract_options)
+                        if raw:
+                            self._append_field(fields, element, raw, ashby_schema)
+                    except Exception as e:
+                        logger.debug(f"Error extracting field data: {e}")
+                        continue
             
             # ── Ashby Yes/No button groups ────────────────────────────────────
             # These fields use a hidden <input type="checkbox" tabindex="-1"> paired
@@ -2456,13 +2308,453 @@ class FieldInteractorV2:
             except Exception as e:
                 logger.debug(f"  Ashby Yes/No scan error: {e}")
 
-            logger.debug(f"Detected {len(fields)} form fields")
+            self.last_scan_stats['fields'] = len(fields)
+            self.last_scan_stats['elapsed_ms'] = round((time.perf_counter() - scan_started) * 1000, 1)
+            logger.debug(
+                f"Detected {len(fields)} form fields "
+                f"({self.last_scan_stats['mode']} scan, "
+                f"{self.last_scan_stats['fallback_probes']} fallback probes, "
+                f"{self.last_scan_stats['elapsed_ms']}ms)"
+            )
             return fields
             
         except Exception as e:
             logger.error(f"Error detecting form fields: {e}")
             return []
 
+    async def _snapshot_form_fields(self, extract_options: bool) -> Optional[List[Dict[str, Any]]]:
+        """
+        Collect attributes, resolved label, category, options and a stable locator
+        handle for every visible form field in ONE page.evaluate round trip.
+
+        Each element is tagged with a data attribute so the caller can build a
+        Locator for it without another CDP call.  Returns None if the script
+        fails so the caller can fall back to per-element probing.
+        """
+        try:
+            records = await self.page.evaluate(
+                _FIELD_SNAPSHOT_JS,
+                {'attr': _SNAPSHOT_FIELD_ATTR, 'extractOptions': extract_options},
+            )
+        except Exception as e:
+            logger.debug(f"DOM snapshot scan failed, using per-element probing: {e}")
+            return None
+        if not isinstance(records, list):
+            return None
+        return records
+
+    async def _probe_field_element(self, element: Locator, extract_options: bool) -> Optional[Dict[str, Any]]:
+        """
+        Per-element field probe (one awaited Playwright call per attribute/lookup).
+
+        Used for the legacy scan and for snapshot records flagged as ambiguous.
+        Returns None for elements that are not real form fields.
+        """
+        input_type = await element.get_attribute('type') or 'text'
+        name = await element.get_attribute('name') or ''
+        id_attr = await element.get_attribute('id') or ''
+        placeholder = await element.get_attribute('placeholder') or ''
+        aria_label = await element.get_attribute('aria-label') or ''
+        tag_name = await element.evaluate('el => el.tagName.toLowerCase()')
+        role = await element.get_attribute('role') or ''
+        aria_haspopup = await element.get_attribute('aria-haspopup') or ''
+        aria_autocomplete = await element.get_attribute('aria-autocomplete') or ''
+
+        # Determine field category
+        if tag_name == 'select':
+            category = 'dropdown'
+        # Workday multiselect: search input inside a multiselect container
+        # Identified by data-uxi-widget-type="selectinput" + data-uxi-multiselect-id
+        elif (await element.get_attribute('data-uxi-widget-type') == 'selectinput'
+              and await element.get_attribute('data-uxi-multiselect-id')):
+            category = 'workday_multiselect'
+        # Greenhouse/React Select: input with role="combobox" and aria-haspopup="true"
+        elif role == 'combobox' and (aria_haspopup == 'true' or aria_autocomplete == 'list'):
+            # Check if this is a multi-select by looking at parent container classes
+            try:
+                parent_classes = await element.evaluate(
+                    'el => el.closest(".select__value-container")?.className || ""'
+                )
+                if 'is-multi' in parent_classes or '--is-multi' in parent_classes:
+                    category = 'greenhouse_dropdown_multi'
+                else:
+                    category = 'greenhouse_dropdown'
+            except:
+                category = 'greenhouse_dropdown'
+        elif input_type == 'checkbox':
+            category = 'checkbox'
+        elif input_type == 'radio':
+            category = 'radio'
+        elif input_type == 'file':
+            category = 'file_upload'
+        elif tag_name == 'textarea':
+            category = 'textarea'
+        else:
+            category = 'text_input'
+
+        # --- SKIP React Select inner search inputs ---
+        # React Select renders an <input type="text"> INSIDE the dropdown
+        # value container (.select__value-container) for type-ahead searching.
+        # This internal input is NOT a real form field — it's already managed
+        # by the greenhouse_dropdown handler.  Detecting it creates ghost fields
+        # (e.g. a second "Country" text_input next to the Country dropdown) that
+        # then get filled with the wrong value and corrupt the phone widget.
+        # Detect by: element sits inside '.select__value-container' or
+        # '.select__input-container' (React Select DOM class names).
+        if category == 'text_input':
+            try:
+                is_react_select_inner = await element.evaluate('''
+                    el => !!(
+                        el.closest('.select__value-container') ||
+                        el.closest('.select__input-container') ||
+                        el.closest('[class*="select__input"]')
+                    )
+                ''')
+                if is_react_select_inner:
+                    logger.debug(
+                        f"  [field_scan] Skipping React Select inner input "
+                        f"(name={name!r}, aria-label={aria_label!r})"
+                    )
+                    return None
+            except Exception:
+                pass
+
+        # Try to find label (enhanced for Greenhouse/React Select)
+        label_text = ''
+
+        # Method 1: Check for label[for="id"]
+        # NOTE: page.locator() is SYNCHRONOUS in Playwright - do NOT await it.
+        # Awaiting a Locator object raises TypeError (silently caught), breaking
+        # label detection for all fields that rely on this path (e.g. radio buttons).
+        # For file inputs, <label for=id> is often the button text ("Attach",
+        # "Upload") rather than the semantic field name ("Cover Letter") — we
+        # discard those so the ancestor-walk can find the real label.
+        _FILE_UI_WORDS = {'attach', 'upload', 'browse', 'choose file', 'select file',
+                          'add file', 'pick file', 'open file'}
+        if id_attr:
+            try:
+                label_element = self.page.locator(f'label[for="{id_attr}"]').first
+                if await label_element.count() > 0:
+                    label_text = await label_element.inner_text()
+                    label_text = label_text.strip().replace('*', '').strip()
+                    # Discard generic UI words for file inputs — use ancestor walk instead
+                    if input_type == 'file' and label_text.lower() in _FILE_UI_WORDS:
+                        label_text = ''
+            except:
+                pass
+
+        # Method 2: Check aria-labelledby (common in Greenhouse)
+        if not label_text:
+            try:
+                labelledby = await element.get_attribute('aria-labelledby')
+                if labelledby:
+                    # Handle multiple IDs (space-separated) - take the first one
+                    label_id = labelledby.split()[0] if labelledby else None
+                    if label_id:
+                        label_element = self.page.locator(f'#{label_id}').first
+                        if await label_element.count() > 0:
+                            label_text = await label_element.inner_text()
+                            label_text = label_text.strip().replace('*', '').strip()  # Remove asterisks
+            except:
+                pass
+
+        # Method 2.5: For Greenhouse multi-selects, check parent label
+        if not label_text and category in ['greenhouse_dropdown', 'greenhouse_dropdown_multi']:
+            try:
+                # Look for label in parent container
+                parent_label = await element.evaluate('''
+                    el => {
+                        const container = el.closest('.select__container') || el.closest('.select');
+                        return container?.querySelector('label.label')?.textContent || '';
+                    }
+                ''')
+                if parent_label:
+                    label_text = parent_label.strip().replace('*', '').strip()
+            except:
+                pass
+
+        # Method 3: Try aria-label, placeholder, or name
+        if not label_text:
+            try:
+                label_text = aria_label or placeholder or name
+                # For file inputs, discard generic UI action words from
+                # aria-label too (Greenhouse sets aria-label="Attach" on the
+                # file input button, hiding the semantic label "Cover Letter").
+                if (input_type == 'file'
+                        and label_text
+                        and label_text.strip().lower() in _FILE_UI_WORDS):
+                    label_text = ''
+            except:
+                pass
+
+        # Method 3.5: Ancestor-walk — find a label in the closest form-field
+        # container. Handles Greenhouse file-upload fields ("Cover Letter") and
+        # conditional fields whose <label> is not linked via `for=id`.
+        if not label_text:
+            try:
+                ancestor_label = await element.evaluate(r'''
+                    el => {
+                        // Walk up the DOM, look for a <label> sibling or container label
+                        let node = el.parentElement;
+                        for (let depth = 0; depth < 7; depth++) {
+                            if (!node || node === document.body) break;
+
+                            // Prefer a <label> that is a direct child of this container
+                            // and does NOT wrap the input itself
+                            const directLabels = Array.from(
+                                node.querySelectorAll(':scope > label, :scope > div > label')
+                            );
+                            for (const lbl of directLabels) {
+                                const t = lbl.textContent.replace(/\*/g, '').trim();
+                                if (t && t.length >= 2 && t.length <= 200) return t;
+                            }
+
+                            // Any <label> inside the container that doesn't wrap the input
+                            const allLabels = Array.from(node.querySelectorAll('label'));
+                            for (const lbl of allLabels) {
+                                if (!lbl.contains(el)) {
+                                    const t = lbl.textContent.replace(/\*/g, '').trim();
+                                    if (t && t.length >= 2 && t.length <= 200) return t;
+                                }
+                            }
+
+                            // Preceding sibling that looks like a label/heading
+                            const prev = node.previousElementSibling;
+                            if (prev) {
+                                const tag = prev.tagName.toLowerCase();
+                                if (['label', 'legend', 'h1', 'h2', 'h3', 'h4', 'p', 'span'].includes(tag)) {
+                                    const t = prev.textContent.replace(/\*/g, '').trim();
+                                    if (t && t.length >= 2 && t.length <= 200) return t;
+                                }
+                            }
+
+                            node = node.parentElement;
+                        }
+                        return '';
+                    }
+                ''')
+                if ancestor_label:
+                    label_text = ancestor_label.strip().replace('*', '').strip()
+            except Exception:
+                pass
+
+        # Method 4: Workday multiselect - label lives on the container div
+        # The input carries data-uxi-multiselect-id pointing to the container,
+        # and the container has aria-labelledby pointing to the visible label.
+        if not label_text and category == 'workday_multiselect':
+            try:
+                multiselect_id = await element.get_attribute('data-uxi-multiselect-id')
+                if multiselect_id:
+                    container = self.page.locator(f'[id="{multiselect_id}"]').first
+                    if await container.count() > 0:
+                        labelledby = await container.get_attribute('aria-labelledby')
+                        if labelledby:
+                            for lbl_id in labelledby.split():
+                                lbl_el = self.page.locator(f'#{lbl_id}').first
+                                if await lbl_el.count() > 0:
+                                    candidate = (await lbl_el.inner_text()).strip().replace('*', '').strip()
+                                    if candidate:
+                                        label_text = candidate
+                                        break
+            except:
+                pass
+
+        # Method 5: ATS internal-ID rescue
+        # If the label still looks like an opaque ATS field ID (e.g. Workable's
+        # "QA_11314685" or "CA_29438"), the normal label extraction missed the
+        # visible question text.  Do a wider DOM search specifically for these.
+        _ATS_ID_PATTERN = re.compile(r'^([A-Z]{1,3}_\d{4,}|CA_\d+)$')
+        if not label_text or _ATS_ID_PATTERN.match((label_text or '').strip()):
+            try:
+                rescued = await element.evaluate(r'''
+                    (el) => {
+                        // Walk outward up to 10 levels looking for a label or
+                        // heading element that contains readable question text.
+                        function cleanText(t) {
+                            return (t || '').replace(/\*/g, '').replace(/\s+/g, ' ').trim();
+                        }
+                        function isReadable(t) {
+                            return t && t.length >= 4 && t.length <= 300
+                                && !/^[A-Z]{1,3}_\d+$/.test(t);
+                        }
+
+                        // Check fieldset legend first (most semantic)
+                        let node = el.parentElement;
+                        for (let d = 0; d < 10; d++) {
+                            if (!node || node === document.body) break;
+
+                            // Legend inside fieldset
+                            if (node.tagName === 'FIELDSET') {
+                                const leg = node.querySelector('legend');
+                                if (leg) { const t = cleanText(leg.textContent); if (isReadable(t)) return t; }
+                            }
+
+                            // label[for=id] at any ancestor level (Workable uses this pattern)
+                            if (el.id) {
+                                const lbl = document.querySelector(`label[for="${el.id}"]`);
+                                if (lbl) { const t = cleanText(lbl.textContent); if (isReadable(t)) return t; }
+                            }
+
+                            // Any label/p/div/span that looks like a question heading
+                            // and comes BEFORE this element in the container
+                            const candidates = Array.from(node.querySelectorAll(
+                                'label, legend, p[class*="label"], p[class*="question"], ' +
+                                'div[class*="label"], div[class*="question"], ' +
+                                'span[class*="label"], span[class*="question"], ' +
+                                'div[class*="title"], span[class*="title"], ' +
+                                'li[class*="label"], li[class*="question"]'
+                            ));
+                            for (const c of candidates) {
+                                if (!c.contains(el)) {
+                                    const t = cleanText(c.textContent);
+                                    if (isReadable(t)) return t;
+                                }
+                            }
+
+                            // data-testid attributes Workable adds to question containers
+                            const tid = node.getAttribute('data-testid') || '';
+                            if (tid.startsWith('field-')) {
+                                // Try aria-label on the container
+                                const al = node.getAttribute('aria-label');
+                                if (al && isReadable(al)) return cleanText(al);
+                            }
+
+                            node = node.parentElement;
+                        }
+                        return null;
+                    }
+                ''')
+                if rescued and rescued.strip():
+                    rescued_clean = rescued.strip().replace('*', '').strip()
+                    logger.debug(
+                        f"🔧 ATS-ID rescue: label '{label_text}' → '{rescued_clean[:60]}'"
+                    )
+                    label_text = rescued_clean
+            except Exception:
+                pass
+
+        # Extract options for dropdowns if requested
+        available_options = []
+        if extract_options and category == 'dropdown':
+            try:
+                option_elements = await element.locator('option').all()
+                for opt in option_elements:
+                    opt_text = await opt.inner_text()
+                    opt_value = await opt.get_attribute('value') or ''
+                    if opt_text.strip():
+                        available_options.append({
+                            'text': opt_text.strip(),
+                            'value': opt_value
+                        })
+            except:
+                pass
+
+        return {
+            'input_type': input_type,
+            'name': name,
+            'id': id_attr,
+            'placeholder': placeholder,
+            'aria_label': aria_label,
+            'tag_name': tag_name,
+            'category': category,
+            'label': label_text,
+            'options': available_options,
+        }
+
+    def _append_field(
+        self,
+        fields: List[Dict[str, Any]],
+        element: Locator,
+        raw: Dict[str, Any],
+        ashby_schema: Dict[str, Dict[str, Any]],
+    ) -> None:
+        """Build the field dict (stable_id, Ashby enrichment) and append it to `fields`."""
+        input_type = raw.get('input_type') or 'text'
+        name = raw.get('name') or ''
+        id_attr = raw.get('id') or ''
+        placeholder = raw.get('placeholder') or ''
+        aria_label = raw.get('aria_label') or ''
+        tag_name = raw.get('tag_name') or ''
+        category = raw.get('category') or 'text_input'
+        label_text = raw.get('label') or ''
+        available_options = list(raw.get('options') or [])
+
+        # Build a stable_id that SURVIVES DOM re-renders.
+        #
+        # Priority (most → least stable):
+        #   name        - set by form author, never changes
+        #   aria_label  - semantic text attribute, never changes
+        #   placeholder - visible hint text, never changes
+        #   label hash  - derived from visible label, never changes
+        #   id_attr     - LAST: React/Workday regenerate ids on every render
+        #
+        # Each variant uses an explicit prefix so _get_fresh_element can
+        # reconstruct the right CSS selector without guessing.
+        # IMPORTANT: We must ensure stable_id is UNIQUE per field so that
+        # catalog/mapping never overwrites one field with another (which
+        # caused wrong values in wrong fields, e.g. city in LinkedIn).
+        if name:
+            base_id = f"name:{name}"
+        elif aria_label:
+            base_id = f"aria_label:{aria_label}"
+        elif placeholder:
+            base_id = f"placeholder:{placeholder}"
+        elif label_text:
+            label_hash = hashlib.md5(label_text.encode()).hexdigest()[:8]
+            base_id = f"label_hash:{label_hash}"
+        elif id_attr:
+            base_id = f"id:{id_attr}"
+        else:
+            base_id = f"pos:{len(fields)}"
+        # Uniquify: if this base_id was already used, append _0, _1, ...
+        existing_stable_ids = {f.get('stable_id') for f in fields}
+        stable_id = base_id
+        if stable_id in existing_stable_ids:
+            suffix = 0
+            while stable_id in existing_stable_ids:
+                stable_id = f"{base_id}_{suffix}"
+                suffix += 1
+        # Ashby enrichment: if the field's `name` matches a path from
+        # window.__appData, override the label (and options) with the
+        # authoritative values from the schema - prevents any mislabeling
+        # that can arise from DOM label-scraping on React SPAs.
+        ashby_info = ashby_schema.get(name) or ashby_schema.get(id_attr) or {}
+        if ashby_info:
+            ashby_title = ashby_info.get('title', '').strip()
+            if ashby_title:
+                label_text = ashby_title
+                logger.debug(f"🎯 Ashby schema override: '{name}' → '{ashby_title}'")
+            # Carry Ashby options for ValueSelect fields (dropdown/radio)
+            if ashby_info.get('options') and not available_options:
+                available_options = ashby_info['options']
+            # Map Ashby types to field categories
+            ashby_type = ashby_info.get('type', '')
+            if ashby_type == 'Boolean' and category not in ('radio', 'checkbox'):
+                category = 'ashby_button_group'
+            elif ashby_type == 'ValueSelect' and category == 'text_input':
+                category = 'ashby_button_group'
+            elif ashby_type == 'LongText' and category == 'text_input':
+                category = 'textarea'
+
+        field_data = {
+            'element': element,
+            'field_category': category,
+            'input_type': input_type,
+            'label': label_text.strip() if label_text else f"Field {len(fields) + 1}",
+            'name': name,
+            'id': id_attr,
+            'placeholder': placeholder,
+            'aria_label': aria_label,
+            'stable_id': stable_id,
+            'available_options': available_options,
+            'tag_name': tag_name,
+            # Scan-order index - used as last-resort position-based locator
+            # when all attribute-based lookups fail after a DOM re-render.
+            'position_index': len(fields),
+        }
+
+        fields.append(field_data)
+
     async def upload_resume_if_present(self, resume_path: str) -> bool:
         """
         If a resume upload control is present, upload the resume and return True; else False.
@@ -16,13 +16,14 @@ from loguru import logger
 from components.executors.field_interactor_v2 import FieldInteractorV2
 from components.executors.deterministic_field_mapper import DeterministicFieldMapper
 from components.executors.learned_patterns_mapper import LearnedPatternsMapper
-from components.executors.semantic_field_mapper import SemanticFieldMapper
+from components.executors.semantic_field_mapper import SemanticFieldMapper, SemanticMatch
 from components.brains.gemini_field_mapper import GeminiFieldMapper
 from components.exceptions.field_exceptions import RequiresHumanInputError
 from components.state.field_completion_tracker import FieldCompletionTracker
 from components.validators.field_value_validator import FieldValueValidator
 from components.pattern_recorder import PatternRecorder
 from components.user_pattern_recorder import UserPatternRecorder
+from components.page_settle import wait_for_settle
 
 
 class FieldAttemptTracker:
@@ -83,7 +84,8 @@ class GenericFormFillerV2Enhanced:
     """
 
     MAX_ITERATIONS = 5
-    DYNAMIC_CONTENT_WAIT_MS = 1000
+    DYNAMIC_CONTENT_WAIT_MS = 1000  # fixed pause the settle wait replaced (stats only)
+    DYNAMIC_CONTENT_SETTLE_TIMEOUT_MS = 4000
     _CACHED_OVERRIDE_ALLOWED_CATEGORIES = {
         "text_input",
         "textarea",
@@ -213,20 +215,10 @@ class GenericFormFillerV2Enhanced:
         if not SemanticFieldMapper.is_available():
             return
         try:
-            from sqlalchemy import create_engine, text as sa_text
-            from urllib.parse import quote_plus
-            import os
-
-            DB_HOST     = os.getenv('DB_HOST', 'localhost')
-            DB_PORT     = os.getenv('DB_PORT', '5432')
-            DB_NAME     = os.getenv('DB_NAME', 'job_agent_db')
-            DB_USER     = os.getenv('DB_USER', 'postgres')
-            DB_PASSWORD = os.getenv('DB_PASSWORD', '')
-            encoded_pw  = quote_plus(DB_PASSWORD)
-            url = f"postgresql://{DB_USER}:{encoded_pw}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+            from sqlalchemy import text as sa_text
+            from components.db_engine_registry import get_engine
 
-            engine = create_engine(url, pool_pre_ping=True)
-            with engine.connect() as conn:
+            with get_engine().connect() as conn:
                 rows = conn.execute(sa_text("""
                     SELECT profile_field, field_label_raw
                     FROM field_label_patterns
@@ -273,19 +265,10 @@ class GenericFormFillerV2Enhanced:
             return {}
 
         try:
-            from sqlalchemy import create_engine, text as sa_text
-            from urllib.parse import quote_plus
-
-            DB_HOST     = os.getenv('DB_HOST', 'localhost')
-            DB_PORT     = os.getenv('DB_PORT', '5432')
-            DB_NAME     = os.getenv('DB_NAME', 'job_agent_db')
-            DB_USER     = os.getenv('DB_USER', 'postgres')
-            DB_PASSWORD = os.getenv('DB_PASSWORD', '')
-            encoded_pw  = quote_plus(DB_PASSWORD)
-            url = f"postgresql://{DB_USER}:{encoded_pw}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-
-            engine = create_engine(url, pool_pre_ping=True)
-            with engine.connect() as conn:
+            from sqlalchemy import text as sa_text
+            from components.db_engine_registry import get_engine
+
+            with get_engine().connect() as conn:
                 rows = conn.execute(sa_text("""
                     SELECT field_label_raw, field_value_cached, profile_field
                     FROM user_field_overrides
@@ -503,6 +486,13 @@ class GenericFormFillerV2Enhanced:
         current_url = self.page.url
         self.completion_tracker.set_current_page(current_url)
 
+        # Load this user's overrides and the global patterns in one query so
+        # Phase 1.5 lookups are in-memory (off the loop: it is a DB round trip)
+        await asyncio.to_thread(
+            self.learned_mapper.prefetch,
+            LearnedPatternsMapper.site_domain_from_url(current_url),
+        )
+
         result = {
             "success": False,
             "total_fields_filled": 0,
@@ -585,8 +575,13 @@ class GenericFormFillerV2Enhanced:
                 logger.warning("⚠️ No progress made in this iteration")
                 break
 
-            # Step 5: Wait for dynamic content
-            await self.page.wait_for_timeout(self.DYNAMIC_CONTENT_WAIT_MS)
+            # Step 5: Wait for dynamic content (conditional fields, validation)
+            await wait_for_settle(
+                self.page,
+                timeout_ms=self.DYNAMIC_CONTENT_SETTLE_TIMEOUT_MS,
+                replaces_ms=self.DYNAMIC_CONTENT_WAIT_MS,
+                reason="dynamic_content",
+            )
 
         # Step 6: Lightweight heuristic cross-check (no Gemini call)
         # The Gemini review + correction cycle was replaced by a capture-filter
@@ -1095,7 +1090,7 @@ class GenericFormFillerV2Enhanced:
             elif next_method == 'learned_pattern':
                 fields_needing_learned.append(field)
 
-        # PHASE 1.5: Per-user override lookup (fast single-row DB query per field)
+        # PHASE 1.5: Per-user override + global pattern lookup (prefetched index, in-memory)
         # These are human-filled / human-corrected values — trusted immediately.
         fields_needing_semantic = []
         if fields_needing_learned:
@@ -1112,7 +1107,7 @@ class GenericFormFillerV2Enhanced:
                 else:
                     fields_needing_semantic.append(field)
         
-        # PHASE 1.75: Semantic mapping (local model, ~5 ms/field, no API cost)
+        # PHASE 1.75: Semantic mapping (local model, one batched encode, no API cost)
         # Handles paraphrases the DB has never seen before.
         # Successful matches are written back to the DB as exact patterns.
         fields_needing_ai = []
@@ -1121,8 +1116,11 @@ class GenericFormFillerV2Enhanced:
                 f"🔍 Phase 1.75: Semantic mapping for "
                 f"{len(fields_needing_semantic)} fields..."
             )
-            for field in fields_needing_semantic:
-                success = await self._try_semantic(field, profile, result)
+            matches = self.semantic_mapper.map_fields(
+                [field.get('label', 'Unknown') for field in fields_needing_semantic]
+            )
+            for field, match in zip(fields_needing_semantic, matches):
+                success = match is not None and await self._try_semantic(field, profile, result, match)
                 if success:
                     filled_count += 1
                 else:
@@ -1452,11 +1450,14 @@ class GenericFormFillerV2Enhanced:
         field: Dict[str, Any],
         profile: Dict[str, Any],
         result: Dict[str, Any],
+        match: Optional[SemanticMatch] = None,
     ) -> bool:
         """
         Try to fill field using local sentence-embedding similarity.
 
         Runs entirely on-device (~5 ms per field after model load).
+        `match` is the field's result from a page-wide map_fields() batch;
+        without it the label is mapped on its own.
         If a confident match is found, the mapping is recorded to the global
         DB so it becomes an exact match next time — no model call needed.
         """
@@ -1464,7 +1465,8 @@ class GenericFormFillerV2Enhanced:
         field_category = field.get('field_category', 'text_input')
 
         try:
-            match = self.semantic_mapper.map_field(field_label)
+            if match is None:
+                match = self.semantic_mapper.map_field(field_label)
             if not match:
                 return False
 
@@ -1866,7 +1868,9 @@ class GenericFormFillerV2Enhanced:
         Returns True if field contains expected value, False if empty.
         """
         try:
-            await asyncio.sleep(0.3)  # Wait for value to settle
+            # Wait for value to settle
+            await wait_for_settle(self.page, quiet_ms=100, timeout_ms=1000, network_idle=False,
+                                  replaces_ms=300, reason="validate_field")
 
             if 'dropdown' in field_category:
                 # For dropdowns, check selected value or input value
@@ -2509,7 +2513,7 @@ If everything looks correct, set approved=true with empty issues list.
                         logger.info(f"🎯 Clicked Next/Continue button successfully")
 
                         # Wait for page to load
-                        await self.page.wait_for_timeout(2000)
+                        await wait_for_settle(self.page, timeout_ms=10000, replaces_ms=2000, reason="next_page")
 
                         return True
 
@@ -2728,7 +2732,8 @@ If GREEN SIGNAL (nothing can be done), set:
                         continue
 
                     await button.click()
-                    await self.page.wait_for_timeout(300)
+                    await wait_for_settle(self.page, quiet_ms=100, timeout_ms=1000, network_idle=False,
+                                          replaces_ms=300, reason="legal_accept")
 
                     # Verify the click registered
                     updated_class = await button.get_attribute('class') or ''
@@ -2768,7 +2773,8 @@ If GREEN SIGNAL (nothing can be done), set:
 
                     if any(kw in label_text for kw in LEGAL_KEYWORDS):
                         await cb.check()
-                        await self.page.wait_for_timeout(300)
+                        await wait_for_settle(self.page, quiet_ms=100, timeout_ms=1000, network_idle=False,
+                                              replaces_ms=300, reason="legal_accept")
                         logger.info(
                             f'✅ Checked legal agreement checkbox (generic pattern): '
                             f'"{label_text[:80]}"'
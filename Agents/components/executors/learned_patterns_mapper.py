@@ -9,18 +9,30 @@ Lookup priority (highest → lowest):
   2. field_label_patterns  — global AI-learned patterns (confidence ≥ 0.70, occurrences ≥ 2)
   3. Gemini AI             — fallback when no pattern exists
 
+At form start, prefetch() loads every user override and global pattern that
+can match (for the current user and site) in one query into a
+LearnedPatternIndex, so per-field lookups are dictionary hits plus a local
+trigram match instead of up to three SQL round trips.  Pattern writes call
+invalidate_learned_patterns(), which sends the written labels back to SQL
+until the next prefetch.  An expired index keeps answering while a background
+thread rebuilds it; if the global part hit PREFETCH_GLOBAL_LIMIT, labels the
+index misses are still looked up in SQL.
+
 Privacy: Only uses labels and mappings, never stores actual field values.
 """
+import math
 import re
-from typing import Dict, Optional, Any
+import threading
+import time
+import weakref
+from collections import Counter
+from typing import Dict, FrozenSet, Iterable, List, Optional, Any, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from loguru import logger
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
-import os
+from sqlalchemy import text
+from components.db_engine_registry import get_engine, get_sessionmaker
 from dotenv import load_dotenv
-from urllib.parse import quote_plus
 
 load_dotenv()
 
@@ -39,6 +51,196 @@ class LearnedPattern:
     source: str = field(default="global")  # "global" | "user_override"
 
 
+def _trigrams(label: str) -> FrozenSet[str]:
+    """pg_trgm-compatible trigram set: each word padded with two leading and one trailing space."""
+    grams = set()
+    for word in re.findall(r'[a-z0-9]+', label.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    """Same result as pg_trgm similarity(a, b)."""
+    ta, tb = _trigrams(a), _trigrams(b)
+    if not ta or not tb:
+        return 0.0
+    shared = len(ta & tb)
+    return shared / (len(ta) + len(tb) - shared)
+
+
+def _days_since(when: Optional[datetime]) -> float:
+    if when is None:
+        return 0.0
+    now = datetime.now(when.tzinfo) if when.tzinfo else datetime.now()
+    return (now - when).total_seconds() / 86400
+
+
+class _PatternTable:
+    """Rows of one source grouped by normalized label, with a trigram inverted index."""
+
+    def __init__(self):
+        self.by_label: Dict[str, List[tuple]] = {}
+        self._grams: Dict[str, FrozenSet[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+
+    def add(self, label: str, row: tuple):
+        rows = self.by_label.get(label)
+        if rows is None:
+            rows = self.by_label[label] = []
+            grams = self._grams[label] = _trigrams(label)
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(label)
+        rows.append(row)
+
+    def similar(self, label: str, threshold: float) -> Dict[str, float]:
+        """{indexed label: similarity} for labels with similarity > threshold."""
+        query = _trigrams(label)
+        if not query:
+            return {}
+        shared = Counter()
+        for gram in query:
+            for candidate in self._postings.get(gram, ()):
+                shared[candidate] += 1
+        result = {}
+        for candidate, n in shared.items():
+            sim = n / (len(query) + len(self._grams[candidate]) - n)
+            if sim > threshold:
+                result[candidate] = sim
+        return result
+
+
+class LearnedPatternIndex:
+    """
+    In-process snapshot of the patterns one mapper can return for a user/site.
+
+    Lookups reproduce the ranking of the SQL queries in LearnedPatternsMapper.
+    Rows are (id, profile_field, field_category, confidence_score,
+    occurrence_count, last_used, field_value_cached, scope_rank).
+    """
+
+    def __init__(
+        self,
+        rows: Iterable[tuple],
+        user_id: Optional[str],
+        site_domain: Optional[str],
+        fuzzy_threshold: float,
+        truncated: bool = False,
+    ):
+        self.user_id = user_id
+        self.site_domain = site_domain
+        self.fuzzy_threshold = fuzzy_threshold
+        self.built_at = time.monotonic()
+        self.stale_labels: Set[str] = set()
+        # Global rows were cut off at the prefetch limit, so a miss is not final
+        self.truncated = truncated
+        self.user = _PatternTable()
+        self.global_ = _PatternTable()
+        for source, label, *row in rows:
+            table = self.user if source == "user_override" else self.global_
+            table.add(label, tuple(row))
+
+    def __len__(self) -> int:
+        return sum(len(r) for t in (self.user, self.global_) for r in t.by_label.values())
+
+    def needs_database(self, normalized_label: str) -> bool:
+        """True when a pattern written since the snapshot could change this lookup."""
+        if not self.stale_labels:
+            return False
+        if normalized_label in self.stale_labels:
+            return True
+        return any(
+            trigram_similarity(normalized_label, stale) > self.fuzzy_threshold
+            for stale in self.stale_labels
+        )
+
+    def lookup_user_override(self, normalized_label: str, field_category: str) -> Optional[LearnedPattern]:
+        rows = self.user.by_label.get(normalized_label)
+        if rows:
+            # scope_rank DESC, confidence_score DESC, occurrence_count DESC
+            best = max(rows, key=lambda r: (r[7], r[3], r[4]))
+            return self._pattern(best, field_category, "user_override")
+
+        best, best_key = None, None
+        for label, sim in self.user.similar(normalized_label, self.fuzzy_threshold).items():
+            for row in self.user.by_label[label]:
+                key = (sim, row[3])  # sim DESC, confidence_score DESC
+                if best_key is None or key > best_key:
+                    best, best_key = row, key
+        if best is None:
+            return None
+        logger.debug(
+            f"LearnedPatternsMapper: Fuzzy user override match "
+            f"(similarity: {best_key[0]:.2f})"
+        )
+        return self._pattern(best, field_category, "user_override")
+
+    def lookup_global(self, normalized_label: str, field_category: str) -> Optional[LearnedPattern]:
+        rows = self.global_.by_label.get(normalized_label)
+        if rows:
+            best = max(rows, key=lambda r: (
+                (10 if r[2] == field_category else 0)
+                + r[3] * 5
+                + math.log(r[4] + 1) * 2
+                - _days_since(r[5]) * 0.1
+            ))
+            return self._pattern(best, field_category, "global")
+
+        best, best_score, best_sim = None, None, 0.0
+        for label, sim in self.global_.similar(normalized_label, self.fuzzy_threshold).items():
+            for row in self.global_.by_label[label]:
+                score = (
+                    sim * 10
+                    + (5 if row[2] == field_category else 0)
+                    + row[3] * 3
+                    + math.log(row[4] + 1)
+                )
+                if best_score is None or score > best_score:
+                    best, best_score, best_sim = row, score, sim
+        if best is None:
+            return None
+        logger.debug(f"LearnedPatternsMapper: Fuzzy match found (similarity: {best_sim:.2f})")
+        return self._pattern(best, field_category, "global")
+
+    @staticmethod
+    def _pattern(row: tuple, field_category: str, source: str) -> LearnedPattern:
+        pattern_id, profile_field, category, confidence, occurrences, last_used, cached_value, _ = row
+        return LearnedPattern(
+            profile_field=(profile_field or "") if source == "user_override" else profile_field,
+            field_category=category or field_category,
+            confidence_score=float(confidence),
+            occurrence_count=occurrences,
+            last_used=last_used,
+            pattern_id=pattern_id,
+            cached_value=cached_value,
+            source=source,
+        )
+
+
+# Every live mapper, so pattern writes anywhere in the process can invalidate them
+_live_mappers: "weakref.WeakSet[LearnedPatternsMapper]" = weakref.WeakSet()
+_live_mappers_lock = threading.Lock()
+
+
+def invalidate_learned_patterns(
+    normalized_labels: Optional[Iterable[str]] = None,
+    user_id: Optional[str] = None,
+) -> None:
+    """
+    Tell prefetched indexes and caches that patterns were written.
+
+    Args:
+        normalized_labels: Labels that were written; None invalidates everything.
+        user_id: Set for user_field_overrides writes, which only affect that
+                 user's mappers. Omit for global field_label_patterns writes.
+    """
+    labels = None if normalized_labels is None else set(normalized_labels)
+    with _live_mappers_lock:
+        mappers = list(_live_mappers)
+    for mapper in mappers:
+        mapper.invalidate(labels, user_id)
+
+
 class LearnedPatternsMapper:
     """
     Maps form fields using learned patterns from the global database.
@@ -61,9 +263,12 @@ class LearnedPatternsMapper:
     # Fuzzy matching similarity threshold (pg_trgm)
     FUZZY_SIMILARITY_THRESHOLD = 0.75
 
-    # Cache TTL (5 minutes)
+    # Cache TTL (5 minutes); also how long a prefetched index stays valid
     CACHE_TTL_SECONDS = 300
 
+    # Upper bound on global patterns pulled into the prefetch index
+    PREFETCH_GLOBAL_LIMIT = 20000
+
     def __init__(self, user_id: Optional[str] = None, site_domain: Optional[str] = None):
         """
         Initialize mapper with database connection and cache.
@@ -76,29 +281,178 @@ class LearnedPatternsMapper:
         self.site_domain = site_domain
         self.pattern_cache = {}  # {cache_key: (pattern, timestamp)}
         self.cache_timestamps = {}
+        self._index: Optional[LearnedPatternIndex] = None
+        self._index_lock = threading.Lock()
+        # Labels written while a prefetch query runs (None: no prefetch running)
+        self._written_during_prefetch: Optional[Set[str]] = None
+        self._refresh_thread: Optional[threading.Thread] = None
         self._init_database()
+        with _live_mappers_lock:
+            _live_mappers.add(self)
 
     def _init_database(self):
         """Initialize database connection."""
         try:
-            DB_HOST = os.getenv('DB_HOST', 'localhost')
-            DB_PORT = os.getenv('DB_PORT', '5432')
-            DB_NAME = os.getenv('DB_NAME', 'job_agent_db')
-            DB_USER = os.getenv('DB_USER', 'postgres')
-            DB_PASSWORD = os.getenv('DB_PASSWORD', '')
-
-            encoded_password = quote_plus(DB_PASSWORD)
-            DATABASE_URL = f"postgresql://{DB_USER}:{encoded_password}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-
-            self.engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-            self.SessionLocal = sessionmaker(bind=self.engine)
-            logger.info("LearnedPatternsMapper: Database connection initialized")
+            self.engine = get_engine()
+            self.SessionLocal = get_sessionmaker()
+            logger.debug("LearnedPatternsMapper: Using shared database engine")
 
         except Exception as e:
             logger.error(f"LearnedPatternsMapper: Failed to initialize database: {e}")
             self.engine = None
             self.SessionLocal = None
 
+    @staticmethod
+    def site_domain_from_url(url: Optional[str]) -> Optional[str]:
+        """Registrable domain as stored in user_field_overrides.site_domain (see HumanFillTracker)."""
+        if not url:
+            return None
+        m = re.search(r'https?://([^/]+)', url)
+        if not m:
+            return None
+        parts = m.group(1).split('.')
+        return ('.'.join(parts[-2:]) if len(parts) >= 2 else m.group(1)).lower()
+
+    def prefetch(self, site_domain: Optional[str] = None) -> bool:
+        """
+        Load all patterns this mapper can return into an in-process index.
+
+        One query covers the user's overrides (global and scoped to
+        site_domain) and every global pattern above the usage thresholds.
+        Until the index expires (CACHE_TTL_SECONDS) map_field() answers from it.
+
+        Returns:
+            True if the index was built
+        """
+        if site_domain is not None:
+            self.site_domain = site_domain
+        if not self.SessionLocal:
+            return False
+
+        params = {
+            'min_confidence':      self.MIN_CONFIDENCE,
+            'min_occurrences':     self.MIN_OCCURRENCES,
+            'global_limit':        self.PREFETCH_GLOBAL_LIMIT,
+        }
+        user_part = ""
+        if self.user_id:
+            user_part = """
+                SELECT
+                    'user_override' AS source,
+                    field_label_normalized,
+                    id, profile_field, field_category, confidence_score,
+                    occurrence_count, last_used, field_value_cached,
+                    CASE WHEN site_domain = :site_domain THEN 1 ELSE 0 END AS scope_rank
+                FROM user_field_overrides
+                WHERE user_id = :user_id
+                  AND confidence_score >= :min_confidence_user
+                  AND (site_domain = :site_domain OR site_domain IS NULL)
+                UNION ALL
+            """
+            params.update({
+                'user_id':             self.user_id,
+                'site_domain':         self.site_domain,
+                'min_confidence_user': self.MIN_CONFIDENCE_USER_OVERRIDE,
+            })
+
+        started = time.perf_counter()
+        with self._index_lock:
+            self._written_during_prefetch = set()
+        try:
+            session = self.SessionLocal()
+            try:
+                rows = session.execute(text(user_part + """
+                    (
+                        SELECT
+                            'global' AS source,
+                            field_label_normalized,
+                            id, profile_field, field_category, confidence_score,
+                            occurrence_count, last_used, NULL AS field_value_cached,
+                            0 AS scope_rank
+                        FROM field_label_patterns
+                        WHERE confidence_score >= :min_confidence
+                          AND occurrence_count >= :min_occurrences
+                        ORDER BY occurrence_count DESC
+                        LIMIT :global_limit
+                    )
+                """), params).fetchall()
+            finally:
+                session.close()
+        except Exception as e:
+            logger.warning(f"LearnedPatternsMapper: Prefetch failed, using per-field queries: {e}")
+            with self._index_lock:
+                self._index = None
+                self._written_during_prefetch = None
+            return False
+
+        global_rows = sum(1 for r in rows if r[0] == "global")
+        index = LearnedPatternIndex(
+            ((r[0], r[1], r[2], r[3], r[4], float(r[5]), r[6] or 0, r[7], r[8], r[9])
+             for r in rows if r[1]),
+            self.user_id,
+            self.site_domain,
+            self.FUZZY_SIMILARITY_THRESHOLD,
+            truncated=global_rows >= self.PREFETCH_GLOBAL_LIMIT,
+        )
+        with self._index_lock:
+            written = self._written_during_prefetch
+            self._written_during_prefetch = None
+            if written is None:
+                # Everything was invalidated while the query ran
+                self._index = None
+                return False
+            index.stale_labels.update(written)
+            self._index = index
+        logger.info(
+            f"LearnedPatternsMapper: Prefetched {len(index)} patterns "
+            f"(site={self.site_domain or 'any'}) in {(time.perf_counter() - started) * 1000:.0f} ms"
+            + (f", global patterns truncated at {self.PREFETCH_GLOBAL_LIMIT}" if index.truncated else "")
+        )
+        return True
+
+    def invalidate(self, normalized_labels: Optional[Set[str]] = None, user_id: Optional[str] = None):
+        """Drop cached answers for written labels (all labels when None)."""
+        if user_id is not None and str(user_id) != str(self.user_id):
+            return  # another user's overrides
+        with self._index_lock:
+            if normalized_labels is None:
+                self._index = None
+                self._written_during_prefetch = None
+                self.clear_cache()
+                return
+            if self._index is not None:
+                self._index.stale_labels.update(normalized_labels)
+            if self._written_during_prefetch is not None:
+                self._written_during_prefetch.update(normalized_labels)
+            for cache_key in list(self.pattern_cache):
+                if cache_key.split(":", 1)[1] in normalized_labels:
+                    self.pattern_cache.pop(cache_key, None)
+                    self.cache_timestamps.pop(cache_key, None)
+
+    def _usable_index(self, user_id: Optional[str], site_domain: Optional[str]) -> Optional[LearnedPatternIndex]:
+        index = self._index
+        if index is None:
+            return None
+        if index.user_id != user_id or index.site_domain != site_domain:
+            return None
+        if time.monotonic() - index.built_at > self.CACHE_TTL_SECONDS:
+            # Keep answering from the expired index while it is rebuilt with the
+            # same scope; map_field runs on the event loop, prefetch is a DB round trip
+            self._refresh_in_background(index.site_domain)
+        return index
+
+    def _refresh_in_background(self, site_domain: Optional[str]):
+        with self._index_lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return
+            self._refresh_thread = threading.Thread(
+                target=self.prefetch,
+                args=(site_domain,),
+                name="learned-patterns-refresh",
+                daemon=True,
+            )
+            self._refresh_thread.start()
+
     def map_field(
         self,
         field_label: str,
@@ -133,6 +487,34 @@ class LearnedPatternsMapper:
         # Normalize label
         normalized_label = self._normalize_label(field_label)
 
+        # Prefetched index: exact + local trigram lookups, no SQL
+        index = self._usable_index(effective_user_id, effective_site_domain)
+        index_missed = False
+        if index is not None and not index.needs_database(normalized_label):
+            pattern = None
+            if effective_user_id:
+                pattern = index.lookup_user_override(normalized_label, field_category)
+                if pattern:
+                    logger.info(
+                        f"LearnedPatternsMapper: [USER OVERRIDE] '{field_label}' → "
+                        f"{pattern.profile_field or '(cached value)'} "
+                        f"(confidence: {pattern.confidence_score:.2f})"
+                    )
+            if pattern is None:
+                pattern = index.lookup_global(normalized_label, field_category)
+                if pattern:
+                    logger.info(
+                        f"LearnedPatternsMapper: Mapped '{field_label}' → {pattern.profile_field} "
+                        f"(confidence: {pattern.confidence_score:.2f}, occurrences: {pattern.occurrence_count})"
+                    )
+            if pattern is not None:
+                return pattern
+            if not index.truncated:
+                logger.debug(f"LearnedPatternsMapper: No pattern found for '{field_label}'")
+                return None
+            # The index holds only the most used global patterns; ask SQL for this label
+            index_missed = True
+
         # Cache key includes user so per-user overrides don't bleed into global cache
         cache_key = f"{effective_user_id or 'global'}:{normalized_label}"
 
@@ -145,7 +527,8 @@ class LearnedPatternsMapper:
         pattern = None
 
         # ── Priority 1: per-user overrides ──────────────────────────────────
-        if effective_user_id:
+        # (skipped after an index miss: the index holds every override)
+        if effective_user_id and not index_missed:
             pattern = self._query_user_override(
                 normalized_label, field_category, effective_user_id, effective_site_domain
             )
@@ -3,6 +3,8 @@ from typing import Dict, List, Optional, Any
 from playwright.async_api import Page, Locator
 from loguru import logger
 
+from components.page_settle import wait_for_settle
+
 
 class SectionFiller:
     """Fills education and work experience sections with profile data."""
@@ -72,7 +74,7 @@ class SectionFiller:
             logger.info("➕ Clicking add education button...")
             add_button = section_info['add_button']['element']
             await add_button.click()
-            await self.page.wait_for_timeout(1000)  # Wait for form to appear
+            await wait_for_settle(self.page, replaces_ms=1000, reason="section_add_entry")  # Wait for form to appear
             
             # Try to fill the new form that appeared
             return await self._fill_new_education_form(education_data[0])  # Fill with first education entry
@@ -111,7 +113,7 @@ class SectionFiller:
             logger.info("➕ Clicking add work experience button...")
             add_button = section_info['add_button']['element']
             await add_button.click()
-            await self.page.wait_for_timeout(1000)  # Wait for form to appear
+            await wait_for_settle(self.page, replaces_ms=1000, reason="section_add_entry")  # Wait for form to appear
             
             # Try to fill the new form that appeared
             return await self._fill_new_work_form(work_data[0])  # Fill with first work entry
@@ -396,7 +398,7 @@ class SectionFiller:
         try:
             # Click to open dropdown
             await element.click()
-            await self.page.wait_for_timeout(1000)
+            await wait_for_settle(self.page, timeout_ms=3000, replaces_ms=1000, reason="section_dropdown_open")
             
             # Look for options
             option_selectors = [
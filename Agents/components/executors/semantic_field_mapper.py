@@ -21,15 +21,29 @@ Model
 -----
 all-MiniLM-L6-v2: 80 MB, 384-dim, ~5 ms per encode on CPU.
 Loaded lazily on first use; model is cached for the process lifetime.
+
+Anchor store
+------------
+Anchor embeddings are persisted next to the model cache, keyed by a hash of
+the anchor text.  Startup memory-maps the stored matrix and only encodes
+anchors it has never seen, so a warm start runs no model forward pass for
+the index.  Label embeddings are kept in an in-process LRU.
 """
 
+import hashlib
+import json
 import re
 import os
+import threading
 import numpy as np
-from typing import Dict, List, Optional, Tuple
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
 from dataclasses import dataclass
 from loguru import logger
 
+MODEL_NAME = "all-MiniLM-L6-v2"
+MODEL_CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "..", ".model_cache")
+
 
 # --------------------------------------------------------------------------- #
 #  Field anchor definitions                                                    #
@@ -233,6 +247,130 @@ class SemanticMatch:
     matched_anchor: str    # which anchor triggered the match (for debugging)
 
 
+# --------------------------------------------------------------------------- #
+#  Anchor embedding store                                                      #
+# --------------------------------------------------------------------------- #
+
+class AnchorEmbeddingStore:
+    """
+    On-disk anchor embeddings keyed by sha1(anchor text).
+
+    Layout (one directory per model):
+        anchors.json          {"model": ..., "file": "anchors-<digest>.npy", "keys": [...]}
+        anchors-<digest>.npy  float32 (len(keys), dim), row i belongs to keys[i]
+
+    The matrix file is named after its content and the manifest is replaced
+    last, so a reader always sees a matching (keys, matrix) pair even when
+    several processes append at once.  Rows are only ever appended.
+    """
+
+    MANIFEST = "anchors.json"
+
+    def __init__(self, directory: str, model_name: str = MODEL_NAME):
+        self.directory = directory
+        self.model_name = model_name
+        self._keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._loaded = False
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        self._load()
+        return len(self._keys)
+
+    def lookup(self, texts: Sequence[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """Return ({position: vector} for stored texts, [positions of missing texts])."""
+        self._load()
+        found: Dict[int, np.ndarray] = {}
+        missing: List[int] = []
+        for i, text in enumerate(texts):
+            row = self._rows.get(self.key(text))
+            if row is None:
+                missing.append(i)
+            else:
+                found[i] = self._matrix[row]
+        return found, missing
+
+    def append(self, texts: Sequence[str], vectors: np.ndarray) -> None:
+        """Add newly encoded anchors and persist (best effort)."""
+        self._load()
+        new_keys, new_rows, seen = [], [], set(self._rows)
+        for text, vec in zip(texts, vectors):
+            k = self.key(text)
+            if k in seen:
+                continue
+            seen.add(k)
+            new_keys.append(k)
+            new_rows.append(vec)
+        if not new_keys:
+            return
+
+        added = np.asarray(new_rows, dtype=np.float32)
+        matrix = added if self._matrix is None else np.vstack([self._matrix, added])
+        keys = self._keys + new_keys
+        self._set(keys, matrix)
+
+        try:
+            self._save(keys, matrix)
+        except OSError as e:
+            logger.debug(f"SemanticFieldMapper: Could not persist anchor store: {e}")
+
+    def _set(self, keys: List[str], matrix: np.ndarray) -> None:
+        self._keys = keys
+        self._rows = {k: i for i, k in enumerate(keys)}
+        self._matrix = matrix
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        manifest_path = os.path.join(self.directory, self.MANIFEST)
+        try:
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("model") != self.model_name:
+                return
+            keys = list(manifest["keys"])
+            matrix = np.load(os.path.join(self.directory, manifest["file"]), mmap_mode="r")
+            if matrix.shape[0] != len(keys):
+                logger.debug("SemanticFieldMapper: Anchor store is inconsistent, ignoring it")
+                return
+            self._set(keys, matrix)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug(f"SemanticFieldMapper: Could not load anchor store: {e}")
+
+    def _save(self, keys: List[str], matrix: np.ndarray) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        digest = hashlib.sha1("\n".join(keys).encode("utf-8")).hexdigest()[:16]
+        matrix_name = f"anchors-{digest}.npy"
+        matrix_path = os.path.join(self.directory, matrix_name)
+        if not os.path.exists(matrix_path):
+            tmp = f"{matrix_path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                np.save(f, np.ascontiguousarray(matrix, dtype=np.float32))
+            os.replace(tmp, matrix_path)
+
+        manifest_path = os.path.join(self.directory, self.MANIFEST)
+        tmp = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model_name, "file": matrix_name, "keys": keys}, f)
+        os.replace(tmp, manifest_path)
+
+        # Drop superseded matrices (may fail on Windows while memory-mapped elsewhere)
+        for name in os.listdir(self.directory):
+            if name.startswith("anchors-") and name.endswith(".npy") and name != matrix_name:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+
 # --------------------------------------------------------------------------- #
 #  Mapper                                                                      #
 # --------------------------------------------------------------------------- #
@@ -242,7 +380,9 @@ class SemanticFieldMapper:
     Lazy-loaded semantic field mapper.
 
     The model and embeddings are built on first use and cached for the
-    lifetime of the process.  Subsequent calls are ~5 ms each.
+    lifetime of the process.  Anchor embeddings come from the on-disk
+    AnchorEmbeddingStore; labels are encoded in one batch per page
+    (map_fields) and remembered in an LRU.
     """
 
     # Minimum cosine similarity to accept a match.
@@ -258,13 +398,20 @@ class SemanticFieldMapper:
     HIGH_CONFIDENCE   = 0.85
     MEDIUM_CONFIDENCE = 0.72
 
+    LABEL_CACHE_SIZE = 2048
+    ANCHOR_STORE_DIR = os.path.join(MODEL_CACHE_DIR, "anchor_index", MODEL_NAME)
+
     # Singleton: model and embeddings are shared across all instances
     _model           = None
     _anchor_matrix   = None   # (total_anchors, 384)
     _anchor_fields   = None   # parallel list of profile_field names
     _anchor_texts    = None   # parallel list of anchor text (for debug)
+    _anchor_keys     = None   # {(profile_field, anchor.lower())} already indexed
+    _anchor_store    = None
+    _label_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
     _initialized     = False
     _init_failed     = False
+    _lock            = threading.RLock()
 
     def __init__(self, extra_anchors: Optional[Dict[str, List[str]]] = None):
         """
@@ -284,44 +431,56 @@ class SemanticFieldMapper:
 
         Returns SemanticMatch if similarity >= SIMILARITY_THRESHOLD, else None.
         """
-        if not self._ensure_initialized():
-            return None
+        return self.map_fields([field_label])[0]
 
-        try:
-            label_vec = self._model.encode(
-                [field_label],
-                normalize_embeddings=True,
-                show_progress_bar=False,
-            )[0]  # shape: (384,)
+    def map_fields(self, field_labels: Sequence[str]) -> List[Optional[SemanticMatch]]:
+        """
+        Map several labels at once (e.g. all unresolved fields on a page).
 
-            # Cosine similarity against all anchors (vectors already normalized)
-            sims = self._anchor_matrix @ label_vec  # shape: (N,)
+        Labels not yet in the LRU are encoded in a single forward pass.
+        Returns one SemanticMatch-or-None per label, in input order.
+        """
+        if not field_labels:
+            return []
+        if not self._ensure_initialized() or not self._ensure_model():
+            return [None] * len(field_labels)
 
-            best_idx  = int(np.argmax(sims))
-            best_sim  = float(sims[best_idx])
-            best_field = self._anchor_fields[best_idx]
-            best_anchor = self._anchor_texts[best_idx]
+        try:
+            label_vecs = self._encode_labels(field_labels)  # shape: (L, 384)
 
-            if best_sim < self.SIMILARITY_THRESHOLD:
-                logger.debug(
-                    f"SemanticFieldMapper: No confident match for '{field_label}' "
-                    f"(best: '{best_field}' @ {best_sim:.2f})"
+            # Cosine similarity against all anchors (vectors already normalized)
+            sims = label_vecs @ np.asarray(self._anchor_matrix).T  # shape: (L, N)
+            best_idxs = np.argmax(sims, axis=1)
+
+            matches: List[Optional[SemanticMatch]] = []
+            for row, field_label in enumerate(field_labels):
+                best_idx    = int(best_idxs[row])
+                best_sim    = float(sims[row, best_idx])
+                best_field  = self._anchor_fields[best_idx]
+                best_anchor = self._anchor_texts[best_idx]
+
+                if best_sim < self.SIMILARITY_THRESHOLD:
+                    logger.debug(
+                        f"SemanticFieldMapper: No confident match for '{field_label}' "
+                        f"(best: '{best_field}' @ {best_sim:.2f})"
+                    )
+                    matches.append(None)
+                    continue
+
+                logger.info(
+                    f"SemanticFieldMapper: '{field_label}' → '{best_field}' "
+                    f"(similarity={best_sim:.2f}, anchor='{best_anchor}')"
                 )
-                return None
-
-            logger.info(
-                f"SemanticFieldMapper: '{field_label}' → '{best_field}' "
-                f"(similarity={best_sim:.2f}, anchor='{best_anchor}')"
-            )
-            return SemanticMatch(
-                profile_field=best_field,
-                confidence=best_sim,
-                matched_anchor=best_anchor,
-            )
+                matches.append(SemanticMatch(
+                    profile_field=best_field,
+                    confidence=best_sim,
+                    matched_anchor=best_anchor,
+                ))
+            return matches
 
         except Exception as e:
-            logger.error(f"SemanticFieldMapper: map_field failed: {e}")
-            return None
+            logger.error(f"SemanticFieldMapper: map_fields failed: {e}")
+            return [None] * len(field_labels)
 
     def add_db_anchors(self, db_patterns: Dict[str, List[str]]):
         """
@@ -336,56 +495,114 @@ class SemanticFieldMapper:
         if not db_patterns:
             return
         self._extra_anchors.update(db_patterns)
-        # Force re-init on next use
-        SemanticFieldMapper._initialized = False
-        SemanticFieldMapper._init_failed  = False
-        logger.info(
-            f"SemanticFieldMapper: Added DB anchors for "
-            f"{len(db_patterns)} fields — will re-index on next call."
-        )
+        with SemanticFieldMapper._lock:
+            if not SemanticFieldMapper._initialized:
+                # Picked up by _build_index on first use
+                return
+            try:
+                added = self._append_anchors(db_patterns)
+            except Exception as e:
+                logger.error(f"SemanticFieldMapper: Could not index DB anchors: {e}")
+                return
+        if added:
+            logger.info(
+                f"SemanticFieldMapper: Indexed {added} new DB anchors for "
+                f"{len(db_patterns)} fields."
+            )
+
+    @classmethod
+    def prewarm(cls, load_model_in_background: bool = True) -> bool:
+        """
+        Build the anchor index up front so the first page pays no setup.
+
+        When every anchor is already in the store this is a memory-map and no
+        model call; the model itself (needed to encode labels) then loads in a
+        background thread.
+        """
+        mapper = cls()
+        if not mapper._ensure_initialized():
+            return False
+        if cls._model is None:
+            if load_model_in_background:
+                threading.Thread(target=mapper._ensure_model, name="semantic-mapper-warmup", daemon=True).start()
+            else:
+                return mapper._ensure_model()
+        return True
 
     # ---------------------------------------------------------------------- #
     #  Lazy initialization                                                     #
     # ---------------------------------------------------------------------- #
 
     def _ensure_initialized(self) -> bool:
+        """Build the anchor index (loads the model only for anchors the store lacks)."""
         if SemanticFieldMapper._initialized:
             return True
         if SemanticFieldMapper._init_failed:
             return False
 
-        try:
-            from sentence_transformers import SentenceTransformer
-
-            logger.info("SemanticFieldMapper: Loading all-MiniLM-L6-v2 model...")
-            SemanticFieldMapper._model = SentenceTransformer(
-                "all-MiniLM-L6-v2",
-                cache_folder=os.path.join(
-                    os.path.dirname(__file__), "..", "..", ".model_cache"
-                ),
-            )
-            logger.info("SemanticFieldMapper: Model loaded.")
+        with SemanticFieldMapper._lock:
+            if SemanticFieldMapper._initialized:
+                return True
+            if SemanticFieldMapper._init_failed:
+                return False
 
-            self._build_index()
-            SemanticFieldMapper._initialized = True
-            return True
+            try:
+                self._build_index()
+                SemanticFieldMapper._initialized = True
+                return True
 
-        except ImportError:
-            logger.error(
-                "SemanticFieldMapper: sentence-transformers not installed. "
-                "Run: pip install sentence-transformers"
-            )
-            SemanticFieldMapper._init_failed = True
-            return False
+            except ImportError:
+                self._report_missing_dependency()
+                return False
 
-        except Exception as e:
-            logger.error(f"SemanticFieldMapper: Initialization failed: {e}")
-            SemanticFieldMapper._init_failed = True
+            except Exception as e:
+                logger.error(f"SemanticFieldMapper: Initialization failed: {e}")
+                SemanticFieldMapper._init_failed = True
+                return False
+
+    def _ensure_model(self) -> bool:
+        if SemanticFieldMapper._model is not None:
+            return True
+        if SemanticFieldMapper._init_failed:
             return False
+        with SemanticFieldMapper._lock:
+            try:
+                self._load_model()
+                return True
+            except ImportError:
+                self._report_missing_dependency()
+                return False
+            except Exception as e:
+                logger.error(f"SemanticFieldMapper: Model load failed: {e}")
+                SemanticFieldMapper._init_failed = True
+                return False
 
-    def _build_index(self):
-        """Build the (N, 384) anchor matrix from static + dynamic anchors."""
-        # Merge static anchors with any extra ones (DB-loaded or test)
+    @staticmethod
+    def _report_missing_dependency():
+        logger.error(
+            "SemanticFieldMapper: sentence-transformers not installed. "
+            "Run: pip install sentence-transformers"
+        )
+        SemanticFieldMapper._init_failed = True
+
+    @classmethod
+    def _load_model(cls):
+        if cls._model is not None:
+            return
+        from sentence_transformers import SentenceTransformer
+
+        logger.info(f"SemanticFieldMapper: Loading {MODEL_NAME} model...")
+        cls._model = SentenceTransformer(MODEL_NAME, cache_folder=MODEL_CACHE_DIR)
+        logger.info("SemanticFieldMapper: Model loaded.")
+
+    @classmethod
+    def _get_anchor_store(cls) -> AnchorEmbeddingStore:
+        if cls._anchor_store is None or cls._anchor_store.directory != cls.ANCHOR_STORE_DIR:
+            cls._anchor_store = AnchorEmbeddingStore(cls.ANCHOR_STORE_DIR)
+        return cls._anchor_store
+
+    def _merged_anchors(self) -> Dict[str, List[str]]:
+        """Static anchors merged with any extra ones (DB-loaded or test)."""
         merged: Dict[str, List[str]] = {}
         for field, anchors in FIELD_ANCHORS.items():
             merged[field] = list(anchors)
@@ -396,6 +613,33 @@ class SemanticFieldMapper:
                 merged[field] += [a for a in anchors if a.lower() not in existing]
             else:
                 merged[field] = list(anchors)
+        return merged
+
+    @classmethod
+    def _anchor_embeddings(cls, texts: List[str]) -> np.ndarray:
+        """Embeddings for anchor texts: stored rows, plus one encode for the rest."""
+        store = cls._get_anchor_store()
+        found, missing = store.lookup(texts)
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            logger.info(f"SemanticFieldMapper: Encoding {len(missing_texts)} new anchors...")
+            cls._load_model()
+            encoded = cls._model.encode(
+                missing_texts,
+                normalize_embeddings=True,
+                batch_size=64,
+                show_progress_bar=False,
+            )
+            store.append(missing_texts, encoded)
+            for i, vec in zip(missing, encoded):
+                found[i] = vec
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.asarray([found[i] for i in range(len(texts))], dtype=np.float32)
+
+    def _build_index(self):
+        """Build the (N, 384) anchor matrix from static + dynamic anchors."""
+        merged = self._merged_anchors()
 
         # Flatten to parallel lists
         fields_list  = []
@@ -406,23 +650,64 @@ class SemanticFieldMapper:
                 texts_list.append(anchor)
 
         logger.info(
-            f"SemanticFieldMapper: Encoding {len(texts_list)} anchors "
+            f"SemanticFieldMapper: Indexing {len(texts_list)} anchors "
             f"for {len(merged)} profile fields..."
         )
 
-        embeddings = SemanticFieldMapper._model.encode(
-            texts_list,
-            normalize_embeddings=True,
-            batch_size=64,
-            show_progress_bar=False,
-        )  # shape: (N, 384)
+        embeddings = self._anchor_embeddings(texts_list)  # shape: (N, 384)
 
         SemanticFieldMapper._anchor_matrix = embeddings
         SemanticFieldMapper._anchor_fields = fields_list
         SemanticFieldMapper._anchor_texts  = texts_list
+        SemanticFieldMapper._anchor_keys   = {
+            (field, text.lower()) for field, text in zip(fields_list, texts_list)
+        }
 
         logger.info("SemanticFieldMapper: Index built.")
 
+    def _append_anchors(self, patterns: Dict[str, List[str]]) -> int:
+        """Append anchors not yet indexed; returns how many were added."""
+        new_fields, new_texts = [], []
+        keys = SemanticFieldMapper._anchor_keys
+        for field, anchors in patterns.items():
+            for anchor in anchors:
+                key = (field, anchor.lower())
+                if key in keys:
+                    continue
+                keys.add(key)
+                new_fields.append(field)
+                new_texts.append(anchor)
+        if not new_texts:
+            return 0
+
+        embeddings = self._anchor_embeddings(new_texts)
+        SemanticFieldMapper._anchor_matrix = np.vstack([SemanticFieldMapper._anchor_matrix, embeddings])
+        SemanticFieldMapper._anchor_fields = SemanticFieldMapper._anchor_fields + new_fields
+        SemanticFieldMapper._anchor_texts  = SemanticFieldMapper._anchor_texts + new_texts
+        return len(new_texts)
+
+    def _encode_labels(self, labels: Sequence[str]) -> np.ndarray:
+        """Label embeddings, encoding the LRU misses in one forward pass."""
+        cache = SemanticFieldMapper._label_cache
+        with SemanticFieldMapper._lock:
+            missing = list(dict.fromkeys(label for label in labels if label not in cache))
+            if missing:
+                encoded = SemanticFieldMapper._model.encode(
+                    missing,
+                    normalize_embeddings=True,
+                    batch_size=64,
+                    show_progress_bar=False,
+                )
+                cache.update(zip(missing, encoded))
+
+            vectors = []
+            for label in labels:
+                cache.move_to_end(label)
+                vectors.append(cache[label])
+            while len(cache) > self.LABEL_CACHE_SIZE:
+                cache.popitem(last=False)
+        return np.asarray(vectors, dtype=np.float32)
+
     # ---------------------------------------------------------------------- #
     #  Utility                                                                 #
     # ---------------------------------------------------------------------- #
@@ -0,0 +1,217 @@
+"""
+Adaptive page-settle waits.
+
+wait_for_settle() replaces fixed wait_for_timeout()/asyncio.sleep() pauses
+after clicks, fills and navigations. It returns as soon as the page has
+actually settled:
+
+  - DOM quiet:     no structural mutations (MutationObserver) for quiet_ms
+  - network idle:  no XHR/fetch/document request in flight for quiet_ms
+  - visibility:    the optional target selector is visible
+
+and gives up at timeout_ms, so fast pages no longer pay the full fixed pause
+and slow pages get more time than the old sleeps allowed.
+
+Every wait is added to the current application's WaitStats (see
+track_waits()), together with the fixed pause it replaced, so the time saved
+is reported per application.
+"""
+
+import asyncio
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, Optional
+
+from loguru import logger
+
+DEFAULT_QUIET_MS = 250
+DEFAULT_TIMEOUT_MS = 5000
+# Let the page react to the action (start a request, toggle a class) before
+# the first probe, so an untouched page is not mistaken for a settled one
+_FIRST_PROBE_MS = 50
+_POLL_MS = 50
+# Requests open this long are long-polls / analytics beacons, not page loads
+_STALE_REQUEST_S = 10.0
+# Resource types that never gate interaction with the form
+_IGNORED_RESOURCE_TYPES = {"websocket", "eventsource", "media", "font", "image", "ping", "manifest"}
+
+# Installs one MutationObserver per document (kept for the document's
+# lifetime) and reports how long the DOM has been quiet. Style-only attribute
+# changes are ignored so CSS/JS animations do not keep the page "busy".
+_PROBE_JS = """
+(selector) => {
+    let state = window.__launchwaySettle;
+    if (!state || state.doc !== document) {
+        state = { doc: document, last: performance.now() };
+        new MutationObserver(() => { state.last = performance.now(); }).observe(document, {
+            childList: true, subtree: true, characterData: true, attributes: true,
+            attributeFilter: ['class', 'hidden', 'disabled', 'aria-hidden', 'aria-expanded',
+                              'aria-busy', 'open', 'value'],
+        });
+        window.__launchwaySettle = state;
+    }
+    let visible = true;
+    if (selector) {
+        const el = document.querySelector(selector);
+        visible = !!el && el.getClientRects().length > 0 && getComputedStyle(el).visibility !== 'hidden';
+    }
+    return { quietMs: performance.now() - state.last, visible };
+}
+"""
+
+
+@dataclass
+class WaitStats:
+    """Time one application spent in settle waits."""
+    waits: int = 0
+    seconds: float = 0.0
+    replaced_seconds: float = 0.0  # what the fixed pauses they replaced would have cost
+    capped: int = 0                # waits that hit timeout_ms
+    by_reason: Dict[str, float] = field(default_factory=dict)
+
+    def record(self, seconds: float, replaced_seconds: float, capped: bool, reason: str) -> None:
+        self.waits += 1
+        self.seconds += seconds
+        self.replaced_seconds += replaced_seconds
+        self.capped += capped
+        if reason:
+            self.by_reason[reason] = self.by_reason.get(reason, 0.0) + seconds
+
+    @property
+    def saved_seconds(self) -> float:
+        return self.replaced_seconds - self.seconds
+
+    def summary(self) -> str:
+        return (
+            f"⏱️ Settle waits: {self.seconds:.1f}s over {self.waits} waits "
+            f"(fixed waits: {self.replaced_seconds:.1f}s, saved: {self.saved_seconds:.1f}s, capped: {self.capped})"
+        )
+
+
+_current_stats: ContextVar[Optional[WaitStats]] = ContextVar("page_settle_stats", default=None)
+
+
+@contextmanager
+def track_waits() -> Iterator[WaitStats]:
+    """Collect the enclosed settle waits (one application) into a fresh WaitStats."""
+    stats = WaitStats()
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+def current_wait_stats() -> Optional[WaitStats]:
+    return _current_stats.get()
+
+
+class _NetworkTracker:
+    """In-flight request bookkeeping for one page (attached on first use)."""
+
+    def __init__(self, page):
+        self.inflight: Dict[Any, float] = {}
+        self.last_activity = time.monotonic()
+        page.on("request", self._started)
+        page.on("requestfinished", self._finished)
+        page.on("requestfailed", self._finished)
+
+    def _started(self, request) -> None:
+        try:
+            if request.resource_type in _IGNORED_RESOURCE_TYPES:
+                return
+        except Exception:
+            pass
+        now = time.monotonic()
+        self.inflight[request] = now
+        self.last_activity = now
+
+    def _finished(self, request) -> None:
+        if self.inflight.pop(request, None) is not None:
+            self.last_activity = time.monotonic()
+
+    def idle_seconds(self) -> float:
+        now = time.monotonic()
+        if any(now - started < _STALE_REQUEST_S for started in self.inflight.values()):
+            return 0.0
+        return now - self.last_activity
+
+
+_trackers: "weakref.WeakKeyDictionary[Any, _NetworkTracker]" = weakref.WeakKeyDictionary()
+
+
+def _network_tracker(target) -> Optional[_NetworkTracker]:
+    page = getattr(target, "page", target)  # Frame -> its Page
+    if not hasattr(page, "on"):
+        return None
+    try:
+        tracker = _trackers.get(page)
+        if tracker is None:
+            tracker = _trackers[page] = _NetworkTracker(page)
+        return tracker
+    except TypeError:  # not weak-referenceable
+        return None
+
+
+async def wait_for_settle(
+    target,
+    selector: Optional[str] = None,
+    quiet_ms: int = DEFAULT_QUIET_MS,
+    timeout_ms: int = DEFAULT_TIMEOUT_MS,
+    network_idle: bool = True,
+    replaces_ms: int = 0,
+    reason: str = "",
+) -> bool:
+    """
+    Wait until `target` (a Page or Frame) has settled, at most timeout_ms.
+
+    Args:
+        selector: Also wait for this CSS selector to be visible
+        quiet_ms: How long DOM (and network) must stay quiet
+        network_idle: Also require no requests in flight for quiet_ms
+        replaces_ms: Duration of the fixed pause this wait replaces (stats only)
+        reason: Label for per-reason stats
+
+    Returns:
+        True when the page settled, False when the cap was hit
+    """
+    started = time.monotonic()
+    deadline = started + timeout_ms / 1000
+    quiet_s = quiet_ms / 1000
+    tracker = _network_tracker(target) if network_idle else None
+    settled = False
+
+    try:
+        await asyncio.sleep(min(_FIRST_PROBE_MS, timeout_ms) / 1000)
+        while True:
+            try:
+                probe = await target.evaluate(_PROBE_JS, selector)
+                dom_quiet_s = probe["quietMs"] / 1000
+                visible = probe["visible"]
+            except Exception:
+                # Execution context destroyed by a navigation: the new
+                # document counts as a mutation
+                dom_quiet_s, visible = 0.0, False
+            net_quiet_s = tracker.idle_seconds() if tracker else quiet_s
+
+            if dom_quiet_s >= quiet_s and net_quiet_s >= quiet_s and visible:
+                settled = True
+                break
+            now = time.monotonic()
+            if now >= deadline:
+                break
+            # Sleep until the quiet window could next be complete
+            remaining_quiet = max(quiet_s - min(dom_quiet_s, net_quiet_s), _POLL_MS / 1000)
+            await asyncio.sleep(min(remaining_quiet, _POLL_MS / 1000 * 4, deadline - now))
+    finally:
+        elapsed = time.monotonic() - started
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(elapsed, replaces_ms / 1000, not settled, reason)
+
+    if not settled:
+        logger.debug(f"Page did not settle within {timeout_ms}ms ({reason or 'unlabelled'})")
+    return settled
@@ -12,11 +12,12 @@ from datetime import datetime
 import json
 from pathlib import Path
 from loguru import logger
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
+from .db_engine_registry import get_engine, get_sessionmaker
 import os
 from dotenv import load_dotenv
-from urllib.parse import quote_plus
+
+from .executors.learned_patterns_mapper import invalidate_learned_patterns
 
 load_dotenv()
 
@@ -117,18 +118,9 @@ class PatternRecorder:
             logger.debug("PatternRecorder: production mode — using API routing")
             return
         try:
-            DB_HOST = os.getenv('DB_HOST', 'localhost')
-            DB_PORT = os.getenv('DB_PORT', '5432')
-            DB_NAME = os.getenv('DB_NAME', 'job_agent_db')
-            DB_USER = os.getenv('DB_USER', 'postgres')
-            DB_PASSWORD = os.getenv('DB_PASSWORD', '')
-
-            encoded_password = quote_plus(DB_PASSWORD)
-            DATABASE_URL = f"postgresql://{DB_USER}:{encoded_password}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-
-            self.engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-            self.SessionLocal = sessionmaker(bind=self.engine)
-            logger.info("PatternRecorder: Database connection initialized")
+            self.engine = get_engine()
+            self.SessionLocal = get_sessionmaker()
+            logger.debug("PatternRecorder: Using shared database engine")
 
         except Exception as e:
             logger.error(f"PatternRecorder: Failed to initialize database: {e}")
@@ -219,7 +211,10 @@ class PatternRecorder:
                 "field_category": field_category,
                 "success": bool(success),
             }
-            return self._record_via_api(payload)
+            saved = self._record_via_api(payload)
+            if saved:
+                invalidate_learned_patterns([payload["field_label_normalized"]])
+            return saved
 
         # Normalize label
         normalized_label = self._normalize_label(field_label)
@@ -307,6 +302,7 @@ class PatternRecorder:
                     f"(confidence: {initial_confidence:.2f}, success: {success})"
                 )
 
+            invalidate_learned_patterns([normalized_label])
             return True
 
         except Exception as e:
@@ -357,7 +353,10 @@ class PatternRecorder:
                 "field_category": field_category,
                 "success": bool(success),
             }
-            return self._record_via_api(payload)
+            saved = self._record_via_api(payload)
+            if saved:
+                invalidate_learned_patterns([payload["field_label_normalized"]])
+            return saved
 
         normalized_label = self._normalize_label(field_label)
 
@@ -438,6 +437,7 @@ class PatternRecorder:
                 )
 
             session.close()
+            invalidate_learned_patterns([normalized_label])
             return True
 
         except Exception as e:
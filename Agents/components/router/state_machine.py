@@ -3,6 +3,8 @@ import logging
 from typing import Dict, Any, Optional, Callable, Awaitable
 from playwright.async_api import Page # Use the specific Page type for clarity
 
+from components.page_settle import DEFAULT_TIMEOUT_MS, wait_for_settle
+
 logger = logging.getLogger(__name__)
 
 class ApplicationState:
@@ -286,7 +288,7 @@ class StateMachine:
                         button = self.page.get_by_text(button_text, exact=False).first
                         await button.click(timeout=5000)
                         logger.info(f"✅ Clicked button: '{button_text}'")
-                        await self.page.wait_for_timeout(2000)
+                        await wait_for_settle(self.page, timeout_ms=8000, replaces_ms=2000, reason="checkpoint_click")
                         self.app_state.context['progress_made'] = True
                         return True
                     except Exception as e:
@@ -295,8 +297,9 @@ class StateMachine:
 
                 elif action == 'wait':
                     wait_ms = details.get('wait_ms', 3000)
-                    logger.info(f"⏳ Waiting {wait_ms}ms for dynamic content...")
-                    await self.page.wait_for_timeout(wait_ms)
+                    logger.info(f"⏳ Waiting up to {max(wait_ms, DEFAULT_TIMEOUT_MS)}ms for dynamic content...")
+                    await wait_for_settle(self.page, timeout_ms=max(wait_ms, DEFAULT_TIMEOUT_MS),
+                                          replaces_ms=wait_ms, reason="checkpoint_wait")
                     return True
 
             return False
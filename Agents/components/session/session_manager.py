@@ -3,6 +3,7 @@ Session Manager for Job Application Agent
 Handles session persistence, freezing, and resumption
 """
 
+import hashlib
 import json
 import time
 import uuid
@@ -13,6 +14,8 @@ from typing import Dict, List, Any, Optional
 from playwright.async_api import Page, BrowserContext
 from loguru import logger
 from ..action_recorder import ActionRecorder, ActionReplay
+from ..page_settle import wait_for_settle
+from .session_store import SessionStore, SCREENSHOT_QUALITY, session_summary
 
 
 class ApplicationSession:
@@ -92,6 +95,11 @@ class ApplicationSession:
         return session
 
 
+def _digest(data: Dict[str, Any]) -> str:
+    """Fingerprint of a serialized session, to skip rewriting unchanged shards"""
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
 class SessionManager:
     """Manages job application sessions with action recording"""
     
@@ -102,8 +110,10 @@ class SessionManager:
         self.browser_states_dir = os.path.join(storage_dir, "browser_states")
         self.action_logs_dir = os.path.join(storage_dir, "action_logs")  # NEW: Action logs directory
         
-        # Action recording
+        # Action recording - one recorder per session so concurrent applications
+        # sharing this manager never save each other's actions
         self.current_action_recorder: Optional[ActionRecorder] = None
+        self.action_recorders: Dict[str, ActionRecorder] = {}
         
         # Create directories with full error handling
         try:
@@ -116,49 +126,81 @@ class SessionManager:
             logger.error(f"❌ Failed to create session directories: {e}")
             raise
         
+        self.store = SessionStore(storage_dir)
+        # Full sessions are loaded from their shard on first access; the index
+        # holds a summary of every session for listings and the dashboard
         self.sessions: Dict[str, ApplicationSession] = {}
+        self.index: Dict[str, Dict[str, Any]] = {}
+        self._saved_digests: Dict[str, str] = {}
         self.load_sessions()
     
     def load_sessions(self):
-        """Load sessions from storage"""
+        """Load the session index from storage"""
         try:
             if os.path.exists(self.sessions_file):
-                with open(self.sessions_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for session_data in data:
-                        session = ApplicationSession.from_dict(session_data)
-                        self.sessions[session.session_id] = session
-                logger.info(f"Loaded {len(self.sessions)} sessions from storage")
+                migrated = self.store.migrate_legacy(self.sessions_file)
+                logger.info(f"Migrated {migrated} sessions from {self.sessions_file} to sharded storage")
+            self.index = self.store.load_index()
+            self.sessions = {}
+            logger.info(f"Loaded {len(self.index)} sessions from storage")
         except Exception as e:
             logger.error(f"Failed to load sessions: {e}")
             self.sessions = {}
+            self.index = {}
     
     def save_sessions(self):
-        """Save sessions to storage"""
+        """Save changed sessions to storage (one shard each) and refresh the index"""
         try:
-            data = [session.to_dict() for session in self.sessions.values()]
-            with open(self.sessions_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-            logger.debug(f"Saved {len(self.sessions)} sessions to storage")
+            updated = {}
+            for session_id, session in self.sessions.items():
+                data = session.to_dict()
+                digest = _digest(data)
+                if self._saved_digests.get(session_id) == digest:
+                    continue
+                self.store.write_shard(data)
+                self._saved_digests[session_id] = digest
+                updated[session_id] = session_summary(data)
+            if updated:
+                self.index = self.store.write_index(updated)
+            logger.debug(f"Saved {len(updated)} changed sessions to storage")
         except Exception as e:
             logger.error(f"Failed to save sessions: {e}")
     
+    def _load_session(self, session_id: str) -> Optional[ApplicationSession]:
+        """Read one session's shard into memory"""
+        try:
+            data = self.store.read_shard(session_id)
+        except Exception as e:
+            logger.error(f"Failed to load session {session_id}: {e}")
+            return None
+        if data is None:
+            return None
+        session = ApplicationSession.from_dict(data)
+        self.sessions[session_id] = session
+        self._saved_digests[session_id] = _digest(session.to_dict())
+        return session
+    
     # NEW: Action Recording Methods
     def start_action_recording(self, session_id: str, initial_url: str) -> ActionRecorder:
         """Start recording actions for a session"""
-        self.current_action_recorder = ActionRecorder()
-        self.current_action_recorder.start_recording(session_id, initial_url)
+        recorder = ActionRecorder()
+        recorder.start_recording(session_id, initial_url)
+        self.action_recorders[session_id] = recorder
+        self.current_action_recorder = recorder
         logger.info(f"Started action recording for session {session_id}")
-        return self.current_action_recorder
+        return recorder
     
-    def get_action_recorder(self) -> Optional[ActionRecorder]:
-        """Get the current action recorder"""
+    def get_action_recorder(self, session_id: Optional[str] = None) -> Optional[ActionRecorder]:
+        """Get a session's action recorder (default: the most recently started one)"""
+        if session_id is not None:
+            return self.action_recorders.get(session_id)
         return self.current_action_recorder
     
     def stop_action_recording(self, session_id: str, save_to_session: bool = True) -> bool:
         """Stop recording and optionally save actions to session"""
-        if not self.current_action_recorder:
-            logger.warning("No active action recorder to stop")
+        recorder = self.action_recorders.get(session_id)
+        if not recorder:
+            logger.warning(f"No active action recorder to stop for session {session_id}")
             return False
         
         try:
@@ -167,19 +209,19 @@ class SessionManager:
             
             # Save action log to file
             action_log_file = os.path.join(self.action_logs_dir, f"actions_{session_id}.json")
-            action_data = self.current_action_recorder.to_dict()
+            action_data = recorder.to_dict()
             
             with open(action_log_file, 'w', encoding='utf-8') as f:
                 json.dump(action_data, f, indent=2, ensure_ascii=False)
             
             # Save to session if requested
-            if save_to_session and session_id in self.sessions:
-                session = self.sessions[session_id]
+            session = self.get_session(session_id) if save_to_session else None
+            if session:
                 session.action_history = action_data["actions"]
-                last_successful = self.current_action_recorder.get_last_successful_step()
+                last_successful = recorder.get_last_successful_step()
                 session.last_successful_step = last_successful.to_dict() if last_successful else None
 
-                failure_point = self.current_action_recorder.get_failure_point()
+                failure_point = recorder.get_failure_point()
                 session.failure_point = failure_point.to_dict() if failure_point else None
                 session.last_updated = time.time()
 
@@ -192,7 +234,9 @@ class SessionManager:
                 self.save_sessions()
             
             logger.info(f"Stopped action recording for session {session_id}. Actions saved to {action_log_file}")
-            self.current_action_recorder = None
+            self.action_recorders.pop(session_id, None)
+            if self.current_action_recorder is recorder:
+                self.current_action_recorder = None
             return True
             
         except Exception as e:
@@ -271,12 +315,15 @@ class SessionManager:
             logger.error(f"Error during action replay for session {session_id}: {e}")
             return False
     
+    async def _store_screenshot(self, page: Page) -> str:
+        """Capture a full-page JPEG and store it content-addressed (identical pages share a file)"""
+        image = await page.screenshot(full_page=True, type="jpeg", quality=SCREENSHOT_QUALITY)
+        return self.store.put_screenshot(image)
+    
     async def take_screenshot(self, session_id: str, page: Page) -> Optional[str]:
         """Take a screenshot for reference purposes"""
         try:
-            screenshot_filename = f"session_{session_id}_{int(time.time())}.png"
-            screenshot_path = os.path.join(self.screenshots_dir, screenshot_filename)
-            await page.screenshot(path=screenshot_path, full_page=True)
+            screenshot_path = await self._store_screenshot(page)
             logger.info(f"Reference screenshot saved: {screenshot_path}")
             return screenshot_path
         except Exception as e:
@@ -293,12 +340,15 @@ class SessionManager:
     
     def get_session(self, session_id: str) -> Optional[ApplicationSession]:
         """Get session by ID"""
-        return self.sessions.get(session_id)
+        session = self.sessions.get(session_id)
+        if session is None and session_id in self.index:
+            session = self._load_session(session_id)
+        return session
     
     def update_session(self, session_id: str, **kwargs):
         """Update session data"""
-        if session_id in self.sessions:
-            session = self.sessions[session_id]
+        session = self.get_session(session_id)
+        if session:
             for key, value in kwargs.items():
                 if hasattr(session, key):
                     setattr(session, key, value)
@@ -308,11 +358,16 @@ class SessionManager:
     
     def get_all_sessions(self) -> List[ApplicationSession]:
         """Get all sessions sorted by creation time (newest first)"""
-        return sorted(self.sessions.values(), key=lambda s: s.created_at, reverse=True)
+        sessions = [self.get_session(session_id) for session_id in set(self.index) | set(self.sessions)]
+        return sorted([s for s in sessions if s], key=lambda s: s.created_at, reverse=True)
     
     def get_sessions_by_status(self, status: str) -> List[ApplicationSession]:
         """Get sessions filtered by status"""
-        return [s for s in self.sessions.values() if s.status == status]
+        ids = {sid for sid, summary in self.index.items() if summary.get("status") == status}
+        ids |= {sid for sid, s in self.sessions.items() if s.status == status}
+        sessions = [self.get_session(session_id) for session_id in ids]
+        # Status in memory wins over a stale index entry
+        return [s for s in sessions if s and s.status == status]
     
     async def freeze_session(self, session_id: str, page: Page, completion_tracker=None) -> bool:
         """Freeze a session by saving its current state"""
@@ -323,9 +378,7 @@ class SessionManager:
                 return False
             
             # Take screenshot
-            screenshot_filename = f"session_{session_id}_{int(time.time())}.png"
-            screenshot_path = os.path.join(self.screenshots_dir, screenshot_filename)
-            await page.screenshot(path=screenshot_path, full_page=True)
+            screenshot_path = await self._store_screenshot(page)
             session.screenshot_path = screenshot_path
             logger.info(f"Screenshot saved: {screenshot_path}")
             
@@ -352,11 +405,8 @@ class SessionManager:
                     "user_agent": await page.evaluate("() => navigator.userAgent")
                 }
                 
-                # Save browser state to file
-                state_filename = f"state_{session_id}.json"
-                state_path = os.path.join(self.browser_states_dir, state_filename)
-                with open(state_path, 'w', encoding='utf-8') as f:
-                    json.dump(browser_state, f, indent=2, ensure_ascii=False)
+                # Save browser state to a compressed file
+                state_path = self.store.put_state(session_id, browser_state)
                 
                 session.browser_state = {"state_file": state_path}
                 logger.info(f"Browser state saved: {state_path}")
@@ -437,8 +487,7 @@ class SessionManager:
             # Load browser state
             state_file = session.browser_state.get("state_file")
             if state_file and os.path.exists(state_file):
-                with open(state_file, 'r', encoding='utf-8') as f:
-                    browser_state = json.load(f)
+                browser_state = self.store.read_state(state_file)
                 
                 # Enhanced authentication restoration process
                 logger.info("Starting enhanced authentication restoration...")
@@ -464,7 +513,7 @@ class SessionManager:
 
                         # Wait for page to be ready for storage operations
                         await page.wait_for_load_state("domcontentloaded")
-                        await page.wait_for_timeout(1000)
+                        await wait_for_settle(page, timeout_ms=5000, replaces_ms=1000, reason="session_restore_navigate")
 
                         # Step 3: Restore storage AFTER navigation (now on correct origin)
                         if browser_state.get("local_storage"):
@@ -483,8 +532,8 @@ class SessionManager:
                             except Exception as e:
                                 logger.warning(f"Failed to restore sessionStorage: {e}")
 
-                        # Wait for any authentication checks to complete
-                        await page.wait_for_timeout(2000)
+                        # Wait for any authentication checks (and their redirects) to complete
+                        await wait_for_settle(page, timeout_ms=10000, replaces_ms=2000, reason="session_restore_auth")
 
                         # Check if we're on a login/auth page and handle accordingly
                         current_url = page.url
@@ -500,7 +549,7 @@ class SessionManager:
 
                 # Step 4: Extended wait for dynamic content and authentication
                 logger.info("Waiting for page to fully settle and authentication to complete...")
-                await page.wait_for_timeout(2000)
+                await wait_for_settle(page, timeout_ms=10000, replaces_ms=2000, reason="session_restore_settle")
                 
                 # Try multiple restoration strategies
                 await self._restore_form_fields_comprehensive(page, session, browser_state)
@@ -548,7 +597,8 @@ class SessionManager:
                 if await field.is_visible():
                     await field.click()
                     await field.press('Tab')  # This often triggers autofill
-                    await page.wait_for_timeout(500)
+                    await wait_for_settle(page, quiet_ms=150, timeout_ms=1500, network_idle=False,
+                                          replaces_ms=500, reason="session_autofill")
                     break
                     
             # Trigger autofill on name fields
@@ -557,7 +607,8 @@ class SessionManager:
                 if await field.is_visible():
                     await field.click()
                     await field.press('Tab')
-                    await page.wait_for_timeout(500)
+                    await wait_for_settle(page, quiet_ms=150, timeout_ms=1500, network_idle=False,
+                                          replaces_ms=500, reason="session_autofill")
                     break
                     
         except Exception as e:
@@ -606,7 +657,8 @@ class SessionManager:
                                     except:
                                         # Alternative dropdown handling
                                         await element.click()
-                                        await page.wait_for_timeout(300)
+                                        await wait_for_settle(page, timeout_ms=1500, replaces_ms=300,
+                                                              reason="session_restore_dropdown")
                                         option = page.locator(f'text="{field_value}"').first
                                         if await option.is_visible():
                                             await option.click()
@@ -672,8 +724,12 @@ class SessionManager:
             if not session:
                 return False
             
-            # Delete screenshot
-            if session.screenshot_path and os.path.exists(session.screenshot_path):
+            # Delete screenshot unless another session shares the same image
+            shared = any(
+                summary.get("screenshot_path") == session.screenshot_path
+                for sid, summary in self.index.items() if sid != session_id
+            )
+            if session.screenshot_path and not shared and os.path.exists(session.screenshot_path):
                 os.remove(session.screenshot_path)
             
             # Delete browser state file
@@ -681,9 +737,11 @@ class SessionManager:
             if state_file and os.path.exists(state_file):
                 os.remove(state_file)
             
-            # Remove from memory and save
-            del self.sessions[session_id]
-            self.save_sessions()
+            # Remove from memory and storage
+            self.sessions.pop(session_id, None)
+            self._saved_digests.pop(session_id, None)
+            self.store.delete_shard(session_id)
+            self.index = self.store.write_index({}, removed=[session_id])
             
             logger.info(f"Session {session_id} deleted successfully")
             return True
@@ -693,19 +751,19 @@ class SessionManager:
             return False
     
     def get_dashboard_data(self) -> Dict[str, Any]:
-        """Get dashboard summary data"""
-        sessions = self.get_all_sessions()
+        """Get dashboard summary data (from the index; shards and blobs are not read)"""
+        summaries = dict(self.index)
+        for session_id, session in self.sessions.items():
+            summaries[session_id] = session_summary(session.to_dict())
+        sessions = sorted(summaries.values(), key=lambda s: s.get("created_at") or 0, reverse=True)
         
         status_counts = {
-            "completed": len([s for s in sessions if s.status == "completed"]),
-            "needs_attention": len([s for s in sessions if s.status == "needs_attention"]),
-            "in_progress": len([s for s in sessions if s.status == "in_progress"]),
-            "frozen": len([s for s in sessions if s.status == "frozen"]),
-            "failed": len([s for s in sessions if s.status == "failed"])
+            status: len([s for s in sessions if s.get("status") == status])
+            for status in ("completed", "needs_attention", "in_progress", "frozen", "failed")
         }
         
         return {
             "total_sessions": len(sessions),
             "status_counts": status_counts,
-            "sessions": [s.to_dict() for s in sessions]
+            "sessions": sessions
         }
@@ -0,0 +1,178 @@
+"""
+Session Store for Job Application Agent
+Sharded on-disk storage behind SessionManager
+
+Layout under the session storage directory:
+  index.json                          lightweight summary of every session
+  shards/<id[:2]>/<id>.json.gz        full ApplicationSession data, one file per session
+  browser_states/state_<id>.json.gz   frozen cookies/storage/page HTML, gzip-compressed
+  screenshots/<sha[:2]>/<sha>.jpg     content-addressed (deduplicated) screenshots
+
+Only the index is read at startup; shards and blobs are read on demand.
+Writes go through a temp file + os.replace so a crash never leaves a
+half-written index or shard behind.
+"""
+
+import gzip
+import hashlib
+import io
+import json
+import os
+import uuid
+from typing import Any, Dict, Iterable, Optional
+from loguru import logger
+
+
+INDEX_VERSION = 1
+
+# Fields copied into the index; everything else stays in the shard
+INDEX_FIELDS = (
+    "session_id",
+    "job_url",
+    "job_title",
+    "company",
+    "status",
+    "created_at",
+    "last_updated",
+    "completion_percentage",
+    "screenshot_path",
+)
+
+SCREENSHOT_QUALITY = 70
+SCREENSHOT_MAX_BYTES = 1_500_000
+
+
+def _atomic_write(path: str, payload: bytes):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp, 'wb') as f:
+        f.write(payload)
+    os.replace(tmp, path)
+
+
+def _dumps(data: Any) -> bytes:
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode('utf-8')
+
+
+def session_summary(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Index entry for a serialized session"""
+    return {field: data.get(field) for field in INDEX_FIELDS}
+
+
+class SessionStore:
+    """Index + per-session shards + compressed/deduplicated blobs"""
+
+    def __init__(self, storage_dir: str):
+        self.storage_dir = storage_dir
+        self.index_file = os.path.join(storage_dir, "index.json")
+        self.shards_dir = os.path.join(storage_dir, "shards")
+        self.screenshots_dir = os.path.join(storage_dir, "screenshots")
+        self.browser_states_dir = os.path.join(storage_dir, "browser_states")
+        os.makedirs(self.shards_dir, exist_ok=True)
+
+    # Index
+
+    def load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Session summaries keyed by session id"""
+        if not os.path.exists(self.index_file):
+            return {}
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get("sessions", {})
+
+    def write_index(self, updated: Dict[str, Dict[str, Any]], removed: Iterable[str] = ()) -> Dict[str, Dict[str, Any]]:
+        """Merge this process's changes into the on-disk index and return the result.
+
+        Re-reading before writing keeps entries added by other agent processes
+        sharing the same storage directory.
+        """
+        try:
+            index = self.load_index()
+        except Exception as e:
+            logger.warning(f"Session index unreadable, rebuilding from this process's view: {e}")
+            index = {}
+        index.update(updated)
+        for session_id in removed:
+            index.pop(session_id, None)
+        _atomic_write(self.index_file, _dumps({"version": INDEX_VERSION, "sessions": index}))
+        return index
+
+    # Shards
+
+    def _shard_path(self, session_id: str) -> str:
+        return os.path.join(self.shards_dir, session_id[:2], f"{session_id}.json.gz")
+
+    def read_shard(self, session_id: str) -> Optional[Dict[str, Any]]:
+        path = self._shard_path(session_id)
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rb') as f:
+            return json.loads(f.read().decode('utf-8'))
+
+    def write_shard(self, data: Dict[str, Any]):
+        _atomic_write(self._shard_path(data["session_id"]), gzip.compress(_dumps(data), compresslevel=6))
+
+    def delete_shard(self, session_id: str):
+        path = self._shard_path(session_id)
+        if os.path.exists(path):
+            os.remove(path)
+
+    # Blobs
+
+    def put_screenshot(self, image: bytes) -> str:
+        """Store a screenshot once per distinct image and return its path"""
+        digest = hashlib.sha256(image).hexdigest()
+        path = os.path.join(self.screenshots_dir, digest[:2], f"{digest}.jpg")
+        if not os.path.exists(path):
+            _atomic_write(path, self._cap_screenshot(image))
+        return path
+
+    @staticmethod
+    def _cap_screenshot(image: bytes) -> bytes:
+        """Re-encode as JPEG, downscaling until it fits SCREENSHOT_MAX_BYTES"""
+        is_jpeg = image[:3] == b"\xff\xd8\xff"
+        if is_jpeg and len(image) <= SCREENSHOT_MAX_BYTES:
+            return image
+
+        from PIL import Image
+
+        with Image.open(io.BytesIO(image)) as img:
+            img = img.convert("RGB")
+            out = image if is_jpeg else b""
+            scale = 1.0
+            for _ in range(4):
+                if out and len(out) <= SCREENSHOT_MAX_BYTES:
+                    break
+                if out:
+                    scale *= max(0.3, (SCREENSHOT_MAX_BYTES / len(out)) ** 0.5 * 0.95)
+                size = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+                buf = io.BytesIO()
+                img.resize(size).save(buf, format="JPEG", quality=SCREENSHOT_QUALITY, optimize=True)
+                out = buf.getvalue()
+            return out
+
+    def put_state(self, session_id: str, browser_state: Dict[str, Any]) -> str:
+        path = os.path.join(self.browser_states_dir, f"state_{session_id}.json.gz")
+        _atomic_write(path, gzip.compress(_dumps(browser_state), compresslevel=6))
+        return path
+
+    @staticmethod
+    def read_state(path: str) -> Dict[str, Any]:
+        """Read a frozen browser state (compressed, or a legacy plain JSON file)"""
+        if path.endswith(".gz"):
+            with gzip.open(path, 'rb') as f:
+                return json.loads(f.read().decode('utf-8'))
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    # Migration
+
+    def migrate_legacy(self, sessions_file: str) -> int:
+        """Split a legacy single-file sessions.json into shards + index"""
+        with open(sessions_file, 'r', encoding='utf-8') as f:
+            sessions = json.load(f)
+        for data in sessions:
+            self.write_shard(data)
+        self.write_index({data["session_id"]: session_summary(data) for data in sessions})
+        os.replace(sessions_file, f"{sessions_file}.migrated")
+        return len(sessions)
@@ -32,13 +32,11 @@ Fields the profiler intentionally leaves unmapped (NULL forever):
 """
 
 import re
-import os
 import asyncio
 from typing import Dict, List, Optional, Any
 from loguru import logger
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
-from urllib.parse import quote_plus
+from sqlalchemy import text
+from components.db_engine_registry import get_engine, get_sessionmaker
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -127,15 +125,8 @@ class UserOverrideProfiler:
 
     def _init_db(self):
         try:
-            DB_HOST     = os.getenv('DB_HOST', 'localhost')
-            DB_PORT     = os.getenv('DB_PORT', '5432')
-            DB_NAME     = os.getenv('DB_NAME', 'job_agent_db')
-            DB_USER_DB  = os.getenv('DB_USER', 'postgres')
-            DB_PASSWORD = os.getenv('DB_PASSWORD', '')
-            encoded_pw  = quote_plus(DB_PASSWORD)
-            url = f"postgresql://{DB_USER_DB}:{encoded_pw}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-            self.engine = create_engine(url, pool_pre_ping=True)
-            self.SessionLocal = sessionmaker(bind=self.engine)
+            self.engine = get_engine()
+            self.SessionLocal = get_sessionmaker()
         except Exception as e:
             logger.error(f"UserOverrideProfiler: DB init failed: {e}")
             self.engine = None
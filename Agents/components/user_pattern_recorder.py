@@ -26,11 +26,12 @@ from pathlib import Path
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from loguru import logger
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import text
+from .db_engine_registry import get_engine, get_sessionmaker
 import os
 from dotenv import load_dotenv
-from urllib.parse import quote_plus
+
+from .executors.learned_patterns_mapper import invalidate_learned_patterns
 
 load_dotenv()
 
@@ -86,21 +87,9 @@ class UserPatternRecorder:
             return
 
         try:
-            DB_HOST     = os.getenv('DB_HOST', 'localhost')
-            DB_PORT     = os.getenv('DB_PORT', '5432')
-            DB_NAME     = os.getenv('DB_NAME', 'job_agent_db')
-            DB_USER     = os.getenv('DB_USER', 'postgres')
-            DB_PASSWORD = os.getenv('DB_PASSWORD', '')
-
-            encoded_password = quote_plus(DB_PASSWORD)
-            DATABASE_URL = (
-                f"postgresql://{DB_USER}:{encoded_password}"
-                f"@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-            )
-
-            self.engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-            self.SessionLocal = sessionmaker(bind=self.engine)
-            logger.info("UserPatternRecorder: Database connection initialized")
+            self.engine = get_engine()
+            self.SessionLocal = get_sessionmaker()
+            logger.debug("UserPatternRecorder: Using shared database engine")
 
         except Exception as e:
             logger.warning(
@@ -266,7 +255,10 @@ class UserPatternRecorder:
                 "site_domain":    normalized_site_domain,
                 "profile_field":  profile_field,
             }
-            return self._record_via_api(payload)
+            saved = self._record_via_api(payload)
+            if saved:
+                invalidate_learned_patterns([payload["field_label_normalized"]], user_id=user_id)
+            return saved
 
         if not user_id:
             logger.warning("UserPatternRecorder: user_id is required, skipping")
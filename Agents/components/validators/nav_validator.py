@@ -1,8 +1,22 @@
 import logging
+import weakref
 from typing import Any, Dict, Optional
 
 logger = logging.getLogger(__name__)
 
+# Tabs that belong to a running application.  When several applications share
+# one browser context, a tab opened by another application must never be
+# mistaken for a tab opened by our own click.
+_claimed_pages: "weakref.WeakSet" = weakref.WeakSet()
+
+
+def claim_page(page: Any) -> None:
+    """Mark a tab as owned by an application so other applications ignore it."""
+    try:
+        _claimed_pages.add(page)
+    except TypeError:
+        pass
+
 class NavValidator:
     """Validates if a navigation or significant DOM change occurred."""
 
@@ -10,6 +24,7 @@ class NavValidator:
         self.page = page
         self.initial_state = {}
         self.initial_pages_count = 0
+        self.initial_pages = []
 
     async def capture_initial_state(self):
         """Captures the initial state of the page before an action."""
@@ -20,7 +35,8 @@ class NavValidator:
         }
         # Capture the initial number of pages in the browser context
         try:
-            self.initial_pages_count = len(self.page.context.pages)
+            self.initial_pages = list(self.page.context.pages)
+            self.initial_pages_count = len(self.initial_pages)
             logger.debug(f"Initial pages count: {self.initial_pages_count}")
         except Exception as e:
             logger.warning(f"Failed to capture initial pages count: {e}")
@@ -73,9 +89,25 @@ class NavValidator:
             
             logger.debug(f"Current pages count: {current_pages_count}, Initial: {self.initial_pages_count}")
             
-            if current_pages_count > self.initial_pages_count:
-                # Find the newest page (likely the one that was just opened)
-                newest_page = current_pages[-1]  # Last page in the list is usually the newest
+            # Only tabs that appeared since the initial state and aren't another
+            # application's tab
+            new_pages = [
+                p for p in current_pages
+                if not any(p is q for q in self.initial_pages) and p not in _claimed_pages
+            ]
+            if not self.initial_pages and current_pages_count <= self.initial_pages_count:
+                new_pages = []
+            
+            if new_pages:
+                # Prefer a tab our page opened; otherwise the newest one
+                newest_page = new_pages[-1]  # Last page in the list is usually the newest
+                for candidate in reversed(new_pages):
+                    try:
+                        if await candidate.opener() is self.page:
+                            newest_page = candidate
+                            break
+                    except Exception:
+                        continue
                 
                 # Wait a bit for the new page to load
                 try:
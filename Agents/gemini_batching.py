@@ -0,0 +1,137 @@
+"""
+Helpers for packing many small Gemini tasks into few requests.
+
+Callers that used to send one prompt per item (a project, a bullet) build one
+prompt per chunk instead and ask for a JSON array with one result per item id:
+
+  - chunk_by_tokens:   split items into chunks that fit a prompt-token budget
+                       (and an item cap), preserving order
+  - run_chunks:        run the chunk requests, concurrently with a cap when
+                       there is more than one; each worker runs in a copy of
+                       the caller's context so the Gemini lane follows it
+  - parse_json_items:  {id: entry} from a model reply, tolerant of code
+                       fences and surrounding text
+
+Items a reply leaves out (or that fail the caller's checks) are retried with
+the caller's single-item call, so a bad chunk degrades to the old behaviour.
+Rate-limit errors are the exception: run_chunks re-raises them, since
+splitting the chunk into single calls would only add requests to the quota
+that just ran out.
+
+Limits default from the environment:
+  LAUNCHWAY_GEMINI_BATCH_TOKENS    prompt tokens of items per request (default 6000)
+  LAUNCHWAY_GEMINI_BATCH_WORKERS   concurrent chunk requests (default 4)
+"""
+
+import contextvars
+import json
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from gemini_budget import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_TOKENS = 6000
+DEFAULT_BATCH_WORKERS = 4
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def batch_token_budget() -> int:
+    return _env_int("LAUNCHWAY_GEMINI_BATCH_TOKENS", DEFAULT_BATCH_TOKENS)
+
+
+def batch_workers() -> int:
+    return _env_int("LAUNCHWAY_GEMINI_BATCH_WORKERS", DEFAULT_BATCH_WORKERS)
+
+
+def chunk_by_tokens(
+    items: Sequence[str],
+    max_tokens: Optional[int] = None,
+    max_items: int = 10,
+) -> List[List[int]]:
+    """Indices of `items` (their prompt text) grouped into request-sized chunks.
+
+    A chunk closes when adding the next item would pass `max_tokens` or
+    `max_items`; an item larger than the budget gets a chunk of its own.
+    """
+    max_tokens = max_tokens or batch_token_budget()
+    chunks: List[List[int]] = []
+    current: List[int] = []
+    current_tokens = 0
+    for index, text in enumerate(items):
+        tokens = estimate_tokens(text)
+        if current and (current_tokens + tokens > max_tokens or len(current) >= max_items):
+            chunks.append(current)
+            current, current_tokens = [], 0
+        current.append(index)
+        current_tokens += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def run_chunks(
+    fn: Callable[[List[int]], Any],
+    chunks: List[List[int]],
+    max_workers: Optional[int] = None,
+) -> List[Any]:
+    """fn(chunk) for every chunk, results in chunk order.
+
+    A chunk whose request raises yields None (logged), leaving its items to
+    the caller's single-item fallback.  A rate-limit error (429 /
+    RESOURCE_EXHAUSTED / quota) is re-raised and chunks not yet started are
+    cancelled.
+    """
+    def call(chunk: List[int]) -> Any:
+        try:
+            return fn(chunk)
+        except Exception as e:
+            error_str = str(e)
+            if '429' in error_str or 'RESOURCE_EXHAUSTED' in error_str or 'quota' in error_str.lower():
+                raise
+            logger.warning("Batched Gemini request for %d item(s) failed: %s", len(chunk), e)
+            return None
+
+    workers = min(max_workers or batch_workers(), len(chunks))
+    if workers <= 1:
+        return [call(chunk) for chunk in chunks]
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gemini-batch") as pool:
+        futures = [pool.submit(contextvars.copy_context().run, call, chunk) for chunk in chunks]
+        try:
+            return [future.result() for future in futures]
+        except Exception:
+            for future in futures:
+                future.cancel()
+            raise
+
+
+def parse_json_items(text: str, key: str) -> Dict[int, Dict[str, Any]]:
+    """{id: entry} from a reply shaped like {"<key>": [{"id": 1, ...}, ...]}.
+
+    A bare JSON array is accepted too. Entries without an integer id are
+    dropped; an unparseable reply gives {}.
+    """
+    text = re.sub(r'```(?:json)?\s*', '', (text or '').strip())
+    match = re.search(r'[\[{].*[\]}]', text, re.DOTALL)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group())
+    except ValueError:
+        return {}
+    entries = data.get(key, []) if isinstance(data, dict) else data
+    parsed = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if isinstance(entry, dict) and isinstance(entry.get('id'), int):
+            parsed[entry['id']] = entry
+    return parsed
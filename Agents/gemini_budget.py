@@ -0,0 +1,415 @@
+"""
+Process-wide Gemini request budget.
+
+Every Gemini call in the process - the gemini_compat shim, GeminiKeyManager and
+GeminiRateLimiter, sync or async - draws from one shared budget, so limiters no
+longer wait on each other blindly:
+
+  - token buckets:        requests_per_minute and tokens_per_minute (prompt
+                          tokens, estimated up front and corrected from the
+                          response's usage metadata)
+  - max_in_flight:        concurrent requests across all callers
+  - rate-limit cooldown:  a 429 seen by any caller pauses new requests on the
+                          same API key for the backoff period, instead of every
+                          caller discovering the limit separately
+  - priority lanes:       when callers queue, form filling goes before default
+                          work, which goes before resume tailoring; the lane is
+                          taken from gemini_lane() (a context variable, so it
+                          follows asyncio tasks and asyncio.to_thread)
+  - metrics:              get_stats(), totals plus per-lane counters
+
+Sync callers block their thread while they wait; async callers await, so a
+rate-limit wait never parks a worker thread.
+
+A process default budget is always present (limits from LAUNCHWAY_GEMINI_RPM /
+LAUNCHWAY_GEMINI_TPM, unlimited when unset). set_gemini_budget() installs a
+different one, e.g. for the duration of a parallel run.
+"""
+
+import asyncio
+import hashlib
+import itertools
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Lower rank is served first when callers queue
+LANES = {"form_fill": 0, "default": 1, "tailoring": 2}
+DEFAULT_LANE = "default"
+
+_current_lane: ContextVar[str] = ContextVar("gemini_lane", default=DEFAULT_LANE)
+
+# Rough token costs used before the response reports real usage
+_CHARS_PER_TOKEN = 4
+_IMAGE_TOKENS = 258
+
+
+@contextmanager
+def gemini_lane(lane: str) -> Iterator[None]:
+    """Run the enclosed Gemini calls in `lane` (see LANES)."""
+    if lane not in LANES:
+        raise ValueError(f"Unknown Gemini lane {lane!r}; expected one of {sorted(LANES)}")
+    token = _current_lane.set(lane)
+    try:
+        yield
+    finally:
+        _current_lane.reset(token)
+
+
+def key_id(api_key: Optional[str]) -> str:
+    """Short, non-reversible id for an API key (cooldowns are tracked per key)."""
+    if not api_key:
+        return ""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:12]
+
+
+def estimate_tokens(contents: Any) -> int:
+    """Approximate prompt tokens of a generate_content `contents` argument."""
+    if contents is None:
+        return 0
+    if isinstance(contents, str):
+        return max(1, len(contents) // _CHARS_PER_TOKEN)
+    if isinstance(contents, (list, tuple)):
+        return sum(estimate_tokens(item) for item in contents)
+    if isinstance(contents, dict):
+        if "parts" in contents:
+            return estimate_tokens(contents["parts"])
+        if "inline_data" in contents or "mime_type" in contents:
+            return _IMAGE_TOKENS
+        return estimate_tokens(contents.get("text"))
+    if hasattr(contents, "save") and hasattr(contents, "mode"):  # PIL image
+        return _IMAGE_TOKENS
+    text = getattr(contents, "text", None)
+    return estimate_tokens(text if isinstance(text, str) else str(contents))
+
+
+def usage_prompt_tokens(response: Any) -> Optional[int]:
+    """Prompt tokens reported in a google-genai response, if any."""
+    usage = getattr(response, "usage_metadata", None)
+    count = getattr(usage, "prompt_token_count", None) if usage is not None else None
+    return count if isinstance(count, int) else None
+
+
+@dataclass
+class GeminiTicket:
+    """One admitted request; hand it back to GeminiBudget.release()."""
+    lane: str
+    key: str
+    tokens: int
+    started: float = field(default_factory=time.monotonic)
+    tokens_used: Optional[int] = None
+
+    def record_usage(self, response: Any) -> None:
+        """Take the real prompt-token count from a response for the token bucket."""
+        self.tokens_used = usage_prompt_tokens(response)
+
+
+class _Waiter:
+    __slots__ = ("rank", "seq", "lane", "key", "tokens", "loop", "event", "blocks_loop")
+
+    def __init__(self, rank, seq, lane, key, tokens):
+        self.rank = rank
+        self.seq = seq
+        self.lane = lane
+        self.key = key
+        self.tokens = tokens
+        self.loop = None  # set for async waiters: the loop they are woken on
+        self.event = None
+        self.blocks_loop = None  # set for sync waiters on an event-loop thread
+
+
+class GeminiBudget:
+    """Shared token-bucket limit on Gemini requests, prompt tokens and concurrency."""
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+    ):
+        self.requests_per_minute = requests_per_minute or None
+        self.max_in_flight = max_in_flight or None
+        self.tokens_per_minute = tokens_per_minute or None
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        # Buckets start full, so a burst of up to one minute's allowance goes through
+        self._request_bucket = float(self.requests_per_minute or 0)
+        self._token_bucket = float(self.tokens_per_minute or 0)
+        self._refilled_at = time.monotonic()
+        self._paused_until: Dict[str, float] = {}
+        self._waiting: List[_Waiter] = []
+        self._seq = itertools.count()
+        self.stats = {
+            "requests": 0, "waited": 0, "wait_seconds": 0.0, "rate_limited": 0,
+            "errors": 0, "tokens": 0, "call_seconds": 0.0,
+        }
+        self.lane_stats: Dict[str, Dict[str, float]] = {}
+
+    # ── admission (caller holds self._cond) ──────────────────────────────────
+
+    def _refill_locked(self, now: float) -> None:
+        elapsed = now - self._refilled_at
+        self._refilled_at = now
+        if self.requests_per_minute:
+            self._request_bucket = min(
+                float(self.requests_per_minute),
+                self._request_bucket + elapsed * self.requests_per_minute / 60,
+            )
+        if self.tokens_per_minute:
+            self._token_bucket = min(
+                float(self.tokens_per_minute),
+                self._token_bucket + elapsed * self.tokens_per_minute / 60,
+            )
+
+    def _try_start_locked(self, waiter: _Waiter) -> Optional[float]:
+        """
+        Admit `waiter` if its turn and the budget allow it.
+
+        Returns 0 when admitted, otherwise seconds to wait before trying again
+        (None = until another request starts or finishes).
+        """
+        now = time.monotonic()
+        self._refill_locked(now)
+        pause = self._paused_until.get(waiter.key, 0.0) - now
+        if pause > 0:
+            return pause
+        # Higher-priority (and, within a lane, earlier) callers go first, unless
+        # they are held by a cooldown on a different key
+        for other in self._waiting:
+            if other is waiter:
+                break
+            # A sync caller blocking a loop thread can't wait on async callers
+            # of that loop: they would never be woken to take their turn
+            if waiter.blocks_loop is not None and other.loop is waiter.blocks_loop:
+                continue
+            if self._paused_until.get(other.key, 0.0) <= now:
+                return None
+        if self.max_in_flight and self._in_flight >= self.max_in_flight:
+            return None
+        delay = 0.0
+        if self.requests_per_minute and self._request_bucket < 1:
+            delay = (1 - self._request_bucket) * 60 / self.requests_per_minute
+        if self.tokens_per_minute:
+            needed = min(waiter.tokens, self.tokens_per_minute)
+            if self._token_bucket < needed:
+                delay = max(delay, (needed - self._token_bucket) * 60 / self.tokens_per_minute)
+        if delay > 0:
+            return delay
+
+        if self.requests_per_minute:
+            self._request_bucket -= 1
+        if self.tokens_per_minute:
+            self._token_bucket -= waiter.tokens
+        self._in_flight += 1
+        self._waiting.remove(waiter)
+        self._notify_locked()
+        return 0.0
+
+    def _notify_locked(self) -> None:
+        self._cond.notify_all()
+        for waiter in self._waiting:
+            if waiter.loop is not None:
+                try:
+                    waiter.loop.call_soon_threadsafe(waiter.event.set)
+                except RuntimeError:
+                    pass  # loop already closed
+
+    def _enqueue(self, lane: Optional[str], tokens: int, key: str) -> _Waiter:
+        lane = lane or _current_lane.get()
+        waiter = _Waiter(LANES.get(lane, LANES[DEFAULT_LANE]), next(self._seq), lane, key, max(0, int(tokens)))
+        self._waiting.append(waiter)
+        self._waiting.sort(key=lambda w: (w.rank, w.seq))
+        return waiter
+
+    def _abandon_locked(self, waiter: _Waiter) -> None:
+        if waiter in self._waiting:
+            self._waiting.remove(waiter)
+            self._notify_locked()
+
+    def _admitted(self, waiter: _Waiter, queued_at: float) -> GeminiTicket:
+        waited = time.monotonic() - queued_at
+        with self._cond:
+            lane = self._lane_locked(waiter.lane)
+            for counters in (self.stats, lane):
+                counters["requests"] += 1
+                if waited > 0.01:
+                    counters["waited"] += 1
+                    counters["wait_seconds"] += waited
+        return GeminiTicket(lane=waiter.lane, key=waiter.key, tokens=waiter.tokens)
+
+    def _lane_locked(self, lane: str) -> Dict[str, float]:
+        return self.lane_stats.setdefault(
+            lane,
+            {"requests": 0, "waited": 0, "wait_seconds": 0.0, "errors": 0, "tokens": 0, "call_seconds": 0.0},
+        )
+
+    # ── public API ───────────────────────────────────────────────────────────
+
+    def acquire(self, lane: Optional[str] = None, tokens: int = 0, key: str = "") -> GeminiTicket:
+        """Block the calling thread until a request may start.
+
+        Prefer acquire_async on an event-loop thread; when called there anyway,
+        this does not queue behind async waiters of that loop.
+        """
+        queued_at = time.monotonic()
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        with self._cond:
+            waiter = self._enqueue(lane, tokens, key)
+            waiter.blocks_loop = running_loop
+            try:
+                while True:
+                    delay = self._try_start_locked(waiter)
+                    if delay == 0:
+                        break
+                    self._cond.wait(timeout=1.0 if delay is None else delay)
+            except BaseException:
+                self._abandon_locked(waiter)
+                raise
+        return self._admitted(waiter, queued_at)
+
+    async def acquire_async(self, lane: Optional[str] = None, tokens: int = 0, key: str = "") -> GeminiTicket:
+        """Await (without holding a thread) until a request may start."""
+        queued_at = time.monotonic()
+        with self._cond:
+            waiter = self._enqueue(lane, tokens, key)
+            waiter.loop = asyncio.get_running_loop()
+            waiter.event = asyncio.Event()
+        try:
+            while True:
+                with self._cond:
+                    delay = self._try_start_locked(waiter)
+                    if delay == 0:
+                        break
+                    waiter.event.clear()
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), timeout=1.0 if delay is None else delay)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            with self._cond:
+                self._abandon_locked(waiter)
+            raise
+        return self._admitted(waiter, queued_at)
+
+    def release(self, ticket: Optional[GeminiTicket] = None, error: bool = False) -> None:
+        with self._cond:
+            self._in_flight = max(0, self._in_flight - 1)
+            if ticket is not None:
+                tokens = ticket.tokens if ticket.tokens_used is None else ticket.tokens_used
+                if self.tokens_per_minute and ticket.tokens_used is not None:
+                    # Correct the up-front estimate with the real prompt size
+                    self._token_bucket = min(
+                        float(self.tokens_per_minute),
+                        self._token_bucket - (ticket.tokens_used - ticket.tokens),
+                    )
+                lane = self._lane_locked(ticket.lane)
+                elapsed = time.monotonic() - ticket.started
+                for counters in (self.stats, lane):
+                    counters["tokens"] += tokens
+                    counters["call_seconds"] += elapsed
+                    if error:
+                        counters["errors"] += 1
+            self._notify_locked()
+
+    @contextmanager
+    def slot(self, lane: Optional[str] = None, tokens: int = 0, key: str = "") -> Iterator[GeminiTicket]:
+        ticket = self.acquire(lane, tokens, key)
+        error = False
+        try:
+            yield ticket
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.release(ticket, error=error)
+
+    @asynccontextmanager
+    async def slot_async(self, lane: Optional[str] = None, tokens: int = 0, key: str = "") -> AsyncIterator[GeminiTicket]:
+        ticket = await self.acquire_async(lane, tokens, key)
+        error = False
+        try:
+            yield ticket
+        except BaseException:
+            error = True
+            raise
+        finally:
+            self.release(ticket, error=error)
+
+    def note_rate_limited(self, backoff_seconds: float, key: str = "") -> None:
+        """Pause every caller using `key` after a 429 from any one of them."""
+        with self._cond:
+            self._paused_until[key] = max(self._paused_until.get(key, 0.0), time.monotonic() + backoff_seconds)
+            self.stats["rate_limited"] += 1
+            self._notify_locked()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self.stats)
+            lanes = {name: dict(counters) for name, counters in self.lane_stats.items()}
+            stats["in_flight"] = self._in_flight
+            stats["queued"] = len(self._waiting)
+        for counters in [stats] + list(lanes.values()):
+            counters["wait_seconds"] = round(counters["wait_seconds"], 2)
+            counters["call_seconds"] = round(counters["call_seconds"], 2)
+        stats["lanes"] = lanes
+        return stats
+
+
+_budget: Optional[GeminiBudget] = None
+_default_budget: Optional[GeminiBudget] = None
+_default_budget_lock = threading.Lock()
+
+
+def get_gemini_budget() -> Optional[GeminiBudget]:
+    """The budget installed with set_gemini_budget() (None when only the default is in use)."""
+    return _budget
+
+
+def set_gemini_budget(budget: Optional[GeminiBudget]) -> Optional[GeminiBudget]:
+    """Install (or clear, with None) a process-wide budget; returns the previous one."""
+    global _budget
+    previous, _budget = _budget, budget
+    return previous
+
+
+def current_gemini_budget() -> GeminiBudget:
+    """The budget Gemini calls draw from: the installed one, else the process default."""
+    global _default_budget
+    budget = _budget
+    if budget is not None:
+        return budget
+    with _default_budget_lock:
+        if _default_budget is None:
+            _default_budget = GeminiBudget(
+                requests_per_minute=int(os.getenv("LAUNCHWAY_GEMINI_RPM", "0") or 0) or None,
+                tokens_per_minute=int(os.getenv("LAUNCHWAY_GEMINI_TPM", "0") or 0) or None,
+            )
+        return _default_budget
+
+
+@contextmanager
+def gemini_call_slot(tokens: int = 0, key: str = "") -> Iterator[GeminiTicket]:
+    """Hold a slot of the current budget for one request."""
+    with current_gemini_budget().slot(tokens=tokens, key=key) as ticket:
+        yield ticket
+
+
+@asynccontextmanager
+async def gemini_call_slot_async(tokens: int = 0, key: str = "") -> AsyncIterator[GeminiTicket]:
+    """Await a slot of the current budget for one request."""
+    async with current_gemini_budget().slot_async(tokens=tokens, key=key) as ticket:
+        yield ticket
+
+
+def note_gemini_rate_limited(backoff_seconds: float, key: str = "") -> None:
+    current_gemini_budget().note_rate_limited(backoff_seconds, key)
@@ -17,44 +17,109 @@ Usage in agent files:
 import logging
 import os
 import random
-import time
-import asyncio
 import base64
 from io import BytesIO
 from typing import Any
 
 from google import genai as _genai_new
 
+from gemini_budget import (
+    estimate_tokens,
+    gemini_call_slot,
+    gemini_call_slot_async,
+    key_id,
+    note_gemini_rate_limited,
+)
+from gemini_response_cache import lookup_cached_response, store_cached_response
+
 logger = logging.getLogger(__name__)
 
 
+def _is_rate_limit_error(exc: Exception) -> bool:
+    err = str(exc)
+    return "429" in err or "RESOURCE_EXHAUSTED" in err
+
+
+def _backoff_seconds(attempt: int) -> float:
+    return (2 ** (attempt + 1)) + random.uniform(-0.5, 0.5)
+
+
+def _budget_key(fn) -> str:
+    """Budget key (see gemini_budget.key_id) of a bound client.models method."""
+    api_client = getattr(getattr(fn, "__self__", None), "_api_client", None)
+    return key_id(getattr(api_client, "api_key", None))
+
+
+def _log_backoff(wait: float, attempt: int, max_retries: int) -> None:
+    logger.warning(
+        f"Gemini 429 rate-limit hit — backing off {wait:.1f}s "
+        f"(attempt {attempt + 1}/{max_retries})"
+    )
+    print(
+        f"[WARN] Gemini rate limit (429) — retrying in {wait:.1f}s "
+        f"(attempt {attempt + 1}/{max_retries})"
+    )
+
+
 def _call_with_backoff(fn, *args, max_retries: int = 6, **kwargs) -> Any:
     """
     Call *fn(*args, **kwargs)* with exponential backoff on 429 / RESOURCE_EXHAUSTED.
 
     Wait schedule (seconds): 2, 4, 8, 16, 32, 64  (+jitter ±0.5s each)
     After max_retries attempts the last exception is re-raised.
+
+    Each attempt holds a slot of the process-wide Gemini budget (see
+    gemini_budget).  A 429 pauses every caller using the same API key for the
+    backoff period; the next attempt waits out that pause when it asks the
+    budget for a slot.
+
+    Inside gemini_response_cache.cache_gemini_responses() a cached response
+    for the same model, prompt, config and images is returned instead.
     """
+    cache_key, cached = lookup_cached_response(kwargs.get("model"), kwargs.get("contents"), kwargs.get("config"))
+    if cached is not None:
+        return cached
+    key = _budget_key(fn)
+    tokens = estimate_tokens(kwargs.get("contents"))
     for attempt in range(max_retries):
         try:
-            return fn(*args, **kwargs)
+            with gemini_call_slot(tokens=tokens, key=key) as ticket:
+                response = fn(*args, **kwargs)
+                ticket.record_usage(response)
+            store_cached_response(cache_key, response)
+            return response
         except Exception as exc:
-            err = str(exc)
-            if "429" in err or "RESOURCE_EXHAUSTED" in err:
-                if attempt == max_retries - 1:
-                    raise
-                wait = (2 ** (attempt + 1)) + random.uniform(-0.5, 0.5)
-                logger.warning(
-                    f"Gemini 429 rate-limit hit — backing off {wait:.1f}s "
-                    f"(attempt {attempt + 1}/{max_retries})"
-                )
-                print(
-                    f"[WARN] Gemini rate limit (429) — retrying in {wait:.1f}s "
-                    f"(attempt {attempt + 1}/{max_retries})"
-                )
-                time.sleep(wait)
-            else:
+            if not _is_rate_limit_error(exc) or attempt == max_retries - 1:
                 raise
+            wait = _backoff_seconds(attempt)
+            note_gemini_rate_limited(wait, key)
+            _log_backoff(wait, attempt, max_retries)
+
+
+async def _call_with_backoff_async(fn, *args, max_retries: int = 6, **kwargs) -> Any:
+    """
+    Awaitable _call_with_backoff for coroutine functions (client.aio...).
+
+    Budget waits and backoff pauses are awaited, so they never hold a thread.
+    """
+    cache_key, cached = lookup_cached_response(kwargs.get("model"), kwargs.get("contents"), kwargs.get("config"))
+    if cached is not None:
+        return cached
+    key = _budget_key(fn)
+    tokens = estimate_tokens(kwargs.get("contents"))
+    for attempt in range(max_retries):
+        try:
+            async with gemini_call_slot_async(tokens=tokens, key=key) as ticket:
+                response = await fn(*args, **kwargs)
+                ticket.record_usage(response)
+            store_cached_response(cache_key, response)
+            return response
+        except Exception as exc:
+            if not _is_rate_limit_error(exc) or attempt == max_retries - 1:
+                raise
+            wait = _backoff_seconds(attempt)
+            note_gemini_rate_limited(wait, key)
+            _log_backoff(wait, attempt, max_retries)
 
 # Module-level key set via genai.configure()
 _API_KEY: str = ""
@@ -151,6 +216,10 @@ class GenerationConfig:
                 params["top_p"] = self.top_p
             if self.top_k is not None:
                 params["top_k"] = self.top_k
+            # Other fields the new SDK knows (e.g. response_mime_type for JSON output)
+            for name, value in self._extra.items():
+                if name in _types.GenerateContentConfig.model_fields:
+                    params[name] = value
             return _types.GenerateContentConfig(**params)
         except Exception:
             return None
@@ -223,7 +292,8 @@ class GenerativeModel:
 
         return [{"role": "user", "parts": [self._content_item_to_part(contents)]}]
 
-    def generate_content(self, contents: Any, **kwargs) -> _CompatResponse:
+    def _prepare_call(self, contents: Any, kwargs: dict) -> tuple:
+        """Client and generate_content kwargs for one call (shared by sync/async)."""
         api_key = _get_api_key()
         if not api_key:
             raise ValueError(
@@ -244,12 +314,18 @@ class GenerativeModel:
         call_kwargs = {"model": self.model_name, "contents": self._normalize_contents(contents)}
         if gen_config is not None:
             call_kwargs["config"] = gen_config
+        return client, call_kwargs
+
+    def generate_content(self, contents: Any, **kwargs) -> _CompatResponse:
+        client, call_kwargs = self._prepare_call(contents, kwargs)
         raw = _call_with_backoff(client.models.generate_content, **call_kwargs)
         return _CompatResponse(_extract_text(raw))
 
     async def generate_content_async(self, contents: Any, **kwargs) -> _CompatResponse:
-        """Async compatibility wrapper for old google.generativeai callers."""
-        return await asyncio.to_thread(self.generate_content, contents, **kwargs)
+        """Native async call (client.aio) for old google.generativeai callers."""
+        client, call_kwargs = self._prepare_call(contents, kwargs)
+        raw = await _call_with_backoff_async(client.aio.models.generate_content, **call_kwargs)
+        return _CompatResponse(_extract_text(raw))
 
 
 # ── Namespace object ─────────────────────────────────────────────────────────
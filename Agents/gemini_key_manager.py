@@ -8,7 +8,14 @@ Fallback algorithm:
   4. Still failing → 60-second cooldown, then final retry of primary.
   5. Still failing → raise GeminiQuotaExhaustedError with a user-facing message.
 
-Usage (sync or async; both thin wrappers are provided):
+Every attempt draws from the process-wide Gemini budget (gemini_budget), and the
+cooldown is registered there as a pause on the primary key, so other callers
+using that key back off too.  The async variant calls the SDK's native async
+client and awaits budget waits and the cooldown.  Calls made inside
+gemini_response_cache.cache_gemini_responses() are served from the response
+cache when possible.
+
+Usage (sync or async):
     mgr = GeminiKeyManager(
         primary_mode="custom",
         secondary_mode="launchway",
@@ -21,8 +28,10 @@ Usage (sync or async; both thin wrappers are provided):
 import asyncio
 import logging
 import os
-import time
-from typing import Any, Callable, Optional
+from typing import Any, Callable, List, Optional, Tuple
+
+from gemini_budget import current_gemini_budget, estimate_tokens, key_id
+from gemini_response_cache import lookup_cached_response, store_cached_response
 
 logger = logging.getLogger(__name__)
 
@@ -122,13 +131,18 @@ class GeminiKeyManager:
             legacy_kwargs["generation_config"] = kwargs["config"]
         return model_obj.generate_content(contents, **legacy_kwargs)
 
-    # ── public synchronous interface ─────────────────────────────────────────
+    async def _attempt_async(self, api_key: str, model: str, contents: Any, **kwargs) -> Any:
+        """Make one Gemini call with the given key on the SDK's async client."""
+        try:
+            from google import genai as _genai
+        except ImportError:
+            # Legacy SDK has no native async client
+            return await asyncio.to_thread(self._attempt, api_key, model, contents, **kwargs)
+        client = _genai.Client(api_key=api_key)
+        return await client.aio.models.generate_content(model=model, contents=contents, **kwargs)
 
-    def generate_content(self, model: str, contents: Any, **kwargs) -> Any:
-        """
-        Call Gemini with automatic primary → secondary → cooldown → retry fallback.
-        Raises GeminiQuotaExhaustedError if all attempts fail.
-        """
+    def _attempt_plan(self) -> List[Tuple[str, str, bool]]:
+        """(step name, api key, cooldown first) for each step of the fallback algorithm."""
         if not self.is_configured:
             raise AiEngineNotConfiguredError(
                 "AI Engine is not set up yet. Please configure your primary API key method "
@@ -143,59 +157,85 @@ class GeminiKeyManager:
                 "No API key available. If you chose 'custom', make sure you've saved a valid Gemini key."
             )
 
-        # Step 1 - primary
-        try:
-            logger.debug(f"[GeminiKeyManager] Trying primary ({self.primary_mode})")
-            return self._attempt(primary_key, model, contents, **kwargs)
-        except Exception as e1:
-            if not _is_quota_error(e1):
-                raise  # not a quota issue - propagate immediately
-            logger.warning(f"[GeminiKeyManager] Primary quota hit: {e1}")
-
-        # Step 2 - secondary (if configured)
+        plan = [(f"primary ({self.primary_mode})", primary_key, False)]
         if secondary_key:
-            try:
-                logger.debug(f"[GeminiKeyManager] Trying secondary ({self.secondary_mode})")
-                return self._attempt(secondary_key, model, contents, **kwargs)
-            except Exception as e2:
-                if not _is_quota_error(e2):
-                    raise
-                logger.warning(f"[GeminiKeyManager] Secondary quota hit: {e2}")
+            plan.append((f"secondary ({self.secondary_mode})", secondary_key, False))
+        plan.append(("primary retry", primary_key, False))
+        plan.append(("primary after cooldown", primary_key, True))
+        return plan
 
-        # Step 3 - retry primary once immediately
-        try:
-            logger.debug("[GeminiKeyManager] Retrying primary immediately")
-            return self._attempt(primary_key, model, contents, **kwargs)
-        except Exception as e3:
-            if not _is_quota_error(e3):
-                raise
-            logger.warning(f"[GeminiKeyManager] Primary retry failed: {e3}")
-
-        # Step 4 - cooldown then final attempt
+    def _start_cooldown(self, budget, api_key: str) -> None:
         logger.warning(
             f"[GeminiKeyManager] All keys exhausted. Cooling down for {self.cooldown_seconds}s …"
         )
-        time.sleep(self.cooldown_seconds)
+        # The next slot on this key waits until the pause ends
+        budget.note_rate_limited(self.cooldown_seconds, key_id(api_key))
+
+    @staticmethod
+    def _exhausted() -> GeminiQuotaExhaustedError:
+        return GeminiQuotaExhaustedError(
+            "Gemini API quota exhausted on all configured keys after a cooldown retry. "
+            "Please wait a few minutes and try again, or add a secondary API key in your AI Engine settings."
+        )
 
-        try:
-            logger.debug("[GeminiKeyManager] Final attempt after cooldown")
-            return self._attempt(primary_key, model, contents, **kwargs)
-        except Exception as e4:
-            if not _is_quota_error(e4):
-                raise
-            raise GeminiQuotaExhaustedError(
-                "Gemini API quota exhausted on all configured keys after a cooldown retry. "
-                "Please wait a few minutes and try again, or add a secondary API key in your AI Engine settings."
-            ) from e4
+    # ── public synchronous interface ─────────────────────────────────────────
+
+    def generate_content(self, model: str, contents: Any, **kwargs) -> Any:
+        """
+        Call Gemini with automatic primary → secondary → cooldown → retry fallback.
+        Raises GeminiQuotaExhaustedError if all attempts fail.
+        """
+        plan = self._attempt_plan()
+        cache_key, cached = lookup_cached_response(model, contents, kwargs.get("config"))
+        if cached is not None:
+            return cached
+        budget = current_gemini_budget()
+        tokens = estimate_tokens(contents)
+        last_error = None
+        for step, api_key, cooldown in plan:
+            if cooldown:
+                self._start_cooldown(budget, api_key)
+            try:
+                logger.debug(f"[GeminiKeyManager] Trying {step}")
+                with budget.slot(tokens=tokens, key=key_id(api_key)) as ticket:
+                    response = self._attempt(api_key, model, contents, **kwargs)
+                    ticket.record_usage(response)
+                store_cached_response(cache_key, response)
+                return response
+            except Exception as e:
+                if not _is_quota_error(e):
+                    raise  # not a quota issue - propagate immediately
+                logger.warning(f"[GeminiKeyManager] {step} quota hit: {e}")
+                last_error = e
+        raise self._exhausted() from last_error
 
     # ── public async interface ────────────────────────────────────────────────
 
     async def generate_content_async(self, model: str, contents: Any, **kwargs) -> Any:
-        """Async variant - runs the synchronous logic in a thread executor."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(
-            None, lambda: self.generate_content(model, contents, **kwargs)
-        )
+        """Async variant - same fallback, with budget waits and the cooldown awaited."""
+        plan = self._attempt_plan()
+        cache_key, cached = lookup_cached_response(model, contents, kwargs.get("config"))
+        if cached is not None:
+            return cached
+        budget = current_gemini_budget()
+        tokens = estimate_tokens(contents)
+        last_error = None
+        for step, api_key, cooldown in plan:
+            if cooldown:
+                self._start_cooldown(budget, api_key)
+            try:
+                logger.debug(f"[GeminiKeyManager] Trying {step}")
+                async with budget.slot_async(tokens=tokens, key=key_id(api_key)) as ticket:
+                    response = await self._attempt_async(api_key, model, contents, **kwargs)
+                    ticket.record_usage(response)
+                store_cached_response(cache_key, response)
+                return response
+            except Exception as e:
+                if not _is_quota_error(e):
+                    raise
+                logger.warning(f"[GeminiKeyManager] {step} quota hit: {e}")
+                last_error = e
+        raise self._exhausted() from last_error
 
     # ── convenience: build from profile dict ─────────────────────────────────
 
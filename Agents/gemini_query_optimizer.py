@@ -9,6 +9,7 @@ import json
 import re
 from typing import Dict, Any, List, Optional
 from gemini_compat import genai
+from gemini_response_cache import cache_gemini_responses
 
 logger = logging.getLogger(__name__)
 
@@ -60,8 +61,9 @@ class GeminiQueryOptimizer:
             # Build prompt for Gemini
             prompt = self._build_optimization_prompt(user_keywords, location, profile_data)
             
-            # Generate optimized queries
-            response = self.model.generate_content(prompt)
+            # Generate optimized queries (same profile + keywords → same prompt)
+            with cache_gemini_responses("search_query", ttl_seconds=24 * 3600):
+                response = self.model.generate_content(prompt)
             result_text = response.text.strip()
             
             # Parse Gemini's response
@@ -223,7 +225,8 @@ Output JSON schema:
                 user_hours_old=user_hours_old
             )
 
-            response = self.model.generate_content(prompt)
+            with cache_gemini_responses("jobspy_params", ttl_seconds=24 * 3600):
+                response = self.model.generate_content(prompt)
             result_text = (response.text or "").strip()
             parsed = self._parse_json_from_text(result_text)
             if not isinstance(parsed, dict):
@@ -3,63 +3,65 @@ Gemini API Rate Limiter with Exponential Backoff
 Handles 429 RESOURCE_EXHAUSTED errors and queues requests
 """
 
-import time
+import re
 import functools
 from typing import Any, Callable
 from google import genai
 from google.api_core import exceptions
 
+from gemini_budget import (
+    GeminiBudget,
+    estimate_tokens,
+    gemini_call_slot,
+    gemini_call_slot_async,
+    key_id,
+    note_gemini_rate_limited,
+)
+
+
+def _is_rate_limit_error(error_str: str) -> bool:
+    return (
+        '429' in error_str or
+        'RESOURCE_EXHAUSTED' in error_str or
+        'quota' in error_str.lower()
+    )
+
+
+def _retry_delay(error_str: str) -> int:
+    """Wait suggested by the API error (retryDelay), else 60 seconds."""
+    match = re.search(r"'retryDelay':\s*'(\d+)s'", error_str)
+    return int(match.group(1)) if match else 60
+
+
+def _client_key(client: Any) -> str:
+    return key_id(getattr(getattr(client, "_api_client", None), "api_key", None))
+
 
 class GeminiRateLimiter:
     """
     Rate limiter for Gemini API calls with automatic retry and backoff.
 
     Free tier: 10 requests per minute
-    Strategy: Wait 60 seconds when rate limit hit, then retry
+    Strategy: Wait 60 seconds (or the API's retryDelay) when rate limit hit, then retry
+
+    requests_per_minute caps this limiter's callers; every attempt also holds a
+    slot of the process-wide Gemini budget (gemini_budget), so a 429 seen here
+    pauses the gemini_compat shim and GeminiKeyManager on the same key, and
+    vice versa.  Waits block the thread in call_with_retry and are awaited in
+    call_with_retry_async.
     """
 
     def __init__(self, requests_per_minute: int = 10):
         self.requests_per_minute = requests_per_minute
-        self.request_timestamps = []
-        self.last_rate_limit_time = None
-
-    def _clean_old_requests(self):
-        """Remove request timestamps older than 1 minute."""
-        current_time = time.time()
-        self.request_timestamps = [
-            ts for ts in self.request_timestamps
-            if current_time - ts < 60
-        ]
-
-    def _wait_if_needed(self):
-        """Wait if we're approaching rate limit."""
-        self._clean_old_requests()
-
-        # If we've hit rate limit recently, wait
-        if self.last_rate_limit_time:
-            time_since_limit = time.time() - self.last_rate_limit_time
-            if time_since_limit < 60:
-                wait_time = 60 - time_since_limit
-                print(f"⏳ Rate limit cooldown: waiting {wait_time:.0f} seconds...")
-                time.sleep(wait_time)
-                self.last_rate_limit_time = None
-
-        # If we're at capacity, wait until oldest request expires
-        if len(self.request_timestamps) >= self.requests_per_minute:
-            oldest_request = self.request_timestamps[0]
-            time_since_oldest = time.time() - oldest_request
-            wait_time = 60 - time_since_oldest + 1  # +1 for safety margin
-
-            if wait_time > 0:
-                print(f"⏳ Approaching rate limit: waiting {wait_time:.0f} seconds...")
-                time.sleep(wait_time)
-                self._clean_old_requests()
+        self._local_budget = GeminiBudget(requests_per_minute=requests_per_minute)
 
     def call_with_retry(
         self,
         func: Callable,
         *args,
         max_retries: int = 3,
+        tokens: int = 0,
+        key: str = "",
         **kwargs
     ) -> Any:
         """
@@ -69,6 +71,8 @@ class GeminiRateLimiter:
             func: The API function to call (e.g., client.models.generate_content)
             *args, **kwargs: Arguments to pass to func
             max_retries: Maximum number of retry attempts
+            tokens: Estimated prompt tokens (for the shared tokens-per-minute bucket)
+            key: Budget key of the API key in use (gemini_budget.key_id)
 
         Returns:
             API response
@@ -78,53 +82,55 @@ class GeminiRateLimiter:
         """
         for attempt in range(max_retries + 1):
             try:
-                # Wait if needed before making request
-                self._wait_if_needed()
+                with self._local_budget.slot(), gemini_call_slot(tokens=tokens, key=key) as ticket:
+                    response = func(*args, **kwargs)
+                    ticket.record_usage(response)
+                    return response
 
-                # Make the API call
-                response = func(*args, **kwargs)
+            except Exception as e:
+                if not self._handle_rate_limit(e, attempt, max_retries, key):
+                    raise
 
-                # Record successful request
-                self.request_timestamps.append(time.time())
+        raise Exception("Max retries exceeded")
 
-                return response
+    async def call_with_retry_async(
+        self,
+        func: Callable,
+        *args,
+        max_retries: int = 3,
+        tokens: int = 0,
+        key: str = "",
+        **kwargs
+    ) -> Any:
+        """call_with_retry for coroutine functions (e.g. client.aio.models.generate_content)."""
+        for attempt in range(max_retries + 1):
+            try:
+                async with self._local_budget.slot_async(), gemini_call_slot_async(tokens=tokens, key=key) as ticket:
+                    response = await func(*args, **kwargs)
+                    ticket.record_usage(response)
+                    return response
 
             except Exception as e:
-                # Check if it's a rate limit error
-                error_str = str(e)
-                is_rate_limit = (
-                    '429' in error_str or
-                    'RESOURCE_EXHAUSTED' in error_str or
-                    'quota' in error_str.lower()
-                )
-
-                if is_rate_limit:
-                    self.last_rate_limit_time = time.time()
-
-                    if attempt < max_retries:
-                        # Extract wait time from error if available
-                        wait_time = 60  # Default
-                        if 'retryDelay' in error_str:
-                            try:
-                                import re
-                                match = re.search(r"'retryDelay':\s*'(\d+)s'", error_str)
-                                if match:
-                                    wait_time = int(match.group(1))
-                            except:
-                                pass
-
-                        print(f"⚠️  Rate limit hit. Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}...")
-                        time.sleep(wait_time)
-                        continue
-                    else:
-                        print(f"❌ Rate limit exceeded. All {max_retries} retries exhausted.")
-                        raise
-                else:
-                    # Non-rate-limit error, raise immediately
+                if not self._handle_rate_limit(e, attempt, max_retries, key):
                     raise
 
         raise Exception("Max retries exceeded")
 
+    def _handle_rate_limit(self, error: Exception, attempt: int, max_retries: int, key: str) -> bool:
+        """Register a 429 with the shared budget; True when the call should be retried."""
+        error_str = str(error)
+        if not _is_rate_limit_error(error_str):
+            return False  # Non-rate-limit error, raise immediately
+        if attempt >= max_retries:
+            print(f"❌ Rate limit exceeded. All {max_retries} retries exhausted.")
+            return False
+
+        wait_time = _retry_delay(error_str)
+        print(f"⚠️  Rate limit hit. Waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}...")
+        # The retry's budget slot waits out this pause
+        note_gemini_rate_limited(wait_time, key)
+        return True
+
 
 # Global rate limiter instance
 _global_rate_limiter = None
@@ -158,21 +164,42 @@ def generate_content_with_retry(
         )
     """
     rate_limiter = get_rate_limiter()
+    call_kwargs = {"model": model, "contents": contents}
+    if config:
+        call_kwargs["config"] = config
 
-    def api_call():
-        if config:
-            return client.models.generate_content(
-                model=model,
-                contents=contents,
-                config=config
-            )
-        else:
-            return client.models.generate_content(
-                model=model,
-                contents=contents
-            )
+    return rate_limiter.call_with_retry(
+        client.models.generate_content,
+        max_retries=max_retries,
+        tokens=estimate_tokens(contents),
+        key=_client_key(client),
+        **call_kwargs
+    )
 
-    return rate_limiter.call_with_retry(api_call, max_retries=max_retries)
+
+async def generate_content_with_retry_async(
+    client: genai.Client,
+    model: str,
+    contents: Any,
+    config: Any = None,
+    max_retries: int = 3
+) -> Any:
+    """
+    Async generate_content_with_retry on the SDK's native async client
+    (client.aio); rate-limit waits are awaited instead of sleeping a thread.
+    """
+    rate_limiter = get_rate_limiter()
+    call_kwargs = {"model": model, "contents": contents}
+    if config:
+        call_kwargs["config"] = config
+
+    return await rate_limiter.call_with_retry_async(
+        client.aio.models.generate_content,
+        max_retries=max_retries,
+        tokens=estimate_tokens(contents),
+        key=_client_key(client),
+        **call_kwargs
+    )
 
 
 def batch_requests_with_delay(
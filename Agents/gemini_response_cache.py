@@ -0,0 +1,309 @@
+"""
+Content-addressed cache for Gemini responses
+
+Several call sites send byte-identical prompts over and over - keyword
+extraction for an unchanged resume, search-query optimization for the same
+profile and keywords, dropdown selection for the same option list on the same
+ATS.  This module caches response text keyed by a hash of
+
+    model + normalized prompt text + generation config + image digests
+
+and is consulted by the shared Gemini call path (gemini_compat._call_with_backoff
+and GeminiKeyManager).  Caching is opt-in per call site:
+
+    with cache_gemini_responses("resume_keywords", ttl_seconds=7 * 86400):
+        response = model.generate_content(prompt)
+
+  - size-bounded SQLite store under ~/.launchway for the CLI, Redis for the
+    server (REDIS_URL) - the same backends as job_search_cache
+  - per-namespace hit / miss / store counters and prompt tokens saved via
+    get_stats()
+
+Only non-empty responses are cached.  Set LAUNCHWAY_GEMINI_CACHE=off to
+disable caching everywhere.
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from job_search_cache import RedisSearchCacheBackend, SQLiteSearchCacheBackend, _build_redis_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 24 * 3600
+DEFAULT_CACHE_PATH = Path.home() / ".launchway" / "gemini_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 5000
+KEY_PREFIX = "gemini:"
+
+
+@dataclass(frozen=True)
+class _CachePolicy:
+    namespace: str
+    ttl_seconds: float
+
+
+_policy: ContextVar[Optional[_CachePolicy]] = ContextVar("gemini_cache_policy", default=None)
+
+
+@contextmanager
+def cache_gemini_responses(namespace: str, ttl_seconds: float = DEFAULT_TTL) -> Iterator[None]:
+    """Serve the enclosed Gemini calls from the response cache (stats are kept per namespace)."""
+    token = _policy.set(_CachePolicy(namespace, ttl_seconds))
+    try:
+        yield
+    finally:
+        _policy.reset(token)
+
+
+# ── Keys ─────────────────────────────────────────────────────────────────────
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _digest(data: Any) -> str:
+    if isinstance(data, str):
+        data = data.encode("ascii", errors="ignore")
+    return hashlib.sha256(data).hexdigest()
+
+
+def _canonical_contents(contents: Any) -> Any:
+    """Prompt text normalized, images replaced by a digest of their bytes."""
+    if contents is None:
+        return None
+    if isinstance(contents, str):
+        return _normalize_text(contents)
+    if isinstance(contents, (bytes, bytearray)):
+        return {"blob": _digest(bytes(contents))}
+    if isinstance(contents, (list, tuple)):
+        return [_canonical_contents(item) for item in contents]
+    if isinstance(contents, dict):
+        if "inline_data" in contents:
+            return {"image": _canonical_contents(contents["inline_data"])}
+        if "data" in contents and "mime_type" in contents:
+            data = contents["data"]
+            if isinstance(data, str):
+                try:
+                    data = base64.b64decode(data)
+                except Exception:
+                    pass
+            return {"mime_type": contents["mime_type"], "digest": _digest(data)}
+        return {str(k): _canonical_contents(v) for k, v in sorted(contents.items())}
+    if hasattr(contents, "save") and hasattr(contents, "mode"):  # PIL image
+        from io import BytesIO
+        buffer = BytesIO()
+        contents.save(buffer, format="PNG")
+        return {"image": _digest(buffer.getvalue())}
+    if hasattr(contents, "model_dump"):  # google.genai types
+        return _canonical_contents(contents.model_dump(exclude_none=True))
+    return _normalize_text(str(contents))
+
+
+def _canonical_config(config: Any) -> Any:
+    if config is None:
+        return None
+    if isinstance(config, dict):
+        return {k: v for k, v in config.items() if v is not None}
+    if hasattr(config, "model_dump"):  # google.genai GenerateContentConfig
+        return config.model_dump(exclude_none=True, mode="json")
+    if hasattr(config, "__dict__"):  # gemini_compat.GenerationConfig
+        return {k: v for k, v in vars(config).items() if v is not None and v != {}}
+    return repr(config)
+
+
+def gemini_cache_key(model: str, contents: Any, config: Any = None) -> str:
+    """Content address of one generate_content request."""
+    canonical = {
+        "model": model,
+        "contents": _canonical_contents(contents),
+        "config": _canonical_config(config),
+    }
+    digest = hashlib.sha256(
+        json.dumps(canonical, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"{KEY_PREFIX}{digest[:40]}"
+
+
+# ── Responses ────────────────────────────────────────────────────────────────
+
+class _CachedPart:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _CachedContent:
+    def __init__(self, text: str):
+        self.parts = [_CachedPart(text)]
+
+
+class _CachedCandidate:
+    def __init__(self, text: str):
+        self.content = _CachedContent(text)
+
+
+class CachedGeminiResponse:
+    """Stands in for a generate_content response (.text and .candidates)."""
+
+    cached = True
+    usage_metadata = None
+
+    def __init__(self, text: str):
+        self.text = text
+        self.candidates = [_CachedCandidate(text)]
+
+
+def _response_text(response: Any) -> str:
+    try:
+        text = getattr(response, "text", None)
+        if text:
+            return text
+    except Exception:
+        pass
+    try:
+        return response.candidates[0].content.parts[0].text or ""
+    except Exception:
+        return ""
+
+
+def _prompt_tokens(response: Any) -> int:
+    usage = getattr(response, "usage_metadata", None)
+    count = getattr(usage, "prompt_token_count", None) if usage is not None else None
+    return count if isinstance(count, int) else 0
+
+
+# ── Cache ────────────────────────────────────────────────────────────────────
+
+class GeminiResponseCache:
+    """Response text store with per-namespace hit-rate stats."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _bump(self, namespace: str, counter: str, amount: float = 1) -> None:
+        with self._lock:
+            per_namespace = self._stats.setdefault(
+                namespace,
+                {"hits": 0, "misses": 0, "stores": 0, "errors": 0, "prompt_tokens_saved": 0},
+            )
+            per_namespace[counter] += amount
+
+    def get(self, namespace: str, key: str) -> Optional[CachedGeminiResponse]:
+        try:
+            cached = self.backend.get(key)
+        except Exception as e:
+            self._bump(namespace, "errors")
+            logger.warning(f"Gemini cache read failed ({namespace}): {e}")
+            return None
+        if cached is None:
+            self._bump(namespace, "misses")
+            return None
+        stored_at, entry = cached
+        self._bump(namespace, "hits")
+        self._bump(namespace, "prompt_tokens_saved", entry.get("prompt_tokens", 0))
+        logger.debug(f"Gemini cache hit ({namespace}, {time.time() - stored_at:.0f}s old)")
+        return CachedGeminiResponse(entry["text"])
+
+    def set(self, namespace: str, key: str, response: Any, ttl_seconds: float) -> None:
+        text = _response_text(response)
+        if not text:
+            return
+        try:
+            self.backend.set(key, {"text": text, "prompt_tokens": _prompt_tokens(response)}, ttl_seconds)
+            self._bump(namespace, "stores")
+        except Exception as e:
+            self._bump(namespace, "errors")
+            logger.warning(f"Gemini cache write failed ({namespace}): {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-namespace counters plus totals and hit rate."""
+        with self._lock:
+            per_namespace = {name: dict(counters) for name, counters in self._stats.items()}
+        totals: Dict[str, float] = {}
+        for counters in per_namespace.values():
+            for name, value in counters.items():
+                totals[name] = totals.get(name, 0) + value
+        lookups = totals.get("hits", 0) + totals.get("misses", 0)
+        totals["hit_rate"] = round(totals.get("hits", 0) / lookups, 3) if lookups else 0.0
+        return {"namespaces": per_namespace, "totals": totals}
+
+
+_default_cache: Optional[GeminiResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_gemini_cache() -> Optional[GeminiResponseCache]:
+    """
+    Process-wide cache: Redis when REDIS_URL is set (server), otherwise SQLite
+    under ~/.launchway (CLI).  Returns None when disabled via
+    LAUNCHWAY_GEMINI_CACHE=off or when no backend can be opened.
+    """
+    global _default_cache
+    if os.getenv("LAUNCHWAY_GEMINI_CACHE", "on").strip().lower() in ("0", "off", "false", "no"):
+        return None
+    with _default_cache_lock:
+        if _default_cache is not None:
+            return _default_cache
+        try:
+            client = _build_redis_client()
+            if client is not None:
+                backend = RedisSearchCacheBackend(client, key_prefix=KEY_PREFIX)
+                logger.info("Gemini response cache: Redis backend")
+            else:
+                path = Path(os.getenv("LAUNCHWAY_GEMINI_CACHE_PATH", str(DEFAULT_CACHE_PATH)))
+                backend = SQLiteSearchCacheBackend(path, max_entries=DEFAULT_MAX_ENTRIES)
+                logger.info(f"Gemini response cache: SQLite backend at {path}")
+            _default_cache = GeminiResponseCache(backend)
+        except Exception as e:
+            logger.warning(f"Gemini response cache unavailable: {e}")
+            return None
+        return _default_cache
+
+
+def set_default_gemini_cache(cache: Optional[GeminiResponseCache]) -> Optional[GeminiResponseCache]:
+    """Replace the process-wide cache (e.g. in tests); returns the previous one."""
+    global _default_cache
+    with _default_cache_lock:
+        previous, _default_cache = _default_cache, cache
+    return previous
+
+
+# ── Hooks for the shared call path ───────────────────────────────────────────
+
+def lookup_cached_response(model: str, contents: Any, config: Any = None) -> Tuple[Optional[str], Optional[CachedGeminiResponse]]:
+    """
+    (cache key, cached response) for a request made inside
+    cache_gemini_responses(); (None, None) when caching is not requested.
+    """
+    policy = _policy.get()
+    if policy is None:
+        return None, None
+    cache = get_default_gemini_cache()
+    if cache is None:
+        return None, None
+    try:
+        key = gemini_cache_key(model, contents, config)
+    except Exception as e:
+        logger.debug(f"Gemini request not cacheable: {e}")
+        return None, None
+    return key, cache.get(policy.namespace, key)
+
+
+def store_cached_response(key: Optional[str], response: Any) -> None:
+    """Store a fresh response under the key from lookup_cached_response()."""
+    policy = _policy.get()
+    cache = get_default_gemini_cache()
+    if key is None or policy is None or cache is None:
+        return
+    cache.set(policy.namespace, key, response, policy.ttl_seconds)
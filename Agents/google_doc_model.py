@@ -0,0 +1,483 @@
+"""
+Local Google Doc model for resume tailoring
+
+Tailoring used to round-trip to the Docs API at every step: one batchUpdate
+per replacement, a documents().get after each batch to find the new indices,
+and a Drive PDF export whenever it needed a page count.  LocalGoogleDoc
+fetches the document once and edits an in-memory copy instead:
+
+  - replace_all_text() mirrors the API's replaceAllText on the copy and
+    shifts the startIndex/endIndex of everything after each edit
+  - update_text_style() splits and restyles text runs at exact indices
+  - flush() sends every queued request in a single batchUpdate; if the API
+    rejects the batch as invalid, it is split in halves until the bad
+    requests are isolated and skipped, as the old per-request sends did.
+    A skipped replaceAllText already changed the copy, so the ranges queued
+    after it are shifted back by its edits and the copy is re-fetched
+  - estimated_pages() measures the edited copy with the font metrics from
+    improved_char_calc, so overflow checks need no PDF export
+
+doc.document keeps the Docs API shape, so the existing readers
+(read_structural_elements, extract_document_structure) work on the copy.
+Document indices count UTF-16 code units, as the API does, so text with
+characters outside the BMP (emoji, some symbols) keeps the server's indices.
+Only the body is measured; headers, footers and footnotes are edited too
+because replaceAllText touches them on the server.
+"""
+
+import copy
+import math
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    from Agents.improved_char_calc import (
+        DEFAULT_FONT,
+        DEFAULT_FONT_SIZE,
+        calculate_char_limits,
+        estimate_visual_lines,
+        extract_font_metrics_from_doc,
+    )
+except ImportError:
+    from improved_char_calc import (
+        DEFAULT_FONT,
+        DEFAULT_FONT_SIZE,
+        calculate_char_limits,
+        estimate_visual_lines,
+        extract_font_metrics_from_doc,
+    )
+
+# Stands in for non-text paragraph elements (inline images, page breaks...)
+# so they keep their index width but never match replacement text
+OBJECT_PLACEHOLDER = '\ufffc'
+# Line box height as a multiple of the font size at 100% line spacing
+LINE_HEIGHT_FACTOR = 1.2
+DEFAULT_LINE_SPACING = 115
+BULLET_INDENT_PTS = 36
+
+
+def _walk_indexed(content: List[dict]) -> Iterator[dict]:
+    """Yield every dict carrying startIndex/endIndex in a segment, in document order."""
+    for element in content:
+        yield element
+        if 'paragraph' in element:
+            yield from element['paragraph'].get('elements', [])
+        elif 'table' in element:
+            for row in element['table'].get('tableRows', []):
+                yield row
+                for cell in row.get('tableCells', []):
+                    yield cell
+                    yield from _walk_indexed(cell.get('content', []))
+        elif 'tableOfContents' in element:
+            yield from _walk_indexed(element['tableOfContents'].get('content', []))
+
+
+def _walk_paragraphs(content: List[dict]) -> Iterator[dict]:
+    """Yield paragraph structural elements, including those inside tables."""
+    for element in content:
+        if 'paragraph' in element:
+            yield element
+        elif 'table' in element:
+            for row in element['table'].get('tableRows', []):
+                for cell in row.get('tableCells', []):
+                    yield from _walk_paragraphs(cell.get('content', []))
+        elif 'tableOfContents' in element:
+            yield from _walk_paragraphs(element['tableOfContents'].get('content', []))
+
+
+def _element_text(elem: dict) -> str:
+    if 'textRun' in elem:
+        return elem['textRun'].get('content', '')
+    return OBJECT_PLACEHOLDER * (elem.get('endIndex', 0) - elem.get('startIndex', 0))
+
+
+def _paragraph_text(paragraph: dict) -> str:
+    return ''.join(_element_text(elem) for elem in paragraph['paragraph'].get('elements', []))
+
+
+def utf16_len(text: str) -> int:
+    """Length of `text` in UTF-16 code units (the unit of Docs API indices)."""
+    return len(text.encode('utf-16-le')) // 2
+
+
+def _code_point_offset(text: str, units: int) -> int:
+    """Python string offset in `text` of the UTF-16 offset `units`."""
+    if units <= 0:
+        return 0
+    seen = 0
+    for offset, char in enumerate(text):
+        if seen >= units:
+            return offset
+        seen += 2 if ord(char) > 0xFFFF else 1
+    return len(text)
+
+
+def _find_all(haystack: str, needle: str) -> List[int]:
+    """Non-overlapping occurrences, left to right (replaceAllText semantics)."""
+    positions = []
+    pos = haystack.find(needle)
+    while pos != -1:
+        positions.append(pos)
+        pos = haystack.find(needle, pos + len(needle))
+    return positions
+
+
+def _shift(edit: list, index: int) -> int:
+    """Where `index` ends up once edit = (start, old_len, new_len) is applied."""
+    start, old_len, new_len = edit[-3:]
+    if index <= start:
+        return index
+    if index >= start + old_len:
+        return index + new_len - old_len
+    return min(index, start + new_len)
+
+
+def _unshift(edit: list, index: int) -> int:
+    """Where `index` was before edit = (start, old_len, new_len) was applied."""
+    start, old_len, new_len = edit[-3:]
+    if index <= start:
+        return index
+    if index >= start + new_len:
+        return index - (new_len - old_len)
+    return min(index, start + old_len)
+
+
+def _magnitude(style: dict, key: str, default: float = 0) -> float:
+    return style.get(key, {}).get('magnitude', default)
+
+
+class LocalGoogleDoc:
+    """In-memory copy of a Google Doc that batches edits into one batchUpdate."""
+
+    def __init__(self, document: Dict[str, Any], document_id: Optional[str] = None):
+        self.document = copy.deepcopy(document)
+        self.document_id = document_id or document.get('documentId')
+        self.pending: List[dict] = []
+        # (request, error) for requests the API rejected and flush() skipped
+        self.skipped: List[Tuple[dict, str]] = []
+        # id(queued replaceAllText) -> its local edits, in the order applied, as
+        # [segment_id, start, old_len, new_len] with indices at the time of the edit
+        self._edits: Dict[int, List[list]] = {}
+
+    @classmethod
+    def fetch(cls, docs_service, document_id: str) -> 'LocalGoogleDoc':
+        """The only documents().get a tailoring run needs."""
+        document = docs_service.documents().get(documentId=document_id).execute()
+        return cls(document, document_id)
+
+    @property
+    def body_content(self) -> List[dict]:
+        return self.document.get('body', {}).get('content', [])
+
+    def _segments(self) -> Iterator[Tuple[str, List[dict]]]:
+        yield '', self.body_content
+        for key in ('headers', 'footers', 'footnotes'):
+            for segment_id, segment in self.document.get(key, {}).items():
+                yield segment_id, segment.get('content', [])
+
+    def _segment_content(self, segment_id: str) -> List[dict]:
+        for sid, content in self._segments():
+            if sid == segment_id:
+                return content
+        raise KeyError(f"Unknown segment: {segment_id}")
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def find(self, text: str, match_case: bool = True) -> Optional[int]:
+        """Document index of the first body occurrence of `text`, or None."""
+        if not text:
+            return None
+        for paragraph in _walk_paragraphs(self.body_content):
+            haystack = _paragraph_text(paragraph)
+            pos = haystack.find(text) if match_case else haystack.lower().find(text.lower())
+            if pos != -1:
+                return paragraph.get('startIndex', 0) + utf16_len(haystack[:pos])
+        return None
+
+    def count(self, text: str, match_case: bool = True) -> int:
+        """How many occurrences replace_all_text(text, ...) would change."""
+        if not text:
+            return 0
+        needle = text if match_case else text.lower()
+        total = 0
+        for _, content in self._segments():
+            for paragraph in _walk_paragraphs(content):
+                haystack = _paragraph_text(paragraph)
+                total += len(_find_all(haystack if match_case else haystack.lower(), needle))
+        return total
+
+    # ------------------------------------------------------------------
+    # Editing
+    # ------------------------------------------------------------------
+
+    def replace_all_text(self, text: str, replace_text: str, match_case: bool = True) -> int:
+        """Replace every occurrence locally and queue the matching replaceAllText.
+
+        Matches never cross paragraph boundaries, as on the server.  Returns
+        the number of occurrences changed (the reply's occurrencesChanged);
+        nothing is queued when it is 0.
+        """
+        if not text:
+            return 0
+        needle = text if match_case else text.lower()
+        changed = 0
+        edits = []
+        for segment_id, content in self._segments():
+            for paragraph in list(_walk_paragraphs(content)):
+                haystack = _paragraph_text(paragraph)
+                positions = _find_all(haystack if match_case else haystack.lower(), needle)
+                base = paragraph.get('startIndex', 0)
+                # Right to left so earlier offsets stay valid within the paragraph
+                for offset in reversed(positions):
+                    start = base + utf16_len(haystack[:offset])
+                    end = start + utf16_len(haystack[offset:offset + len(text)])
+                    self._replace_range(content, paragraph, start, end, replace_text)
+                    edits.append([segment_id, start, end - start, utf16_len(replace_text)])
+                changed += len(positions)
+        if changed:
+            request = {
+                'replaceAllText': {
+                    'containsText': {'text': text, 'matchCase': match_case},
+                    'replaceText': replace_text,
+                }
+            }
+            self.pending.append(request)
+            self._edits[id(request)] = edits
+        return changed
+
+    def _replace_range(self, content: List[dict], paragraph: dict, start: int, end: int, new_text: str) -> None:
+        elements = paragraph['paragraph'].get('elements', [])
+        delta = utf16_len(new_text) - (end - start)
+        own = {id(elem) for elem in elements}
+
+        for item in _walk_indexed(content):
+            if id(item) in own:
+                continue
+            item_start, item_end = item.get('startIndex', 0), item.get('endIndex', 0)
+            if item_start >= end:
+                item['startIndex'] = item_start + delta
+                item['endIndex'] = item_end + delta
+            elif item_end >= end:
+                # Containers of the edit (this paragraph, its table cell/row/table)
+                item['endIndex'] = item_end + delta
+
+        kept = []
+        inserted = False
+        for elem in elements:
+            elem_start, elem_end = elem.get('startIndex', 0), elem.get('endIndex', 0)
+            if elem_end <= start:
+                kept.append(elem)
+                continue
+            if elem_start >= end:
+                elem['startIndex'] = elem_start + delta
+                elem['endIndex'] = elem_end + delta
+                kept.append(elem)
+                continue
+            run = elem['textRun']
+            text = run.get('content', '')
+            tail = text[_code_point_offset(text, end - elem_start):] if elem_end > end else ''
+            if not inserted:
+                # The run holding the start of the match takes the new text (and its style)
+                run['content'] = text[:_code_point_offset(text, start - elem_start)] + new_text + tail
+                inserted = True
+            else:
+                run['content'] = tail
+                elem['startIndex'] = start + utf16_len(new_text)
+            elem['endIndex'] = elem['startIndex'] + utf16_len(run['content'])
+            if run['content']:
+                kept.append(elem)
+        paragraph['paragraph']['elements'] = kept
+
+    def update_text_style(self, start: int, end: int, text_style: Dict[str, Any], fields: str,
+                          segment_id: str = '') -> None:
+        """Restyle [start, end) locally and queue the matching updateTextStyle."""
+        if end <= start:
+            return
+        text_range = {'startIndex': start, 'endIndex': end}
+        if segment_id:
+            text_range['segmentId'] = segment_id
+        self.pending.append({
+            'updateTextStyle': {'range': text_range, 'textStyle': text_style, 'fields': fields}
+        })
+
+        field_names = [name.strip() for name in fields.split(',') if name.strip()]
+        for paragraph in _walk_paragraphs(self._segment_content(segment_id)):
+            if paragraph.get('endIndex', 0) <= start or paragraph.get('startIndex', 0) >= end:
+                continue
+            restyled = []
+            for elem in paragraph['paragraph'].get('elements', []):
+                elem_start, elem_end = elem.get('startIndex', 0), elem.get('endIndex', 0)
+                if 'textRun' not in elem or elem_end <= start or elem_start >= end:
+                    restyled.append(elem)
+                    continue
+                for piece in self._split_run(elem, [start, end]):
+                    if start <= piece['startIndex'] and piece['endIndex'] <= end:
+                        style = piece['textRun'].setdefault('textStyle', {})
+                        for name in field_names:
+                            if name == '*':
+                                style.clear()
+                                style.update(copy.deepcopy(text_style))
+                            elif name in text_style:
+                                style[name] = copy.deepcopy(text_style[name])
+                            else:
+                                style.pop(name, None)
+                    restyled.append(piece)
+            paragraph['paragraph']['elements'] = restyled
+
+    @staticmethod
+    def _split_run(elem: dict, cuts: List[int]) -> List[dict]:
+        """Split a textRun element at the given document indices."""
+        pieces = []
+        elem_start, elem_end = elem['startIndex'], elem['endIndex']
+        text = elem['textRun'].get('content', '')
+        bounds = [elem_start] + sorted(c for c in set(cuts) if elem_start < c < elem_end) + [elem_end]
+        for piece_start, piece_end in zip(bounds, bounds[1:]):
+            piece = copy.deepcopy(elem)
+            piece['startIndex'], piece['endIndex'] = piece_start, piece_end
+            piece['textRun']['content'] = text[_code_point_offset(text, piece_start - elem_start):
+                                               _code_point_offset(text, piece_end - elem_start)]
+            pieces.append(piece)
+        return pieces
+
+    def flush(self, docs_service) -> List[dict]:
+        """Send all queued requests in one batchUpdate; returns its replies.
+
+        A batch rejected as invalid (HTTP 400) is bisected so the valid
+        requests still go out; requests rejected on their own are recorded
+        in self.skipped and get an empty reply.  Other errors propagate, with
+        the requests not yet sent left queued.
+
+        The copy already holds a skipped edit, so the ranges queued after a
+        skipped replaceAllText are shifted back by its edits before they go
+        out, and once the batch is done the copy is re-fetched to match what
+        the server actually has.
+        """
+        if not self.pending:
+            return []
+        requests, self.pending = self.pending, []
+        replies: List[dict] = []
+        skipped = len(self.skipped)
+        try:
+            self._send(docs_service, requests, replies, requests)
+        except Exception:
+            # One reply per request handled so far, in order
+            self.pending = requests[len(replies):] + self.pending
+            raise
+        for request in requests:
+            self._edits.pop(id(request), None)
+        if len(self.skipped) > skipped:
+            self.document = docs_service.documents().get(documentId=self.document_id).execute()
+        return replies
+
+    def _send(self, docs_service, requests: List[dict], replies: List[dict], batch: List[dict]) -> None:
+        try:
+            response = docs_service.documents().batchUpdate(
+                documentId=self.document_id,
+                body={'requests': requests}
+            ).execute()
+        except Exception as e:
+            if getattr(getattr(e, 'resp', None), 'status', None) != 400:
+                raise
+            if len(requests) == 1:
+                kind = next(iter(requests[0]), 'request')
+                print(f"      ⚠️  Skipped {kind} rejected by the Docs API: {e}")
+                self.skipped.append((requests[0], str(e)))
+                replies.append({})
+                # Everything after it in the batch is still unsent
+                self._undo_edits(requests[0], batch[len(replies):])
+                return
+            middle = len(requests) // 2
+            self._send(docs_service, requests[:middle], replies, batch)
+            self._send(docs_service, requests[middle:], replies, batch)
+            return
+        replies.extend(response.get('replies', []))
+
+    def _undo_edits(self, request: dict, later: List[dict]) -> None:
+        """Rebase the indices in `later` as if `request`'s local edits never happened."""
+        for edit in reversed(self._edits.pop(id(request), [])):
+            undone = list(edit)
+            for other in later:
+                for later_edit in self._edits.get(id(other), []):
+                    if later_edit[0] == undone[0]:
+                        # Keep the undone edit in the coordinates after this one
+                        shifted = _shift(later_edit, undone[1])
+                        later_edit[1] = _unshift(undone, later_edit[1])
+                        undone[1] = shifted
+                for body in other.values():
+                    text_range = body.get('range') if isinstance(body, dict) else None
+                    if text_range and text_range.get('segmentId', '') == undone[0]:
+                        for key in ('startIndex', 'endIndex'):
+                            if key in text_range:
+                                text_range[key] = _unshift(undone, text_range[key])
+
+    # ------------------------------------------------------------------
+    # Measuring
+    # ------------------------------------------------------------------
+
+    def _named_styles(self) -> Dict[str, dict]:
+        styles = self.document.get('namedStyles', {}).get('styles', [])
+        return {style.get('namedStyleType'): style for style in styles}
+
+    def _paragraph_height(self, paragraph: dict, width: float, named: Dict[str, dict]) -> float:
+        para = paragraph['paragraph']
+        para_style = para.get('paragraphStyle', {})
+        base = named.get(para_style.get('namedStyleType', 'NORMAL_TEXT')) or named.get('NORMAL_TEXT') or {}
+        base_text = base.get('textStyle', {})
+        base_para = base.get('paragraphStyle', {})
+
+        font_size = _magnitude(base_text, 'fontSize', DEFAULT_FONT_SIZE)
+        font_name = base_text.get('weightedFontFamily', {}).get('fontFamily', DEFAULT_FONT)
+        runs = [elem['textRun'] for elem in para.get('elements', []) if 'textRun' in elem]
+        sizes = [_magnitude(run.get('textStyle', {}), 'fontSize') for run in runs]
+        if any(sizes):
+            font_size = max(sizes)
+        for run in runs:
+            family = run.get('textStyle', {}).get('weightedFontFamily', {}).get('fontFamily')
+            if family:
+                font_name = family
+                break
+
+        indent_start = _magnitude(para_style, 'indentStart', _magnitude(base_para, 'indentStart'))
+        indent_first_line = _magnitude(para_style, 'indentFirstLine', _magnitude(base_para, 'indentFirstLine'))
+        if para.get('bullet'):
+            indent_start += (para['bullet'].get('nestingLevel', 0) + 1) * BULLET_INDENT_PTS
+
+        text = ''.join(run.get('content', '') for run in runs).rstrip('\n')
+        visual_lines = 1
+        if text:
+            limits = calculate_char_limits(width, indent_start, indent_first_line, font_name, font_size)
+            visual_lines = estimate_visual_lines(
+                len(text),
+                max(1, limits['char_limit_first_line']),
+                max(1, limits['char_limit_continuation']),
+            )['visual_lines']
+
+        line_spacing = para_style.get('lineSpacing', base_para.get('lineSpacing', DEFAULT_LINE_SPACING))
+        space = (_magnitude(para_style, 'spaceAbove', _magnitude(base_para, 'spaceAbove'))
+                 + _magnitude(para_style, 'spaceBelow', _magnitude(base_para, 'spaceBelow')))
+        return visual_lines * font_size * LINE_HEIGHT_FACTOR * line_spacing / 100 + space
+
+    def _content_height(self, content: List[dict], width: float, named: Dict[str, dict]) -> float:
+        height = 0.0
+        for element in content:
+            if 'paragraph' in element:
+                height += self._paragraph_height(element, width, named)
+            elif 'table' in element:
+                for row in element['table'].get('tableRows', []):
+                    cells = row.get('tableCells', [])
+                    if cells:
+                        cell_width = width / len(cells)
+                        height += max(self._content_height(cell.get('content', []), cell_width, named)
+                                      for cell in cells)
+        return height
+
+    def estimated_height(self) -> float:
+        """Estimated rendered height of the body in points."""
+        metrics = extract_font_metrics_from_doc(self.document)
+        return self._content_height(self.body_content, metrics['available_width'], self._named_styles())
+
+    def estimated_pages(self) -> int:
+        """Estimated page count of the body (a PDF export is still the final word)."""
+        available_height = extract_font_metrics_from_doc(self.document)['available_height']
+        return max(1, math.ceil(self.estimated_height() / max(1.0, available_height)))
@@ -21,7 +21,7 @@ from components.detectors.popup_detector import PopupDetector
 from components.detectors.apply_detector import ApplyDetector
 from components.executors.popup_executor import PopupExecutor
 from components.executors.click_executor import ClickExecutor
-from components.validators.nav_validator import NavValidator
+from components.validators.nav_validator import NavValidator, claim_page
 from components.executors.generic_form_filler_v2_enhanced import GenericFormFillerV2Enhanced as GenericFormFiller
 from components.custom_exceptions import HumanInterventionRequired
 from components.detectors.submit_detector import SubmitDetector
@@ -33,10 +33,12 @@ from components.detectors.application_form_detector import ApplicationFormDetect
 from components.executors.cmp_consent import CmpConsent
 from components.brains.gemini_page_analyzer import GeminiPageAnalyzer
 from components.executors.iframe_helper import IframeHelper
+from components.page_settle import current_wait_stats, track_waits, wait_for_settle
 
 # Persistent browser manager
 sys.path.append(os.path.join(os.path.dirname(__file__), '.'))
-from persistent_browser_manager import PersistentBrowserManager
+from persistent_browser_manager import PersistentBrowserManager, release_pooled_browsers
+from gemini_budget import gemini_lane
 
 # Initialize logger first (before VNC import that uses it)
 logger = logging.getLogger(__name__)
@@ -469,6 +471,11 @@ class RefactoredJobAgent:
         logger.info("✅ All components updated for new page")
 
     async def process_link(self, url: str) -> None:
+        # Settle waits are totalled per application (see components.page_settle)
+        with track_waits():
+            await self._process_link(url)
+
+    async def _process_link(self, url: str) -> None:
         logger.info("Processing link with refactored agent: %s", url)
         self._log_to_jobs("info", f"🚀 Starting job application for: {url}")
         
@@ -493,6 +500,7 @@ class RefactoredJobAgent:
             self.action_recorder = None
 
         self.page = await self._new_page()
+        claim_page(self.page)
 
         try:
             # Update status to running
@@ -508,8 +516,8 @@ class RefactoredJobAgent:
             if self.action_recorder:
                 self.action_recorder.record_navigation(url, success=True)
                 logger.info(f"🎬 Recorded initial navigation to: {url}")
-            # Wait a bit more for dynamic content to load
-            await self.page.wait_for_timeout(3000)
+            # Wait for dynamic content to load
+            await wait_for_settle(self.page, timeout_ms=10000, replaces_ms=3000, reason="initial_load")
             self._log_to_jobs("info", "✅ Page loaded successfully")
 
             # ── User Override Profiler ───────────────────────────────────────
@@ -566,6 +574,13 @@ class RefactoredJobAgent:
             logger.error(f"Failed to process link '{url}': {e}", exc_info=True)
             self._log_to_jobs("error", f"❌ Failed to process job application: {str(e)}")
         finally:
+            if self.page_analyzer and self.page_analyzer.stats["calls"]:
+                logger.info(f"🧠 Vision analysis: {self.page_analyzer.get_stats()}")
+            wait_stats = current_wait_stats()
+            if wait_stats and wait_stats.waits:
+                logger.info(wait_stats.summary())
+                self._log_to_jobs("info", wait_stats.summary())
+
             # Stop action recording and save to session (NEW ACTION-BASED APPROACH)
             if (self.session_manager and self.current_session and 
                 not hasattr(self, '_session_already_frozen')):
@@ -749,15 +764,17 @@ class RefactoredJobAgent:
                     from Agents.resume_tailoring_agent import tailor_resume_and_return_url
                     logger.info("🧵 [Resume Tailoring] Tailoring in progress (this may take 30-90 seconds)...")
                     print("[INFO] ⏳ Resume tailoring in progress (this may take 30-90 seconds)...")
-                    tailoring_metrics = await asyncio.to_thread(
-                        tailor_resume_and_return_url,
-                        resume_url,
-                        tailoring_text,
-                        job_context.get('title', 'Job'),
-                        job_context.get('company', 'Company'),
-                        user_id=self.user_id,
-                        replace_projects_on_tailor=self.replace_projects_on_tailor,
-                    )
+                    # Tailoring's Gemini calls queue behind form filling of parallel applications
+                    with gemini_lane("tailoring"):
+                        tailoring_metrics = await asyncio.to_thread(
+                            tailor_resume_and_return_url,
+                            resume_url,
+                            tailoring_text,
+                            job_context.get('title', 'Job'),
+                            job_context.get('company', 'Company'),
+                            user_id=self.user_id,
+                            replace_projects_on_tailor=self.replace_projects_on_tailor,
+                        )
 
                     if not tailoring_metrics:
                         logger.error("❌ [Resume Tailoring] Tailoring returned no result")
@@ -1924,7 +1941,7 @@ Return ONLY valid JSON, no extra text.
                 logger.info(f"✅ Clicked target element via selector: {selector}")
                 if self.action_recorder:
                     self.action_recorder.record_click(selector, f"AI target: {target_text}", success=True)
-                await self.page.wait_for_timeout(500)
+                await wait_for_settle(self.page, timeout_ms=5000, replaces_ms=500, reason="ai_guided_click")
                 return 'ai_guided_navigation'
             except Exception as click_error:
                 last_error = click_error
@@ -2020,7 +2037,7 @@ Return ONLY valid JSON, no extra text.
                     interactor = FieldInteractorV2(self.page, self.action_recorder)
                     if await interactor.upload_resume_if_present(resume_path):
                         logger.info("✅ Resume uploaded directly (avoiding autofill)")
-                        await self.page.wait_for_timeout(2000)  # Wait for processing
+                        await wait_for_settle(self.page, timeout_ms=10000, replaces_ms=2000, reason="resume_upload")
                         
                         # Look for continue/next button
                         continue_selectors = [
@@ -2090,7 +2107,7 @@ Return ONLY valid JSON, no extra text.
                     interactor = FieldInteractorV2(self.page, self.action_recorder)
                     if await interactor.upload_resume_if_present(resume_path):
                         logger.info("✅ Resume uploaded directly")
-                        await self.page.wait_for_timeout(2000)  # Wait for processing
+                        await wait_for_settle(self.page, timeout_ms=10000, replaces_ms=2000, reason="resume_upload")
                         
                         # Look for continue button after upload
                         continue_selectors = [
@@ -2201,16 +2218,14 @@ Return ONLY valid JSON, no extra text.
     async def _analyze_page_with_ai(self, screenshot_bytes: bytes, prompt: str) -> Dict[str, Any]:
         """Use AI to analyze page screenshot with custom prompt."""
         try:
-            import base64
             import json
-            from PIL import Image
-            from io import BytesIO
-            
-            # Convert screenshot to image
-            image = Image.open(BytesIO(screenshot_bytes))
             
-            # Use the page analyzer's model
-            if not self.page_analyzer.model:
+            # Image preparation runs off the loop and the model call is awaited;
+            # an unchanged page is answered from the analyzer's cache
+            response_text = await self.page_analyzer.analyze_screenshot(
+                screenshot_bytes, prompt, url=self.page.url if self.page else ""
+            )
+            if response_text is None:
                 return {
                     "action": "need_human_intervention",
                     "confidence": 0.0,
@@ -2219,11 +2234,8 @@ Return ONLY valid JSON, no extra text.
                     "elements_detected": []
                 }
             
-            # Generate content with image and prompt
-            response = self.page_analyzer.model.generate_content([image, prompt])
-            
             # Parse JSON response
-            response_text = response.text.strip()
+            response_text = response_text.strip()
             
             # Clean up the response to extract JSON
             if response_text.startswith('```json'):
@@ -2420,7 +2432,7 @@ Return ONLY valid JSON, no extra text.
                 
             elif ai_analysis['page_type'] == 'LOADING_PAGE':
                 logger.info("⏳ AI detected loading page. Waiting and retrying...")
-                await self.page.wait_for_timeout(3000)
+                await wait_for_settle(self.page, timeout_ms=10000, replaces_ms=3000, reason="loading_page")
                 return 'find_apply'  # Retry
                 
             else:
@@ -2449,7 +2461,7 @@ Return ONLY valid JSON, no extra text.
         if success:
             # Wait for page to load completely after click
             await self.page.wait_for_load_state("domcontentloaded", timeout=15000)
-            await self.page.wait_for_timeout(2000)
+            await wait_for_settle(self.page, timeout_ms=8000, replaces_ms=2000, reason="apply_click")
             
             # CRITICAL: Check for new tabs first - this is a consequence of the click action
             logger.info("🔍 Checking for new tabs/windows opened by Apply button click...")
@@ -2475,6 +2487,7 @@ Return ONLY valid JSON, no extra text.
                     logger.info(f"🗂️ Regular tab detected. Switching to: {new_page.url}")
                     # Update main_page to the new tab (not a popup)
                     self.main_page = new_page
+                    claim_page(new_page)
                     # Switch to the new tab and update our working context
                     self.page = new_page
                     # Update all components to use the new page
@@ -2642,7 +2655,7 @@ Return ONLY valid JSON, no extra text.
                         if login_result.get('handled') and login_result.get('success'):
                             logger.info(f"✅ Logged in with saved credentials: {login_result.get('message')}")
                             state.context['login_attempted'] = True
-                            await self.current_context.wait_for_timeout(3000)
+                            await wait_for_settle(self.current_context, timeout_ms=10000, replaces_ms=3000, reason="login")
                             # Continue to next page after login
                         elif login_result.get('handled'):
                             logger.warning(f"⚠️ Login attempted but failed: {login_result.get('message')}")
@@ -2660,7 +2673,8 @@ Return ONLY valid JSON, no extra text.
                         if account_result.get('handled') and account_result.get('success'):
                             logger.info(f"✅ Account creation handled: {account_result.get('message')}")
                             # Wait a bit for page to process
-                            await self.current_context.wait_for_timeout(2000)
+                            await wait_for_settle(self.current_context, timeout_ms=8000, replaces_ms=2000,
+                                                  reason="account_creation")
                             # Continue to form filling (account might ask for more info)
                         elif account_result.get('handled'):
                             logger.warning(f"⚠️ Account creation attempted but not successful: {account_result.get('message')}")
@@ -3027,7 +3041,7 @@ Return ONLY valid JSON, no extra text.
         
         # Wait for page to load
         await self.page.wait_for_load_state("domcontentloaded", timeout=15000)
-        await self.page.wait_for_timeout(2000)
+        await wait_for_settle(self.page, timeout_ms=8000, replaces_ms=2000, reason="next_page")
         
         # Step 3: Check for errors on the page
         errors = await self._detect_form_errors()
@@ -3086,7 +3100,7 @@ Return ONLY valid JSON, no extra text.
                     button_to_click = next_button or submit_button
                     await button_to_click.click()
                     await self.page.wait_for_load_state("domcontentloaded", timeout=15000)
-                    await self.page.wait_for_timeout(2000)
+                    await wait_for_settle(self.page, timeout_ms=8000, replaces_ms=2000, reason="next_page")
                     
                     # Check for errors again
                     errors = await self._detect_form_errors()
@@ -4103,7 +4117,7 @@ async def _get_or_create_playwright():
 
         return _global_playwright_instance
 
-async def run_links_with_refactored_agent(links: list[str], headless: bool, keep_open: bool, debug: bool, hold_seconds: int, slow_mo_ms: int, job_id: str = None, jobs_dict: dict = None, session_manager: SessionManager = None, user_id: str = None, vnc_mode: bool = False, vnc_port: int = 5900, tailor_resume: bool = False, resume_path: str = None, full_auto_mode: bool = False, replace_projects_on_tailor: bool = False):
+async def run_links_with_refactored_agent(links: list[str], headless: bool, keep_open: bool, debug: bool, hold_seconds: int, slow_mo_ms: int, job_id: str = None, jobs_dict: dict = None, session_manager: SessionManager = None, user_id: str = None, vnc_mode: bool = False, vnc_port: int = 5900, tailor_resume: bool = False, resume_path: str = None, full_auto_mode: bool = False, replace_projects_on_tailor: bool = False, max_parallel: int = 1):
     """
     Run job application agent with optional VNC streaming
 
@@ -4112,6 +4126,11 @@ async def run_links_with_refactored_agent(links: list[str], headless: bool, keep
         vnc_port: Port for VNC server (default 5900)
         tailor_resume: If True, resume will be tailored for this job (future feature)
         resume_path: Path to resume file to inject (optional)
+        max_parallel: Applications to run at once, each on its own agent and tab
+            of the user's persistent browser, so it needs user_id (ignored in
+            VNC mode); see parallel_application_runner.  With job_id/jobs_dict,
+            each link reports to its own "<job_id>-<n>" entry and the job's
+            entry is set once all of them finish
 
     Returns:
         Dict with VNC session info if vnc_mode=True, otherwise None
@@ -4133,32 +4152,89 @@ async def run_links_with_refactored_agent(links: list[str], headless: bool, keep
     else:
         logger.info("📄 Using standard resume (no tailoring)")
 
+    agents: list[RefactoredJobAgent] = []
+    agent = None
+
     try:
         # Extract job URL for VNC app mode (use first link)
         job_url = links[0] if links and vnc_mode else None
 
-        agent = RefactoredJobAgent(
-            p,
-            headless=headless,
-            keep_open=keep_open,
-            debug=debug,
-            hold_seconds=hold_seconds,
-            slow_mo_ms=slow_mo_ms,
-            job_id=job_id,
-            jobs_dict=jobs_dict,
-            session_manager=session_manager,
-            user_id=user_id,
-            vnc_mode=vnc_mode,
-            vnc_port=vnc_port,
-            tailor_resume=tailor_resume,
-            resume_path=resume_path,
-            job_url=job_url,
-            full_auto_mode=full_auto_mode,
-            replace_projects_on_tailor=replace_projects_on_tailor,
-        )
+        def _make_agent(agent_job_id: str = None) -> RefactoredJobAgent:
+            new_agent = RefactoredJobAgent(
+                p,
+                headless=headless,
+                keep_open=keep_open,
+                debug=debug,
+                hold_seconds=hold_seconds,
+                slow_mo_ms=slow_mo_ms,
+                job_id=agent_job_id,
+                jobs_dict=jobs_dict,
+                session_manager=session_manager,
+                user_id=user_id,
+                vnc_mode=vnc_mode,
+                vnc_port=vnc_port,
+                tailor_resume=tailor_resume,
+                resume_path=resume_path,
+                job_url=job_url,
+                full_auto_mode=full_auto_mode,
+                replace_projects_on_tailor=replace_projects_on_tailor,
+            )
+            agents.append(new_agent)
+            return new_agent
+
+        parallel = max_parallel > 1 and len(links) > 1 and not vnc_mode
+        if parallel and not using_persistent:
+            # Without a persistent profile every agent launches (and closes) its own browser
+            logger.warning("⚠️  max_parallel needs user_id for a shared browser - running applications one at a time")
+            parallel = False
+
+        if parallel:
+            # One agent (and tab of the user's persistent context) per link
+            from parallel_application_runner import ParallelApplicationRunner
+            from gemini_budget import GeminiBudget
+
+            parent = jobs_dict.get(job_id) if jobs_dict is not None and job_id else None
+            link_job_ids = {}
+            for n, link in enumerate(links, start=1):
+                link_job_ids[link] = f"{job_id}-{n}" if job_id else None
+                if parent is not None:
+                    # Agents only write to their own entry, never the job's
+                    jobs_dict[link_job_ids[link]] = {
+                        'status': 'queued',
+                        'logs': [],
+                        'last_updated': time.time(),
+                        'job_url': link,
+                        'parent_job_id': job_id,
+                    }
+            if parent is not None:
+                parent['link_job_ids'] = list(link_job_ids.values())
+                parent['status'] = 'running'
+                parent['last_updated'] = time.time()
+
+            logger.info(f"🔀 Running {len(links)} applications, up to {max_parallel} at once")
+            runner = ParallelApplicationRunner(
+                max_concurrency=max_parallel,
+                gemini_budget=GeminiBudget(max_in_flight=max_parallel * 2),
+            )
 
-        for link in links:
-            await agent.process_link(link)
+            async def _apply(link: str) -> None:
+                await _make_agent(link_job_ids[link]).process_link(link)
+
+            await runner.run(list(links), _apply)
+
+            if parent is not None:
+                statuses = [jobs_dict[link_job_id]['status'] for link_job_id in link_job_ids.values()]
+                if all(status == 'completed' for status in statuses):
+                    parent['status'] = 'completed'
+                elif 'intervention' in statuses:
+                    parent['status'] = 'intervention'
+                else:
+                    parent['status'] = 'failed'
+                parent['last_updated'] = time.time()
+        else:
+            agent = _make_agent(job_id)
+            for link in links:
+                await agent.process_link(link)
         
         # Get VNC session info before cleanup (for frontend connection)
         if vnc_mode and agent.vnc_coordinator:
@@ -4204,15 +4280,15 @@ async def run_links_with_refactored_agent(links: list[str], headless: bool, keep
         
         # STANDARD MODE: Regular cleanup
         should_keep_open = (
-            (hasattr(agent, 'keep_browser_open_for_human') and agent.keep_browser_open_for_human) or
+            any(getattr(a, 'keep_browser_open_for_human', False) for a in agents) or
             keep_open or
             debug
         )
         
         # Cleanup temporary files unless keeping open for human
-        if not should_keep_open and hasattr(agent, 'created_files'):
+        if not should_keep_open:
             import os
-            for file_path in agent.created_files:
+            for file_path in [f for a in agents for f in getattr(a, 'created_files', [])]:
                 try:
                     if os.path.exists(file_path):
                         os.remove(file_path)
@@ -4222,6 +4298,9 @@ async def run_links_with_refactored_agent(links: list[str], headless: bool, keep
 
         # PERSISTENT PROFILE MODE: Don't stop playwright (keeps browser alive)
         if using_persistent:
+            if not should_keep_open:
+                # Pooled browsers stay warm; only this loop's connection is dropped
+                await release_pooled_browsers()
             logger.info("♻️  Job complete - persistent browser remains open for next application")
             # Don't stop the global playwright instance - this would close the persistent browser!
             return None
@@ -0,0 +1,302 @@
+"""
+Near-duplicate job index for multi-source discovery
+
+The same posting is syndicated through JSearch, Adzuna, TheirStack, GoogleJobs
+... with different tracking URLs, so exact job_url matching lets every copy
+through to ranking, description fetching and (worst case) several browser
+applications.  A job is treated as a duplicate of an indexed one when:
+
+  - its canonical URL matches (tracking query params stripped), or
+  - normalized title + company + location match exactly, or
+  - MinHash/LSH over title/company/description shingles finds a candidate at
+    the same company whose shingle sets mostly overlap and whose title shares
+    most of its words.  Overlap is measured as containment
+    (|A & B| / min(|A|, |B|)) so a truncated description snippet from one
+    source still matches the full text from another.  The title check keeps
+    different roles apart when their descriptions open with the same
+    company blurb.
+
+Insert and lookup cost O(shingles x permutations) plus a handful of bucket
+probes, so indexing thousands of jobs stays near-linear.  The index can be
+saved to / loaded from JSON so continuous mode keeps it across rounds.
+"""
+
+import base64
+import json
+import logging
+import os
+import re
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = Path.home() / ".launchway" / "job_dedup_index.json"
+
+NUM_PERM = 128
+BANDS = 32               # 32 bands x 4 rows: ~87% recall at 0.5 Jaccard, ~3% at 0.2
+CONTAINMENT_THRESHOLD = 0.7
+# Share of the shorter title's words the other title must contain for a
+# near match ("Senior Backend Engineer (Remote)" vs "Senior Backend Engineer")
+TITLE_CONTAINMENT_THRESHOLD = 0.8
+# Only the leading description words are shingled: roughly the length of the
+# snippets some sources return, so snippet vs full text still has high Jaccard
+DESCRIPTION_WORDS = 60
+MIN_DESCRIPTION_WORDS = 20
+MAX_ENTRIES = 20000
+
+_KEEP_QUERY_KEYS = {"id", "jobid", "job_id", "pid", "jk", "gh_jid", "reqid", "requisitionid"}
+_COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co",
+    "company", "plc", "gmbh", "ag", "sa", "lp", "llp", "the",
+}
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+
+
+def canonicalize_job_url(url: str) -> str:
+    """Job URL with tracking parameters, fragments and trailing slashes removed."""
+    raw = (url or "").strip()
+    if not raw:
+        return ""
+    try:
+        split = urlsplit(raw)
+        scheme = (split.scheme or "https").lower()
+        netloc = split.netloc.lower()
+        path = split.path.rstrip("/")
+        query_pairs = [
+            (k.lower(), v)
+            for k, v in parse_qsl(split.query, keep_blank_values=False)
+            if k and k.lower() in _KEEP_QUERY_KEYS
+        ]
+        query = urlencode(sorted(query_pairs))
+        return urlunsplit((scheme, netloc, path, query, ""))
+    except Exception:
+        return raw.rstrip("/").lower()
+
+
+def _words(text: Any) -> List[str]:
+    return _WORD_RE.findall(str(text or "").lower())
+
+
+def normalize_company(company: Any) -> str:
+    words = [w for w in _words(company) if w not in _COMPANY_SUFFIXES]
+    return " ".join(words)
+
+
+class NearDuplicateJobIndex:
+    """Canonical-URL + MinHash/LSH index of jobs already seen."""
+
+    def __init__(self, num_perm: int = NUM_PERM, bands: int = BANDS,
+                 threshold: float = CONTAINMENT_THRESHOLD, seed: int = 1):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.seed = seed
+        rng = np.random.default_rng(seed)
+        # a < 2^31 and shingle hashes < 2^32 keep a*x + b inside uint64
+        self._a = rng.integers(1, 1 << 31, size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 31, size=(num_perm, 1), dtype=np.uint64)
+
+        self._entries: List[Dict[str, Any]] = []
+        self._by_url: Dict[str, int] = {}
+        self._by_key: Dict[str, int] = {}
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Features
+
+    @staticmethod
+    def _exact_key(title: str, company: str, location: Any) -> str:
+        return f"{' '.join(_words(title))}|{company}|{' '.join(_words(location))}"
+
+    @staticmethod
+    def _shingles(title: str, company: str, description: Any) -> List[str]:
+        words = _words(description)[:DESCRIPTION_WORDS]
+        shingles = {f"t:{w}" for w in _words(title)}
+        shingles.add(f"c:{company}")
+        shingles.update(" ".join(words[i:i + 3]) for i in range(max(0, len(words) - 2)))
+        return list(shingles)
+
+    @staticmethod
+    def _similar_titles(a: str, b: str) -> bool:
+        words_a, words_b = set(_words(a)), set(_words(b))
+        if not words_a or not words_b:
+            return False
+        shared = len(words_a & words_b)
+        return shared / min(len(words_a), len(words_b)) >= TITLE_CONTAINMENT_THRESHOLD
+
+    def _signature(self, shingles: List[str]) -> np.ndarray:
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles),
+                             dtype=np.uint64, count=len(shingles))
+        permuted = (self._a * hashes + self._b) % _MERSENNE_PRIME
+        return (permuted.min(axis=1) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def _features(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        title = str(job.get("title") or "")
+        company = normalize_company(job.get("company"))
+        features = {
+            "url": canonicalize_job_url(job.get("job_url") or job.get("url") or ""),
+            "key": self._exact_key(title, company, job.get("location")) if title and company else "",
+            "company": company,
+            "title": title,
+            "signature": None,
+            "size": 0,
+        }
+        if company and len(_words(job.get("description"))) >= MIN_DESCRIPTION_WORDS:
+            shingles = self._shingles(title, company, job.get("description"))
+            features["signature"] = self._signature(shingles)
+            features["size"] = len(shingles)
+        return features
+
+    # Lookup / insert
+
+    def _near_match(self, features: Dict[str, Any]) -> Optional[int]:
+        signature = features["signature"]
+        if signature is None:
+            return None
+        checked = set()
+        for band_key in self._band_keys(signature):
+            for entry_id in self._buckets.get(band_key, ()):
+                if entry_id in checked:
+                    continue
+                checked.add(entry_id)
+                entry = self._entries[entry_id]
+                if entry["company"] != features["company"]:
+                    continue
+                if not self._similar_titles(entry["title"], features["title"]):
+                    continue
+                jaccard = float(np.mean(entry["signature"] == signature))
+                if not jaccard:
+                    continue
+                # |A & B| = J (|A| + |B|) / (1 + J)
+                overlap = jaccard * (entry["size"] + features["size"]) / (1 + jaccard)
+                if overlap / min(entry["size"], features["size"]) >= self.threshold:
+                    return entry_id
+        return None
+
+    def _match(self, features: Dict[str, Any]) -> Optional[int]:
+        if features["url"] and features["url"] in self._by_url:
+            return self._by_url[features["url"]]
+        if features["key"] and features["key"] in self._by_key:
+            return self._by_key[features["key"]]
+        return self._near_match(features)
+
+    def find_duplicate(self, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """The indexed job `job` duplicates ({'url', 'title', 'company'}), or None."""
+        entry_id = self._match(self._features(job))
+        if entry_id is None:
+            return None
+        entry = self._entries[entry_id]
+        return {"url": entry["url"], "title": entry["title"], "company": entry["company"]}
+
+    def _insert(self, entry: Dict[str, Any]) -> int:
+        entry_id = len(self._entries)
+        self._entries.append(entry)
+        if entry["url"]:
+            self._by_url[entry["url"]] = entry_id
+        if entry["key"]:
+            self._by_key.setdefault(entry["key"], entry_id)
+        if entry["signature"] is not None:
+            for band_key in self._band_keys(entry["signature"]):
+                self._buckets.setdefault(band_key, []).append(entry_id)
+        return entry_id
+
+    def add(self, job: Dict[str, Any]) -> bool:
+        """Index `job`; returns False (and indexes nothing) if it duplicates a known job."""
+        features = self._features(job)
+        if not features["url"] and not features["key"]:
+            return False  # nothing to identify the job by
+        entry_id = self._match(features)
+        if entry_id is not None:
+            # Remember this copy's URL too so an exact repeat is a cheap hit
+            if features["url"] and features["url"] not in self._by_url:
+                self._by_url[features["url"]] = entry_id
+            return False
+        features["added_at"] = time.time()
+        self._insert(features)
+        return True
+
+    # Persistence
+
+    def save(self, path: Path = DEFAULT_INDEX_PATH, max_entries: int = MAX_ENTRIES) -> None:
+        """Write the newest `max_entries` jobs to `path` (atomically)."""
+        aliases: Dict[int, List[str]] = {}
+        for url, entry_id in self._by_url.items():
+            if url != self._entries[entry_id]["url"]:
+                aliases.setdefault(entry_id, []).append(url)
+        first = max(0, len(self._entries) - max_entries)
+        payload = {
+            "version": 1,
+            "num_perm": self.num_perm,
+            "bands": self.bands,
+            "seed": self.seed,
+            "entries": [
+                {
+                    "url": e["url"],
+                    "aliases": aliases.get(entry_id, []),
+                    "key": e["key"],
+                    "company": e["company"],
+                    "title": e["title"],
+                    "size": e["size"],
+                    "signature": base64.b64encode(e["signature"].tobytes()).decode("ascii")
+                    if e["signature"] is not None else None,
+                    "added_at": e["added_at"],
+                }
+                for entry_id, e in enumerate(self._entries[first:], start=first)
+            ],
+        }
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path = DEFAULT_INDEX_PATH, max_age_seconds: Optional[float] = None) -> "NearDuplicateJobIndex":
+        """Index saved by save(); entries older than `max_age_seconds` are dropped.
+
+        A missing or unreadable file gives an empty index.
+        """
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return cls()
+        except Exception as e:
+            logger.warning(f"Job dedup index unreadable, starting empty: {e}")
+            return cls()
+        index = cls(num_perm=data.get("num_perm", NUM_PERM), bands=data.get("bands", BANDS),
+                    seed=data.get("seed", 1))
+        cutoff = time.time() - max_age_seconds if max_age_seconds else 0
+        for item in data.get("entries", []):
+            if item.get("added_at", 0) < cutoff:
+                continue
+            signature = item.get("signature")
+            entry_id = index._insert({
+                "url": item.get("url", ""),
+                "key": item.get("key", ""),
+                "company": item.get("company", ""),
+                "title": item.get("title", ""),
+                "size": item.get("size", 0),
+                "signature": np.frombuffer(base64.b64decode(signature), dtype=np.uint32).copy()
+                if signature else None,
+                "added_at": item.get("added_at", 0),
+            })
+            for alias in item.get("aliases", []):
+                index._by_url.setdefault(alias, entry_id)
+        return index
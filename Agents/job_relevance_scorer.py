@@ -18,11 +18,21 @@ works whether the profile came from AgentProfileService or the Launchway API.
 
 import re
 import logging
-from typing import Any, Dict, List, Set
+from typing import Any, Callable, Dict, List, Set
 from datetime import datetime
 
+try:
+    import numpy as np
+except ImportError:  # batch scoring falls back to per-job scoring
+    np = None
+
 logger = logging.getLogger(__name__)
 
+# Description keyword-match tiers used by _score_description_match:
+# matches 0 → 0, 1-4 → 5, 5-9 → 10, 10-16 → 17, 17+ → 25
+_DESC_MATCH_BOUNDS = [0, 4, 9, 16]
+_DESC_MATCH_POINTS = [0, 5, 10, 17, 25]
+
 
 class JobRelevanceScorer:
     """Calculate relevance score for a job based on the user's profile."""
@@ -148,11 +158,13 @@ class JobRelevanceScorer:
         'its', 'our', 'their', 'this', 'that', 'also', 'other', 'using',
     }
 
+    # Whole words of 3+ characters (same as \b\w+\b filtered to len > 2)
+    _TOKEN_RE = re.compile(r'\b\w{3,}\b')
+
     def _tokenize(self, text: str) -> Set[str]:
         if not text:
             return set()
-        tokens = re.findall(r'\b\w+\b', text.lower())
-        return {t for t in tokens if t not in self._STOP_WORDS and len(t) > 2}
+        return set(self._TOKEN_RE.findall(text.lower())) - self._STOP_WORDS
 
     # ── main scorer ───────────────────────────────────────────────────────────
 
@@ -195,6 +207,156 @@ class JobRelevanceScorer:
             logger.error(f"Scoring error for '{job.get('title','?')}': {e}")
             return 0
 
+    # ── batch scorer ──────────────────────────────────────────────────────────
+
+    def calculate_scores(self, jobs: List[Dict[str, Any]]) -> List[int]:
+        """
+        Score many jobs at once; returns exactly [calculate_score(j) for j in jobs].
+
+        Each title/description is tokenized once into a sparse job×term incidence
+        (COO row/col arrays over the profile vocabulary).  Title and description
+        keyword overlaps then come from a few bincount reductions against the
+        profile's keyword and resume-title vectors, which are built once per
+        batch instead of once per job.  The remaining components depend on
+        a handful of distinct values (level, location, job type, date...) and
+        are memoized per batch.
+        """
+        if np is None or not jobs:
+            return [self.calculate_score(job) for job in jobs]
+
+        # Profile-side vocabulary - built once for the whole batch.  A malformed
+        # profile makes every per-job title score raise (→ 0), so leave such
+        # profiles to the per-job path rather than re-deriving its error handling.
+        try:
+            rk_titles = (self.profile.get("resume_keywords") or {}).get("job_titles", [])
+            rk_title_tokens: Set[str] = set()
+            if rk_titles:
+                for t in rk_titles:
+                    rk_title_tokens.update(self._tokenize(str(t)))
+            past_titles = [
+                exp.get("title", "").lower()
+                for exp in (
+                    self.profile.get("work_experience")
+                    or self.profile.get("work experience")
+                    or []
+                )
+                if isinstance(exp, dict)
+            ]
+        except Exception:
+            return [self.calculate_score(job) for job in jobs]
+        past_titles = [t for t in past_titles if t]
+
+        vocab = {tok: idx for idx, tok in enumerate(sorted(self.user_keywords | rk_title_tokens))}
+        vocab_tokens = set(vocab)
+        user_vec = np.zeros(len(vocab))
+        rk_vec = np.zeros(len(vocab))
+        for tok, idx in vocab.items():
+            if tok in self.user_keywords:
+                user_vec[idx] = 1.0
+            if tok in rk_title_tokens:
+                rk_vec[idx] = 1.0
+
+        # Sparse job×term incidence over the profile vocabulary (COO row/col
+        # lists); job tokens outside the vocabulary can never score, so only
+        # their count is kept (title length is the ratio denominator).
+        n = len(jobs)
+        title_rows: List[int] = []
+        title_cols: List[int] = []
+        desc_rows: List[int] = []
+        desc_cols: List[int] = []
+        title_len = np.zeros(n, dtype=np.int64)
+        has_title = np.zeros(n, dtype=bool)
+        has_desc = np.zeros(n, dtype=bool)
+        failed = np.zeros(n, dtype=bool)
+        title_lowers: List[str] = [""] * n
+
+        for i, job in enumerate(jobs):
+            try:
+                title = job.get("title", "")
+                if title:
+                    tokens = self._tokenize(title)
+                    title_lowers[i] = title.lower()
+                    has_title[i] = True
+                    title_len[i] = len(tokens)
+                    for tok in tokens & vocab_tokens:
+                        title_rows.append(i)
+                        title_cols.append(vocab[tok])
+                combined = f"{job.get('description', '')} {job.get('requirements', '')}"
+                if combined.strip():
+                    has_desc[i] = True
+                    for tok in self._tokenize(combined) & vocab_tokens:
+                        desc_rows.append(i)
+                        desc_cols.append(vocab[tok])
+            except Exception as e:
+                logger.error(f"Scoring error for '{job.get('title', '?')}': {e}")
+                failed[i] = True
+
+        t_rows = np.asarray(title_rows, dtype=np.int64)
+        t_cols = np.asarray(title_cols, dtype=np.int64)
+        d_rows = np.asarray(desc_rows, dtype=np.int64)
+        d_cols = np.asarray(desc_cols, dtype=np.int64)
+        title_hits = np.bincount(t_rows, weights=user_vec[t_cols], minlength=n)
+        rk_hits = np.bincount(t_rows, weights=rk_vec[t_cols], minlength=n)
+        desc_hits = np.bincount(d_rows, weights=user_vec[d_cols], minlength=n)
+
+        # Title match (0-30)
+        if self.user_keywords:
+            title_scores = (title_hits / np.maximum(title_len, 1) * 25).astype(np.int64)
+            if past_titles:
+                past_title_re = re.compile("|".join(re.escape(t) for t in past_titles))
+                past_bonus = np.fromiter(
+                    (bool(past_title_re.search(t)) for t in title_lowers), dtype=bool, count=n
+                )
+                title_scores = np.where(past_bonus, np.minimum(title_scores + 5, 30), title_scores)
+            if rk_titles:
+                title_scores = np.where(rk_hits > 0, np.minimum(title_scores + 5, 30), title_scores)
+        else:
+            title_scores = np.full(n, 5, dtype=np.int64)
+        title_scores = np.where(has_title, title_scores, 0)
+
+        # Description match (0-25)
+        if self.user_keywords:
+            tiers = np.searchsorted(_DESC_MATCH_BOUNDS, desc_hits.astype(np.int64), side="left")
+            desc_scores = np.asarray(_DESC_MATCH_POINTS)[tiers]
+        else:
+            desc_scores = np.zeros(n, dtype=np.int64)
+        desc_scores = np.where(has_desc, desc_scores, 0)
+
+        # Remaining components: few distinct inputs per batch → memoize
+        memo: Dict[Any, Any] = {}
+        scores: List[int] = []
+        for i, job in enumerate(jobs):
+            if failed[i]:
+                scores.append(0)
+                continue
+            try:
+                score = int(title_scores[i]) + int(desc_scores[i])
+                score += self._memoized(memo, self._score_experience_match,
+                                        job.get("experience_level", ""))
+                score += self._memoized(memo, self._score_salary_match,
+                                        job.get("salary_min"), job.get("salary_max"),
+                                        job.get("salary_currency", "USD"))
+                score += self._memoized(memo, self._score_location_match,
+                                        job.get("location", ""), job.get("is_remote", False))
+                score += self._memoized(memo, self._score_job_type_match, job.get("job_type", ""))
+                score += self._memoized(memo, self._score_recency, job.get("posted_date", ""))
+                scores.append(max(0, min(100, score)))
+            except Exception as e:
+                logger.error(f"Scoring error for '{job.get('title', '?')}': {e}")
+                scores.append(0)
+        return scores
+
+    @staticmethod
+    def _memoized(memo: Dict[Any, Any], fn: Callable[..., int], *args) -> int:
+        try:
+            key = (fn.__name__, args)
+            hash(key)
+        except TypeError:
+            return fn(*args)
+        if key not in memo:
+            memo[key] = fn(*args)
+        return memo[key]
+
     # ── component scorers ─────────────────────────────────────────────────────
 
     def _score_title_match(self, title: str) -> int:
@@ -375,8 +537,8 @@ def rank_jobs(
     """
     scorer = JobRelevanceScorer(profile)
 
-    for job in jobs:
-        job["relevance_score"] = scorer.calculate_score(job)
+    for job, score in zip(jobs, scorer.calculate_scores(jobs)):
+        job["relevance_score"] = score
 
     filtered = [j for j in jobs if j["relevance_score"] >= min_score]
     filtered.sort(key=lambda j: j["relevance_score"], reverse=True)
@@ -0,0 +1,403 @@
+"""
+Search-result cache for JobAPIAdapter.search_jobs
+
+Continuous mode and the /api/search-jobs route re-run the same searches round
+after round, each one spending paid API quota (e.g. the Google CSE daily cap)
+and several seconds of latency.  This module caches adapter responses keyed by
+adapter name + a canonical form of the query parameters.
+
+  - per-source TTLs (SOURCE_TTLS), plus a stale window during which a cached
+    result is served immediately and refreshed on a background thread
+    (stale-while-revalidate)
+  - SQLite backend (size-bounded LRU under ~/.launchway) for the CLI
+  - Redis backend for the server (selected automatically when REDIS_URL is set)
+  - hit / stale-hit / miss / quota-saved counters via get_stats()
+  - source_params(): adapter params generated from the user's query and
+    profile (Gemini for TheMuse, JSearch, Adzuna, TheirStack) cached per
+    source + user query + profile, so repeat searches reuse them and hit the
+    same result entry
+
+Only successful, non-empty responses are cached so a failing API is retried on
+the next search instead of being masked for a whole TTL.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached result is served as fresh, per adapter api_name
+SOURCE_TTLS = {
+    "JobSpy": 30 * 60,               # scraped boards change quickly
+    "GoogleCustomSearch": 6 * 3600,  # 100 calls/day - hold results longer
+    "JSearch": 2 * 3600,
+    "Adzuna": 2 * 3600,
+    "ActiveJobsDB": 2 * 3600,
+    "GoogleJobs": 2 * 3600,
+    "TheMuse": 6 * 3600,
+    "TheirStack": 6 * 3600,
+}
+DEFAULT_TTL = 3600
+# Extra seconds after expiry during which the stale result is still returned
+# while a background refresh runs
+DEFAULT_STALE_TTL = 2 * 3600
+# Generated adapter params depend only on the user's query, so they are kept
+# longer than any result entry built from them
+DEFAULT_PARAMS_TTL = 24 * 3600
+
+DEFAULT_CACHE_PATH = Path.home() / ".launchway" / "search_cache.sqlite3"
+DEFAULT_MAX_ENTRIES = 500
+
+
+def _canonical_value(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    if isinstance(value, dict):
+        return {str(k): _canonical_value(v) for k, v in value.items() if v is not None and v != ""}
+    if isinstance(value, (list, tuple, set)):
+        items = [_canonical_value(v) for v in value if v is not None and v != ""]
+        # Order of filter lists (sites, employment types...) never changes the result set
+        return sorted(items, key=lambda v: json.dumps(v, sort_keys=True, default=str))
+    return value
+
+
+def canonical_query_key(source: str, query_params: Dict[str, Any]) -> str:
+    """
+    Cache key for one adapter search.
+
+    Params are normalized so trivially different dicts hit the same entry:
+    None/empty values dropped, strings lower-cased with whitespace collapsed,
+    list values sorted, keys sorted.
+    """
+    canonical = _canonical_value(query_params or {})
+    digest = hashlib.sha256(
+        json.dumps(canonical, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+    return f"jobsearch:{source}:{digest[:32]}"
+
+
+class SQLiteSearchCacheBackend:
+    """Size-bounded LRU store in a local SQLite file (safe across threads and processes)."""
+
+    def __init__(self, path: Path = DEFAULT_CACHE_PATH, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.max_entries = max(1, int(max_entries))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS search_cache ("
+                " key TEXT PRIMARY KEY,"
+                " stored_at REAL NOT NULL,"
+                " last_access REAL NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " payload TEXT NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_search_cache_last_access ON search_cache(last_access)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(str(self.path), timeout=5)
+
+    def get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT stored_at, expires_at, payload FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                return None
+            stored_at, expires_at, payload = row
+            if expires_at <= now:
+                conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+                return None
+            conn.execute("UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key))
+        return stored_at, json.loads(payload)
+
+    def set(self, key: str, entry: Dict[str, Any], retain_seconds: float) -> None:
+        now = time.time()
+        payload = json.dumps(entry, default=str)
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, stored_at, last_access, expires_at, payload)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, now, now, now + retain_seconds, payload),
+            )
+            conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+            (count,) = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()
+            if count > self.max_entries:
+                conn.execute(
+                    "DELETE FROM search_cache WHERE key IN ("
+                    " SELECT key FROM search_cache ORDER BY last_access ASC LIMIT ?)",
+                    (count - self.max_entries,),
+                )
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM search_cache")
+
+
+class RedisSearchCacheBackend:
+    """Shared store for the server; entries expire via Redis TTLs."""
+
+    def __init__(self, client, key_prefix: str = "jobsearch:"):
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        raw = self.client.get(key)
+        if not raw:
+            return None
+        data = json.loads(raw)
+        return data["stored_at"], data["entry"]
+
+    def set(self, key: str, entry: Dict[str, Any], retain_seconds: float) -> None:
+        payload = json.dumps({"stored_at": time.time(), "entry": entry}, default=str)
+        self.client.set(key, payload, ex=max(1, int(retain_seconds)))
+
+    def clear(self) -> None:
+        for key in self.client.scan_iter(match=f"{self.key_prefix}*"):
+            self.client.delete(key)
+
+
+class JobSearchCache:
+    """TTL + stale-while-revalidate cache of adapter search responses."""
+
+    def __init__(
+        self,
+        backend,
+        source_ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = DEFAULT_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        params_ttl: float = DEFAULT_PARAMS_TTL,
+    ):
+        self.backend = backend
+        self.source_ttls = {**SOURCE_TTLS, **(source_ttls or {})}
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.params_ttl = params_ttl
+        self._lock = threading.Lock()
+        self._refreshing = set()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def ttl_for(self, source: str) -> float:
+        return self.source_ttls.get(source, self.default_ttl)
+
+    def _bump(self, source: str, counter: str, amount: float = 1) -> None:
+        with self._lock:
+            per_source = self._stats.setdefault(
+                source,
+                {"hits": 0, "stale_hits": 0, "misses": 0, "refreshes": 0,
+                 "errors": 0, "calls_saved": 0, "quota_units_saved": 0, "params_reused": 0},
+            )
+            per_source[counter] += amount
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-source counters plus totals and hit rate."""
+        with self._lock:
+            per_source = {name: dict(counters) for name, counters in self._stats.items()}
+        totals: Dict[str, float] = {}
+        for counters in per_source.values():
+            for name, value in counters.items():
+                totals[name] = totals.get(name, 0) + value
+        lookups = totals.get("hits", 0) + totals.get("stale_hits", 0) + totals.get("misses", 0)
+        served = totals.get("hits", 0) + totals.get("stale_hits", 0)
+        totals["hit_rate"] = round(served / lookups, 3) if lookups else 0.0
+        return {"sources": per_source, "totals": totals}
+
+    @staticmethod
+    def _quota_remaining(adapter) -> Optional[int]:
+        """Remaining daily calls for adapters that track a paid quota (Google CSE)."""
+        probe = getattr(adapter, "_remaining_calls_today", None)
+        if not callable(probe):
+            return None
+        try:
+            return int(probe())
+        except Exception:
+            return None
+
+    def _fetch_and_store(self, adapter, key: str, query_params: Dict[str, Any]) -> Dict[str, Any]:
+        source = adapter.api_name
+        quota_before = self._quota_remaining(adapter)
+        response = adapter.search_jobs(query_params)
+        quota_after = self._quota_remaining(adapter)
+        if response and response.get("data") and not response.get("error"):
+            quota_cost = 1
+            if quota_before is not None and quota_after is not None:
+                quota_cost = max(0, quota_before - quota_after)
+            try:
+                self.backend.set(
+                    key,
+                    {"response": response, "quota_cost": quota_cost},
+                    self.ttl_for(source) + self.stale_ttl,
+                )
+            except Exception as e:
+                self._bump(source, "errors")
+                logger.warning(f"Search cache write failed for {source}: {e}")
+        return response
+
+    def _refresh_in_background(self, adapter, key: str, query_params: Dict[str, Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                self._fetch_and_store(adapter, key, query_params)
+                self._bump(adapter.api_name, "refreshes")
+            except Exception as e:
+                logger.warning(f"Background refresh failed for {adapter.api_name}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=_refresh, name=f"search-cache-refresh-{adapter.api_name}", daemon=True).start()
+
+    def source_params(
+        self,
+        source: str,
+        user_query: Dict[str, Any],
+        generate: Callable[[], Optional[Dict[str, Any]]],
+        profile_key: str = "",
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Adapter params derived from `user_query`, generated once per source + query.
+
+        Generated params (e.g. from Gemini) differ slightly on every call, so
+        hashing fresh ones into the result key would almost never hit.  Reusing
+        the stored params keeps the key stable and skips the generation.  A None
+        from `generate` (generation failed) is returned but not stored.
+
+        `profile_key` identifies everything else the generation reads (e.g. a
+        hash of the profile in the prompt); params are never shared across
+        different profile keys, and a profile edit generates new ones.
+        """
+        key = canonical_query_key(f"params:{source}", {"query": user_query, "profile": profile_key})
+        try:
+            cached = self.backend.get(key)
+        except Exception as e:
+            self._bump(source, "errors")
+            logger.warning(f"Search params cache read failed for {source}: {e}")
+            cached = None
+        if cached is not None and time.time() - cached[0] <= self.params_ttl:
+            self._bump(source, "params_reused")
+            return dict(cached[1]["params"])
+
+        params = generate()
+        if params:
+            try:
+                self.backend.set(key, {"params": params}, self.params_ttl)
+            except Exception as e:
+                self._bump(source, "errors")
+                logger.warning(f"Search params cache write failed for {source}: {e}")
+        return params
+
+    def search(self, adapter, query_params: Dict[str, Any]) -> Dict[str, Any]:
+        """Return adapter.search_jobs(query_params), served from cache when possible."""
+        source = adapter.api_name
+        key = canonical_query_key(source, query_params)
+        cached = None
+        try:
+            cached = self.backend.get(key)
+        except Exception as e:
+            self._bump(source, "errors")
+            logger.warning(f"Search cache read failed for {source}: {e}")
+
+        if cached is not None:
+            stored_at, entry = cached
+            age = time.time() - stored_at
+            ttl = self.ttl_for(source)
+            if age <= ttl + self.stale_ttl:
+                self._bump(source, "hits" if age <= ttl else "stale_hits")
+                self._bump(source, "calls_saved")
+                self._bump(source, "quota_units_saved", entry.get("quota_cost", 0))
+                if age > ttl:
+                    self._refresh_in_background(adapter, key, query_params)
+                response = dict(entry["response"])
+                response["cached"] = True
+                response["cache_age_s"] = round(age, 1)
+                logger.info(f"{source}: serving cached results ({age:.0f}s old{', refreshing' if age > ttl else ''})")
+                return response
+
+        self._bump(source, "misses")
+        return self._fetch_and_store(adapter, key, query_params)
+
+
+class CachedJobAPIAdapter:
+    """Wraps a JobAPIAdapter so search_jobs goes through a JobSearchCache."""
+
+    def __init__(self, adapter, cache: JobSearchCache):
+        self._adapter = adapter
+        self._cache = cache
+        self.api_name = adapter.api_name
+
+    def search_jobs(self, query_params: Dict[str, Any]) -> Dict[str, Any]:
+        return self._cache.search(self._adapter, query_params)
+
+    def __getattr__(self, name):
+        return getattr(self._adapter, name)
+
+
+_default_cache: Optional[JobSearchCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def _build_redis_client():
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return None
+    try:
+        import redis
+    except ImportError:
+        return None
+    # Upstash requires TLS
+    if redis_url.startswith("redis://") and "upstash.io" in redis_url:
+        redis_url = redis_url.replace("redis://", "rediss://", 1)
+    return redis.from_url(redis_url, decode_responses=True)
+
+
+def get_default_search_cache() -> Optional[JobSearchCache]:
+    """
+    Process-wide cache: Redis when REDIS_URL is set (server), otherwise SQLite
+    under ~/.launchway (CLI).  Returns None when disabled via
+    LAUNCHWAY_SEARCH_CACHE=off or when no backend can be opened.
+    """
+    global _default_cache
+    if os.getenv("LAUNCHWAY_SEARCH_CACHE", "on").strip().lower() in ("0", "off", "false", "no"):
+        return None
+    with _default_cache_lock:
+        if _default_cache is not None:
+            return _default_cache
+        try:
+            client = _build_redis_client()
+            if client is not None:
+                backend = RedisSearchCacheBackend(client)
+                logger.info("Job search cache: Redis backend")
+            else:
+                path = Path(os.getenv("LAUNCHWAY_SEARCH_CACHE_PATH", str(DEFAULT_CACHE_PATH)))
+                backend = SQLiteSearchCacheBackend(path)
+                logger.info(f"Job search cache: SQLite backend at {path}")
+            _default_cache = JobSearchCache(backend)
+        except Exception as e:
+            logger.warning(f"Job search cache unavailable: {e}")
+            return None
+        return _default_cache
+
+
+def wrap_adapters_with_cache(adapters: List[Any], cache: Optional[JobSearchCache]) -> List[Any]:
+    """Route every adapter's search_jobs through `cache` (no-op when cache is None)."""
+    if cache is None:
+        return adapters
+    return [
+        a if isinstance(a, CachedJobAPIAdapter) else CachedJobAPIAdapter(a, cache)
+        for a in adapters
+    ]
@@ -0,0 +1,195 @@
+"""
+Concurrent fan-out of a job search across multiple JobAPIAdapters.
+
+Every adapter's search_jobs (plus any per-source parameter generation) runs on
+its own worker thread.  Results are handed back to the caller's thread as soon
+as each source finishes so dedup/ranking can start before the slowest API
+returns.
+
+Deadlines:
+  - per-source: a source that has been running longer than its timeout is
+    abandoned and reported as "timeout" (the thread is left to finish in the
+    background; its result is discarded)
+  - global: once the overall deadline passes, whatever has completed is
+    returned; sources still running are reported as "timeout", sources that
+    never got a worker are reported as "skipped"
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SourceResult:
+    """Outcome of one adapter's search."""
+    source: str
+    jobs: List[Dict[str, Any]] = field(default_factory=list)
+    status: str = "pending"  # ok | empty | error | timeout | skipped
+    latency_ms: float = 0.0
+    error: Optional[str] = None
+
+    def to_stats(self) -> Dict[str, Any]:
+        """Per-source entry for the `sources` map returned by search_all_sources."""
+        return {
+            "count": len(self.jobs),
+            "status": self.status,
+            "latency_ms": round(self.latency_ms, 1),
+            "error": self.error,
+        }
+
+
+class JobSearchFanOut:
+    """Runs adapter searches concurrently under per-source and global deadlines."""
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        source_timeout: float = 40.0,
+        deadline: float = 60.0,
+        source_timeouts: Optional[Dict[str, float]] = None,
+    ):
+        self.max_workers = max(1, int(max_workers))
+        self.source_timeout = source_timeout
+        self.deadline = deadline
+        self.source_timeouts = dict(source_timeouts or {})
+
+    def _timeout_for(self, source: str) -> float:
+        return self.source_timeouts.get(source, self.source_timeout)
+
+    @staticmethod
+    def _run_source(
+        adapter: Any,
+        build_params: Callable[[Any], Dict[str, Any]],
+        started_at: Dict[str, float],
+        lock: threading.Lock,
+    ) -> SourceResult:
+        name = adapter.api_name
+        t0 = time.monotonic()
+        with lock:
+            started_at[name] = t0
+        try:
+            params = build_params(adapter)
+            response = adapter.search_jobs(params) or {}
+            jobs = response.get("data") or []
+            if jobs:
+                status = "ok"
+            else:
+                status = "error" if response.get("error") else "empty"
+            return SourceResult(
+                source=name,
+                jobs=jobs,
+                status=status,
+                latency_ms=(time.monotonic() - t0) * 1000,
+                error=response.get("error"),
+            )
+        except Exception as e:
+            return SourceResult(
+                source=name,
+                status="error",
+                latency_ms=(time.monotonic() - t0) * 1000,
+                error=str(e),
+            )
+
+    def run(
+        self,
+        adapters: List[Any],
+        build_params: Callable[[Any], Dict[str, Any]],
+        on_result: Optional[Callable[[SourceResult], None]] = None,
+    ) -> Dict[str, SourceResult]:
+        """
+        Search every adapter concurrently.
+
+        Args:
+            adapters: JobAPIAdapter instances (anything with api_name + search_jobs)
+            build_params: Called on the worker thread to build each adapter's query params
+            on_result: Called on the calling thread with each SourceResult as it completes
+
+        Returns:
+            {source_name: SourceResult} in adapter order, one entry per adapter
+        """
+        results: Dict[str, SourceResult] = {}
+        if not adapters:
+            return results
+
+        started_at: Dict[str, float] = {}
+        lock = threading.Lock()
+        began = time.monotonic()
+        executor = ThreadPoolExecutor(
+            max_workers=min(self.max_workers, len(adapters)),
+            thread_name_prefix="job-search",
+        )
+        pending = {
+            executor.submit(self._run_source, adapter, build_params, started_at, lock): adapter.api_name
+            for adapter in adapters
+        }
+
+        def _deliver(result: SourceResult):
+            results[result.source] = result
+            if result.status == "error":
+                logger.error(f"{result.source}: search failed after {result.latency_ms:.0f}ms: {result.error}")
+            elif result.status == "timeout":
+                logger.warning(f"{result.source}: abandoned after {result.latency_ms:.0f}ms ({result.status})")
+            else:
+                logger.info(f"{result.source}: {len(result.jobs)} jobs in {result.latency_ms:.0f}ms")
+            if on_result is not None:
+                try:
+                    on_result(result)
+                except Exception as e:
+                    logger.error(f"Error handling results from {result.source}: {e}")
+
+        try:
+            while pending:
+                now = time.monotonic()
+                remaining = self.deadline - (now - began)
+                if remaining <= 0:
+                    break
+
+                # Sleep until the next completion, the next per-source expiry, or the global deadline
+                wake_in = remaining
+                with lock:
+                    for name in pending.values():
+                        if name in started_at:
+                            wake_in = min(wake_in, self._timeout_for(name) - (now - started_at[name]))
+                done, _ = wait(list(pending), timeout=max(wake_in, 0.0), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    pending.pop(future)
+                    _deliver(future.result())
+
+                now = time.monotonic()
+                with lock:
+                    expired = [
+                        (future, name) for future, name in pending.items()
+                        if name in started_at and now - started_at[name] >= self._timeout_for(name)
+                    ]
+                for future, name in expired:
+                    pending.pop(future)
+                    _deliver(SourceResult(
+                        source=name,
+                        status="timeout",
+                        latency_ms=(now - started_at[name]) * 1000,
+                        error=f"no response within {self._timeout_for(name):.0f}s",
+                    ))
+        finally:
+            now = time.monotonic()
+            for future, name in pending.items():
+                if future.done() and not future.cancelled():
+                    _deliver(future.result())
+                elif future.cancel() or name not in started_at:
+                    _deliver(SourceResult(source=name, status="skipped", error="global search deadline reached"))
+                else:
+                    _deliver(SourceResult(
+                        source=name,
+                        status="timeout",
+                        latency_ms=(now - started_at[name]) * 1000,
+                        error="global search deadline reached",
+                    ))
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return {a.api_name: results[a.api_name] for a in adapters if a.api_name in results}
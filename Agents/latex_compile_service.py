@@ -0,0 +1,526 @@
+"""
+LaTeX compile service
+
+Tailoring compiles the same project many times (page-count baseline, repair
+loop, bullet-shrink loop) and stored resumes are compiled again on upload
+and download.  Every compile used to be two cold pdflatex passes.  This
+service puts four things in front of pdflatex:
+
+  - a content-addressed cache of PDF bytes + page count, keyed by a hash of
+    every project file (the main file's build outputs excluded) and the main
+    .tex path, stored under ~/.launchway/latex_cache
+  - a single pass when the first pass leaves the .aux unchanged (the
+    cross-references were already stable, a second pass would change nothing)
+  - a precompiled preamble per template (mylatexformat), keyed by the
+    preamble text and the local files it loads; templates that cannot be
+    dumped fall back to plain compiles and are remembered as unsupported
+  - a bounded worker pool, with concurrent requests for the same content
+    waiting on one compile
+
+get_stats() reports requests, cache hit rate, passes and compile time.
+
+Environment:
+  LAUNCHWAY_LATEX_CACHE=off             disable the PDF cache
+  LAUNCHWAY_LATEX_CACHE_DIR             cache directory
+  LAUNCHWAY_LATEX_CACHE_ENTRIES         cached PDFs kept (default 200)
+  LAUNCHWAY_LATEX_PREAMBLE_FORMAT=off   disable precompiled preambles
+  LAUNCHWAY_LATEX_WORKERS               concurrent pdflatex jobs (default 2)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".launchway" / "latex_cache"
+DEFAULT_MAX_ENTRIES = 200
+DEFAULT_WORKERS = 2
+
+# Outputs pdflatex writes for the main file (<stem><suffix>); they do not
+# change the output of a fresh compile, so they are left out of the content
+# hash.  Other files with these suffixes (e.g. PDF figures) are sources.
+BUILD_ARTIFACT_SUFFIXES = (
+    ".aux", ".log", ".out", ".pdf", ".toc", ".fls", ".fdb_latexmk", ".synctex.gz",
+)
+# Precompiled preamble copied into the project for a compile (see
+# _prepare_preamble_format)
+_FORMAT_FILE_RE = re.compile(r"lw_[0-9a-f]+\.(?:fmt|log)")
+
+_PREAMBLE_INPUT_RE = re.compile(r"\\(?:input|include|documentclass|usepackage)(?:\[[^\]]*\])?\{([^}]+)\}")
+
+
+def _is_off(name: str) -> bool:
+    return os.getenv(name, "on").strip().lower() in ("0", "off", "false", "no")
+
+
+def count_pdf_pages(pdf_bytes: Optional[bytes]) -> Optional[int]:
+    """Count pages in a PDF from raw bytes. Returns None if counting fails."""
+    if not pdf_bytes:
+        return None
+    try:
+        try:
+            from pypdf import PdfReader
+            return len(PdfReader(io.BytesIO(pdf_bytes)).pages)
+        except ImportError:
+            pass
+        try:
+            from PyPDF2 import PdfReader  # type: ignore
+            return len(PdfReader(io.BytesIO(pdf_bytes)).pages)
+        except ImportError:
+            pass
+        # Raw-bytes fallback: count unique /Type /Page dictionary entries.
+        count = len(re.findall(rb"/Type\s*/Page\b", pdf_bytes))
+        return count if count > 0 else None
+    except Exception:
+        return None
+
+
+def _file_digest(path: str) -> Optional[str]:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+def _aux_state(project_dir: str, stem: str) -> Tuple[Optional[str], ...]:
+    """Digests of the files a pass reads back from the previous one."""
+    base = os.path.join(project_dir, stem)
+    return tuple(_file_digest(base + suffix) for suffix in (".aux", ".toc", ".out"))
+
+
+def _build_artifacts(main_tex_file: str) -> FrozenSet[str]:
+    """Project-relative paths of the files a compile of main_tex_file writes."""
+    stem = os.path.splitext(main_tex_file.replace("\\", "/"))[0]
+    # Next to the main file's path as given and, for a main file in a
+    # subdirectory, in the working directory (pdflatex's default)
+    stems = {stem, stem.rsplit("/", 1)[-1]}
+    return frozenset(s + suffix for s in stems for suffix in BUILD_ARTIFACT_SUFFIXES)
+
+
+def project_hash(project_dir: str, main_tex_file: str) -> str:
+    """Content address of a LaTeX project: main file path + every source file."""
+    digest = hashlib.sha256(main_tex_file.replace("\\", "/").encode("utf-8"))
+    artifacts = _build_artifacts(main_tex_file)
+    for root, dirs, files in os.walk(project_dir):
+        dirs.sort()
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            rel = os.path.relpath(full, project_dir).replace("\\", "/")
+            if rel in artifacts or _FORMAT_FILE_RE.fullmatch(rel):
+                continue
+            digest.update(b"\0" + rel.encode("utf-8") + b"\0")
+            digest.update((_file_digest(full) or "").encode("ascii"))
+    return digest.hexdigest()[:40]
+
+
+def preamble_key(project_dir: str, main_tex_file: str) -> Optional[str]:
+    """Key of the main file's preamble and the local files it loads, or None without one."""
+    main_path = os.path.join(project_dir, main_tex_file.replace("/", os.sep))
+    try:
+        with open(main_path, "r", encoding="utf-8", errors="ignore") as f:
+            text = f.read()
+    except OSError:
+        return None
+    end = text.find("\\begin{document}")
+    if end == -1:
+        return None
+    preamble = text[:end]
+    digest = hashlib.sha256(preamble.encode("utf-8"))
+    main_dir = os.path.dirname(main_path)
+    for match in _PREAMBLE_INPUT_RE.finditer(preamble):
+        for name in match.group(1).split(","):
+            name = name.strip()
+            for candidate in (name, name + ".tex", name + ".sty", name + ".cls"):
+                local = os.path.join(main_dir, candidate.replace("/", os.sep))
+                if os.path.isfile(local):
+                    digest.update(candidate.encode("utf-8"))
+                    digest.update((_file_digest(local) or "").encode("ascii"))
+                    break
+    return digest.hexdigest()[:24]
+
+
+@dataclass
+class CompileStats:
+    requests: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0          # waited on an identical compile already running
+    compiles: int = 0
+    failures: int = 0
+    single_pass: int = 0
+    preamble_format_compiles: int = 0
+    preamble_format_builds: int = 0
+    compile_ms_total: int = 0
+
+
+class LatexCompileService:
+    """pdflatex behind a PDF cache, single-pass detection, preamble formats and a worker pool."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        workers: int = DEFAULT_WORKERS,
+        use_cache: bool = True,
+        use_preamble_formats: bool = True,
+        runner: Callable[..., subprocess.CompletedProcess] = subprocess.run,
+    ):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_entries = max_entries
+        self.use_cache = use_cache
+        self.use_preamble_formats = use_preamble_formats
+        self.runner = runner
+        self.stats = CompileStats()
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="latex-compile")
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    # ── Public API ───────────────────────────────────────────────────────
+
+    def compile(
+        self,
+        project_dir: str,
+        main_tex_file: str,
+        timeout_seconds: int = 90,
+    ) -> Tuple[Optional[bytes], Dict[str, Any]]:
+        """
+        Compile `main_tex_file` in `project_dir`; returns (pdf_bytes|None, meta).
+
+        meta has success, compiler, error, stdout, stderr, duration_ms plus
+        cached, passes, preamble_format and page_count (raw PDF pages).
+        """
+        meta = _new_meta()
+        main_rel = (main_tex_file or "").strip().replace("\\", "/")
+        if not main_rel:
+            meta["error"] = "Missing main .tex file path."
+            return None, meta
+        if not os.path.exists(os.path.join(project_dir, main_rel.replace("/", os.sep))):
+            meta["error"] = f"Main .tex file not found at: {main_rel}"
+            return None, meta
+
+        started = time.perf_counter()
+        key = project_hash(project_dir, main_rel)
+        self._bump("requests")
+
+        cached = self._cache_get(key)
+        if cached is not None:
+            pdf_bytes, page_count = cached
+            self._bump("cache_hits")
+            meta.update(success=True, compiler="pdflatex", cached=True, page_count=page_count,
+                        duration_ms=int((time.perf_counter() - started) * 1000))
+            logger.info("LaTeX compile cache hit for %s (hit rate %.0f%%)", main_rel, self.hit_rate() * 100)
+            return pdf_bytes, meta
+
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._executor.submit(self._compile_uncached, project_dir, main_rel, timeout_seconds, key)
+                self._inflight[key] = future
+            else:
+                self.stats.coalesced += 1
+        try:
+            pdf_bytes, result_meta = future.result()
+        finally:
+            if owner:
+                with self._lock:
+                    self._inflight.pop(key, None)
+        return pdf_bytes, dict(result_meta)
+
+    def hit_rate(self) -> float:
+        with self._lock:
+            requests, hits = self.stats.requests, self.stats.cache_hits + self.stats.coalesced
+        return hits / requests if requests else 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters plus cache hit rate and mean compile time."""
+        with self._lock:
+            stats = asdict(self.stats)
+        stats["hit_rate"] = round(self.hit_rate(), 3)
+        stats["avg_compile_ms"] = (
+            round(stats["compile_ms_total"] / stats["compiles"]) if stats["compiles"] else 0
+        )
+        return stats
+
+    # ── Compiling ────────────────────────────────────────────────────────
+
+    def _bump(self, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self.stats, counter, getattr(self.stats, counter) + amount)
+
+    def _compile_uncached(
+        self,
+        project_dir: str,
+        main_rel: str,
+        timeout_seconds: int,
+        key: str,
+    ) -> Tuple[Optional[bytes], Dict[str, Any]]:
+        meta = _new_meta()
+        started = time.perf_counter()
+        format_name = self._prepare_preamble_format(project_dir, main_rel, timeout_seconds)
+        try:
+            pdf_bytes = self._run_passes(project_dir, main_rel, timeout_seconds, meta, format_name)
+            if pdf_bytes is None and format_name and not meta.get("_no_retry"):
+                # Retry plainly; if that works the format itself was the problem
+                # (TeX upgrade, preamble that does not survive a dump)
+                meta.update(error=None)
+                pdf_bytes = self._run_passes(project_dir, main_rel, timeout_seconds, meta, None)
+                if pdf_bytes is not None:
+                    logger.warning("Precompiled preamble failed for %s - no longer using it", main_rel)
+                    self._mark_format_unsupported(format_name)
+        finally:
+            if format_name:
+                _remove_quietly(os.path.join(project_dir, format_name + ".fmt"))
+
+        duration_ms = int((time.perf_counter() - started) * 1000)
+        meta["duration_ms"] = duration_ms
+        meta.pop("_no_retry", None)
+        self._bump("compiles")
+        self._bump("compile_ms_total", duration_ms)
+        if pdf_bytes is None:
+            self._bump("failures")
+            return None, meta
+
+        if meta["passes"] == 1:
+            self._bump("single_pass")
+        if meta["preamble_format"]:
+            self._bump("preamble_format_compiles")
+        meta["page_count"] = count_pdf_pages(pdf_bytes)
+        self._cache_put(key, pdf_bytes, meta["page_count"])
+        logger.info(
+            "LaTeX compiled %s in %dms (%d pass(es)%s, cache hit rate %.0f%%)",
+            main_rel, duration_ms, meta["passes"],
+            ", precompiled preamble" if meta["preamble_format"] else "",
+            self.hit_rate() * 100,
+        )
+        return pdf_bytes, meta
+
+    def _run_passes(
+        self,
+        project_dir: str,
+        main_rel: str,
+        timeout_seconds: int,
+        meta: Dict[str, Any],
+        format_name: Optional[str],
+    ) -> Optional[bytes]:
+        """Up to two pdflatex passes; the second only when the first changed the .aux."""
+        cmd = ["pdflatex"]
+        if format_name:
+            cmd.append(f"-fmt={format_name}")
+        cmd += ["-interaction=nonstopmode", "-halt-on-error", "-file-line-error", main_rel]
+        meta["compiler"] = "pdflatex"
+        meta["preamble_format"] = bool(format_name)
+
+        stem = os.path.splitext(main_rel)[0].replace("/", os.sep)
+        try:
+            for pass_number in (1, 2):
+                aux_before = _aux_state(project_dir, stem)
+                result = self.runner(
+                    cmd,
+                    cwd=project_dir,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout_seconds,
+                    check=True,
+                )
+                meta["passes"] = pass_number
+                if _aux_state(project_dir, stem) == aux_before:
+                    break  # references already stable
+
+            meta["stdout"] = (result.stdout or "")[-20000:]
+            meta["stderr"] = (result.stderr or "")[-20000:]
+
+            pdf_on_disk = os.path.join(project_dir, stem + ".pdf")
+            if not os.path.exists(pdf_on_disk):
+                meta["error"] = f"Compilation completed but PDF not found: {os.path.splitext(main_rel)[0]}.pdf"
+                return None
+            with open(pdf_on_disk, "rb") as f:
+                pdf_bytes = f.read()
+            meta["success"] = True
+            return pdf_bytes
+
+        except subprocess.TimeoutExpired:
+            meta["error"] = f"LaTeX compilation timed out after {timeout_seconds}s."
+            meta["_no_retry"] = True
+            return None
+        except FileNotFoundError:
+            meta["error"] = "pdflatex not found on PATH (install MiKTeX or TeX Live)."
+            meta["_no_retry"] = True
+            return None
+        except subprocess.CalledProcessError as e:
+            meta["stdout"] = (e.stdout or "")[-20000:]
+            meta["stderr"] = (e.stderr or "")[-20000:]
+            meta["error"] = f"LaTeX compilation failed (compiler={meta.get('compiler')})."
+            return None
+
+    # ── Precompiled preambles ────────────────────────────────────────────
+
+    def _format_dir(self) -> Path:
+        return self.cache_dir / "formats"
+
+    def _mark_format_unsupported(self, format_name: str) -> None:
+        try:
+            self._format_dir().mkdir(parents=True, exist_ok=True)
+            (self._format_dir() / f"{format_name}.unsupported").touch()
+            _remove_quietly(str(self._format_dir() / f"{format_name}.fmt"))
+        except OSError:
+            pass
+
+    def _prepare_preamble_format(self, project_dir: str, main_rel: str, timeout_seconds: int) -> Optional[str]:
+        """Copy this template's preamble format into the project (building it once); returns its name."""
+        if not self.use_preamble_formats:
+            return None
+        key = preamble_key(project_dir, main_rel)
+        if not key:
+            return None
+        format_name = f"lw_{key}"
+        format_dir = self._format_dir()
+        cached_format = format_dir / f"{format_name}.fmt"
+        if (format_dir / f"{format_name}.unsupported").exists():
+            return None
+
+        if not cached_format.exists():
+            built = os.path.join(project_dir, format_name + ".fmt")
+            try:
+                self.runner(
+                    ["pdflatex", "-ini", "-interaction=nonstopmode", "-halt-on-error",
+                     f"-jobname={format_name}", "&pdflatex", "mylatexformat.ltx", main_rel],
+                    cwd=project_dir,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout_seconds,
+                    check=True,
+                )
+                if not os.path.exists(built):
+                    raise subprocess.SubprocessError("no format file written")
+                format_dir.mkdir(parents=True, exist_ok=True)
+                tmp = format_dir / f"{format_name}.{uuid.uuid4().hex[:8]}.tmp"
+                shutil.move(built, tmp)
+                os.replace(tmp, cached_format)
+                self._bump("preamble_format_builds")
+            except FileNotFoundError:
+                return None  # no pdflatex; the compile reports it
+            except (subprocess.SubprocessError, OSError) as e:
+                logger.info("Preamble of %s cannot be precompiled (%s) - using plain compiles", main_rel, e)
+                self._mark_format_unsupported(format_name)
+                return None
+            finally:
+                _remove_quietly(built)
+                _remove_quietly(os.path.join(project_dir, format_name + ".log"))
+
+        try:
+            shutil.copyfile(cached_format, os.path.join(project_dir, format_name + ".fmt"))
+        except OSError:
+            return None
+        return format_name
+
+    # ── PDF cache ────────────────────────────────────────────────────────
+
+    def _cache_get(self, key: str) -> Optional[Tuple[bytes, Optional[int]]]:
+        if not self.use_cache:
+            return None
+        pdf_path = self.cache_dir / f"{key}.pdf"
+        meta_path = self.cache_dir / f"{key}.json"
+        try:
+            page_count = json.loads(meta_path.read_text(encoding="utf-8")).get("page_count")
+            pdf_bytes = pdf_path.read_bytes()
+            os.utime(meta_path)  # recency for pruning
+            return pdf_bytes, page_count
+        except (OSError, ValueError):
+            return None
+
+    def _cache_put(self, key: str, pdf_bytes: bytes, page_count: Optional[int]) -> None:
+        if not self.use_cache:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            suffix = uuid.uuid4().hex[:8]
+            tmp_pdf = self.cache_dir / f"{key}.pdf.{suffix}.tmp"
+            tmp_pdf.write_bytes(pdf_bytes)
+            os.replace(tmp_pdf, self.cache_dir / f"{key}.pdf")
+            # The .json is written last: it marks the entry complete
+            tmp_meta = self.cache_dir / f"{key}.json.{suffix}.tmp"
+            tmp_meta.write_text(json.dumps({"page_count": page_count, "created_at": time.time()}), encoding="utf-8")
+            os.replace(tmp_meta, self.cache_dir / f"{key}.json")
+            self._prune()
+        except OSError as e:
+            logger.warning("LaTeX compile cache write failed: %s", e)
+
+    def _prune(self) -> None:
+        entries = sorted(self.cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in entries[self.max_entries:]:
+            _remove_quietly(str(stale))
+            _remove_quietly(str(stale.with_suffix(".pdf")))
+
+
+def _new_meta() -> Dict[str, Any]:
+    return {
+        "success": False,
+        "compiler": None,
+        "error": None,
+        "stdout": "",
+        "stderr": "",
+        "duration_ms": 0,
+        "cached": False,
+        "passes": 0,
+        "preamble_format": False,
+        "page_count": None,
+    }
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+_default_service: Optional[LatexCompileService] = None
+_default_service_lock = threading.Lock()
+
+
+def get_compile_service() -> LatexCompileService:
+    """Process-wide compile service configured from the LAUNCHWAY_LATEX_* variables."""
+    global _default_service
+    with _default_service_lock:
+        if _default_service is None:
+            _default_service = LatexCompileService(
+                cache_dir=Path(os.getenv("LAUNCHWAY_LATEX_CACHE_DIR", str(DEFAULT_CACHE_DIR))),
+                max_entries=int(os.getenv("LAUNCHWAY_LATEX_CACHE_ENTRIES", str(DEFAULT_MAX_ENTRIES))),
+                workers=int(os.getenv("LAUNCHWAY_LATEX_WORKERS", str(DEFAULT_WORKERS))),
+                use_cache=not _is_off("LAUNCHWAY_LATEX_CACHE"),
+                use_preamble_formats=not _is_off("LAUNCHWAY_LATEX_PREAMBLE_FORMAT"),
+            )
+        return _default_service
+
+
+def set_compile_service(service: Optional[LatexCompileService]) -> Optional[LatexCompileService]:
+    """Replace the process-wide service (e.g. in tests); returns the previous one."""
+    global _default_service
+    with _default_service_lock:
+        previous, _default_service = _default_service, service
+    return previous
+
+
+def get_compile_stats() -> Dict[str, Any]:
+    """Stats of the process-wide service (zeros before the first compile)."""
+    with _default_service_lock:
+        service = _default_service
+    if service is None:
+        return dict(asdict(CompileStats()), hit_rate=0.0, avg_compile_ms=0)
+    return service.get_stats()
@@ -17,7 +17,6 @@ import logging
 import os
 import re
 import shutil
-import subprocess
 import tempfile
 import zipfile
 from dataclasses import dataclass
@@ -27,6 +26,7 @@ from typing import Any, Dict, List, Optional, Tuple
 from google import genai
 
 from gemini_rate_limiter import generate_content_with_retry
+from latex_compile_service import count_pdf_pages, get_compile_service
 from resume_tailoring_agent import extract_job_keywords
 
 logger = logging.getLogger(__name__)
@@ -370,81 +370,12 @@ def _compile_latex_project_to_pdf_bytes(
     """
     Compile a LaTeX project in `project_dir` and return compiled PDF bytes.
     Returns (pdf_bytes|None, meta).
-    """
-    meta: Dict[str, Any] = {
-        "success": False,
-        "compiler": None,
-        "error": None,
-        "stdout": "",
-        "stderr": "",
-        "duration_ms": 0,
-    }
-
-    main_rel = (main_tex_file or "").strip().replace("\\", "/")
-    if not main_rel:
-        meta["error"] = "Missing main .tex file path."
-        return None, meta
-
-    main_on_disk = os.path.join(project_dir, main_rel.replace("/", os.sep))
-    if not os.path.exists(main_on_disk):
-        meta["error"] = f"Main .tex file not found at: {main_rel}"
-        return None, meta
-
-    start = datetime.utcnow()
-
-    # Use pdflatex (two passes for refs/TOC). Avoids latexmk behavior differences on Windows/MiKTeX.
-    pdflatex_cmd = [
-        "pdflatex",
-        "-interaction=nonstopmode",
-        "-halt-on-error",
-        "-file-line-error",
-        main_rel,
-    ]
-
-    def _run(cmd: List[str], compiler_name: str) -> subprocess.CompletedProcess:
-        meta["compiler"] = compiler_name
-        return subprocess.run(
-            cmd,
-            cwd=project_dir,
-            capture_output=True,
-            text=True,
-            timeout=timeout_seconds,
-            check=True,
-        )
 
-    try:
-        result = _run(pdflatex_cmd, "pdflatex")
-        # Second pass for cross-references / TOC
-        result = _run(pdflatex_cmd, "pdflatex")
-
-        meta["stdout"] = (result.stdout or "")[-20000:]
-        meta["stderr"] = (result.stderr or "")[-20000:]
-
-        pdf_rel = os.path.splitext(main_rel)[0] + ".pdf"
-        pdf_on_disk = os.path.join(project_dir, pdf_rel.replace("/", os.sep))
-        if not os.path.exists(pdf_on_disk):
-            meta["error"] = f"Compilation completed but PDF not found: {pdf_rel}"
-            return None, meta
-
-        with open(pdf_on_disk, "rb") as f:
-            pdf_bytes = f.read()
-
-        meta["success"] = True
-        return pdf_bytes, meta
-
-    except subprocess.TimeoutExpired:
-        meta["error"] = f"LaTeX compilation timed out after {timeout_seconds}s."
-        return None, meta
-    except FileNotFoundError:
-        meta["error"] = "pdflatex not found on PATH (install MiKTeX or TeX Live)."
-        return None, meta
-    except subprocess.CalledProcessError as e:
-        meta["stdout"] = (e.stdout or "")[-20000:]
-        meta["stderr"] = (e.stderr or "")[-20000:]
-        meta["error"] = f"LaTeX compilation failed (compiler={meta.get('compiler')})."
-        return None, meta
-    finally:
-        meta["duration_ms"] = int((datetime.utcnow() - start).total_seconds() * 1000)
+    Goes through the shared compile service (content-hash PDF cache,
+    single pass when references are already stable, precompiled preamble,
+    bounded worker pool); meta["page_count"] carries the raw page count.
+    """
+    return get_compile_service().compile(project_dir, main_tex_file, timeout_seconds)
 
 
 def compile_latex_zip_to_pdf(
@@ -613,32 +544,16 @@ def parse_latex_zip(file_bytes: bytes, requested_main_tex: Optional[str] = None)
 
 def _count_pdf_pages(pdf_bytes: bytes) -> Optional[int]:
     """Count pages in a PDF from raw bytes. Returns None if counting fails."""
-    if not pdf_bytes:
-        return None
-    try:
-        try:
-            from pypdf import PdfReader
-            return len(PdfReader(io.BytesIO(pdf_bytes)).pages)
-        except ImportError:
-            pass
-        try:
-            from PyPDF2 import PdfReader  # type: ignore
-            return len(PdfReader(io.BytesIO(pdf_bytes)).pages)
-        except ImportError:
-            pass
-        # Raw-bytes fallback: count unique /Type /Page dictionary entries.
-        count = len(re.findall(rb"/Type\s*/Page\b", pdf_bytes))
-        return count if count > 0 else None
-    except Exception:
-        return None
+    return count_pdf_pages(pdf_bytes)
 
 
-def _get_effective_page_count(pdf_bytes: Optional[bytes]) -> Optional[int]:
+def _get_effective_page_count(pdf_bytes: Optional[bytes], raw_count: Optional[int] = None) -> Optional[int]:
     """
     Return the effective page count by subtracting the trailing blank page
     that pdflatex commonly appends.  Returns at least 1 if any pages exist.
+    Pass `raw_count` (compile meta["page_count"]) to skip re-parsing the PDF.
     """
-    raw = _count_pdf_pages(pdf_bytes)
+    raw = raw_count if raw_count is not None and pdf_bytes else _count_pdf_pages(pdf_bytes)
     if raw is None:
         return None
     return max(1, raw - 1)
@@ -846,12 +761,12 @@ def tailor_latex_resume_from_base64(
             main_tex_file=main_tex_file,
             timeout_seconds=90,
         )
-        original_page_count = _get_effective_page_count(_orig_pdf_bytes)
+        original_page_count = _get_effective_page_count(_orig_pdf_bytes, _orig_meta.get("page_count"))
         if original_page_count is not None:
             logger.info(
                 "Original resume effective page count: %d (raw=%s)",
                 original_page_count,
-                _count_pdf_pages(_orig_pdf_bytes),
+                _orig_meta.get("page_count"),
             )
         else:
             logger.warning(
@@ -1048,7 +963,7 @@ REPAIR PAYLOAD:
         # that pdflatex commonly appends.  Iteratively shorten the longest
         # bullet points one batch at a time, recompiling after each batch, until
         # the effective page count no longer exceeds the original.
-        tailored_page_count: Optional[int] = _get_effective_page_count(tailored_pdf_bytes)
+        tailored_page_count: Optional[int] = _get_effective_page_count(tailored_pdf_bytes, pdf_meta.get("page_count"))
         shrink_attempts_log: List[str] = []
         if tailored_pdf_bytes and original_page_count is not None:
             logger.info(
@@ -1107,7 +1022,7 @@ REPAIR PAYLOAD:
                 )
                 if shrunk_pdf_bytes:
                     tailored_pdf_bytes = shrunk_pdf_bytes
-                    tailored_page_count = _get_effective_page_count(shrunk_pdf_bytes)
+                    tailored_page_count = _get_effective_page_count(shrunk_pdf_bytes, shrunk_meta.get("page_count"))
                     logger.info(
                         "After shrink batch %d: effective pages = %s",
                         batch_num, tailored_page_count,
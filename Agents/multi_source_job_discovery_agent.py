@@ -6,8 +6,11 @@ Aggregates jobs from multiple sources and ranks them by relevance
 import os
 import sys
 import json
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+import threading
+from datetime import datetime
+from typing import Callable, Dict, Any, List, Optional
 from dotenv import load_dotenv
 from google import genai
 
@@ -15,22 +18,44 @@ logger = logging.getLogger(__name__)
 
 # Import our new modules
 from job_api_adapters import JobAPIFactory, JobAPIAdapter
-from job_relevance_scorer import rank_jobs
+from job_relevance_scorer import JobRelevanceScorer
+from job_search_fanout import JobSearchFanOut, SourceResult
+from job_search_cache import get_default_search_cache, wrap_adapters_with_cache
+from job_dedup_index import NearDuplicateJobIndex
+from applied_jobs_membership import AppliedJobsMembership, membership_delta
+
+# Applied-jobs membership per user, shared by every agent in the process and
+# refreshed with only the applications changed since its version
+_applied_memberships: Dict[str, AppliedJobsMembership] = {}
+_applied_memberships_lock = threading.Lock()
 
 
 class MultiSourceJobDiscoveryAgent:
     """Job Discovery Agent that searches across multiple job boards"""
 
-    def __init__(self, user_id=None, proxy_manager=None, profile_data=None):
+    # Source fan-out limits for search_all_sources.  Adapters use 20-30s HTTP
+    # timeouts and some also generate their params with Gemini first.
+    MAX_PARALLEL_SOURCES = 8
+    SOURCE_TIMEOUT_S = 40.0
+    SEARCH_DEADLINE_S = 60.0
+
+    def __init__(self, user_id=None, proxy_manager=None, profile_data=None,
+                 known_jobs: Optional[NearDuplicateJobIndex] = None):
         self.user_id = user_id
         self.proxy_manager = proxy_manager
+        # Jobs already handed out in earlier rounds (continuous mode); copies of
+        # them from any source are dropped before ranking
+        self.known_jobs = known_jobs
         # Accept pre-loaded profile (e.g. fetched via Launchway API) to avoid a direct DB call.
         self.profile_data = profile_data if profile_data is not None else self._load_profile_data()
-        self.adapters = JobAPIFactory.get_all_adapters(proxy_manager=proxy_manager)
+        # Identical searches across continuous-mode rounds / API requests are
+        # served from the search-result cache instead of spending API quota.
+        self.search_cache = get_default_search_cache()
+        self.adapters = wrap_adapters_with_cache(
+            JobAPIFactory.get_all_adapters(proxy_manager=proxy_manager), self.search_cache
+        )
         self.gemini_client = self._initialize_gemini()
-        self._applied_cache_loaded = False
-        self._applied_urls_cache = set()
-        self._applied_company_titles_cache = set()
+        self._applied_membership: Optional[AppliedJobsMembership] = None
         logger.info(f"Initialized with {len(self.adapters)} job API adapters")
         if proxy_manager:
             stats = proxy_manager.get_stats()
@@ -238,10 +263,16 @@ class MultiSourceJobDiscoveryAgent:
         manual_keywords: str = None,
         manual_location: str = None,
         manual_remote: bool = None,
-        manual_search_overrides: Optional[Dict[str, Any]] = None
+        manual_search_overrides: Optional[Dict[str, Any]] = None,
+        deadline_s: Optional[float] = None,
+        on_source_results: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
     ) -> Dict[str, Any]:
         """
-        Search all job sources and aggregate results
+        Search all job sources concurrently and aggregate results
+
+        Each source's jobs are deduplicated and scored as soon as that source
+        returns; sources still running at the deadline are reported but do not
+        hold up the response.
 
         Args:
             min_relevance_score: Minimum relevance score to include (0-100)
@@ -249,13 +280,16 @@ class MultiSourceJobDiscoveryAgent:
             manual_location: Override profile-based location (e.g., "New York, NY")
             manual_remote: Override remote preference (True/False)
             manual_search_overrides: Extra adapter/search params to merge (e.g., job_type, hours_old)
+            deadline_s: Overall search deadline in seconds (default: SEARCH_DEADLINE_S)
+            on_source_results: Called with (source_name, new ranked jobs) as each source completes
 
         Returns:
             {
                 "data": [jobs sorted by relevance],
                 "count": total_count,
-                "sources": {source_name: count},
-                "average_score": float
+                "sources": {source_name: {"count", "status", "latency_ms", "error"}},
+                "average_score": float,
+                "cache_stats": search-result cache counters (or None when disabled)
             }
         """
         try:
@@ -286,73 +320,49 @@ class MultiSourceJobDiscoveryAgent:
                 query_params.update(cleaned_overrides)
                 logger.info(f"Applied manual search overrides: {cleaned_overrides}")
             
-            all_jobs = []
-            source_counts = {}
-
-            # Search each source
-            for adapter in self.adapters:
+            seen = NearDuplicateJobIndex()
+            unique_jobs = []
+            ranked_jobs = []
+            scorer = None
+            if self.profile_data:
                 try:
-                    logger.info(f"Searching {adapter.api_name}...")
-
-                    # Adapt query params for specific adapter
-                    adapted_params = self._adapt_params_for_source(query_params, adapter)
-
-                    result = adapter.search_jobs(adapted_params)
-
-                    if result.get("data"):
-                        jobs = result["data"]
-                        all_jobs.extend(jobs)
-                        source_counts[adapter.api_name] = len(jobs)
-                        logger.info(f"{adapter.api_name}: Found {len(jobs)} jobs")
-                    else:
-                        source_counts[adapter.api_name] = 0
-                        logger.warning(f"{adapter.api_name}: No jobs found")
-
+                    scorer = JobRelevanceScorer(self.profile_data)
                 except Exception as e:
-                    logger.error(f"Error searching {adapter.api_name}: {e}")
-                    source_counts[adapter.api_name] = 0
-
-            logger.info(f"Total jobs before deduplication: {len(all_jobs)}")
-
-            # Deduplicate jobs
-            unique_jobs = self._deduplicate_jobs(all_jobs)
-            logger.info(f"Total jobs after deduplication: {len(unique_jobs)}")
-
-            # Rank jobs by relevance
-            if self.profile_data and len(unique_jobs) > 0:
-                logger.info(f"Ranking {len(unique_jobs)} jobs by relevance...")
-                try:
-                    # For Gemini-generated jobs, use a lower min_score since they're already profile-matched
-                    # Check if jobs are from Gemini
-                    gemini_jobs = [j for j in unique_jobs if j.get('source') == 'Gemini AI + Job Search']
-                    other_jobs = [j for j in unique_jobs if j.get('source') != 'Gemini AI + Job Search']
-                    
-                    ranked_jobs = []
-                    
-                    # Rank Gemini jobs with lower threshold (they're already profile-matched)
-                    if gemini_jobs:
-                        logger.info(f"Ranking {len(gemini_jobs)} Gemini jobs with min_score=0 (already profile-matched)")
-                        gemini_ranked = rank_jobs(gemini_jobs, self.profile_data, min_score=0)
-                        ranked_jobs.extend(gemini_ranked)
-                    
-                    # Rank other jobs with normal threshold
-                    if other_jobs:
-                        logger.info(f"Ranking {len(other_jobs)} non-Gemini jobs with min_score={min_relevance_score}")
-                        other_ranked = rank_jobs(other_jobs, self.profile_data, min_score=min_relevance_score)
-                        ranked_jobs.extend(other_ranked)
-                    
-                    # Sort all jobs by relevance score
-                    ranked_jobs.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
-                    
-                    logger.info(f"Ranking completed: {len(ranked_jobs)} jobs total")
-                except Exception as e:
-                    logger.error(f"Error ranking jobs: {e}")
+                    logger.error(f"Error initialising relevance scorer: {e}")
                     logger.warning("Falling back to unranked jobs")
-                    ranked_jobs = unique_jobs
             else:
-                ranked_jobs = unique_jobs
-                if not self.profile_data:
-                    logger.warning("No profile data available, skipping ranking")
+                logger.warning("No profile data available, skipping ranking")
+
+            def _ingest(result: SourceResult):
+                # Streamed per source: dedup against everything seen so far, then score
+                new_jobs = self._deduplicate_jobs(result.jobs, seen)
+                unique_jobs.extend(new_jobs)
+                ranked = self._rank_batch(new_jobs, scorer, min_relevance_score)
+                ranked_jobs.extend(ranked)
+                if on_source_results is not None and ranked:
+                    on_source_results(result.source, ranked)
+
+            fan_out = JobSearchFanOut(
+                max_workers=self.MAX_PARALLEL_SOURCES,
+                source_timeout=self.SOURCE_TIMEOUT_S,
+                deadline=deadline_s if deadline_s is not None else self.SEARCH_DEADLINE_S,
+            )
+            logger.info(f"Searching {len(self.adapters)} sources concurrently...")
+            source_results = fan_out.run(
+                self.adapters,
+                lambda adapter: self._adapt_params_for_source(query_params, adapter),
+                on_result=_ingest,
+            )
+            source_stats = {name: res.to_stats() for name, res in source_results.items()}
+
+            logger.info(
+                f"Total jobs after deduplication: {len(unique_jobs)} "
+                f"(from {sum(st['count'] for st in source_stats.values())} raw)"
+            )
+
+            # Sort all jobs by relevance score
+            ranked_jobs.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+            logger.info(f"Ranking completed: {len(ranked_jobs)} jobs total")
 
             # Filter out jobs already applied to (duplicate prevention)
             ranked_jobs = self._filter_already_applied(ranked_jobs)
@@ -365,9 +375,10 @@ class MultiSourceJobDiscoveryAgent:
             return {
                 "data": ranked_jobs,
                 "count": len(ranked_jobs),
-                "sources": source_counts,
+                "sources": source_stats,
                 "average_score": round(avg_score, 2),
-                "total_before_filter": len(unique_jobs)
+                "total_before_filter": len(unique_jobs),
+                "cache_stats": self.search_cache.get_stats() if self.search_cache else None,
             }
 
         except Exception as e:
@@ -380,11 +391,11 @@ class MultiSourceJobDiscoveryAgent:
                 "error": str(e)
             }
 
-    def _generate_api_params_with_gemini(self, adapter: JobAPIAdapter) -> Dict[str, Any]:
-        """Use Gemini to generate optimal API parameters for a specific job source"""
+    def _generate_api_params_with_gemini(self, adapter: JobAPIAdapter) -> Optional[Dict[str, Any]]:
+        """Use Gemini to generate optimal API parameters for a specific job source (None on failure)"""
         if not self.gemini_client:
             logger.warning("Gemini client not initialized, falling back to basic params")
-            return self._build_query_params()
+            return None
 
         # Define API parameter structures for each source
         api_specs = {
@@ -500,7 +511,7 @@ class MultiSourceJobDiscoveryAgent:
         api_spec = api_specs.get(adapter.api_name)
         if not api_spec:
             # Fallback to basic params for unknown adapters
-            return self._build_query_params()
+            return None
 
         prompt = f"""
 You are a job search optimization expert. Given a user's profile, generate the BEST API parameters to find the MAXIMUM number of RELEVANT jobs.
@@ -546,13 +557,26 @@ Return the optimized parameters as JSON:
 
         except Exception as e:
             logger.error(f"Error generating params with Gemini for {adapter.api_name}: {e}")
-            return self._build_query_params()
+            return None
 
     def _adapt_params_for_source(self, params: Dict[str, Any], adapter: JobAPIAdapter) -> Dict[str, Any]:
         """Adapt generic query parameters for specific API adapter - DEPRECATED, use Gemini instead"""
         # Use Gemini to generate API-specific parameters
         if adapter.api_name in ["TheMuse", "JSearch", "Adzuna", "TheirStack"]:
-            return self._generate_api_params_with_gemini(adapter)
+            # Cached per source + user query + profile (the prompt includes the
+            # whole profile): freshly generated params would give a new
+            # search-result cache key every round
+            if self.search_cache is not None:
+                profile_key = hashlib.sha256(
+                    json.dumps(self.profile_data, sort_keys=True, default=str).encode("utf-8")
+                ).hexdigest()
+                generated = self.search_cache.source_params(
+                    adapter.api_name, params, lambda: self._generate_api_params_with_gemini(adapter),
+                    profile_key=profile_key,
+                )
+            else:
+                generated = self._generate_api_params_with_gemini(adapter)
+            return generated or self._build_query_params()
 
         # Fallback for older adapters
         adapted = params.copy()
@@ -578,34 +602,90 @@ Return the optimized parameters as JSON:
 
         return adapted
 
-    def _deduplicate_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _deduplicate_jobs(
+        self, jobs: List[Dict[str, Any]], seen: Optional[NearDuplicateJobIndex] = None
+    ) -> List[Dict[str, Any]]:
         """
-        Deduplicate jobs based on URL or title+company combination
+        Drop exact and near-duplicate jobs (same posting syndicated through
+        several sources with different tracking URLs), plus copies of jobs in
+        `known_jobs`.
+
+        Pass a shared `seen` index to deduplicate incrementally across batches.
         """
-        seen = set()
+        if seen is None:
+            seen = NearDuplicateJobIndex()
         unique_jobs = []
 
         for job in jobs:
-            # Create unique identifier
-            job_url = job.get("job_url", "")
-            title = job.get("title", "").lower().strip()
-            company = job.get("company", "").lower().strip()
-
-            # Use URL as primary identifier
-            if job_url and job_url in seen:
+            if self.known_jobs is not None and self.known_jobs.find_duplicate(job):
                 continue
-            elif job_url:
-                seen.add(job_url)
+            # add() refuses jobs that duplicate an indexed one, and jobs with
+            # neither a URL nor title+company to identify them by
+            if seen.add(job):
                 unique_jobs.append(job)
-            else:
-                # Use title+company as fallback
-                identifier = f"{title}|{company}"
-                if identifier not in seen and title and company:
-                    seen.add(identifier)
-                    unique_jobs.append(job)
 
         return unique_jobs
 
+    def _rank_batch(
+        self,
+        jobs: List[Dict[str, Any]],
+        scorer: Optional[JobRelevanceScorer],
+        min_relevance_score: int,
+    ) -> List[Dict[str, Any]]:
+        """
+        Score a batch of jobs and drop those below the threshold.
+
+        Gemini-generated jobs are already profile-matched, so they are kept
+        regardless of score (min_score=0).
+        """
+        if scorer is None or not jobs:
+            return list(jobs)
+        try:
+            ranked = []
+            for job, score in zip(jobs, scorer.calculate_scores(jobs)):
+                job["relevance_score"] = score
+                min_score = 0 if job.get('source') == 'Gemini AI + Job Search' else min_relevance_score
+                if job["relevance_score"] >= min_score:
+                    ranked.append(job)
+            return ranked
+        except Exception as e:
+            logger.error(f"Error ranking jobs: {e}")
+            logger.warning("Falling back to unranked jobs")
+            return list(jobs)
+
+    def _sync_applied_membership(self) -> AppliedJobsMembership:
+        """This user's applied-jobs membership, brought up to date from the database."""
+        # Import here to avoid circular imports
+        from sqlalchemy import func
+        from database_config import SessionLocal, JobApplication
+
+        user_key = str(self.user_id)
+        with _applied_memberships_lock:
+            membership = _applied_memberships.get(user_key) or AppliedJobsMembership()
+            since = None if membership.needs_full_sync() else membership.version
+            changed_at = func.coalesce(JobApplication.updated_at, JobApplication.created_at)
+
+            db = SessionLocal()
+            try:
+                query = db.query(
+                    JobApplication.job_url,
+                    JobApplication.company_name,
+                    JobApplication.job_title,
+                    JobApplication.status,
+                    changed_at,
+                ).filter(JobApplication.user_id == self.user_id)
+                if since:
+                    query = query.filter(changed_at >= datetime.fromisoformat(since))
+                rows = query.all()
+            finally:
+                db.close()
+
+            # Any recorded application counts here, failed ones included
+            membership.apply_delta(membership_delta(rows, full=not since, since=since, statuses=None))
+            _applied_memberships[user_key] = membership
+            logger.info(f"Applied-jobs membership synced ({len(rows)} changed applications, {len(membership)} keys)")
+            return membership
+
     def _filter_already_applied(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Filter out jobs that the user has already applied to
@@ -617,63 +697,26 @@ Return the optimized parameters as JSON:
             return jobs
         
         try:
-            if not self._applied_cache_loaded:
-                # Import here to avoid circular imports
-                from database_config import SessionLocal, JobApplication
-
-                db = SessionLocal()
-                try:
-                    applied_jobs = db.query(JobApplication).filter(
-                        JobApplication.user_id == self.user_id
-                    ).all()
-                finally:
-                    db.close()
-
-                self._applied_urls_cache = set()
-                self._applied_company_titles_cache = set()
-
-                for app in applied_jobs:
-                    if app.job_url:
-                        normalized_url = app.job_url.rstrip('/').split('?')[0].lower()
-                        self._applied_urls_cache.add(normalized_url)
-
-                    if app.company_name and app.job_title:
-                        company_title = f"{app.company_name.lower().strip()}|{app.job_title.lower().strip()}"
-                        self._applied_company_titles_cache.add(company_title)
-
-                self._applied_cache_loaded = True
-                if not applied_jobs:
+            if self._applied_membership is None:
+                self._applied_membership = self._sync_applied_membership()
+                if not len(self._applied_membership):
                     logger.info("No previous applications found for this user")
-                else:
-                    logger.info(
-                        f"Found {len(self._applied_urls_cache)} applied job URLs and "
-                        f"{len(self._applied_company_titles_cache)} company+title combinations"
-                    )
-            
-            # Filter out jobs that match
+
+            # Filter out jobs that match by canonical URL or company+title
             filtered_jobs = []
             filtered_count = 0
-            
+
             for job in jobs:
-                job_url = job.get('job_url', '').rstrip('/').split('?')[0].lower()
-                company = job.get('company', '').lower().strip()
-                title = job.get('title', '').lower().strip()
-                company_title = f"{company}|{title}"
-                
-                # Check if this job has been applied to
-                if job_url and job_url in self._applied_urls_cache:
-                    filtered_count += 1
-                    logger.debug(f"Filtered duplicate by URL: {job.get('title')} at {job.get('company')}")
-                    continue
-                
-                if company and title and company_title in self._applied_company_titles_cache:
+                if self._applied_membership.contains(
+                    job_url=job.get('job_url'), company=job.get('company'), title=job.get('title')
+                ):
                     filtered_count += 1
-                    logger.debug(f"Filtered duplicate by company+title: {title} at {company}")
+                    logger.debug(f"Filtered already-applied job: {job.get('title')} at {job.get('company')}")
                     continue
-                
+
                 # This job hasn't been applied to yet
                 filtered_jobs.append(job)
-            
+
             logger.info(f"Filtered out {filtered_count} jobs that were already applied to")
             logger.info(f"Returning {len(filtered_jobs)} new/unseen jobs")
             
@@ -0,0 +1,179 @@
+"""
+Bounded-concurrency runner for job applications.
+
+Drives several applications at once - each on its own RefactoredJobAgent and
+its own tab of the shared browser - so page loads and Gemini calls of one
+application overlap with the others instead of running back to back.
+
+  - max_concurrency:   applications in flight at once (tabs)
+  - per-domain caps:   at most `per_domain_limit` applications against the same
+                       host at once (ATS bot detection is per host); jobs whose
+                       host is saturated are skipped over, not waited on
+  - Gemini budget:     a GeminiBudget shared by every application's Gemini calls
+                       is installed for the duration of run()
+  - start_interval_s:  minimum gap between launches (the sequential loop used a
+                       fixed 3s pause between jobs)
+
+Isolation comes from the agents themselves: every job gets a fresh
+RefactoredJobAgent (own components, state machine and ActionRecorder - the
+SessionManager keeps one recorder per session), and tabs are claimed so one
+application's new-tab detection never picks up another's tab.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from gemini_budget import GeminiBudget, set_gemini_budget
+
+logger = logging.getLogger(__name__)
+
+
+def domain_of(url: str) -> str:
+    """Host used for per-domain caps ('' for unparseable URLs)."""
+    try:
+        host = (urlparse(url).hostname or "").lower()
+    except Exception:
+        return ""
+    return host[4:] if host.startswith("www.") else host
+
+
+@dataclass
+class ApplicationOutcome:
+    """Result of one application run by the runner."""
+    item: Any
+    result: Any = None
+    error: Optional[BaseException] = None
+    domain: str = ""
+    duration_s: float = 0.0
+
+
+class ParallelApplicationRunner:
+    """Runs application coroutines with global and per-domain concurrency caps."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 3,
+        per_domain_limit: int = 1,
+        domain_limits: Optional[Dict[str, int]] = None,
+        start_interval_s: float = 1.0,
+        gemini_budget: Optional[GeminiBudget] = None,
+    ):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.per_domain_limit = max(1, int(per_domain_limit))
+        self.domain_limits = dict(domain_limits or {})
+        self.start_interval_s = max(0.0, start_interval_s)
+        self.gemini_budget = gemini_budget
+        self.in_flight = 0
+        self._domain_counts: Dict[str, int] = {}
+
+    def _limit_for(self, domain: str) -> int:
+        return self.domain_limits.get(domain, self.per_domain_limit)
+
+    def _next_startable(self, pending, url_of: Callable[[Any], str]) -> Optional[int]:
+        for index, item in enumerate(pending):
+            domain = domain_of(url_of(item))
+            if self._domain_counts.get(domain, 0) < self._limit_for(domain):
+                return index
+        return None
+
+    async def run(
+        self,
+        pending,
+        apply_one: Callable[[Any], Awaitable[Any]],
+        url_of: Callable[[Any], str] = lambda item: item,
+        should_start: Optional[Callable[[Any], Any]] = None,
+        on_result: Optional[Callable[[ApplicationOutcome], Any]] = None,
+    ) -> List[ApplicationOutcome]:
+        """
+        Run applications until `pending` is exhausted or should_start says stop.
+
+        Args:
+            pending: Mutable sequence (list or deque) of items; items are removed
+                as they are started, so what remains afterwards was not run
+            apply_one: Coroutine function running one application
+            url_of: Maps an item to its job URL (for per-domain caps)
+            should_start: Called (sync or async) with the next item before it is
+                launched; returning False stops launching (running ones finish)
+            on_result: Called (sync or async) with each outcome as it completes
+
+        Returns:
+            Outcomes in completion order
+        """
+        outcomes: List[ApplicationOutcome] = []
+        running: Dict[asyncio.Task, Tuple[Any, str, float]] = {}
+        previous_budget = None
+        if self.gemini_budget is not None:
+            previous_budget = set_gemini_budget(self.gemini_budget)
+        stopping = False
+        last_start = 0.0
+
+        try:
+            while True:
+                # Launch as many as the caps allow
+                while not stopping and pending and len(running) < self.max_concurrency:
+                    index = self._next_startable(pending, url_of)
+                    if index is None:
+                        break  # every pending job's host is saturated
+                    item = pending[index]
+                    if should_start is not None:
+                        allowed = should_start(item)
+                        if inspect.isawaitable(allowed):
+                            allowed = await allowed
+                        if not allowed:
+                            stopping = True
+                            break
+                    del pending[index]
+
+                    gap = self.start_interval_s - (time.monotonic() - last_start)
+                    if running and gap > 0:
+                        await asyncio.sleep(gap)
+                    last_start = time.monotonic()
+
+                    domain = domain_of(url_of(item))
+                    self._domain_counts[domain] = self._domain_counts.get(domain, 0) + 1
+                    task = asyncio.ensure_future(apply_one(item))
+                    running[task] = (item, domain, last_start)
+                    self.in_flight = len(running)
+                    logger.info(f"▶️  Started application ({len(running)}/{self.max_concurrency} running): {domain}")
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item, domain, started = running.pop(task)
+                    self._domain_counts[domain] -= 1
+                    self.in_flight = len(running)
+                    outcome = ApplicationOutcome(item=item, domain=domain, duration_s=time.monotonic() - started)
+                    if task.cancelled():
+                        outcome.error = asyncio.CancelledError()
+                    elif task.exception() is not None:
+                        outcome.error = task.exception()
+                        logger.error(f"Application on {domain} failed: {outcome.error}")
+                    else:
+                        outcome.result = task.result()
+                    outcomes.append(outcome)
+                    if on_result is not None:
+                        try:
+                            handled = on_result(outcome)
+                            if inspect.isawaitable(handled):
+                                await handled
+                        except Exception as e:
+                            logger.error(f"Error handling application result for {domain}: {e}")
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+            self._domain_counts.clear()
+            self.in_flight = 0
+            if self.gemini_budget is not None:
+                set_gemini_budget(previous_budget)
+                logger.info(f"Gemini budget: {self.gemini_budget.get_stats()}")
+
+        return outcomes
@@ -5,11 +5,15 @@ Creates and manages user-specific browser profiles that persist across sessions
 
 import os
 import json
+import time
+import asyncio
 import logging
 import platform
+import threading
 import subprocess
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
 from playwright.async_api import Browser, BrowserContext, async_playwright
 
@@ -19,6 +23,10 @@ logger = logging.getLogger(__name__)
 _active_contexts: Dict[str, BrowserContext] = {}
 # Track which event loop the contexts were created in
 _active_contexts_loop_id: int = -1
+# Per-user launch locks so concurrent applications don't launch the same profile twice
+_launch_locks: Dict[str, Any] = {}
+# Browser pool leases held by the current event loop, per user (see BrowserPool)
+_active_leases: Dict[str, "BrowserLease"] = {}
 
 
 def _clear_stale_contexts_if_new_loop() -> None:
@@ -26,16 +34,20 @@ def _clear_stale_contexts_if_new_loop() -> None:
     All previously stored contexts are bound to the old (closed) loop and
     must be discarded before we try to use them.
     """
-    global _active_contexts, _active_contexts_loop_id
+    global _active_contexts, _active_contexts_loop_id, _launch_locks, _active_leases
     try:
-        import asyncio
         current = id(asyncio.get_running_loop())
     except RuntimeError:
         return  # not in an async context - nothing to do
     if current != _active_contexts_loop_id:
         if _active_contexts:
             logger.info(f"🔄 New event loop - discarding {len(_active_contexts)} stale browser context(s)")
+        # Pooled browsers outlive the loop - only the old loop's leases are dropped
+        for lease in _active_leases.values():
+            lease.pool.abandon(lease)
         _active_contexts = {}
+        _active_leases = {}
+        _launch_locks = {}
         _active_contexts_loop_id = current
 
 
@@ -51,7 +63,7 @@ async def close_all_active_browsers() -> int:
 
     Returns the number of contexts that were successfully closed.
     """
-    closed = 0
+    closed = await release_pooled_browsers()
     for user_id, ctx in list(_active_contexts.items()):
         try:
             await ctx.close()
@@ -66,6 +78,28 @@ async def close_all_active_browsers() -> int:
     return closed
 
 
+async def release_pooled_browsers() -> int:
+    """
+    Return every browser pool lease held by the current event loop.  The
+    pooled Chrome processes stay warm for the next run; only this loop's
+    connections to them are dropped.
+
+    Returns the number of leases returned.
+    """
+    released = 0
+    for user_id, lease in list(_active_leases.items()):
+        _active_leases.pop(user_id, None)
+        _active_contexts.pop(user_id, None)
+        try:
+            await lease.pool.release(lease)
+            released += 1
+        except Exception as e:
+            logger.debug(f"Could not return pooled browser for {user_id}: {e}")
+    if released:
+        logger.info(f"♻️  Returned {released} pooled browser(s) to the pool")
+    return released
+
+
 class PersistentBrowserManager:
     """
     Manages persistent browser profiles for users
@@ -122,6 +156,20 @@ class PersistentBrowserManager:
         # checking the cache - they are tied to the old (closed) loop.
         _clear_stale_contexts_if_new_loop()
 
+        # Concurrent callers (parallel applications) wait for the first launch
+        # and then reuse its context - a profile directory can only be open once
+        import asyncio
+        lock = _launch_locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            return await self._launch_or_reuse(user_id, headless, proxy_config, playwright_instance)
+
+    async def _launch_or_reuse(
+        self,
+        user_id: str,
+        headless: bool,
+        proxy_config: Optional[Dict[str, Any]],
+        playwright_instance,
+    ) -> BrowserContext:
         # Check if browser is already open for this user
         if user_id in _active_contexts:
             context = _active_contexts[user_id]
@@ -143,6 +191,62 @@ class PersistentBrowserManager:
                     pass  # Already closed or invalid
                 _active_contexts.pop(user_id, None)
         
+        pool = get_browser_pool()
+        if pool is not None:
+            try:
+                lease = await pool.acquire(
+                    user_id,
+                    headless=headless,
+                    proxy_config=proxy_config,
+                    playwright_instance=playwright_instance,
+                )
+                _active_leases[user_id] = lease
+                _active_contexts[user_id] = lease.context
+                return lease.context
+            except Exception as e:
+                logger.warning(f"Browser pool lease failed for user {user_id}: {e}. Launching directly.")
+
+        # Get or create playwright instance
+        if playwright_instance:
+            playwright = playwright_instance
+            created_playwright = False
+        else:
+            playwright = await async_playwright().start()
+            created_playwright = True
+
+        context = await self._launch_context(playwright, user_id, headless, proxy_config)
+
+        # Store playwright instance for cleanup (only if we created it)
+        if created_playwright:
+            context._playwright = playwright
+        else:
+            context._playwright = None  # Don't close shared instance
+
+        # Store context in global registry for reuse
+        _active_contexts[user_id] = context
+        logger.info(f"✓ Persistent browser launched for user {user_id} (stored for reuse)")
+        
+        return context
+
+    async def _launch_context(
+        self,
+        playwright,
+        user_id: str,
+        headless: bool,
+        proxy_config: Optional[Dict[str, Any]] = None,
+        extra_args: Optional[list] = None,
+        kill_stale: bool = True,
+    ) -> BrowserContext:
+        """
+        Cold-start Chrome on the user's profile: pre-launch cleanup, up to four
+        launch attempts (the last on a salvaged profile) and anti-detection.
+
+        Args:
+            extra_args: Additional Chromium flags (the browser pool adds a
+                remote-debugging port)
+            kill_stale: Kill orphaned Playwright Chrome processes first; the pool
+                turns this off while it has other warm browsers running
+        """
         profile_path = self.get_profile_path(user_id)
         
         logger.info(f"🌟 Launching NEW persistent browser for user {user_id}")
@@ -186,14 +290,6 @@ class PersistentBrowserManager:
             context_options['proxy'] = proxy_config
             logger.info(f"Using proxy: {proxy_config.get('server', 'unknown')}")
         
-        # Get or create playwright instance
-        if playwright_instance:
-            playwright = playwright_instance
-            created_playwright = False
-        else:
-            playwright = await async_playwright().start()
-            created_playwright = True
-        
         import asyncio
 
         # Minimal flag set that works reliably across environments
@@ -205,9 +301,12 @@ class PersistentBrowserManager:
             '--start-maximized',
             '--force-device-scale-factor=1',
         ]
+        if extra_args:
+            args = args + list(extra_args)
+            safer_args = safer_args + list(extra_args)
 
         # ── Pre-launch cleanup ────────────────────────────────────────────────
-        pre_killed = self._kill_stale_playwright_chrome(profile_path)
+        pre_killed = self._kill_stale_playwright_chrome(profile_path) if kill_stale else 0
         if pre_killed > 0:
             logger.info("🧹 Pre-launch: terminated %s stale Playwright Chrome process(es)", pre_killed)
             await asyncio.sleep(1.5)
@@ -278,12 +377,6 @@ class PersistentBrowserManager:
                         **context_options
                     )
         
-        # Store playwright instance for cleanup (only if we created it)
-        if created_playwright:
-            context._playwright = playwright
-        else:
-            context._playwright = None  # Don't close shared instance
-        
         # Add anti-detection JavaScript
         await self._inject_anti_detection(context)
         
@@ -294,10 +387,6 @@ class PersistentBrowserManager:
             'proxy': proxy_config is not None
         })
         
-        # Store context in global registry for reuse
-        _active_contexts[user_id] = context
-        logger.info(f"✓ Persistent browser launched for user {user_id} (stored for reuse)")
-        
         return context
 
     def _salvage_corrupted_profile(self, profile_path: Path) -> None:
@@ -644,6 +733,9 @@ class PersistentBrowserManager:
         Args:
             user_id: User ID whose browser to close
         """
+        lease = _active_leases.pop(user_id, None)
+        if lease is not None:
+            lease.pool.abandon(lease)
         if user_id in _active_contexts:
             del _active_contexts[user_id]
             logger.info(f"🧹 Removed browser context for user {user_id} from registry")
@@ -746,6 +838,541 @@ class PersistentBrowserManager:
         return context
 
 
+def _browser_rss_mb(profile_path: Path) -> Optional[float]:
+    """
+    Resident memory (MB) of the Chrome process tree that has `profile_path`
+    open, or None when it cannot be measured.  Uses psutil when installed and
+    falls back to /proc on Linux.
+    """
+    marker = f"--user-data-dir={profile_path}"
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            for proc in psutil.process_iter(["cmdline"]):
+                cmdline = proc.info.get("cmdline") or []
+                if marker in cmdline and not any(arg.startswith("--type=") for arg in cmdline):
+                    total = 0
+                    for member in [proc] + proc.children(recursive=True):
+                        try:
+                            total += member.memory_info().rss
+                        except psutil.Error:
+                            pass
+                    return total / (1024 * 1024)
+        except Exception as e:
+            logger.debug(f"psutil memory probe failed: {e}")
+        return None
+
+    proc_dir = Path("/proc")
+    if not proc_dir.is_dir():
+        return None
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    parents: Dict[int, int] = {}
+    rss: Dict[int, int] = {}
+    root = None
+    for entry in proc_dir.iterdir():
+        if not entry.name.isdigit():
+            continue
+        pid = int(entry.name)
+        try:
+            stat = (entry / "stat").read_text()
+            parents[pid] = int(stat.rsplit(")", 1)[1].split()[1])
+            rss[pid] = int((entry / "statm").read_text().split()[1]) * page_size
+            if root is None:
+                cmdline = (entry / "cmdline").read_bytes().split(b"\0")
+                args = [arg.decode(errors="ignore") for arg in cmdline]
+                if marker in args and not any(arg.startswith("--type=") for arg in args):
+                    root = pid
+        except (OSError, ValueError, IndexError):
+            continue
+    if root is None:
+        return None
+    tree = {root}
+    grew = True
+    while grew:
+        grew = False
+        for pid, parent in parents.items():
+            if parent in tree and pid not in tree:
+                tree.add(pid)
+                grew = True
+    return sum(rss.get(pid, 0) for pid in tree) / (1024 * 1024)
+
+
+@dataclass
+class _WarmBrowser:
+    """A pooled Chrome process, owned by the pool's event loop."""
+    user_id: str
+    headless: bool
+    proxy_key: str
+    context: BrowserContext          # the pool loop's handle on the persistent context
+    endpoint: str                    # CDP endpoint leases connect to
+    profile_path: Path
+    launch_seconds: float            # what a cold start of this profile cost
+    baseline_rss_mb: Optional[float]
+    uses: int = 0
+    leases: int = 0
+    last_returned: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class BrowserLease:
+    """A caller's connection to a pooled browser; hand it back with pool.release()."""
+    pool: "BrowserPool"
+    user_id: str
+    context: BrowserContext          # bound to the caller's event loop
+    warm: bool
+    connect_seconds: float
+    _entry: _WarmBrowser = None
+    _browser: Any = None
+    _playwright: Any = None
+    released: bool = False
+
+
+class BrowserPool:
+    """
+    Warm persistent browsers shared across event loops.
+
+    The server runs every application in a fresh event loop and the CLI calls
+    asyncio.run() per menu action, so the loop-bound _active_contexts registry
+    is dropped and Chrome is cold-started (lock cleanup, stale-process kill,
+    launch retries, anti-detection) for each run.  The pool owns its Chrome
+    processes on a background thread with its own event loop; callers lease a
+    browser by connecting over CDP from whatever loop they run in, and
+    returning the lease only disconnects them.
+
+    Chrome can only open a profile directory once, so each user profile has
+    at most one pooled browser:
+
+      - per profile:   0 warm browsers by default, 1 once prewarm() was called
+                       for it (kept warm across recycles and idle time); up to
+                       max_leases_per_browser concurrent leases (one tab each)
+      - pool-wide:     at most max_browsers warm browsers, least recently
+                       returned idle ones are closed first
+      - health checks: a cookies() round trip before every lease and on idle
+                       browsers every maintenance_interval_s
+      - recycling:     after max_uses leases, on RSS growth beyond
+                       max_memory_growth_mb, or when launch options change
+      - stats:         get_stats() reports warm hits, cold starts and the
+                       startup seconds saved by leasing instead of launching
+    """
+
+    def __init__(
+        self,
+        manager: Optional["PersistentBrowserManager"] = None,
+        max_browsers: int = 4,
+        max_leases_per_browser: int = 4,
+        max_uses: int = 25,
+        max_memory_growth_mb: float = 1024,
+        idle_ttl_s: float = 1800,
+        health_check_timeout_s: float = 5.0,
+        maintenance_interval_s: float = 60,
+    ):
+        self.manager = manager or PersistentBrowserManager()
+        self.max_browsers = max(1, int(max_browsers))
+        self.max_leases_per_browser = max(1, int(max_leases_per_browser))
+        self.max_uses = max(1, int(max_uses))
+        self.max_memory_growth_mb = max_memory_growth_mb
+        self.idle_ttl_s = idle_ttl_s
+        self.health_check_timeout_s = health_check_timeout_s
+        self.maintenance_interval_s = maintenance_interval_s
+
+        self._lock = threading.Lock()  # guards start-up and stats
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._maintenance = None
+        self._playwright = None
+        # Pool-loop state
+        self._browsers: Dict[str, _WarmBrowser] = {}
+        self._keep_warm: Dict[str, Tuple[bool, Optional[Dict[str, Any]]]] = {}
+        self._profile_locks: Dict[str, asyncio.Lock] = {}
+        self.stats = {
+            "leases": 0, "warm_hits": 0, "cold_starts": 0, "recycles": 0,
+            "health_failures": 0, "startup_seconds_saved": 0.0,
+        }
+
+    # ── Thread / loop plumbing ───────────────────────────────────────────────
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                ready = threading.Event()
+
+                def _run():
+                    loop = asyncio.new_event_loop()
+                    asyncio.set_event_loop(loop)
+                    self._loop = loop
+                    ready.set()
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=_run, name="browser-pool", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._maintenance = asyncio.run_coroutine_threadsafe(self._maintain(), self._loop)
+                logger.info("🏊 Browser pool started")
+            return self._loop
+
+    def _submit(self, coro):
+        """Schedule `coro` on the pool loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_started())
+
+    async def _call(self, coro):
+        """Run `coro` on the pool loop and await it from the caller's loop."""
+        return await asyncio.wrap_future(self._submit(coro))
+
+    def _bump(self, counter: str, amount: float = 1) -> None:
+        with self._lock:
+            self.stats[counter] += amount
+
+    # ── Caller-facing API ────────────────────────────────────────────────────
+
+    async def acquire(
+        self,
+        user_id: str,
+        headless: bool = True,
+        proxy_config: Optional[Dict[str, Any]] = None,
+        playwright_instance=None,
+    ) -> BrowserLease:
+        """
+        Lease the user's pooled browser, launching it if it is not warm.
+
+        Args:
+            playwright_instance: The caller's Playwright (bound to its loop); a
+                private one is started and stopped with the lease when omitted
+
+        Returns:
+            BrowserLease whose .context is usable from the calling event loop
+        """
+        entry, warm = await self._call(self._checkout(user_id, headless, proxy_config))
+        started = time.monotonic()
+        playwright = playwright_instance
+        created_playwright = None
+        try:
+            if playwright is None:
+                playwright = created_playwright = await async_playwright().start()
+            browser = await playwright.chromium.connect_over_cdp(entry.endpoint)
+            if not browser.contexts:
+                raise RuntimeError("pooled browser exposes no default context")
+            context = browser.contexts[0]
+            await self.manager._inject_anti_detection(context)
+        except Exception:
+            if created_playwright is not None:
+                try:
+                    await created_playwright.stop()
+                except Exception:
+                    pass
+            await self._call(self._checkin(entry, reusable=False))
+            raise
+
+        connect_seconds = time.monotonic() - started
+        self._bump("leases")
+        if warm:
+            saved = max(0.0, entry.launch_seconds - connect_seconds)
+            self._bump("warm_hits")
+            self._bump("startup_seconds_saved", saved)
+            logger.info(f"♻️  Leased warm browser for user {user_id} in {connect_seconds:.2f}s (saved {saved:.1f}s)")
+        return BrowserLease(
+            pool=self,
+            user_id=user_id,
+            context=context,
+            warm=warm,
+            connect_seconds=connect_seconds,
+            _entry=entry,
+            _browser=browser,
+            _playwright=created_playwright,
+        )
+
+    async def release(self, lease: BrowserLease) -> None:
+        """Disconnect the lease and return its browser to the pool."""
+        if lease.released:
+            return
+        lease.released = True
+        try:
+            # On a CDP connection this disconnects; the pooled Chrome keeps running
+            await lease._browser.close()
+        except Exception as e:
+            logger.debug(f"Disconnecting pooled browser for {lease.user_id}: {e}")
+        if lease._playwright is not None:
+            try:
+                await lease._playwright.stop()
+            except Exception:
+                pass
+        await self._call(self._checkin(lease._entry))
+
+    def abandon(self, lease: BrowserLease) -> None:
+        """Return a lease whose event loop is gone (its connection dies with the loop)."""
+        if lease.released:
+            return
+        lease.released = True
+        self._submit(self._checkin(lease._entry))
+
+    def prewarm(self, user_id: str, headless: bool = True, proxy_config: Optional[Dict[str, Any]] = None):
+        """
+        Keep a browser warm for this profile from now on; launches it in the
+        background.  Returns a concurrent.futures.Future for the launch.
+        """
+        self._ensure_started()
+        self._keep_warm[user_id] = (headless, proxy_config)
+        return self._submit(self._ensure_warm(user_id))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        browsers = list(self._browsers.values())
+        stats["warm_browsers"] = len(browsers)
+        stats["active_leases"] = sum(b.leases for b in browsers)
+        stats["startup_seconds_saved"] = round(stats["startup_seconds_saved"], 2)
+        stats["warm_hit_rate"] = round(stats["warm_hits"] / stats["leases"], 3) if stats["leases"] else 0.0
+        return stats
+
+    def shutdown(self, timeout: float = 30) -> None:
+        """Close every pooled browser and stop the pool thread."""
+        with self._lock:
+            loop = self._loop
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_all(), loop).result(timeout)
+        except Exception as e:
+            logger.warning(f"Browser pool shutdown: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        with self._lock:
+            self._loop = None
+            self._thread = None
+        logger.info(f"🏊 Browser pool stopped: {self.get_stats()}")
+
+    # ── Pool loop ────────────────────────────────────────────────────────────
+
+    async def _get_playwright(self):
+        if self._playwright is None:
+            self._playwright = await async_playwright().start()
+        return self._playwright
+
+    def _profile_lock(self, user_id: str) -> asyncio.Lock:
+        return self._profile_locks.setdefault(user_id, asyncio.Lock())
+
+    @staticmethod
+    def _proxy_key(proxy_config: Optional[Dict[str, Any]]) -> str:
+        return json.dumps(proxy_config or {}, sort_keys=True, default=str)
+
+    async def _checkout(self, user_id: str, headless: bool, proxy_config) -> Tuple[_WarmBrowser, bool]:
+        while True:
+            async with self._profile_lock(user_id):
+                entry = self._browsers.get(user_id)
+                warm = entry is not None
+                if entry is not None and entry.leases == 0:
+                    reason = self._recycle_reason(entry, headless, proxy_config)
+                    if reason is None and not await self._healthy(entry):
+                        self._bump("health_failures")
+                        reason = "failed health check"
+                    if reason is not None:
+                        await self._retire(entry, reason)
+                        entry = None
+                if entry is None:
+                    entry = await self._launch(user_id, headless, proxy_config)
+                    warm = False
+                if entry.leases < self.max_leases_per_browser:
+                    entry.leases += 1
+                    entry.uses += 1
+                    return entry, warm
+            # Every tab slot of this profile's browser is leased - wait for a return
+            await asyncio.sleep(0.25)
+
+    async def _checkin(self, entry: _WarmBrowser, reusable: bool = True) -> None:
+        async with self._profile_lock(entry.user_id):
+            entry.leases = max(0, entry.leases - 1)
+            entry.last_returned = time.monotonic()
+            if self._browsers.get(entry.user_id) is not entry:
+                return  # already retired
+            if not reusable:
+                await self._retire(entry, "lease failed")
+            elif entry.leases == 0:
+                if entry.headless:
+                    await self._reset_pages(entry)
+                reason = self._recycle_reason(entry)
+                if reason is not None:
+                    await self._retire(entry, reason)
+        if entry.user_id in self._keep_warm and entry.user_id not in self._browsers:
+            await self._ensure_warm(entry.user_id)
+
+    def _recycle_reason(self, entry: _WarmBrowser, headless: Optional[bool] = None, proxy_config=None) -> Optional[str]:
+        if headless is not None and (
+            entry.headless != headless or entry.proxy_key != self._proxy_key(proxy_config)
+        ):
+            return "launch options changed"
+        if entry.uses >= self.max_uses:
+            return f"{entry.uses} uses"
+        if self.max_memory_growth_mb and entry.baseline_rss_mb is not None:
+            rss = _browser_rss_mb(entry.profile_path)
+            if rss is not None and rss - entry.baseline_rss_mb > self.max_memory_growth_mb:
+                return f"memory grew {rss - entry.baseline_rss_mb:.0f} MB"
+        return None
+
+    async def _healthy(self, entry: _WarmBrowser) -> bool:
+        try:
+            await asyncio.wait_for(entry.context.cookies(), self.health_check_timeout_s)
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled browser for user {entry.user_id} failed health check: {e}")
+            return False
+
+    async def _read_endpoint(self, profile_path: Path, timeout: float = 15.0) -> str:
+        """CDP endpoint from the DevToolsActivePort file Chrome writes at start-up."""
+        port_file = profile_path / "DevToolsActivePort"
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                port = int(port_file.read_text().splitlines()[0])
+                return f"http://127.0.0.1:{port}"
+            except (OSError, ValueError, IndexError):
+                if time.monotonic() >= deadline:
+                    raise RuntimeError(f"Chrome did not report a DevTools port for {profile_path}")
+                await asyncio.sleep(0.1)
+
+    async def _launch(self, user_id: str, headless: bool, proxy_config) -> _WarmBrowser:
+        profile_path = self.manager.get_profile_path(user_id)
+        try:
+            (profile_path / "DevToolsActivePort").unlink()  # left by a previous Chrome
+        except OSError:
+            pass
+        started = time.monotonic()
+        playwright = await self._get_playwright()
+        context = await self.manager._launch_context(
+            playwright,
+            user_id,
+            headless,
+            proxy_config,
+            extra_args=["--remote-debugging-port=0"],
+            # Killing "stale" Playwright Chrome would take down the other warm browsers
+            kill_stale=not self._browsers,
+        )
+        try:
+            endpoint = await self._read_endpoint(profile_path)
+        except Exception:
+            await context.close()
+            raise
+        entry = _WarmBrowser(
+            user_id=user_id,
+            headless=headless,
+            proxy_key=self._proxy_key(proxy_config),
+            context=context,
+            endpoint=endpoint,
+            profile_path=profile_path,
+            launch_seconds=time.monotonic() - started,
+            baseline_rss_mb=_browser_rss_mb(profile_path),
+        )
+        self._browsers[user_id] = entry
+        self._bump("cold_starts")
+        logger.info(f"🏊 Pooled browser launched for user {user_id} in {entry.launch_seconds:.1f}s")
+        await self._evict_over_capacity(keep=entry)
+        return entry
+
+    async def _ensure_warm(self, user_id: str) -> None:
+        if user_id not in self._keep_warm:
+            return
+        headless, proxy_config = self._keep_warm[user_id]
+        async with self._profile_lock(user_id):
+            if user_id in self._browsers:
+                return
+            try:
+                await self._launch(user_id, headless, proxy_config)
+            except Exception as e:
+                logger.warning(f"Could not prewarm browser for user {user_id}: {e}")
+
+    async def _reset_pages(self, entry: _WarmBrowser) -> None:
+        """Close the returned leases' tabs, leaving one blank tab to keep Chrome up."""
+        try:
+            pages = list(entry.context.pages)
+            for page in pages[1:]:
+                await page.close()
+            if pages:
+                await pages[0].goto("about:blank")
+            else:
+                await entry.context.new_page()
+        except Exception as e:
+            logger.debug(f"Resetting pooled browser tabs for {entry.user_id}: {e}")
+
+    async def _retire(self, entry: _WarmBrowser, reason: str) -> None:
+        if self._browsers.get(entry.user_id) is entry:
+            del self._browsers[entry.user_id]
+        self._bump("recycles")
+        logger.info(f"🏊 Recycling pooled browser for user {entry.user_id}: {reason}")
+        try:
+            await asyncio.wait_for(entry.context.close(), 15)
+        except Exception as e:
+            logger.debug(f"Closing pooled browser for {entry.user_id}: {e}")
+
+    async def _evict_over_capacity(self, keep: _WarmBrowser) -> None:
+        while len(self._browsers) > self.max_browsers:
+            idle = [b for b in self._browsers.values() if b.leases == 0 and b is not keep]
+            if not idle:
+                return
+            # Prefer evicting profiles nobody asked to keep warm
+            idle.sort(key=lambda b: (b.user_id in self._keep_warm, b.last_returned))
+            await self._retire(idle[0], "pool full")
+
+    async def _maintain(self) -> None:
+        """Background health checks, idle expiry and keep-warm relaunches."""
+        while True:
+            await asyncio.sleep(self.maintenance_interval_s)
+            now = time.monotonic()
+            for entry in list(self._browsers.values()):
+                lock = self._profile_lock(entry.user_id)
+                if entry.leases or lock.locked():
+                    continue
+                async with lock:
+                    if self._browsers.get(entry.user_id) is not entry or entry.leases:
+                        continue
+                    if entry.user_id not in self._keep_warm and now - entry.last_returned > self.idle_ttl_s:
+                        await self._retire(entry, "idle")
+                    elif not await self._healthy(entry):
+                        self._bump("health_failures")
+                        await self._retire(entry, "failed health check")
+            for user_id in list(self._keep_warm):
+                if user_id not in self._browsers:
+                    await self._ensure_warm(user_id)
+
+    async def _close_all(self) -> None:
+        if self._maintenance is not None:
+            self._maintenance.cancel()
+        self._keep_warm.clear()
+        for entry in list(self._browsers.values()):
+            await self._retire(entry, "pool shutdown")
+        if self._playwright is not None:
+            try:
+                await self._playwright.stop()
+            except Exception:
+                pass
+            self._playwright = None
+
+
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_lock = threading.Lock()
+
+
+def enable_browser_pool(**pool_options) -> BrowserPool:
+    """Install the process-wide browser pool (idempotent); options go to BrowserPool."""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool(**pool_options)
+        return _browser_pool
+
+
+def get_browser_pool() -> Optional[BrowserPool]:
+    """
+    The process-wide browser pool, or None when pooling is off.  The pool is
+    enabled with enable_browser_pool() or LAUNCHWAY_BROWSER_POOL=on.
+    """
+    if _browser_pool is None and os.getenv("LAUNCHWAY_BROWSER_POOL", "off").strip().lower() in ("1", "on", "true", "yes"):
+        return enable_browser_pool()
+    return _browser_pool
+
+
 # Convenience function
 async def get_persistent_browser(
     user_id: str,
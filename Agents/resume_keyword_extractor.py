@@ -138,7 +138,10 @@ class ResumeKeywordExtractor:
         # Cap at ~12 000 chars to keep the prompt cheap and fast
         prompt = _EXTRACT_PROMPT + resume_text[:12_000]
 
-        raw = self._call_gemini(prompt)
+        # An unchanged resume always yields the same keywords
+        from gemini_response_cache import cache_gemini_responses
+        with cache_gemini_responses("resume_keywords", ttl_seconds=30 * 86400):
+            raw = self._call_gemini(prompt)
         if raw is None:
             return self._empty_result()
         return self._parse_response(raw)
@@ -18,6 +18,11 @@ from google.auth.exceptions import RefreshError
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 
+try:
+    from Agents.google_doc_model import LocalGoogleDoc, utf16_len
+except ImportError:
+    from google_doc_model import LocalGoogleDoc, utf16_len
+
 def _load_systematic_tailoring_functions():
     """
     Load systematic tailoring from local checkout first, using direct file load
@@ -452,9 +457,12 @@ def _collect_structure_elements(elements, line_metadata, line_number_ref,
                     )
 
 
-def extract_document_structure(docs_service, document_id):
+def extract_document_structure(docs_service, document_id, doc=None):
     """Extract line-by-line structure with formatting metadata, detecting natural line wraps.
 
+    Pass ``doc`` (a LocalGoogleDoc) to measure its in-memory copy instead of
+    fetching the document again.
+
     Returns a list of line metadata dictionaries containing:
     - text: the actual text content (may span multiple visual lines)
     - alignment: left, center, right, justified
@@ -469,8 +477,11 @@ def extract_document_structure(docs_service, document_id):
     (very common in professional Google Doc templates) are fully parsed.
     """
     try:
-        document = docs_service.documents().get(documentId=document_id).execute()
-        content = document.get('body', {}).get('content', [])
+        if doc is not None:
+            content = doc.body_content
+        else:
+            document = docs_service.documents().get(documentId=document_id).execute()
+            content = document.get('body', {}).get('content', [])
 
         # Default page width (8.5" with 1" margins = 6.5" = 468 points)
         # Average character width ~7 points for typical fonts at 11pt
@@ -525,7 +536,7 @@ def calculate_line_budget(line_metadata, max_additional_lines=0):
         'underutilized_lines': underutilized_lines
     }
 
-def verify_document_length(docs_service, document_id, original_visual_lines, tolerance=0):
+def verify_document_length(docs_service, document_id, original_visual_lines, tolerance=0, doc=None):
     """Verify that document hasn't exceeded original page length.
     
     Args:
@@ -533,6 +544,7 @@ def verify_document_length(docs_service, document_id, original_visual_lines, tol
         document_id: Document ID to check
         original_visual_lines: Original number of visual lines
         tolerance: Number of additional lines allowed (default 0 = strict)
+        doc: Optional LocalGoogleDoc to measure locally (no API call)
         
     Returns:
         Dictionary with:
@@ -542,7 +554,7 @@ def verify_document_length(docs_service, document_id, original_visual_lines, tol
     """
     try:
         # Extract current document structure
-        current_metadata = extract_document_structure(docs_service, document_id)
+        current_metadata = extract_document_structure(docs_service, document_id, doc=doc)
         current_visual_lines = sum(line.get('visual_lines', 1) for line in current_metadata)
         
         max_allowed = original_visual_lines + tolerance
@@ -1013,10 +1025,10 @@ def _apply_styles_from_tags(docs_service, document_id, strip_tags: bool):
 
     If strip_tags is True, remove the tags after styling; otherwise keep them.
     """
-    # Read current plain text of document
-    document = docs_service.documents().get(documentId=document_id).execute()
-    content = document.get('body').get('content')
-    doc_text = read_structural_elements_plain(content) or ''
+    # Read the document once; tag stripping and styling are applied to the
+    # local copy and sent in a single batchUpdate
+    doc = LocalGoogleDoc.fetch(docs_service, document_id)
+    doc_text = read_structural_elements_plain(doc.body_content) or ''
 
     def find_tag_ranges(text: str, open_tag: str, close_tag: str) -> List[Tuple[int, int]]:
         ranges: List[Tuple[int, int]] = []
@@ -1085,33 +1097,13 @@ def _apply_styles_from_tags(docs_service, document_id, strip_tags: bool):
         print(f"   (Debug file save skipped: {debug_error})")
 
     # First, strip all tags from the document
-    cleanup_requests = []
-    for tok in ['<b>', '</b>', '<i>', '</i>']:
-        cleanup_requests.append({
-            'replaceAllText': {
-                'containsText': {
-                    'text': tok,
-                    'matchCase': True
-                },
-                'replaceText': ''
-            }
-        })
-
-    if cleanup_requests:
-        docs_service.documents().batchUpdate(
-            documentId=document_id,
-            body={'requests': cleanup_requests}
-        ).execute()
+    stripped = sum(doc.replace_all_text(tok, '') for tok in ['<b>', '</b>', '<i>', '</i>'])
+    if stripped:
         print("Stripped tags from document")
-        time.sleep(1)  # Wait for API to settle
-
-    # Now apply formatting by finding the text snippets
-    # Re-read the document after tag removal
-    document = docs_service.documents().get(documentId=document_id).execute()
-    content = document.get('body').get('content')
-    clean_doc_text = read_structural_elements_plain(content) or ''
 
-    format_requests = []
+    # Now apply formatting by finding the text snippets in the stripped copy
+    clean_doc_text = read_structural_elements_plain(doc.body_content) or ''
+    format_count = 0
 
     # Bold formatting intentionally disabled for now (user preference).
     # Keep this log so behavior is explicit during runs.
@@ -1120,45 +1112,22 @@ def _apply_styles_from_tags(docs_service, document_id, strip_tags: bool):
 
     # Apply italic formatting
     for idx, text_to_italicize in enumerate(italic_texts):
-        text_position = clean_doc_text.find(text_to_italicize)
-        if text_position == -1:
+        # Document index (not plain-text offset) of the snippet in the stripped copy
+        start_idx = doc.find(text_to_italicize)
+        if start_idx is None:
             print(f"Warning: Could not find text to italicize: '{text_to_italicize[:30]}...'")
             continue
-
-        # Same as bold - 1-based indexing with exclusive endIndex
-        start_idx = text_position + 1
-        end_idx = text_position + len(text_to_italicize) + 2
+        end_idx = start_idx + utf16_len(text_to_italicize)
 
         print(f"Italicizing: '{text_to_italicize[:50]}...'")
-        print(f"  Text position in doc: {text_position}, length: {len(text_to_italicize)}")
         print(f"  Applied range: [{start_idx}, {end_idx}) (endIndex is exclusive)")
 
-        format_requests.append({
-            'updateTextStyle': {
-                'range': {
-                    'startIndex': start_idx,
-                    'endIndex': end_idx
-                },
-                'textStyle': {
-                    'italic': True
-                },
-                'fields': 'italic'
-            }
-        })
-
-    # Apply formatting in batches
-    batch_size = 10
-    for i in range(0, len(format_requests), batch_size):
-        batch = format_requests[i:i + batch_size]
-        if not batch:
-            continue
-        docs_service.documents().batchUpdate(
-            documentId=document_id,
-            body={'requests': batch}
-        ).execute()
-        print(f"Applied formatting batch {i//batch_size + 1}")
+        doc.update_text_style(start_idx, end_idx, {'italic': True}, 'italic')
+        format_count += 1
 
-    print(f"✓ Bold/italic formatting applied successfully!")
+    # Tag stripping and formatting go out in one batchUpdate
+    doc.flush(docs_service)
+    print(f"✓ Bold/italic formatting applied successfully! ({format_count} range(s))")
 
     # Create a visual debug file showing what SHOULD be bold (optional)
     try:
@@ -1201,12 +1170,8 @@ def _apply_styles_from_tags(docs_service, document_id, strip_tags: bool):
     except Exception as debug_error:
         print(f"   (Debug file save skipped: {debug_error})")
 
-    # IMPORTANT: Read the actual document after formatting to see what's REALLY bold
-    print("\n🔍 Reading actual document to verify bold formatting...")
-    time.sleep(2)  # Wait for formatting to settle
-
-    final_document = docs_service.documents().get(documentId=document_id).execute()
-    final_content = final_document.get('body', {}).get('content', [])
+    # The local copy mirrors what was sent, so no re-read is needed to report styling
+    final_content = doc.body_content
 
     # Create a debug file showing what's ACTUALLY bold in the document (optional)
     try:
@@ -1410,13 +1375,13 @@ def apply_json_replacements_to_doc(docs_service, document_id, replacements_json,
         # Extract just the replacements
         valid = [item['replacement'] for item in scored_replacements]
 
-        # Read doc plain text to count occurrences (use plain version for matching)
-        document = docs_service.documents().get(documentId=document_id).execute()
-        doc_text = read_structural_elements_plain(document.get('body').get('content')) or ''
+        # Read the doc once; replacements and formatting are applied to the
+        # local copy (which tracks index shifts) and sent in one batchUpdate
+        doc = LocalGoogleDoc.fetch(docs_service, document_id)
+        doc_text = read_structural_elements_plain(doc.body_content) or ''
         doc_text_norm = _normalize_for_match(doc_text)
 
-        api_requests = []
-        style_requests = []
+        replaced_count = 0
         marker_specs_all = []
 
         # Determine whether to keep tags literally in the doc (debug inspection mode)
@@ -1438,27 +1403,11 @@ def apply_json_replacements_to_doc(docs_service, document_id, replacements_json,
             if count == 1:
                 if keep_tags_literal:
                     # Insert updated_text verbatim (with <b>/<i> visible) for inspection
-                    api_requests.append({
-                        'replaceAllText': {
-                            'containsText': {
-                                'text': plain_original_text,
-                                'matchCase': True
-                            },
-                            'replaceText': updated_text
-                        }
-                    })
+                    replaced_count += bool(doc.replace_all_text(plain_original_text, updated_text))
                     print(f"Queued literal-tag replace for: '{plain_original_text[:60]}...'")
                 else:
                     # ALWAYS use plain text (no tags) in replaceAllText
-                    api_requests.append({
-                        'replaceAllText': {
-                            'containsText': {
-                                'text': plain_original_text,
-                                'matchCase': True
-                            },
-                            'replaceText': plain_updated_text
-                        }
-                    })
+                    replaced_count += bool(doc.replace_all_text(plain_original_text, plain_updated_text))
 
                     # Track every replaced text so we can explicitly normalize
                     # bold=False afterward (replaceAllText may inherit bold style
@@ -1484,193 +1433,50 @@ def apply_json_replacements_to_doc(docs_service, document_id, replacements_json,
             else:
                 print(f"Warning: multiple ({count}) occurrences of target text; skipping to avoid over-replacement")
 
-        print(f"Applying {len(api_requests)} replaceAllText operations")
-
-        # Apply text replacements in batches (preserving existing formatting)
-        batch_size = 10
-        for i in range(0, len(api_requests), batch_size):
-            batch = api_requests[i:i + batch_size]
-            if batch:
-                docs_service.documents().batchUpdate(
-                    documentId=document_id,
-                    body={'requests': batch}
-                ).execute()
-                print(f"Applied batch {i//batch_size + 1}")
-
-        print("✓ Text replacements applied successfully")
+        print(f"Queued {replaced_count} replaceAllText operations")
 
-        # Now apply formatting / normalization if we have marker specs
+        # Now queue formatting / normalization against the replaced local copy
+        format_count = 0
         if marker_specs_all:
             print(f"\n🎨 Applying formatting normalization using Google Docs API structure...")
-            print(f"📋 Debug: marker_specs_all contains {len(marker_specs_all)} items:")
-            for i, spec in enumerate(marker_specs_all):
-                print(f"  {i+1}. Text: '{spec['text'][:60]}...'")
-                print(f"      Style ranges: {spec['style_ranges']}")
-            time.sleep(1)  # Wait for replacements to settle
-
-            # Re-read the document to get the updated structure
-            doc_after_replace = docs_service.documents().get(documentId=document_id).execute()
-            print(f"🔍 Debug: doc_after_replace keys: {doc_after_replace.keys()}")
-            body = doc_after_replace.get('body', {})
-            print(f"🔍 Debug: body keys: {body.keys() if body else 'None'}")
-            content_after = body.get('content', [])
-            print(f"🔍 Debug: content_after type: {type(content_after)}, length: {len(content_after)}")
-
-            format_requests = []
-
-            # Build complete document text with index mapping
-            # Text can span multiple textRuns, so we need to reconstruct the full text
-            # We manually track the cumulative index since startIndex may not be present after replacements
-            doc_text_parts = []
-            cumulative_index = 1  # Google Docs uses 1-based indexing
-            
-            print(f"🔍 Debug: content_after has {len(content_after)} elements")
-            for idx, element in enumerate(content_after):
-                if 'paragraph' in element:
-                    para = element['paragraph']
-                    para_elements = para.get('elements', [])
-                    if idx < 5:  # Only show first 5 for brevity
-                        print(f"🔍 Debug: Element {idx} is paragraph with {len(para_elements)} elements")
-                    for elem in para_elements:
-                        if 'textRun' in elem:
-                            text_run = elem['textRun']
-                            content = text_run.get('content', '')
-                            # Use provided startIndex if available, otherwise use our cumulative tracker
-                            start_index = text_run.get('startIndex')
-                            if start_index is None:
-                                start_index = cumulative_index
-                            
-                            if idx < 5 and len(doc_text_parts) < 10:  # Only show first few
-                                print(f"🔍 Debug: Found textRun with startIndex={start_index}, content[:30]='{content[:30]}'")
-                            
-                            doc_text_parts.append({
-                                'content': content,
-                                'start_index': start_index
-                            })
-                            
-                            # Update cumulative index for next textRun
-                            cumulative_index = start_index + len(content)
-            
-            print(f"🔍 Debug: Collected {len(doc_text_parts)} text parts")
-
-            # Reconstruct full document text
-            full_doc_text = ''.join([part['content'] for part in doc_text_parts])
-
-            print(f"\n🔍 Debug: Full document text length: {len(full_doc_text)}")
-            print(f"🔍 Debug: First 200 chars: '{full_doc_text[:200]}'")
-
             for spec in marker_specs_all:
                 target_text = spec['text']
                 style_ranges = spec['style_ranges']
 
-                # Search for target text in full document
-                text_position = full_doc_text.find(target_text)
-                if text_position == -1:
-                    print(f"⚠️  Could not find text to format: '{target_text[:50]}...'")
-                    # Debug: show where we're searching
-                    print(f"   🔍 Debug: Searching for text with length {len(target_text)}")
-                    print(f"   🔍 Debug: First 100 chars of target: '{target_text[:100]}'")
-                    # Try partial match
-                    if target_text[:30] in full_doc_text:
-                        print(f"   ✓ Found first 30 chars in document!")
-                        pos = full_doc_text.find(target_text[:30])
-                        print(f"   Context: ...{full_doc_text[max(0,pos-20):pos+80]}...")
-                    else:
-                        print(f"   ✗ Not even first 30 chars found in document")
-                    continue
-
-                # Find the Google Docs startIndex for this position
-                # Walk through doc_text_parts to find which textRun contains this position
-                cumulative_length = 0
-                found_start_index = None
-
-                for part in doc_text_parts:
-                    part_length = len(part['content'])
-                    if cumulative_length <= text_position < cumulative_length + part_length:
-                        # Found the textRun containing the start of our text
-                        offset_in_run = text_position - cumulative_length
-                        found_start_index = part['start_index'] + offset_in_run
-                        break
-                    cumulative_length += part_length
-
+                found_start_index = doc.find(target_text)
                 if found_start_index is None:
-                    print(f"⚠️  Could not determine document index for: '{target_text[:50]}...'")
+                    print(f"⚠️  Could not find text to format: '{target_text[:50]}...'")
                     continue
 
                 # Force NO bold on replaced text (user preference), then apply
                 # any explicit italic ranges.
-                format_requests.append({
-                    'updateTextStyle': {
-                        'range': {
-                            'startIndex': found_start_index,
-                            'endIndex': found_start_index + len(target_text)
-                        },
-                        'textStyle': {'bold': False},
-                        'fields': 'bold'
-                    }
-                })
-                print(f"  Unbold: '{target_text[:60]}' at [{found_start_index}, {found_start_index + len(target_text)})")
+                found_end_index = found_start_index + utf16_len(target_text)
+                doc.update_text_style(found_start_index, found_end_index, {'bold': False}, 'bold')
+                format_count += 1
+                print(f"  Unbold: '{target_text[:60]}' at [{found_start_index}, {found_end_index})")
 
                 # Apply each style range within this text
                 for style_range in style_ranges:
-                    range_start = found_start_index + style_range['start']
-                    range_end = found_start_index + style_range['end']
-                    
-                    # Extract the text to be formatted
-                    text_to_format = target_text[style_range['start']:style_range['end']]
-
                     if style_range.get('bold'):
                         # Bold styling intentionally disabled for now.
                         continue
 
                     if style_range['italic']:
-                        # Same workaround for italic with numeric prefixes
-                        numeric_match = re.match(r'^[~]?\d+[+%kKmMbB]?\s*', text_to_format)
-                        
-                        if numeric_match:
-                            # Shift start index by the length of numeric portion
-                            numeric_length = len(numeric_match.group(0))
-                            adjusted_range_start = range_start + numeric_length
-                            
-                            # Italicize the entire text INCLUDING numbers
-                            format_requests.append({
-                                'updateTextStyle': {
-                                    'range': {
-                                        'startIndex': range_start,
-                                        'endIndex': range_end
-                                    },
-                                    'textStyle': {'italic': True},
-                                    'fields': 'italic'
-                                }
-                            })
-                            print(f"  Italic (including numbers): '{text_to_format}' at [{range_start}, {range_end})")
-                        else:
-                            format_requests.append({
-                                'updateTextStyle': {
-                                    'range': {
-                                        'startIndex': range_start,
-                                        'endIndex': range_end
-                                    },
-                                    'textStyle': {'italic': True},
-                                    'fields': 'italic'
-                                }
-                            })
-                            print(f"  Italic: '{text_to_format}' at [{range_start}, {range_end})")
-
-            # Apply all formatting requests
-            if format_requests:
-                batch_size = 10
-                for i in range(0, len(format_requests), batch_size):
-                    batch = format_requests[i:i + batch_size]
-                    docs_service.documents().batchUpdate(
-                        documentId=document_id,
-                        body={'requests': batch}
-                    ).execute()
-                print(f"✅ Applied {len(format_requests)} formatting operations")
-            else:
-                print("No formatting to apply")
+                        # Italicize the entire range, including any numeric prefix
+                        # style_range offsets are string offsets into target_text
+                        range_start = found_start_index + utf16_len(target_text[:style_range['start']])
+                        range_end = found_start_index + utf16_len(target_text[:style_range['end']])
+                        doc.update_text_style(range_start, range_end, {'italic': True}, 'italic')
+                        format_count += 1
+                        print(f"  Italic: '{target_text[style_range['start']:style_range['end']]}' at [{range_start}, {range_end})")
         else:
             print("No formatting specified")
+
+        # Replacements and formatting go out in a single batchUpdate
+        doc.flush(docs_service)
+        print("✓ Text replacements applied successfully")
+        if format_count:
+            print(f"✅ Applied {format_count} formatting operations")
         
     except HttpError as error:
         print(f"An error occurred while applying changes: {error}")
@@ -1921,6 +1727,105 @@ def _load_profile_projects_for_tailoring(
         print(f"[WARN] Could not load profile projects for tailoring: {e}")
         return []
 
+def _recover_from_overflow(doc, systematic_results, current_page_count, original_page_count,
+                           count_pages, max_recovery_attempts=2):
+    """Multi-attempt overflow recovery on a LocalGoogleDoc.
+
+    Recovery edits are applied to the local copy; ``count_pages`` measures it
+    (doc.estimated_pages for the local pass, a flush + PDF export for the
+    final check).  Returns the last page count measured; the time spent is
+    added to systematic_results['timings']['overflow_recovery'].
+    """
+    timings = systematic_results.setdefault('timings', {})
+    for attempt in range(1, max_recovery_attempts + 1):
+        if current_page_count <= original_page_count:
+            print(f"✅ Page count resolved!")
+            break
+
+        print(f"\n🔄 Running overflow recovery (attempt {attempt}/{max_recovery_attempts})...")
+
+        # Refresh metadata from the local copy
+        current_line_metadata = extract_document_structure(None, doc.document_id, doc=doc)
+
+        # Get the actual lines added from Phase 2 (if available)
+        total_lines_added = 0
+        if systematic_results.get('phase2_results'):
+            total_lines_added = systematic_results['phase2_results'].get('total_lines_added', 0)
+
+        # Run overflow recovery
+        recovery = recover_from_overflow_if_needed(
+            line_metadata=current_line_metadata,
+            keywords=systematic_results['phase1_results']['feasible_keywords'],
+            current_pages=current_page_count,
+            target_pages=original_page_count,
+            total_lines_added=total_lines_added,
+            attempt=attempt
+        )
+
+        timings['overflow_recovery'] = round(
+            timings.get('overflow_recovery', 0.0) + recovery.get('duration_seconds', 0.0), 3
+        )
+
+        # Apply recovery replacements
+        replacements = recovery.get('replacements', [])
+
+        # Check if this is incremental (one-by-one)
+        is_incremental_condense = replacements and replacements[0].get('type') == 'overflow_recovery_condense_incremental'
+        is_incremental_remove = replacements and replacements[0].get('type') == 'overflow_recovery_remove_incremental'
+        is_incremental = is_incremental_condense or is_incremental_remove
+
+        applied_count = 0
+        if is_incremental:
+            action_word = "Condensing" if is_incremental_condense else "Removing"
+            print(f"   Applying {len(replacements)} {action_word.lower()} ONE AT A TIME...")
+
+            for i, repl in enumerate(replacements, 1):
+                # Apply one bullet condensation or removal
+                if not doc.replace_all_text(repl['old_text'], repl['new_text']):
+                    print(f"      ⚠️ No match for: {repl.get('bullet_text', 'bullet')}")
+                    continue
+                applied_count += 1
+
+                # Display appropriate message
+                if is_incremental_condense:
+                    lines_before = repl.get('lines_before', '?')
+                    lines_after = repl.get('lines_after', '?')
+                    print(f"      {i}. Condensed: {repl.get('bullet_text', 'bullet')} ({lines_before}→{lines_after} lines)")
+                else:
+                    print(f"      {i}. Removed: {repl.get('bullet_text', 'bullet')} (relevance: {repl.get('relevance', 0)})")
+
+                # Check page count after THIS change
+                current_page_count = count_pages()
+
+                if current_page_count is not None and current_page_count <= original_page_count:
+                    print(f"      ✅ Target reached after {action_word.lower()} {applied_count} bullet(s)!")
+                    print(f"      📄 Page count: {current_page_count}/{original_page_count}")
+                    break  # Stop - we've hit the target!
+        else:
+            # Apply all at once (non-incremental)
+            for repl in replacements:
+                if doc.replace_all_text(repl['old_text'], repl['new_text']):
+                    applied_count += 1
+
+        print(f"   Applied {applied_count}/{len(replacements)} replacements")
+
+        # Check page count after recovery
+        current_page_count = count_pages()
+        print(f"   After recovery: {current_page_count} page(s)")
+
+        if current_page_count is None:
+            print("   ⚠️  Page count unavailable during recovery")
+            break
+        if current_page_count <= original_page_count:
+            print(f"✅ Successfully recovered to {current_page_count} page(s)!")
+            break
+        elif attempt < max_recovery_attempts:
+            print(f"   Still {current_page_count - original_page_count} page(s) over - trying more aggressive approach...")
+        else:
+            print(f"⚠️  Could not fully recover - still {current_page_count - original_page_count} page(s) over after {max_recovery_attempts} attempts")
+
+    return current_page_count
+
 def tailor_resume_and_return_url(original_resume_url, job_description, job_title, company,
                                    credentials=None, user_full_name=None, user_id=None, replace_projects_on_tailor: bool = False, profile_projects: Optional[List[Dict[str, Any]]] = None, **_legacy_kwargs):
     """Tailor resume and return publicly accessible Google Doc URL
@@ -1935,6 +1840,7 @@ def tailor_resume_and_return_url(original_resume_url, job_description, job_title
         user_id: Optional user identifier for profile-aware tailoring context
         replace_projects_on_tailor: When True, allows project section swaps from profile projects
     """
+    tailoring_started = time.perf_counter()
     try:
         # Get Google Services (with user-specific credentials if provided)
         docs_service, drive_service = get_google_services(credentials)
@@ -1981,12 +1887,15 @@ def tailor_resume_and_return_url(original_resume_url, job_description, job_title
         # when it may not be accessible due to drive.file scope restrictions.
         print("Reading resume content from Google Docs...")
         try:
-            document = docs_service.documents().get(documentId=copied_doc_id).execute()
+            # The only documents().get of the run: edits, structure and length
+            # estimates all work on this local copy
+            doc = LocalGoogleDoc.fetch(docs_service, copied_doc_id)
         except Exception as e:
             raise ValueError(f"Could not read the Google Doc: {e}")
 
         # Get both styled and plain text content from the same document
-        content = document.get('body', {}).get('content', [])
+        content = doc.body_content
+        original_estimated_pages = doc.estimated_pages()
         original_resume_text = read_structural_elements(content)
         if not original_resume_text:
             raise ValueError("Could not read content from the original Google Doc")
@@ -2002,7 +1911,7 @@ def tailor_resume_and_return_url(original_resume_url, job_description, job_title
             # Extract document structure and metadata
             print("Extracting document structure and formatting metadata...")
             try:
-                line_metadata = extract_document_structure(docs_service, copied_doc_id)
+                line_metadata = extract_document_structure(docs_service, copied_doc_id, doc=doc)
                 print(f"Extracted metadata for {len(line_metadata)} lines")
 
                 # Save metadata to file for debugging (only if directory exists)
@@ -2132,42 +2041,41 @@ def tailor_resume_and_return_url(original_resume_url, job_description, job_title
                 pass
             systematic_results = run_systematic_tailoring(**systematic_kwargs)
 
-            # Apply replacements
+            systematic_results.setdefault('timings', {})
+            apply_started = time.perf_counter()
+
+            # Apply replacements to the local copy, then send them in one batchUpdate
             if systematic_results['all_replacements']:
                 print(f"\n📝 Applying {len(systematic_results['all_replacements'])} replacements...")
                 _miss_count = 0
 
                 for repl in systematic_results['all_replacements']:
-                    try:
-                        requests_list = [{
-                            'replaceAllText': {
-                                'containsText': {
-                                    'text': repl['old_text'],
-                                    'matchCase': True
-                                },
-                                'replaceText': repl['new_text']
-                            }
-                        }]
-                        resp = docs_service.documents().batchUpdate(
-                            documentId=copied_doc_id,
-                            body={'requests': requests_list}
-                        ).execute()
-                        # Check how many occurrences were actually replaced
-                        hits = (resp.get('replies') or [{}])[0].get('replaceAllText', {}).get('occurrencesChanged', None)
-                        if hits == 0:
-                            _miss_count += 1
-                            rtype = repl.get('type', 'unknown')
-                            preview = repl.get('old_text', '')[:60].replace('\n', '↵')
-                            print(f"      ⚠️  No match [{rtype}]: '{preview}'")
-                    except Exception as e:
-                        print(f"      ⚠️  Skipped: {str(e)[:50]}...")
+                    hits = doc.replace_all_text(repl['old_text'], repl['new_text'])
+                    if hits == 0:
+                        _miss_count += 1
+                        rtype = repl.get('type', 'unknown')
+                        preview = repl.get('old_text', '')[:60].replace('\n', '↵')
+                        print(f"      ⚠️  No match [{rtype}]: '{preview}'")
 
                 if _miss_count:
                     print(f"   ⚠️  {_miss_count} replacement(s) found no matching text in the doc (text may differ)")
-                print("✅ Replacements applied")
 
-            # CRITICAL: Check page count - only run overflow recovery if needed
+            # Estimate the page count locally first and recover without any
+            # API round trips; the edits are only sent once that settles
             print(f"\n📄 Checking page count...")
+            estimated_pages = doc.estimated_pages()
+            print(f"   Estimated: {estimated_pages} page(s) (original {original_estimated_pages})")
+            if estimated_pages > original_estimated_pages:
+                print(f"\n⚠️  OVERFLOW ESTIMATED: {estimated_pages} pages > {original_estimated_pages} pages")
+                _recover_from_overflow(doc, systematic_results, estimated_pages,
+                                       original_estimated_pages, doc.estimated_pages)
+
+            doc.flush(docs_service)
+            if systematic_results['all_replacements']:
+                print("✅ Replacements applied")
+            systematic_results['timings']['apply'] = round(time.perf_counter() - apply_started, 3)
+
+            # Final check against the real rendering (PDF export)
             time.sleep(2)  # Wait for changes to settle
             current_page_count = get_actual_page_count(drive_service, copied_doc_id)
             original_page_count = get_actual_page_count(drive_service, original_doc_id)
@@ -2177,133 +2085,17 @@ def tailor_resume_and_return_url(original_resume_url, job_description, job_title
 
             # Check for overflow (handle None values from missing PyPDF2)
             if current_page_count is None or original_page_count is None:
-                print("   ⚠️  Page count unavailable (PyPDF2 not installed) - skipping overflow check")
+                print("   ⚠️  Page count unavailable (PyPDF2 not installed) - relying on the local estimate")
             elif current_page_count > original_page_count:
                 print(f"\n⚠️  OVERFLOW DETECTED: {current_page_count} pages > {original_page_count} pages")
-                
-                # Multi-attempt overflow recovery (max 2 attempts)
-                max_recovery_attempts = 2
-                for attempt in range(1, max_recovery_attempts + 1):
-                    if current_page_count <= original_page_count:
-                        print(f"✅ Page count resolved!")
-                        break
-                    
-                    print(f"\n🔄 Running overflow recovery (attempt {attempt}/{max_recovery_attempts})...")
-                    
-                    # Refresh metadata
-                    current_line_metadata = extract_document_structure(docs_service, copied_doc_id)
-                    
-                    # Get the actual lines added from Phase 2 (if available)
-                    total_lines_added = 0
-                    if systematic_results.get('phase2_results'):
-                        total_lines_added = systematic_results['phase2_results'].get('total_lines_added', 0)
-
-                    # Run overflow recovery
-                    recovery = recover_from_overflow_if_needed(
-                        line_metadata=current_line_metadata,
-                        keywords=systematic_results['phase1_results']['feasible_keywords'],
-                        current_pages=current_page_count,
-                        target_pages=original_page_count,
-                        total_lines_added=total_lines_added,
-                        attempt=attempt
-                    )
 
-                    # Apply recovery replacements
-                    replacements = recovery.get('replacements', [])
-                    
-                    # Check if this is incremental (one-by-one)
-                    is_incremental_condense = replacements and replacements[0].get('type') == 'overflow_recovery_condense_incremental'
-                    is_incremental_remove = replacements and replacements[0].get('type') == 'overflow_recovery_remove_incremental'
-                    is_incremental = is_incremental_condense or is_incremental_remove
-                    
-                    if is_incremental:
-                        action_word = "Condensing" if is_incremental_condense else "Removing"
-                        print(f"   Applying {len(replacements)} {action_word.lower()} ONE AT A TIME...")
-                        applied_count = 0
-                        
-                        for i, repl in enumerate(replacements, 1):
-                            try:
-                                # Apply one bullet condensation or removal
-                                requests_list = [{
-                                    'replaceAllText': {
-                                        'containsText': {'text': repl['old_text'], 'matchCase': True},
-                                        'replaceText': repl['new_text']
-                                    }
-                                }]
-                                docs_service.documents().batchUpdate(
-                                    documentId=copied_doc_id,
-                                    body={'requests': requests_list}
-                                ).execute()
-                                applied_count += 1
-                                
-                                # Display appropriate message
-                                if is_incremental_condense:
-                                    lines_before = repl.get('lines_before', '?')
-                                    lines_after = repl.get('lines_after', '?')
-                                    print(f"      {i}. Condensed: {repl.get('bullet_text', 'bullet')} ({lines_before}→{lines_after} lines)")
-                                else:
-                                    print(f"      {i}. Removed: {repl.get('bullet_text', 'bullet')} (relevance: {repl.get('relevance', 0)})")
-                                
-                                # Check page count after THIS change
-                                current_page_count = get_actual_page_count(drive_service, copied_doc_id)
-                                
-                                if (
-                                    current_page_count is not None and
-                                    original_page_count is not None and
-                                    current_page_count <= original_page_count
-                                ):
-                                    print(f"      ✅ Target reached after {action_word.lower()} {applied_count} bullet(s)!")
-                                    print(f"      📄 Page count: {current_page_count}/{original_page_count}")
-                                    break  # Stop - we've hit the target!
-                                    
-                            except Exception as e:
-                                print(f"      ⚠️ Failed to apply: {str(e)[:50]}...")
-                        
-                        print(f"   Applied {applied_count}/{len(replacements)} replacements")
-                    else:
-                        # Apply all at once (non-incremental)
-                        applied_count = 0
-                        for repl in replacements:
-                            try:
-                                requests_list = [{
-                                    'replaceAllText': {
-                                        'containsText': {'text': repl['old_text'], 'matchCase': True},
-                                        'replaceText': repl['new_text']
-                                    }
-                                }]
-                                docs_service.documents().batchUpdate(
-                                    documentId=copied_doc_id,
-                                    body={'requests': requests_list}
-                                ).execute()
-                                applied_count += 1
-                            except Exception as e:
-                                print(f"      ⚠️ Failed to apply: {str(e)[:50]}...")
-                        
-                        print(f"   Applied {applied_count}/{len(replacements)} replacements")
-                    
-                    # Check page count after recovery
-                    time.sleep(2)
-                    current_page_count = get_actual_page_count(drive_service, copied_doc_id)
-                    print(f"   After recovery: {current_page_count} page(s)")
-                    
-                    if (
-                        current_page_count is not None and
-                        original_page_count is not None and
-                        current_page_count <= original_page_count
-                    ):
-                        print(f"✅ Successfully recovered to {current_page_count} page(s)!")
-                        break
-                    elif attempt < max_recovery_attempts:
-                        if current_page_count is None or original_page_count is None:
-                            print("   ⚠️  Page count unavailable during recovery - continuing cautiously...")
-                        else:
-                            print(f"   Still {current_page_count - original_page_count} page(s) over - trying more aggressive approach...")
-                    else:
-                        if current_page_count is None or original_page_count is None:
-                            print(f"⚠️  Could not verify final page count after {max_recovery_attempts} attempts")
-                        else:
-                            print(f"⚠️  Could not fully recover - still {current_page_count - original_page_count} page(s) over after {max_recovery_attempts} attempts")
-                        
+                def exported_page_count():
+                    doc.flush(docs_service)
+                    return get_actual_page_count(drive_service, copied_doc_id)
+
+                current_page_count = _recover_from_overflow(doc, systematic_results, current_page_count,
+                                                            original_page_count, exported_page_count)
+                doc.flush(docs_service)
             else:
                 print(f"✅ No overflow - resume stays at {current_page_count} page(s)")
 
@@ -2402,7 +2194,11 @@ def tailor_resume_and_return_url(original_resume_url, job_description, job_title
                     else None
                 )
             },
-            'replacements_applied': len(systematic_results['all_replacements'])
+            'replacements_applied': len(systematic_results['all_replacements']),
+            'timings': {
+                **systematic_results.get('timings', {}),
+                'total': round(time.perf_counter() - tailoring_started, 3),
+            },
         }
 
         print(f"✅ Tailored resume created and made public: {tailoring_metrics['url']}")
@@ -2416,6 +2212,7 @@ def tailor_resume_and_return_url(original_resume_url, job_description, job_title
         print(f"   Match Percentage: {tailoring_metrics['match_stats']['match_percentage']:.1f}%")
         print(f"   Sections Modified: Profile={tailoring_metrics['sections_modified']['profile']}, Skills={tailoring_metrics['sections_modified']['skills']}, Projects={tailoring_metrics['sections_modified']['projects']}")
         print(f"   Replacements Applied: {tailoring_metrics['replacements_applied']}")
+        print(f"   Timings (s): {tailoring_metrics['timings']}")
         
         return tailoring_metrics
 
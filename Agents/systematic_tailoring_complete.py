@@ -1,11 +1,19 @@
 """
 Complete Systematic Resume Tailoring Implementation
 Full two-phase approach with all methods implemented
+
+Phase 2 edits independent sections concurrently (all Gemini calls share the
+process-wide gemini_budget) and merges their replacements in document order:
+  LAUNCHWAY_SECTION_PARALLEL=off   edit sections one after another
+  LAUNCHWAY_SECTION_WORKERS        concurrent section edits (default 4)
 """
 
 import re
 import json
 import math
+import time
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Tuple, Optional
 from google import genai
 from google.api_core import retry
@@ -25,6 +33,22 @@ except ImportError:
 # HELPER FUNCTIONS
 # ============================================================
 
+DEFAULT_SECTION_WORKERS = 4
+
+
+def section_parallel_enabled() -> bool:
+    """Whether Phase 2 edits sections concurrently (LAUNCHWAY_SECTION_PARALLEL)."""
+    return os.getenv("LAUNCHWAY_SECTION_PARALLEL", "on").strip().lower() not in ("0", "off", "false", "no")
+
+
+def section_workers() -> int:
+    """Concurrent section edits (LAUNCHWAY_SECTION_WORKERS)."""
+    try:
+        return max(1, int(os.getenv("LAUNCHWAY_SECTION_WORKERS", str(DEFAULT_SECTION_WORKERS))))
+    except ValueError:
+        return DEFAULT_SECTION_WORKERS
+
+
 def extract_relevant_profile_context(profile_context_text: str, keywords: List[str], max_length: int = 800) -> str:
     """
     Intelligently extract relevant portions of profile context based on keywords.
@@ -581,7 +605,9 @@ class SystematicEditorComplete:
             conservative_mode: If True, only edits Profile → Skills → Projects (strategic changes only)
                              If False, edits everything including experience bullets (aggressive)
 
-        Returns all edits to be applied in one batch.
+        Returns all edits to be applied in one batch, in document order.
+        Sections are edited concurrently unless LAUNCHWAY_SECTION_PARALLEL=off;
+        'section_timings' holds the seconds each section took.
         """
         print("\n" + "="*60)
         if conservative_mode:
@@ -639,47 +665,60 @@ class SystematicEditorComplete:
                 if section not in prioritized_sections:
                     prioritized_sections.append(section)
 
+        # Sections edited in this run; the rest are skipped
+        edit_sections = []
         for section in prioritized_sections:
-            section_type = section['type']
-            
-            # Skip sections based on mode
-            if section_type in skip_types:
+            if section['type'] in skip_types:
                 print(f"\n⏭️  Skipping section: {section['name']} (conservative mode)")
                 continue
-                
-            print(f"\n🔧 Processing section: {section['name']} (Priority {priority_order.index(section_type) + 1 if section_type in priority_order else 'N/A'})")
-            
+            edit_sections.append(section)
+
+        edit_kwargs = dict(
+            validation_results=validation_results,
+            profile_context_data=profile_context_data,
+            space_plan=space_plan,
+            conservative_mode=conservative_mode,
+            profile_projects=profile_projects or [],
+            enable_project_swaps=enable_project_swaps,
+        )
+        section_timings = {}
+        section_results = {}
+        workers = min(section_workers(), len(edit_sections))
+        parallel = section_parallel_enabled() and workers > 1
+
+        if parallel:
+            # Sections only read the shared inputs, so they can be edited
+            # concurrently; every Gemini call still draws from the shared
+            # budget (gemini_budget), and each task runs in a copy of this
+            # context so the caller's Gemini lane applies to it
+            print(f"\n⚡ Editing {len(edit_sections)} sections in parallel ({workers} workers)")
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="section-edit") as pool:
+                futures = {
+                    id(section): pool.submit(
+                        contextvars.copy_context().run, self._timed_edit_section, section, edit_kwargs
+                    )
+                    for section in edit_sections
+                }
+                for section in edit_sections:
+                    section_results[id(section)] = futures[id(section)].result()
+        else:
+            for section in edit_sections:
+                section_type = section['type']
+                print(f"\n🔧 Processing section: {section['name']} (Priority {priority_order.index(section_type) + 1 if section_type in priority_order else 'N/A'})")
+                section_results[id(section)] = self._timed_edit_section(section, edit_kwargs)
+
+        # Merge in document order so the batch is the same however the
+        # sections were scheduled
+        for section in sorted(edit_sections, key=lambda s: s['start_line']):
+            replacements, elapsed = section_results[id(section)]
+            section_timings[section['name']] = round(elapsed, 3)
+
             # Count lines BEFORE editing (only non-empty lines with actual content)
             lines_before = sum(1 for line in section['lines'] if line.get('text', '').strip())
 
-            if section_type == 'profile':
-                replacements = self._edit_profile_section(
-                    section, validation_results, profile_context_data, conservative_mode
-                )
-            elif section_type == 'experience':
-                replacements = self._edit_experience_section(
-                    section, validation_results, profile_context_data, space_plan
-                )
-            elif section_type == 'projects':
-                replacements = self._edit_projects_section(
-                    section,
-                    validation_results,
-                    profile_context_data,
-                    space_plan,
-                    conservative_mode,
-                    profile_projects=profile_projects or [],
-                    enable_project_swaps=enable_project_swaps,
-                )
-            elif section_type == 'skills':
-                replacements = self._edit_skills_section(
-                    section, validation_results, profile_context_data, conservative_mode
-                )
-            else:
-                replacements = []
-
             # Estimate lines AFTER editing (based on replacements)
             # This is an approximation since actual line count depends on rendering
-            # Only count non-empty lines (lines with actual content)
+            # Only count non-empty lines (lines with text content)
             lines_after = lines_before
             for repl in replacements:
                 old_text = repl.get('old_text', '')
@@ -700,7 +739,7 @@ class SystematicEditorComplete:
             total_lines_added += lines_delta
 
             all_replacements.extend(replacements)
-            print(f"   ✓ Generated {len(replacements)} replacement(s)")
+            print(f"   ✓ {section['name']}: {len(replacements)} replacement(s) in {elapsed:.1f}s")
             if lines_delta != 0:
                 print(f"   📏 Estimated lines: {lines_before} → {lines_after} ({lines_delta:+d})")
 
@@ -713,9 +752,53 @@ class SystematicEditorComplete:
             'sections_modified': [s['name'] for s in sections if s['lines']],
             'space_plan': space_plan,
             'section_line_changes': section_line_changes,
-            'total_lines_added': total_lines_added
+            'total_lines_added': total_lines_added,
+            'section_timings': section_timings,
+            'parallel': parallel,
         }
 
+    def _timed_edit_section(self, section: Dict[str, Any], edit_kwargs: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], float]:
+        """Edit one section; returns (replacements, seconds taken)."""
+        started = time.perf_counter()
+        replacements = self._edit_section(section, **edit_kwargs)
+        return replacements, time.perf_counter() - started
+
+    def _edit_section(
+        self,
+        section: Dict[str, Any],
+        validation_results: Dict[str, Any],
+        profile_context_data: str,
+        space_plan: Dict[str, Any],
+        conservative_mode: bool,
+        profile_projects: List[Dict[str, Any]],
+        enable_project_swaps: bool,
+    ) -> List[Dict[str, Any]]:
+        """Dispatch a section to its editor."""
+        section_type = section['type']
+        if section_type == 'profile':
+            return self._edit_profile_section(
+                section, validation_results, profile_context_data, conservative_mode
+            )
+        if section_type == 'experience':
+            return self._edit_experience_section(
+                section, validation_results, profile_context_data, space_plan
+            )
+        if section_type == 'projects':
+            return self._edit_projects_section(
+                section,
+                validation_results,
+                profile_context_data,
+                space_plan,
+                conservative_mode,
+                profile_projects=profile_projects,
+                enable_project_swaps=enable_project_swaps,
+            )
+        if section_type == 'skills':
+            return self._edit_skills_section(
+                section, validation_results, profile_context_data, conservative_mode
+            )
+        return []
+
     def _identify_sections(self, line_metadata: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Identify resume sections."""
         sections = []
@@ -1701,6 +1784,8 @@ class OverflowRecoveryComplete:
                       f"{visual_lines} visual lines")
                 print(f"      {target['text'][:60]}...")
 
+            # Bullets worth condensing, in relevance order
+            jobs = []
             for bullet in condense_targets:
                 # Use visual_lines metadata instead of counting newlines
                 current_visual_lines = bullet.get('visual_lines', 1)
@@ -1718,47 +1803,24 @@ class OverflowRecoveryComplete:
 
                 # Estimate chars per visual line
                 chars_per_line = bullet.get('char_limit', 80)
-                target_char_count = int(target_visual_lines * chars_per_line)
-
-                prompt = f"""Condense this resume bullet while preserving ALL key information:
-
-ORIGINAL ({len(bullet['text'])} chars, {current_visual_lines} visual lines):
-{bullet['text']}
-
-GOAL: Reduce to {target_visual_lines} line(s) (~{target_char_count} chars max)
-
-CONTEXT: This is OVERFLOW RECOVERY. The resume is too long.
-
-CRITICAL REQUIREMENTS:
-- Must save AT LEAST 1 full visual line
-- PRESERVE all quantified data (numbers, percentages, metrics)
-- PRESERVE all technical terms and key accomplishments
-- Remove ONLY filler words: "various", "effectively", "successfully", "helped", etc.
-- Use concise phrasing but keep all factual claims
-- Target: ~{target_char_count} characters or less
-- Maintain minimum 2-line professional appearance
-
-Example transformations:
-- "Successfully implemented various improvements to system performance across multiple areas" (3 lines) → "Implemented improvements to system performance across multiple areas" (2 lines)
-- "Worked collaboratively with cross-functional team to develop and deploy new features" (3 lines) → "Developed and deployed new features with cross-functional team" (2 lines)
-
-CRITICAL OUTPUT FORMAT:
-- Return ONLY the condensed text
-- NO labels, NO character counts, NO metadata
-- Just the raw text for the resume
-- Use plain text only (NO markdown symbols: *, **, #, _, backticks)
+                jobs.append({
+                    'bullet': bullet,
+                    'current_visual_lines': current_visual_lines,
+                    'target_visual_lines': target_visual_lines,
+                    'target_char_count': int(target_visual_lines * chars_per_line),
+                })
 
-If the content cannot be meaningfully condensed to {target_visual_lines} line(s) while preserving key facts, return the original."""
+            # One request for all bullets; single-bullet prompts only for
+            # bullets the batch answer leaves out
+            condensed_by_job = self._condense_bullets_batch(jobs) if jobs else {}
 
+            for index, job in enumerate(jobs):
+                bullet = job['bullet']
+                current_visual_lines = job['current_visual_lines']
                 try:
-                    response = generate_content_with_retry(
-                        client=self.genai_client,
-                        model='gemini-2.5-flash',
-                        contents=prompt
-                    )
-
-                    # Clean up artifacts from Gemini response
-                    condensed = clean_gemini_response(response.text)
+                    condensed = condensed_by_job.get(index)
+                    if condensed is None:
+                        condensed = self._condense_bullet(job)
 
                     # Estimate visual lines for condensed text based on character count
                     chars_per_line = bullet.get('char_limit', 80)
@@ -1987,6 +2049,126 @@ Return ONLY valid JSON, no markdown, no extra text."""
             'attempt': attempt
         }
 
+    def _condense_bullet(self, job: Dict[str, Any]) -> str:
+        """Condense one bullet with its own request (fallback for the batch)."""
+        bullet = job['bullet']
+        current_visual_lines = job['current_visual_lines']
+        target_visual_lines = job['target_visual_lines']
+        target_char_count = job['target_char_count']
+
+        prompt = f"""Condense this resume bullet while preserving ALL key information:
+
+ORIGINAL ({len(bullet['text'])} chars, {current_visual_lines} visual lines):
+{bullet['text']}
+
+GOAL: Reduce to {target_visual_lines} line(s) (~{target_char_count} chars max)
+
+CONTEXT: This is OVERFLOW RECOVERY. The resume is too long.
+
+CRITICAL REQUIREMENTS:
+- Must save AT LEAST 1 full visual line
+- PRESERVE all quantified data (numbers, percentages, metrics)
+- PRESERVE all technical terms and key accomplishments
+- Remove ONLY filler words: "various", "effectively", "successfully", "helped", etc.
+- Use concise phrasing but keep all factual claims
+- Target: ~{target_char_count} characters or less
+- Maintain minimum 2-line professional appearance
+
+Example transformations:
+- "Successfully implemented various improvements to system performance across multiple areas" (3 lines) → "Implemented improvements to system performance across multiple areas" (2 lines)
+- "Worked collaboratively with cross-functional team to develop and deploy new features" (3 lines) → "Developed and deployed new features with cross-functional team" (2 lines)
+
+CRITICAL OUTPUT FORMAT:
+- Return ONLY the condensed text
+- NO labels, NO character counts, NO metadata
+- Just the raw text for the resume
+- Use plain text only (NO markdown symbols: *, **, #, _, backticks)
+
+If the content cannot be meaningfully condensed to {target_visual_lines} line(s) while preserving key facts, return the original."""
+
+        response = generate_content_with_retry(
+            client=self.genai_client,
+            model='gemini-2.5-flash',
+            contents=prompt
+        )
+        # Clean up artifacts from Gemini response
+        return clean_gemini_response(response.text)
+
+    def _condense_bullets_batch(self, jobs: List[Dict[str, Any]]) -> Dict[int, str]:
+        """Condense several bullets in one request.
+
+        Returns {job index: condensed text} for the bullets the response
+        answered; missing or unparseable entries are left out so the caller
+        can condense them one by one.
+        """
+        items = [
+            {
+                'id': index + 1,
+                'text': job['bullet']['text'],
+                'visual_lines': job['current_visual_lines'],
+                'target_lines': job['target_visual_lines'],
+                'max_chars': job['target_char_count'],
+            }
+            for index, job in enumerate(jobs)
+        ]
+        prompt = f"""Condense each of these resume bullets while preserving ALL key information.
+
+BULLETS (id, original text, current visual lines, target lines, max chars):
+{json.dumps(items, indent=2)}
+
+CONTEXT: This is OVERFLOW RECOVERY. The resume is too long.
+
+CRITICAL REQUIREMENTS (for every bullet):
+- Must save AT LEAST 1 full visual line (stay within max_chars)
+- PRESERVE all quantified data (numbers, percentages, metrics)
+- PRESERVE all technical terms and key accomplishments
+- Remove ONLY filler words: "various", "effectively", "successfully", "helped", etc.
+- Use concise phrasing but keep all factual claims
+- Maintain minimum 2-line professional appearance
+- Use plain text only (NO markdown symbols: *, **, #, _, backticks)
+- If a bullet cannot be meaningfully condensed while preserving key facts, return its original text
+
+Example transformations:
+- "Successfully implemented various improvements to system performance across multiple areas" (3 lines) → "Implemented improvements to system performance across multiple areas" (2 lines)
+- "Worked collaboratively with cross-functional team to develop and deploy new features" (3 lines) → "Developed and deployed new features with cross-functional team" (2 lines)
+
+Output Format (JSON only, one entry per bullet id):
+{{
+  "condensed": [{{"id": 1, "text": "condensed bullet text"}}, ...]
+}}
+
+Return ONLY valid JSON, no markdown, no extra text."""
+
+        try:
+            response = generate_content_with_retry(
+                client=self.genai_client,
+                model='gemini-2.5-flash',
+                contents=prompt
+            )
+            response_text = response.text.strip()
+            response_text = re.sub(r'```json\s*', '', response_text)
+            response_text = re.sub(r'```\s*', '', response_text)
+            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            entries = json.loads(json_match.group()).get('condensed', []) if json_match else []
+        except Exception as e:
+            error_str = str(e)
+            if '429' in error_str or 'RESOURCE_EXHAUSTED' in error_str or 'quota' in error_str.lower():
+                raise
+            print(f"      ⚠️  Batch condensation failed, condensing one at a time: {e}")
+            return {}
+
+        condensed = {}
+        for entry in entries if isinstance(entries, list) else []:
+            if not isinstance(entry, dict):
+                continue
+            bullet_id, text = entry.get('id'), entry.get('text')
+            if isinstance(bullet_id, int) and 1 <= bullet_id <= len(jobs) and isinstance(text, str) and text.strip():
+                condensed[bullet_id - 1] = clean_gemini_response(text)
+        missing = len(jobs) - len(condensed)
+        print(f"   📦 Condensed {len(condensed)}/{len(jobs)} bullet(s) in one request"
+              + (f", {missing} left for single requests" if missing else ""))
+        return condensed
+
 
 # ============================================================
 # MAIN ORCHESTRATOR
@@ -2022,8 +2204,9 @@ def run_systematic_tailoring(
         {
             'phase1_results': {...},
             'phase2_results': {...} or None,
-            'overflow_recovery': {...} or None,
-            'all_replacements': [...]
+            'all_replacements': [...],
+            'timings': {'phase1': seconds, 'phase2': seconds or None,
+                        'phase2_sections': {section name: seconds}}
         }
     """
     # Initialize Gemini
@@ -2034,8 +2217,10 @@ def run_systematic_tailoring(
     # PHASE 1: KEYWORD VALIDATION
     # ============================================================
 
+    phase1_started = time.perf_counter()
     validator = KeywordValidatorComplete(profile_responses)
     phase1_results = validator.execute_phase_1(job_keywords, resume_text)
+    timings = {'phase1': round(time.perf_counter() - phase1_started, 3), 'phase2': None, 'phase2_sections': {}}
 
     if not phase1_results['should_proceed']:
         print("\n⚠️  Low keyword match detected. Proceeding with limited tailoring...")
@@ -2054,6 +2239,7 @@ def run_systematic_tailoring(
             print("   Focus: Profile → Skills → Projects only")
         else:
             print("\n📊 Running Phase 2: Space Borrowing (condensing donors, expanding receivers)")
+        phase2_started = time.perf_counter()
         editor = SystematicEditorComplete(client)
         phase2_results = editor.execute_phase_2(
             line_metadata,
@@ -2065,6 +2251,9 @@ def run_systematic_tailoring(
             enable_project_swaps=enable_project_swaps,
         )
         all_replacements = phase2_results['replacements']
+        timings['phase2'] = round(time.perf_counter() - phase2_started, 3)
+        timings['phase2_sections'] = phase2_results.get('section_timings', {})
+        print(f"\n⏱️  Phase 1: {timings['phase1']:.1f}s, Phase 2: {timings['phase2']:.1f}s")
     else:
         print("\n⏭️  Skipping Phase 2: No page overflow detected")
         all_replacements = []
@@ -2072,7 +2261,8 @@ def run_systematic_tailoring(
     return {
         'phase1_results': phase1_results,
         'phase2_results': phase2_results,
-        'all_replacements': all_replacements
+        'all_replacements': all_replacements,
+        'timings': timings,
     }
 
 
@@ -2090,13 +2280,14 @@ def recover_from_overflow_if_needed(
     Args:
         total_lines_added: The actual number of lines added during tailoring
 
-    Returns recovery results with replacement list.
+    Returns recovery results with replacement list and 'duration_seconds'.
     """
+    started = time.perf_counter()
     api_key = os.getenv('GOOGLE_API_KEY') or os.getenv('GEMINI_API_KEY')
     client = genai.Client(api_key=api_key)
 
     recovery = OverflowRecoveryComplete(client)
-    return recovery.recover_from_overflow(
+    results = recovery.recover_from_overflow(
         line_metadata,
         keywords,
         current_pages,
@@ -2104,3 +2295,5 @@ def recover_from_overflow_if_needed(
         total_lines_added,
         attempt
     )
+    results['duration_seconds'] = round(time.perf_counter() - started, 3)
+    return results
@@ -6,9 +6,13 @@ Prevents fabrication of achievements, skills, or experience.
 """
 
 import re
+import json
 import logging
 from typing import Dict, List, Optional
 from gemini_compat import genai
+from gemini_batching import chunk_by_tokens, parse_json_items, run_chunks
+
+CATEGORIES = ('SUPPORTED', 'INFERRED', 'UNSUPPORTED', 'EXAGGERATED')
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -95,13 +99,8 @@ SUMMARY: [brief explanation]"""
             response = self.model.generate_content(prompt)
             analysis = response.text.strip()
 
-            # Parse response
-            unsupported_claims = []
-            exaggerated_claims = []
-            supported_claims = []
-            inferred_claims = []
-
             # Extract claims
+            claims = []
             claim_blocks = re.split(r'\n\n+', analysis)
             for block in claim_blocks:
                 # Look for CLAIM pattern
@@ -114,19 +113,7 @@ SUMMARY: [brief explanation]"""
                     category = category_match.group(1)
                     reasoning = reasoning_match.group(1).strip() if reasoning_match else "No reasoning provided"
 
-                    claim_info = {
-                        'claim': claim_text,
-                        'reasoning': reasoning
-                    }
-
-                    if category == 'UNSUPPORTED':
-                        unsupported_claims.append(claim_info)
-                    elif category == 'EXAGGERATED':
-                        exaggerated_claims.append(claim_info)
-                    elif category == 'INFERRED':
-                        inferred_claims.append(claim_info)
-                    elif category == 'SUPPORTED':
-                        supported_claims.append(claim_info)
+                    claims.append((category, claim_text, reasoning))
 
             # Extract overall assessment
             assessment_match = re.search(r'OVERALL_ASSESSMENT:\s*(SAFE|NEEDS_REVIEW|DANGEROUS)', analysis)
@@ -141,28 +128,7 @@ SUMMARY: [brief explanation]"""
             summary_match = re.search(r'SUMMARY:\s*(.+?)(?=\n\n|$)', analysis, re.DOTALL)
             summary = summary_match.group(1).strip() if summary_match else "Analysis complete"
 
-            # Calculate risk score
-            total_claims = len(supported_claims) + len(inferred_claims) + len(unsupported_claims) + len(exaggerated_claims)
-            if total_claims > 0:
-                risk_score = (len(unsupported_claims) * 1.0 + len(exaggerated_claims) * 0.5) / total_claims
-            else:
-                risk_score = 0.0
-
-            has_hallucinations = len(unsupported_claims) > 0 or len(exaggerated_claims) > 1
-
-            return {
-                'has_hallucinations': has_hallucinations,
-                'unsupported_claims': unsupported_claims,
-                'exaggerated_claims': exaggerated_claims,
-                'inferred_claims': inferred_claims,
-                'supported_claims': supported_claims,
-                'confidence_score': confidence,
-                'risk_score': risk_score,
-                'assessment': assessment,
-                'recommendation': recommendation,
-                'summary': summary,
-                'full_analysis': analysis
-            }
+            return self._build_result(claims, assessment, confidence, recommendation, summary, analysis)
 
         except Exception as e:
             self.logger.error(f"Hallucination detection failed: {e}")
@@ -181,6 +147,59 @@ SUMMARY: [brief explanation]"""
                 'full_analysis': ''
             }
 
+    def _build_result(
+        self,
+        claims: List[tuple],
+        assessment: str,
+        confidence: float,
+        recommendation: str,
+        summary: str,
+        analysis: str
+    ) -> Dict[str, any]:
+        """Detection result from (category, claim, reasoning) tuples and the overall verdict."""
+        unsupported_claims = []
+        exaggerated_claims = []
+        supported_claims = []
+        inferred_claims = []
+
+        for category, claim_text, reasoning in claims:
+            claim_info = {
+                'claim': claim_text,
+                'reasoning': reasoning
+            }
+
+            if category == 'UNSUPPORTED':
+                unsupported_claims.append(claim_info)
+            elif category == 'EXAGGERATED':
+                exaggerated_claims.append(claim_info)
+            elif category == 'INFERRED':
+                inferred_claims.append(claim_info)
+            elif category == 'SUPPORTED':
+                supported_claims.append(claim_info)
+
+        # Calculate risk score
+        total_claims = len(supported_claims) + len(inferred_claims) + len(unsupported_claims) + len(exaggerated_claims)
+        if total_claims > 0:
+            risk_score = (len(unsupported_claims) * 1.0 + len(exaggerated_claims) * 0.5) / total_claims
+        else:
+            risk_score = 0.0
+
+        has_hallucinations = len(unsupported_claims) > 0 or len(exaggerated_claims) > 1
+
+        return {
+            'has_hallucinations': has_hallucinations,
+            'unsupported_claims': unsupported_claims,
+            'exaggerated_claims': exaggerated_claims,
+            'inferred_claims': inferred_claims,
+            'supported_claims': supported_claims,
+            'confidence_score': confidence,
+            'risk_score': risk_score,
+            'assessment': assessment,
+            'recommendation': recommendation,
+            'summary': summary,
+            'full_analysis': analysis
+        }
+
     def validate_bullet_against_experience(
         self,
         bullet_text: str,
@@ -211,14 +230,24 @@ SUMMARY: [brief explanation]"""
     def batch_validate_bullets(
         self,
         bullets: List[str],
-        profile_context_data: str
+        profile_context_data: str,
+        max_bullets_per_request: int = 10,
+        max_workers: Optional[int] = None
     ) -> Dict[str, any]:
         """
         Validate multiple bullets in a single batch.
 
+        Bullets are packed into as few JSON-output requests as the prompt
+        token budget allows (see gemini_batching), sharing one copy of the
+        profile data per request; requests run concurrently when there is
+        more than one. Bullets missing from a reply are validated with a
+        single validate_bullet_against_experience call.
+
         Args:
             bullets: List of bullet texts to validate
             profile_context_data: User's experience data
+            max_bullets_per_request: Cap on bullets packed into one request
+            max_workers: Concurrent requests (default LAUNCHWAY_GEMINI_BATCH_WORKERS)
 
         Returns:
             Dict with:
@@ -226,14 +255,25 @@ SUMMARY: [brief explanation]"""
                 - overall_safe: Boolean indicating if all bullets pass
                 - flagged_bullets: List of bullet indices that need review
         """
+        chunks = chunk_by_tokens(bullets, max_items=max_bullets_per_request) if bullets else []
+
+        def validate_chunk(chunk: List[int]) -> Dict[int, Dict[str, any]]:
+            return self._validate_chunk([(index, bullets[index]) for index in chunk], profile_context_data)
+
+        validated: Dict[int, Dict[str, any]] = {}
+        for chunk_result in run_chunks(validate_chunk, chunks, max_workers=max_workers):
+            validated.update(chunk_result or {})
+
         results = []
         flagged_indices = []
 
         for i, bullet in enumerate(bullets):
-            result = self.validate_bullet_against_experience(
-                bullet_text=bullet,
-                profile_context_data=profile_context_data
-            )
+            result = validated.get(i)
+            if result is None:
+                result = self.validate_bullet_against_experience(
+                    bullet_text=bullet,
+                    profile_context_data=profile_context_data
+                )
             results.append(result)
 
             if result['recommendation'] in ['REVIEW', 'REJECT']:
@@ -241,6 +281,12 @@ SUMMARY: [brief explanation]"""
 
         overall_safe = len(flagged_indices) == 0
 
+        if bullets:
+            self.logger.info(
+                f"Batched hallucination check: {len(bullets)} bullets, {len(chunks)} batch request(s), "
+                f"{len(bullets) - len(validated)} single fallback(s)"
+            )
+
         return {
             'results': results,
             'overall_safe': overall_safe,
@@ -249,6 +295,79 @@ SUMMARY: [brief explanation]"""
             'total_exaggerated_claims': sum(len(r['exaggerated_claims']) for r in results)
         }
 
+    def _validate_chunk(self, items: List[tuple], profile_context_data: str) -> Dict[int, Dict[str, any]]:
+        """One request for several bullets; {bullet index: result} for the entries that parse."""
+        bullets_text = "\n".join(f"{local_id}. {bullet}" for local_id, (_, bullet) in enumerate(items, 1))
+
+        prompt = f"""Analyze each generated resume bullet for factual accuracy against the source data.
+
+SOURCE DATA (ground truth):
+{profile_context_data}
+
+GENERATED BULLETS (to validate, by id):
+{bullets_text}
+
+TASK: For EACH bullet, identify every factual claim and categorize each as:
+1. SUPPORTED: Clearly stated or implied in source data
+2. INFERRED: Reasonable inference from source data (low risk)
+3. UNSUPPORTED: Not backed by any evidence (hallucination - high risk)
+4. EXAGGERATED: Based on truth but overstated (medium risk)
+
+CRITICAL: Numbers, percentages, achievement metrics, specific technologies, company names, dates, and role titles must be EXACTLY from source data. Any deviation is a hallucination.
+
+Judge every bullet on its own; a claim in one bullet is not evidence for another.
+
+Return ONLY valid JSON in this shape, one entry per bullet id:
+{{"bullets": [{{
+  "id": 1,
+  "claims": [{{"claim": "exact claim text", "category": "SUPPORTED|INFERRED|UNSUPPORTED|EXAGGERATED", "reasoning": "why"}}],
+  "overall_assessment": "SAFE|NEEDS_REVIEW|DANGEROUS",
+  "confidence": 0-100,
+  "recommendation": "ACCEPT|REVIEW|REJECT",
+  "summary": "brief explanation"
+}}]}}"""
+
+        response = self.model.generate_content(
+            prompt,
+            generation_config=genai.GenerationConfig(response_mime_type="application/json")
+        )
+        entries = parse_json_items(response.text, "bullets")
+
+        validated = {}
+        for local_id, (index, _) in enumerate(items, 1):
+            entry = entries.get(local_id)
+            if entry is None or not isinstance(entry.get('claims'), list):
+                continue
+            if entry.get('recommendation') not in ('ACCEPT', 'REVIEW', 'REJECT'):
+                continue
+
+            claims = []
+            for claim in entry['claims']:
+                if isinstance(claim, dict) and claim.get('category') in CATEGORIES:
+                    claims.append((
+                        claim['category'],
+                        str(claim.get('claim', '')).strip(),
+                        str(claim.get('reasoning') or 'No reasoning provided').strip()
+                    ))
+
+            assessment = entry.get('overall_assessment')
+            if assessment not in ('SAFE', 'NEEDS_REVIEW', 'DANGEROUS'):
+                assessment = 'NEEDS_REVIEW'
+            try:
+                confidence = int(entry.get('confidence')) / 100
+            except (TypeError, ValueError):
+                confidence = 0.5
+
+            validated[index] = self._build_result(
+                claims,
+                assessment,
+                confidence,
+                entry['recommendation'],
+                str(entry.get('summary') or 'Analysis complete'),
+                json.dumps(entry)
+            )
+        return validated
+
     def validate_project_description(
         self,
         project_title: str,
@@ -7,7 +7,7 @@ import re
 import os
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 
 class AutomatedMetricsExtractor:
@@ -84,6 +84,7 @@ class AutomatedMetricsExtractor:
         metrics["Failure Point"] = self._extract_failure_point()
         metrics["State Saved for User?"] = self._extract_state_saved()
         metrics["Total Time Taken (seconds)"] = self._extract_total_time()
+        metrics["Settle Wait Time (seconds)"], metrics["Settle Wait Saved (seconds)"] = self._extract_settle_waits()
 
         # Quality Metrics
         metrics["Accuracy Score (1-10)"] = 0  # Will be filled in manual review
@@ -477,6 +478,17 @@ class AutomatedMetricsExtractor:
 
         return 0
 
+    def _extract_settle_waits(self) -> Tuple[Any, Any]:
+        """Extract (time spent in settle waits, time saved vs. fixed waits) from the per-application summary; blank without one"""
+        matches = re.findall(
+            r"Settle waits: ([\d.]+)s over \d+ waits \(fixed waits: [\d.]+s, saved: (-?[\d.]+)s",
+            self.log_content,
+        )
+        if not matches:
+            return "", ""
+        waited, saved = matches[-1]
+        return float(waited), float(saved)
+
     def _extract_fields_ratio(self) -> str:
         """Extract filled/total fields ratio"""
         total_fields = self._extract_total_fields()
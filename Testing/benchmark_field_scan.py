@@ -0,0 +1,124 @@
+"""
+Benchmark FieldInteractorV2.get_all_form_fields: DOM snapshot scan vs per-element probing.
+
+Loads each saved HTML fixture from Testing/fixtures/forms into a local headless
+Chromium, runs both scan modes, and reports Playwright protocol round trips,
+wall time and whether both modes produced the same fields.
+
+Usage:
+    python Testing/benchmark_field_scan.py [--runs 5] [--latency-ms 0] [fixture.html ...]
+
+--latency-ms adds an artificial delay to every protocol call to approximate a
+remote browser (each round trip then costs at least that much).
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Agent components import each other as top-level "components.*" packages
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from playwright.async_api import async_playwright
+from playwright._impl._connection import Channel
+
+from components.executors.field_interactor_v2 import FieldInteractorV2
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "forms"
+
+
+class RoundTripCounter:
+    """Counts (and optionally delays) every request sent over the Playwright connection."""
+
+    def __init__(self, latency_ms: float = 0.0):
+        self.count = 0
+        self.latency_s = latency_ms / 1000.0
+        self._original = Channel._inner_send
+
+    def install(self):
+        counter = self
+        original = self._original
+
+        async def _counting_inner_send(channel, *args, **kwargs):
+            counter.count += 1
+            if counter.latency_s:
+                await asyncio.sleep(counter.latency_s)
+            return await original(channel, *args, **kwargs)
+
+        Channel._inner_send = _counting_inner_send
+
+    def uninstall(self):
+        Channel._inner_send = self._original
+
+
+def _field_signature(fields):
+    return [(f['field_category'], f['label'], f['stable_id']) for f in fields]
+
+
+async def _measure(interactor, counter, use_snapshot: bool, runs: int):
+    times, trips, fields = [], [], []
+    for _ in range(runs):
+        before = counter.count
+        started = time.perf_counter()
+        fields = await interactor.get_all_form_fields(extract_options=True, use_snapshot=use_snapshot)
+        times.append((time.perf_counter() - started) * 1000)
+        trips.append(counter.count - before)
+    return {
+        'round_trips': statistics.median(trips),
+        'wall_ms': statistics.median(times),
+        'fields': fields,
+    }
+
+
+async def run_benchmark(fixtures, runs: int, latency_ms: float):
+    counter = RoundTripCounter(latency_ms)
+    rows = []
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        page = await browser.new_page()
+        counter.install()
+        try:
+            for fixture in fixtures:
+                await page.set_content(Path(fixture).read_text(encoding='utf-8'))
+                interactor = FieldInteractorV2(page)
+                probe = await _measure(interactor, counter, use_snapshot=False, runs=runs)
+                snap = await _measure(interactor, counter, use_snapshot=True, runs=runs)
+                rows.append({
+                    'fixture': Path(fixture).name,
+                    'fields': len(snap['fields']),
+                    'probe': probe,
+                    'snapshot': snap,
+                    'fallback_probes': interactor.last_scan_stats.get('fallback_probes', 0),
+                    'identical': _field_signature(probe['fields']) == _field_signature(snap['fields']),
+                })
+        finally:
+            counter.uninstall()
+            await browser.close()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('fixtures', nargs='*', help='HTML fixtures (default: all in Testing/fixtures/forms)')
+    parser.add_argument('--runs', type=int, default=5, help='Scans per mode per fixture (median reported)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Simulated per-round-trip latency')
+    args = parser.parse_args()
+
+    fixtures = args.fixtures or sorted(str(f) for f in FIXTURES_DIR.glob('*.html'))
+    rows = asyncio.run(run_benchmark(fixtures, args.runs, args.latency_ms))
+
+    print(f"\n{'fixture':<32} {'fields':>6} {'probe rt':>9} {'snap rt':>8} "
+          f"{'probe ms':>9} {'snap ms':>8} {'fallback':>8}  same")
+    print('-' * 92)
+    for r in rows:
+        print(f"{r['fixture']:<32} {r['fields']:>6} {r['probe']['round_trips']:>9.0f} "
+              f"{r['snapshot']['round_trips']:>8.0f} {r['probe']['wall_ms']:>9.1f} "
+              f"{r['snapshot']['wall_ms']:>8.1f} {r['fallback_probes']:>8}  "
+              f"{'yes' if r['identical'] else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
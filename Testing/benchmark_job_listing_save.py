@@ -0,0 +1,134 @@
+"""
+Benchmark JobSearchService.save_job_listings: per-job SELECT + ORM writes vs
+the bulk path (chunked IN lookup + bulk INSERT/UPDATE).
+
+Each run saves --jobs synthetic listings into an empty table (all inserts),
+then saves them again with half of them new (half updates), and reports wall
+time and statement count for both paths.
+
+Uses a temporary SQLite file by default; pass --database-url to run against a
+local Postgres (rows are tagged with a run id and deleted afterwards - never
+point it at production).
+
+Usage:
+    python Testing/benchmark_job_listing_save.py [--jobs 300] [--database-url postgresql://...]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+os.environ.setdefault("DB_PASSWORD", "unused-by-benchmark")
+
+import job_search_service
+from database_config import JobListing
+from job_search_service import JobSearchService
+
+
+def legacy_save(jobs_data, search_source="rapidapi"):
+    """The previous implementation: one SELECT per job, ORM objects one by one."""
+    db = job_search_service.SessionLocal()
+    try:
+        saved_count = updated_count = 0
+        for job_data in jobs_data:
+            external_id = JobSearchService._external_id(job_data, search_source)
+            existing_job = db.query(JobListing).filter(JobListing.external_id == external_id).first()
+            if existing_job:
+                JobSearchService._update_job_listing(existing_job, job_data, search_source)
+                updated_count += 1
+            else:
+                db.add(JobSearchService._create_job_listing(job_data, external_id, search_source))
+                saved_count += 1
+        db.commit()
+        return {"saved_count": saved_count, "updated_count": updated_count}
+    finally:
+        db.close()
+
+
+def bulk_save(jobs_data):
+    return JobSearchService.save_job_listings(0, jobs_data)
+
+
+def make_jobs(run_id, start, count):
+    return [
+        {
+            "title": f"Software Engineer {n}",
+            "company": f"Company {n % 97}",
+            "location": "Remote",
+            "salary": "$150k",
+            "description": "Build things. " * 40,
+            "job_url": f"https://bench.example.com/{run_id}/{n}",
+            "posted_date": "2026-10-01",
+        }
+        for n in range(start, start + count)
+    ]
+
+
+def make_engine(database_url):
+    if database_url:
+        return create_engine(database_url), None
+    tmp = tempfile.TemporaryDirectory()
+    engine = create_engine(f"sqlite:///{tmp.name}/main.db")
+
+    @event.listens_for(engine, "connect")
+    def attach_public(dbapi_connection, _):
+        dbapi_connection.execute(f"ATTACH DATABASE '{tmp.name}/public.db' AS public")
+
+    return engine, tmp
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=300)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    engine, tmp = make_engine(args.database_url)
+    JobListing.__table__.create(engine, checkfirst=True)
+    job_search_service.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+    print(f"backend: {engine.dialect.name}, {args.jobs} jobs per save")
+    print(f"{'path':<8} {'phase':<18} {'saved':>6} {'updated':>8} {'statements':>11} {'ms':>9}")
+    run_ids = []
+    for name, save in (("legacy", legacy_save), ("bulk", bulk_save)):
+        run_id = f"{name}-{uuid.uuid4().hex[:8]}"
+        run_ids.append(run_id)
+        phases = (
+            ("insert", make_jobs(run_id, 0, args.jobs)),
+            ("half update", make_jobs(run_id, args.jobs // 2, args.jobs)),
+        )
+        for phase, jobs in phases:
+            statements.clear()
+            started = time.perf_counter()
+            result = save(jobs)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"{name:<8} {phase:<18} {result['saved_count']:>6} {result['updated_count']:>8} "
+                  f"{len(statements):>11} {elapsed_ms:>9.1f}")
+
+    db = job_search_service.SessionLocal()
+    try:
+        for run_id in run_ids:
+            db.query(JobListing).filter(
+                JobListing.job_url.like(f"https://bench.example.com/{run_id}/%")
+            ).delete(synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+    if tmp:
+        engine.dispose()
+        tmp.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Measure JobQueue Redis usage against a local Redis.
+
+Two measurements:
+  - round trips per API call (submit_job, get_job_status, get_user_jobs,
+    get_queue_stats) for a user with --user-jobs jobs, counted at the
+    connection level (a pipeline or MULTI/EXEC is one round trip)
+  - Redis commands per dispatched job and for an idle worker, from both the
+    queue's own dispatch stats and the server's INFO commandstats
+
+Uses the job queue database (REDIS_HOST/REDIS_PORT, db 1) - point it at a
+local development Redis, never at production.
+
+Usage:
+    python Testing/benchmark_job_queue.py [--jobs 200] [--idle-seconds 10] [--user-jobs 50]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+
+from redis.connection import AbstractConnection
+
+from job_queue import JobQueue, JobPriority, redis_client
+
+
+class RoundTripCounter:
+    """Counts packets written to Redis connections (one per command or pipeline)."""
+
+    def __init__(self):
+        self.count = 0
+        self._original = AbstractConnection.send_packed_command
+
+    def __enter__(self):
+        counter = self
+
+        def send_packed_command(conn, command, check_health=True):
+            counter.count += 1
+            return counter._original(conn, command, check_health)
+
+        AbstractConnection.send_packed_command = send_packed_command
+        return self
+
+    def __exit__(self, *exc):
+        AbstractConnection.send_packed_command = self._original
+
+
+def server_command_count() -> int:
+    return sum(stat["calls"] for stat in redis_client.info("commandstats").values())
+
+
+def wait_for(predicate, timeout: float) -> bool:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def measure_round_trips(queue: JobQueue, user_jobs: int):
+    """Round trips and latency per API call for one user with `user_jobs` queued jobs."""
+    user_id = "bench-api-user"
+    job_ids = [queue.submit_job(user_id, "noop", {"n": n}) for n in range(user_jobs - 1)]
+
+    calls = {
+        "submit_job": lambda: job_ids.append(queue.submit_job(user_id, "noop", {"n": "last"})),
+        "get_job_status": lambda: queue.get_job_status(job_ids[0]),
+        "get_user_jobs": lambda: queue.get_user_jobs(user_id),
+        "get_queue_stats": queue.get_queue_stats,
+    }
+    print(f"round trips per call ({user_jobs} jobs for one user):")
+    for name, call in calls.items():
+        with RoundTripCounter() as counter:
+            started = time.perf_counter()
+            call()
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"  {name:<18} {counter.count:4d} round trips  {elapsed_ms:7.2f} ms")
+
+    # Clean up so the worker doesn't pick these jobs up
+    pipe = redis_client.pipeline(transaction=False)
+    for job_id in job_ids:
+        pipe.zrem(queue.queue_key, job_id)
+        pipe.delete(f"job_data:{job_id}")
+    pipe.delete(f"{queue.user_jobs_key}:{user_id}")
+    pipe.execute()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--idle-seconds", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=5)
+    parser.add_argument("--user-jobs", type=int, default=50)
+    args = parser.parse_args()
+
+    queue = JobQueue(max_workers=args.workers, max_concurrent_per_user=max(args.jobs, args.user_jobs))
+    measure_round_trips(queue, args.user_jobs)
+    print()
+
+    done = []
+    queue.register_handler("noop", lambda payload: done.append(payload["n"]) or {"ok": True})
+    queue.start_worker()
+    time.sleep(0.5)
+
+    # Idle cost
+    before = server_command_count()
+    time.sleep(args.idle_seconds)
+    idle_ops = server_command_count() - before - 1  # minus our own INFO
+
+    # Dispatch cost
+    stats_before = queue.get_dispatch_stats()
+    before = server_command_count()
+    started = time.perf_counter()
+    for n in range(args.jobs):
+        queue.submit_job(f"bench-{n % 10}", "noop", {"n": n}, priority=JobPriority.NORMAL)
+    submit_ops = server_command_count() - before - 1
+    wait_for(lambda: len(done) >= args.jobs, 120)
+    elapsed = time.perf_counter() - started
+    time.sleep(0.5)  # let the last results be stored
+    total_ops = server_command_count() - before - 2
+    stats = queue.get_dispatch_stats()
+    queue.stop_worker()
+
+    dispatched = stats["dispatched"] - stats_before["dispatched"]
+    worker_ops = stats["redis_ops"] - stats_before["redis_ops"]
+    print(f"jobs dispatched:          {dispatched}/{args.jobs} in {elapsed:.2f}s")
+    print(f"idle worker:              {idle_ops} commands in {args.idle_seconds:.0f}s")
+    print(f"worker ops/job (queue):   {worker_ops / max(dispatched, 1):.2f}")
+    print(f"server ops/job (total):   {total_ops / max(dispatched, 1):.2f}  "
+          f"(of which submit: {submit_ops / max(args.jobs, 1):.2f})")
+
+
+if __name__ == "__main__":
+    main()
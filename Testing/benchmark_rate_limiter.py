@@ -0,0 +1,114 @@
+"""
+Benchmark ProductionRateLimiter checks per second against a local Redis.
+
+Compares, for a per-user daily limit plus the bonus lookup the routes do:
+  - legacy: user row loaded from the database for the admin check and again
+    for the bonus, full Lua script sent with EVAL, one sorted-set member per
+    request
+  - fast:   cached admin flag/bonus profile, EVALSHA, one counter per day
+
+Users live in a temporary SQLite database (the same user table layout) so the
+legacy path pays a realistic but local lookup; against Postgres it is slower.
+
+Uses the rate limiter's Redis (REDIS_URL or REDIS_HOST/REDIS_PORT, db 0) -
+point it at a local development Redis, never at production.  Keys are tagged
+with fresh user IDs and deleted afterwards.
+
+Usage:
+    python Testing/benchmark_rate_limiter.py [--checks 2000] [--users 20]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+os.environ.setdefault("DB_PASSWORD", "unused-by-benchmark")
+
+import database_config
+import rate_limiter as rate_limiter_module
+from database_config import User
+from rate_limiter import SLIDING_WINDOW_SCRIPT, ProductionRateLimiter, UserLimitCache, redis_client
+
+LIMIT_TYPE = "job_applications_per_user_per_day"
+
+
+def make_session_factory(tmp_dir, user_ids):
+    engine = create_engine(f"sqlite:///{tmp_dir}/main.db")
+
+    @event.listens_for(engine, "connect")
+    def attach_public(dbapi_connection, _):
+        dbapi_connection.execute(f"ATTACH DATABASE '{tmp_dir}/public.db' AS public")
+
+    User.__table__.create(engine)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    db = SessionLocal()
+    for user_id in user_ids:
+        db.add(User(id=user_id, email=f"{user_id}@bench.example.com", password_hash="x",
+                    first_name="Bench", last_name="User", bonus_job_applications_max=2))
+    db.commit()
+    db.close()
+    return engine, SessionLocal
+
+
+def legacy_check(limiter, identifier):
+    """The previous request path (admin lookup, bonus lookup, EVAL + sorted set)."""
+    limiter._load_user_profile(identifier)
+    _, limit_requests = limiter.get_user_limit(identifier, LIMIT_TYPE)
+    now = int(time.time())
+    window_start, _ = limiter._daily_window()
+    return redis_client.eval(
+        SLIDING_WINDOW_SCRIPT, 1, limiter._get_key(LIMIT_TYPE, identifier),
+        now, window_start, limit_requests, 86400 * 2, f"{now}:{uuid.uuid4().hex}",
+    )
+
+
+def fast_check(limiter, identifier):
+    _, limit_requests = limiter.get_user_limit(identifier, LIMIT_TYPE)
+    return limiter.check_limit(LIMIT_TYPE, identifier, custom_limit=limit_requests)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--checks", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=20)
+    args = parser.parse_args()
+
+    redis_client.ping()
+    user_ids = [uuid.uuid4() for _ in range(args.users)]
+    identifiers = [str(u) for u in user_ids]
+    # Large enough that every check is allowed and does the full write path
+    ProductionRateLimiter.LIMITS[LIMIT_TYPE].requests = args.checks * 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine, database_config.SessionLocal = make_session_factory(tmp, user_ids)
+        limiter = rate_limiter_module.ProductionRateLimiter()
+        try:
+            print(f"{args.checks} checks over {args.users} users")
+            print(f"{'path':<8} {'checks/s':>10} {'us/check':>10}")
+            for name, check, ttl in (("legacy", legacy_check, 0), ("fast", fast_check, 300)):
+                limiter.user_cache = UserLimitCache(limiter._load_user_profile, ttl_seconds=ttl)
+                started = time.perf_counter()
+                for n in range(args.checks):
+                    check(limiter, identifiers[n % len(identifiers)])
+                elapsed = time.perf_counter() - started
+                print(f"{name:<8} {args.checks / elapsed:>10.0f} {elapsed / args.checks * 1e6:>10.0f}")
+        finally:
+            window_start, _ = limiter._daily_window()
+            for identifier in identifiers:
+                redis_client.delete(
+                    limiter._get_key(LIMIT_TYPE, identifier),
+                    limiter._get_window_key(LIMIT_TYPE, identifier, window_start),
+                )
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark JobRelevanceScorer: per-job calculate_score vs batch calculate_scores.
+
+Generates synthetic job listings (default 10,000), scores them both ways,
+checks the scores are identical, and reports wall time.
+
+Usage:
+    python Testing/benchmark_relevance_scoring.py [--jobs 10000] [--seed 7]
+"""
+import argparse
+import copy
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from job_relevance_scorer import JobRelevanceScorer
+
+
+PROFILE = {
+    "summary": "Backend engineer building data pipelines and ML platforms in Python and Go.",
+    "skills": {
+        "technical": ["machine learning", "distributed systems", "data engineering"],
+        "programming_languages": ["python", "go", "sql"],
+        "frameworks": ["django", "pytorch", "spark"],
+        "tools": ["docker", "kubernetes", "airflow"],
+    },
+    "work_experience": [
+        {"title": "Software Engineer", "description": "Built streaming ETL with Kafka and Spark."},
+        {"title": "Data Engineer", "description": "Owned Airflow DAGs and warehouse modelling."},
+    ],
+    "resume_keywords": {
+        "skills": ["python", "kafka", "spark", "terraform", "aws"],
+        "job_titles": ["Backend Engineer", "Machine Learning Engineer", "Data Engineer"],
+        "experience_level": "mid",
+    },
+    "preferred location": ["San Francisco, CA", "Remote"],
+    "desired_job_types": ["full-time"],
+    "minimum_salary": 120000,
+}
+
+TITLE_WORDS = ["Senior", "Staff", "Junior", "Backend", "Frontend", "Data", "Machine Learning",
+               "Platform", "Software", "Product", "Marketing", "Sales", "Site Reliability"]
+ROLES = ["Engineer", "Scientist", "Manager", "Analyst", "Designer", "Developer"]
+DESC_WORDS = ("python go java kafka spark airflow kubernetes docker terraform aws gcp azure sql "
+              "react typescript marketing sales finance design figma leadership strategy pipelines "
+              "distributed systems latency throughput customers stakeholders roadmap data cloud").split()
+LOCATIONS = ["San Francisco, CA", "New York, NY", "Remote", "Austin, TX", "Seattle, WA", "London, UK", ""]
+LEVELS = ["entry", "mid", "senior", "lead", "executive", "internship", ""]
+JOB_TYPES = ["full-time", "part-time", "contract", "internship", ""]
+
+
+def synthetic_jobs(count: int, seed: int):
+    rng = random.Random(seed)
+    today = datetime.utcnow()
+    jobs = []
+    for i in range(count):
+        salary_min = rng.choice([None, 90000, 110000, 130000, 150000])
+        jobs.append({
+            "title": f"{rng.choice(TITLE_WORDS)} {rng.choice(ROLES)}",
+            "company": f"Company {i % 500}",
+            "description": " ".join(rng.choices(DESC_WORDS, k=rng.randint(20, 120))),
+            "requirements": " ".join(rng.choices(DESC_WORDS, k=rng.randint(0, 30))),
+            "location": rng.choice(LOCATIONS),
+            "is_remote": rng.random() < 0.3,
+            "experience_level": rng.choice(LEVELS),
+            "job_type": rng.choice(JOB_TYPES),
+            "salary_min": salary_min,
+            "salary_max": salary_min + 30000 if salary_min else None,
+            "salary_currency": "USD",
+            "posted_date": (today - timedelta(days=rng.randint(0, 60))).strftime("%Y-%m-%d"),
+        })
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    jobs = synthetic_jobs(args.jobs, args.seed)
+
+    scorer = JobRelevanceScorer(copy.deepcopy(PROFILE))
+    started = time.perf_counter()
+    per_job = [scorer.calculate_score(job) for job in jobs]
+    per_job_s = time.perf_counter() - started
+
+    scorer = JobRelevanceScorer(copy.deepcopy(PROFILE))
+    started = time.perf_counter()
+    batch = scorer.calculate_scores(jobs)
+    batch_s = time.perf_counter() - started
+
+    mismatches = sum(1 for a, b in zip(per_job, batch) if a != b)
+    print(f"jobs:        {len(jobs)}")
+    print(f"per-job:     {per_job_s * 1000:8.1f} ms")
+    print(f"batch:       {batch_s * 1000:8.1f} ms  ({per_job_s / batch_s if batch_s else 0:.1f}x)")
+    print(f"mismatches:  {mismatches}")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+import tempfile
+import time
+import unittest
+import sys
+from datetime import datetime
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from applied_jobs_membership import (
+    FULL_SYNC_SECONDS,
+    AppliedJobsMembership,
+    BloomFilter,
+    membership_delta,
+    membership_keys,
+    sync_applied_jobs,
+)
+
+
+def row(n, status="completed", minute=0, **overrides):
+    data = {
+        "job_url": f"https://boards.example.com/jobs/{n}",
+        "company": f"Company {n}",
+        "title": f"Engineer {n}",
+        "status": status,
+        "changed_at": datetime(2026, 10, 1, 12, minute),
+    }
+    data.update(overrides)
+    return tuple(data.values())
+
+
+class MembershipKeysTests(unittest.TestCase):
+    def test_url_and_company_title_keys(self):
+        keys = membership_keys("https://Boards.example.com/jobs/1/?utm_source=x", " Acme ", "Data  Engineer")
+        self.assertEqual(keys, membership_keys("https://boards.example.com/jobs/1", "acme", "data engineer"))
+        self.assertEqual(len(keys), 2)
+        # Placeholder company/title recorded by the CLI must not match every unknown job
+        self.assertEqual(len(membership_keys("", "Unknown Company", "Unknown Position")), 0)
+
+
+class BloomFilterTests(unittest.TestCase):
+    def test_no_false_negatives_and_low_false_positive_rate(self):
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for n in range(2000):
+            bloom.add(f"member-{n}")
+        self.assertTrue(all(f"member-{n}" in bloom for n in range(2000)))
+        false_positives = sum(f"other-{n}" in bloom for n in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class AppliedJobsMembershipTests(unittest.TestCase):
+    def test_full_then_delta(self):
+        membership = AppliedJobsMembership()
+        membership.apply_delta(membership_delta([row(1), row(2), row(3, status="failed")], full=True))
+        self.assertTrue(membership.contains(job_url="https://boards.example.com/jobs/1?utm_campaign=a"))
+        self.assertTrue(membership.contains(company="company 2", title="ENGINEER 2"))
+        self.assertFalse(membership.contains(job_url="https://boards.example.com/jobs/3"))
+        self.assertEqual(membership.version, "2026-10-01T12:00:00")
+
+        delta = membership_delta([row(2, status="failed", minute=5), row(3, minute=6)],
+                                 full=False, since=membership.version)
+        membership.apply_delta(delta)
+        self.assertFalse(membership.contains(job_url="https://boards.example.com/jobs/2"))
+        self.assertTrue(membership.contains(job_url="https://boards.example.com/jobs/3"))
+        self.assertEqual(membership.version, "2026-10-01T12:06:00")
+
+    def test_removal_keeps_keys_shared_with_remaining_applications(self):
+        shared = {"company": "Acme", "title": "Data Engineer"}
+        first = row(1, **shared)
+        second = row(2, **shared)
+        membership = AppliedJobsMembership()
+        membership.apply_delta(membership_delta([first, second], full=True))
+
+        # Application 1 fails; application 2 (unchanged, same company|title) is still applied
+        delta = membership_delta([row(1, status="failed", minute=5, **shared)], full=False,
+                                 since=membership.version, remaining=lambda: [second])
+        membership.apply_delta(delta)
+        self.assertFalse(membership.contains(job_url="https://boards.example.com/jobs/1"))
+        self.assertTrue(membership.contains(company="acme", title="data engineer"))
+        self.assertTrue(membership.contains(job_url="https://boards.example.com/jobs/2"))
+
+        # Once no applied application holds the key it goes
+        delta = membership_delta([row(2, status="failed", minute=6, **shared)], full=False,
+                                 since=membership.version, remaining=lambda: [])
+        membership.apply_delta(delta)
+        self.assertFalse(membership.contains(company="acme", title="data engineer"))
+
+    def test_remaining_is_only_queried_for_removals(self):
+        def remaining():
+            raise AssertionError("no removals, no lookup")
+
+        delta = membership_delta([row(1)], full=False, since="2026-10-01T12:00:00", remaining=remaining)
+        self.assertEqual(delta["removed"], [])
+
+    def test_empty_delta_keeps_version(self):
+        membership = AppliedJobsMembership()
+        membership.apply_delta(membership_delta([], full=False, since="2026-10-01T12:00:00"))
+        self.assertEqual(membership.version, "2026-10-01T12:00:00")
+
+    def test_grows_past_initial_bloom_capacity(self):
+        membership = AppliedJobsMembership()
+        membership.contains(job_url="https://x.example.com")  # builds the Bloom filter
+        membership.apply_delta(membership_delta([row(n) for n in range(3000)], full=True))
+        self.assertTrue(all(membership.contains(job_url=f"https://boards.example.com/jobs/{n}") for n in range(3000)))
+
+    def test_sync_uses_cache_and_only_asks_for_deltas(self):
+        requests = []
+
+        def fetch(since):
+            requests.append(since)
+            if since is None:
+                return membership_delta([row(1), row(2)], full=True)
+            return membership_delta([row(4, minute=9)], full=False, since=since)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "applied_jobs_user.json"
+            first = sync_applied_jobs(fetch, path)
+            second = sync_applied_jobs(fetch, path)
+            self.assertEqual(requests, [None, "2026-10-01T12:00:00"])
+            self.assertEqual(len(first), 4)
+            self.assertTrue(second.contains(job_url="https://boards.example.com/jobs/4"))
+            self.assertTrue(second.contains(job_url="https://boards.example.com/jobs/1"))
+
+            # Stale caches resync in full; failed syncs fall back to the cache
+            cached = AppliedJobsMembership.load(path)
+            cached.synced_at = time.time() - FULL_SYNC_SECONDS - 1
+            cached.save(path)
+            sync_applied_jobs(fetch, path)
+            self.assertIsNone(requests[-1])
+
+            def failing(since):
+                raise ConnectionError("offline")
+
+            offline = sync_applied_jobs(failing, path)
+            self.assertTrue(offline.contains(job_url="https://boards.example.com/jobs/2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
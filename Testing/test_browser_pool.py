@@ -0,0 +1,196 @@
+import asyncio
+import tempfile
+import time
+import unittest
+import sys
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from persistent_browser_manager import BrowserPool, PersistentBrowserManager
+
+
+def _chromium_installed() -> bool:
+    try:
+        from playwright.sync_api import sync_playwright
+        with sync_playwright() as playwright:
+            return Path(playwright.chromium.executable_path).exists()
+    except Exception:
+        return False
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+        self.closed = False
+        self.healthy = True
+
+    async def cookies(self):
+        if not self.healthy:
+            raise RuntimeError("Target closed")
+        return []
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeManager:
+    """Stands in for PersistentBrowserManager: 'launching' writes a DevTools port file."""
+
+    def __init__(self, base_dir: Path, launch_delay: float = 0.05):
+        self.base_dir = base_dir
+        self.launch_delay = launch_delay
+        self.launched = []
+
+    def get_profile_path(self, user_id):
+        path = self.base_dir / f"user_{user_id}"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    async def _launch_context(self, playwright, user_id, headless, proxy_config=None, extra_args=None, kill_stale=True):
+        await asyncio.sleep(self.launch_delay)
+        port = 9200 + len(self.launched)
+        (self.get_profile_path(user_id) / "DevToolsActivePort").write_text(f"{port}\n/devtools/browser/x")
+        context = FakeContext()
+        self.launched.append((user_id, context))
+        return context
+
+    async def _inject_anti_detection(self, context):
+        pass
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = [FakeContext()]
+
+    async def close(self):
+        pass
+
+
+class FakeChromium:
+    def __init__(self):
+        self.endpoints = []
+
+    async def connect_over_cdp(self, endpoint):
+        self.endpoints.append(endpoint)
+        return FakeBrowser()
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.chromium = FakeChromium()
+
+
+class FakePlaywrightPool(BrowserPool):
+    async def _get_playwright(self):
+        return None
+
+
+class BrowserPoolTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.manager = FakeManager(Path(self._tmp.name))
+
+    def tearDown(self):
+        self.pool.shutdown()
+        self._tmp.cleanup()
+
+    def _lease_and_return(self, user_id="u1"):
+        async def _run():
+            lease = await self.pool.acquire(user_id, playwright_instance=FakePlaywright())
+            await self.pool.release(lease)
+            return lease
+        return asyncio.run(_run())
+
+    def test_browser_stays_warm_across_event_loops(self):
+        self.pool = FakePlaywrightPool(manager=self.manager)
+
+        first = self._lease_and_return()
+        second = self._lease_and_return()
+
+        self.assertFalse(first.warm)
+        self.assertTrue(second.warm)
+        self.assertEqual(len(self.manager.launched), 1)
+        stats = self.pool.get_stats()
+        self.assertEqual((stats["leases"], stats["warm_hits"], stats["cold_starts"]), (2, 1, 1))
+        self.assertGreater(stats["startup_seconds_saved"], 0)
+        self.assertEqual(stats["active_leases"], 0)
+
+    def test_browser_is_recycled_after_max_uses(self):
+        self.pool = FakePlaywrightPool(manager=self.manager, max_uses=2)
+
+        for _ in range(3):
+            self._lease_and_return()
+
+        self.assertEqual(len(self.manager.launched), 2)
+        self.assertTrue(self.manager.launched[0][1].closed)
+        self.assertEqual(self.pool.get_stats()["recycles"], 1)
+
+    def test_unhealthy_browser_is_replaced(self):
+        self.pool = FakePlaywrightPool(manager=self.manager)
+        self._lease_and_return()
+        self.manager.launched[0][1].healthy = False
+
+        lease = self._lease_and_return()
+
+        self.assertFalse(lease.warm)
+        self.assertEqual(len(self.manager.launched), 2)
+        self.assertEqual(self.pool.get_stats()["health_failures"], 1)
+
+    def test_abandoned_lease_frees_the_browser(self):
+        self.pool = FakePlaywrightPool(manager=self.manager)
+
+        async def _lease():
+            return await self.pool.acquire("u1", playwright_instance=FakePlaywright())
+
+        lease = asyncio.run(_lease())
+        self.pool.abandon(lease)
+        deadline = time.monotonic() + 2
+        while self.pool.get_stats()["active_leases"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(self.pool.get_stats()["active_leases"], 0)
+        self.assertTrue(self._lease_and_return().warm)
+
+    def test_prewarm_launches_in_background(self):
+        self.pool = FakePlaywrightPool(manager=self.manager)
+        self.pool.prewarm("u2").result(2)
+
+        self.assertTrue(self._lease_and_return("u2").warm)
+
+
+@unittest.skipUnless(_chromium_installed(), "Playwright Chromium is not installed")
+class RealChromiumPoolTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.pool = BrowserPool(manager=PersistentBrowserManager(base_dir=self._tmp.name))
+
+    def tearDown(self):
+        self.pool.shutdown()
+        self._tmp.cleanup()
+
+    def test_lease_and_return_real_context(self):
+        async def _run():
+            lease = await self.pool.acquire("real-user", headless=True)
+            try:
+                page = await lease.context.new_page()
+                await page.goto("data:text/html,<p id='ok'>pooled</p>")
+                text = await page.text_content("#ok")
+                await page.close()
+            finally:
+                await self.pool.release(lease)
+            return lease, text
+
+        first, text = asyncio.run(_run())
+        second, _ = asyncio.run(_run())  # new event loop, same warm Chrome
+
+        self.assertEqual(text, "pooled")
+        self.assertFalse(first.warm)
+        self.assertTrue(second.warm)
+        stats = self.pool.get_stats()
+        self.assertEqual((stats["cold_starts"], stats["warm_hits"], stats["active_leases"]), (1, 1, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+from unittest import mock
+
+from sqlalchemy import text
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from components import db_engine_registry
+from components.executors.learned_patterns_mapper import LearnedPatternsMapper
+from components.pattern_recorder import PatternRecorder
+from components.user_override_profiler import UserOverrideProfiler
+from components.user_pattern_recorder import UserPatternRecorder
+
+
+class DbEngineRegistryTests(unittest.TestCase):
+    def setUp(self):
+        db_engine_registry.dispose_all()
+        self.addCleanup(db_engine_registry.dispose_all)
+
+    def test_components_share_one_pool_per_process(self):
+        with mock.patch.dict(os.environ, {"RUN_MODE": "development", "DB_PASSWORD": "p@ss"}):
+            components = [
+                PatternRecorder(), PatternRecorder(),
+                UserPatternRecorder(), UserPatternRecorder(),
+                UserOverrideProfiler(), UserOverrideProfiler(),
+                LearnedPatternsMapper(user_id="u1"), LearnedPatternsMapper(user_id="u2"),
+            ]
+        self.assertEqual(len({id(c.engine) for c in components}), 1)
+        self.assertEqual(len({id(c.SessionLocal) for c in components}), 1)
+        self.assertEqual(len(db_engine_registry.pool_stats()), 1)
+        dsn = next(iter(db_engine_registry.pool_stats()))
+        self.assertNotIn("p@ss", dsn)
+        self.assertNotIn("p%40ss", dsn)
+
+    def test_metrics_count_checkouts_connects_and_waits(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{tmp}/agent.db"
+            engine = db_engine_registry.get_engine(url)
+            self.assertIs(db_engine_registry.get_engine(url), engine)
+            capacity = db_engine_registry.POOL_SIZE + db_engine_registry.MAX_OVERFLOW
+
+            held = [engine.connect() for _ in range(capacity)]
+            waited = threading.Thread(target=lambda: engine.connect().close())
+            waited.start()
+            time.sleep(0.2)
+            held.pop().close()
+            waited.join(5)
+            for conn in held:
+                conn.close()
+            with db_engine_registry.get_sessionmaker(url)() as session:
+                session.execute(text("SELECT 1"))
+
+            stats = db_engine_registry.pool_stats()[url]
+            self.assertEqual(stats["checkouts"], capacity + 2)
+            self.assertEqual(stats["connects"], capacity)
+            self.assertEqual(stats["waits"], 1)
+            self.assertGreater(stats["wait_seconds"], 0.1)
+            self.assertEqual(stats["overflow_peak"], db_engine_registry.MAX_OVERFLOW)
+            self.assertEqual(stats["checked_out"], 0)
+            db_engine_registry.dispose_all()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import json
+import tempfile
+import threading
+import unittest
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from components.executors.dom_pattern_recorder import DomPatternRecorder
+
+
+class DomPatternRecorderTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = Path(self.tmp.name) / "dom_patterns.sqlite3"
+
+    def test_get_requires_a_success(self):
+        recorder = DomPatternRecorder(self.path)
+        recorder.record("https://www.greenhouse.io/acme", "First Name*", "label_for", "text", success=False)
+        self.assertIsNone(recorder.get("greenhouse.io", "first name"))
+        self.assertEqual(recorder.get_all_for_site("greenhouse.io")["first name"]["failure_count"], 1)
+
+        recorder.record("greenhouse.io", "First Name", "label_for", "text", extra={"css_selector": "#fn"})
+        entry = recorder.get("www.greenhouse.io", "First Name:")
+        self.assertEqual((entry["success_count"], entry["failure_count"]), (1, 1))
+        self.assertEqual(entry["extra"], {"css_selector": "#fn"})
+
+    def test_patterns_persist_and_load_per_domain(self):
+        DomPatternRecorder(self.path).record("lever.co", "Email", "aria_label", "email", extra={"a": 1})
+        DomPatternRecorder(self.path).record("greenhouse.io", "Email", "label_for", "email")
+
+        reloaded = DomPatternRecorder(self.path)
+        self.assertEqual(reloaded._data, {})
+        self.assertEqual(reloaded.get("lever.co", "email")["relationship"], "aria_label")
+        self.assertEqual(list(reloaded._data), ["lever.co"])
+        self.assertEqual(reloaded.stats()["total_patterns"], 2)
+        self.assertEqual(reloaded.stats()["by_relationship"], {"aria_label": 1, "label_for": 1})
+
+    def test_concurrent_writers_do_not_lose_updates(self):
+        recorders = [DomPatternRecorder(self.path) for _ in range(4)]
+
+        def write(recorder):
+            for _ in range(25):
+                recorder.record("greenhouse.io", "Phone", "label_for", "tel")
+
+        threads = [threading.Thread(target=write, args=(r,)) for r in recorders]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(DomPatternRecorder(self.path).get("greenhouse.io", "phone")["success_count"], 100)
+
+    def test_legacy_json_is_imported_once(self):
+        legacy = self.path.with_suffix(".json")
+        legacy.write_text(json.dumps({"workday.com": {"first name": {
+            "relationship": "aria_labelledby", "field_type": "text", "success_count": 3,
+            "failure_count": 0, "last_seen": "2026-04-20T12:00:00", "extra": {},
+        }}}))
+
+        recorder = DomPatternRecorder(legacy)
+        self.assertEqual(recorder.get("workday.com", "First Name")["success_count"], 3)
+        self.assertFalse(legacy.exists())
+        self.assertTrue(self.path.exists())
+
+    def test_compact_prunes_stale_failures_only(self):
+        recorder = DomPatternRecorder(self.path)
+        recorder.record("lever.co", "Old", "placeholder", "text", success=False)
+        recorder.record("lever.co", "Good", "placeholder", "text")
+        stale = (datetime.utcnow() - timedelta(days=365)).isoformat()
+        with recorder._connect() as conn:
+            conn.execute("UPDATE dom_patterns SET last_seen = ?", (stale,))
+        recorder.compact()
+
+        self.assertEqual(list(DomPatternRecorder(self.path).get_all_for_site("lever.co")), ["good"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,239 @@
+import json
+import re
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from bullet_generation.project_bullet_generator import ProjectBulletGenerator
+from gemini_batching import chunk_by_tokens, parse_json_items, run_chunks
+from gemini_budget import _current_lane, gemini_lane
+from validation.hallucination_detector import HallucinationDetector
+
+
+class FakeModel:
+    """GenerativeModel stand-in: `reply(prompt)` gives the response text."""
+
+    def __init__(self, reply, delay=0.0):
+        self.reply = reply
+        self.delay = delay
+        self.prompts = []
+        self.configs = []
+        self.lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None):
+        with self.lock:
+            self.prompts.append(prompt)
+            self.configs.append(generation_config)
+        time.sleep(self.delay)
+        return type("Response", (), {"text": self.reply(prompt)})()
+
+    def batch_prompts(self):
+        return [p for p in self.prompts if "EACH" in p]
+
+
+PROJECTS = [
+    {"id": f"p{n}", "name": f"Project {n}", "description": f"Service number {n} for analytics",
+     "technologies": ["Python", "Kafka"], "features": ["streaming ingest"]}
+    for n in range(7)
+]
+
+BULLET = "Built streaming ingest for project {n} using Python and Kafka, processing 2M events per day with 99.9% uptime"
+
+
+def project_ids(prompt):
+    return [int(i) for i in re.findall(r"=== PROJECT id=(\d+) ===", prompt)]
+
+
+def project_number(prompt, local_id):
+    block = prompt.split(f"=== PROJECT id={local_id} ===", 1)[1]
+    return int(re.search(r"PROJECT NAME: Project (\d+)", block).group(1))
+
+
+class GeminiBatchingHelperTests(unittest.TestCase):
+    def test_chunks_respect_token_budget_and_item_cap(self):
+        texts = ["x" * 400] * 5 + ["y" * 4000, "z" * 40]  # 100 tokens each, one of 1000, one of 10
+        self.assertEqual(chunk_by_tokens(texts, max_tokens=250, max_items=10), [[0, 1], [2, 3], [4], [5], [6]])
+        self.assertEqual(chunk_by_tokens(texts, max_tokens=10_000, max_items=3), [[0, 1, 2], [3, 4, 5], [6]])
+        self.assertEqual(chunk_by_tokens([]), [])
+
+    def test_parse_json_items(self):
+        reply = '```json\n{"bullets": [{"id": 2, "ok": true}, {"id": "3"}, "junk", {"id": 1}]}\n```'
+        self.assertEqual(sorted(parse_json_items(reply, "bullets")), [1, 2])
+        self.assertEqual(sorted(parse_json_items('[{"id": 4}]', "bullets")), [4])
+        self.assertEqual(parse_json_items("not json {", "bullets"), {})
+
+    def test_run_chunks_is_concurrent_ordered_and_keeps_lane(self):
+        lanes = []
+
+        def work(chunk):
+            lanes.append(_current_lane.get())
+            time.sleep(0.1)
+            if chunk == [2]:
+                raise ValueError("bad chunk")
+            return sum(chunk)
+
+        started = time.perf_counter()
+        with gemini_lane("tailoring"):
+            results = run_chunks(work, [[0, 1], [2], [3, 4], [5]], max_workers=4)
+        self.assertEqual(results, [1, None, 7, 5])
+        self.assertLess(time.perf_counter() - started, 0.3)
+        self.assertEqual(set(lanes), {"tailoring"})
+
+    def test_run_chunks_reraises_rate_limits(self):
+        started = []
+
+        def work(chunk):
+            started.append(chunk)
+            if chunk == [0]:
+                raise RuntimeError("429 RESOURCE_EXHAUSTED: quota exceeded")
+            time.sleep(0.05)
+            return chunk
+
+        with self.assertRaises(RuntimeError):
+            run_chunks(work, [[0], [1], [2], [3], [4], [5]], max_workers=1)
+        self.assertEqual(started, [[0]])
+        with self.assertRaises(RuntimeError):
+            run_chunks(work, [[0], [1], [2], [3], [4], [5]], max_workers=2)
+
+
+class BatchedBulletGenerationTests(unittest.TestCase):
+    def generator(self, reply, delay=0.0):
+        generator = ProjectBulletGenerator("test-key")
+        generator.model = FakeModel(reply, delay)
+        return generator
+
+    def test_projects_are_packed_into_few_requests(self):
+        def reply(prompt):
+            return json.dumps({"projects": [
+                {"id": i, "bullets": [BULLET.format(n=project_number(prompt, i))] * 4} for i in project_ids(prompt)
+            ]})
+
+        generator = self.generator(reply, delay=0.05)
+        results = generator.generate_bullets_batch(PROJECTS, ["Kafka"], "Data engineer", bullets_per_project=3,
+                                                   max_projects_per_request=3)
+
+        self.assertEqual(len(generator.model.prompts), 3)  # 7 projects, 3 per request
+        self.assertEqual(list(results), [p["id"] for p in PROJECTS])
+        for n, project in enumerate(PROJECTS):
+            self.assertEqual(results[project["id"]], [BULLET.format(n=n)] * 3)
+        self.assertEqual(generator.model.configs[0].to_genai_config().response_mime_type, "application/json")
+
+    def test_json_bullets_keep_leading_figures(self):
+        leading = ["50% faster ingest for project {n} by moving the Python consumers onto Kafka partitions",
+                   "2M events per day processed for project {n} by the Kafka streaming pipeline in Python"]
+
+        def reply(prompt):
+            return json.dumps({"projects": [
+                {"id": i, "bullets": [leading[0].format(n=i), "- " + leading[1].format(n=i)]}
+                for i in project_ids(prompt)
+            ]})
+
+        generator = self.generator(reply)
+        results = generator.generate_bullets_batch(PROJECTS[:1], ["Kafka"], "Data engineer", bullets_per_project=2)
+        self.assertEqual(results["p0"], [leading[0].format(n=1), leading[1].format(n=1)])
+
+    def test_unparsed_projects_fall_back_to_single_calls(self):
+        def reply(prompt):
+            if "EACH" not in prompt:
+                return "- " + BULLET.format(n="single")
+            ids = project_ids(prompt)
+            # First project answered, second with junk bullets, the rest left out
+            return json.dumps({"projects": [{"id": ids[0], "bullets": [BULLET.format(n=project_number(prompt, ids[0]))]},
+                                            {"id": ids[1], "bullets": ["too short", 7]}]})
+
+        generator = self.generator(reply)
+        results = generator.generate_bullets_batch(PROJECTS[:4], ["Kafka"], "Data engineer", bullets_per_project=1)
+
+        self.assertEqual(len(generator.model.batch_prompts()), 1)
+        self.assertEqual(len(generator.model.prompts), 1 + 3)
+        self.assertEqual(results["p0"], [BULLET.format(n=0)])
+        self.assertEqual(results["p1"], [BULLET.format(n="single")])
+
+    def test_failed_batch_request_degrades_to_single_calls(self):
+        def reply(prompt):
+            if "EACH" in prompt:
+                raise RuntimeError("500 internal")
+            return "- " + BULLET.format(n="single")
+
+        generator = self.generator(reply)
+        results = generator.generate_bullets_batch(PROJECTS[:2], ["Kafka"], "Data engineer", bullets_per_project=1)
+        self.assertEqual(results, {"p0": [BULLET.format(n="single")], "p1": [BULLET.format(n="single")]})
+
+    def test_rate_limited_batch_is_not_split_into_single_calls(self):
+        def reply(prompt):
+            raise RuntimeError("429 Resource has been exhausted")
+
+        generator = self.generator(reply)
+        with self.assertRaises(RuntimeError):
+            generator.generate_bullets_batch(PROJECTS[:3], ["Kafka"], "Data engineer", bullets_per_project=1)
+        self.assertEqual(len(generator.model.prompts), 1)
+
+
+class BatchedHallucinationCheckTests(unittest.TestCase):
+    BULLETS = [f"Built service {n} in Python handling {n}M requests" for n in range(12)]
+
+    def detector(self, reply):
+        detector = HallucinationDetector("test-key")
+        detector.model = FakeModel(reply)
+        return detector
+
+    @staticmethod
+    def verdict(bullet_id, text):
+        unsupported = "7M" in text
+        return {
+            "id": bullet_id,
+            "claims": [{"claim": "Python", "category": "SUPPORTED", "reasoning": "in profile"}]
+                      + ([{"claim": "7M requests", "category": "UNSUPPORTED", "reasoning": "no metric"}] if unsupported else []),
+            "overall_assessment": "DANGEROUS" if unsupported else "SAFE",
+            "confidence": 90,
+            "recommendation": "REJECT" if unsupported else "ACCEPT",
+            "summary": "checked",
+        }
+
+    def batched_reply(self, prompt):
+        listed = re.findall(r"^(\d+)\. (.+)$", prompt.split("GENERATED BULLETS", 1)[1].split("TASK:", 1)[0], re.MULTILINE)
+        return json.dumps({"bullets": [self.verdict(int(i), text) for i, text in listed]})
+
+    def test_bullets_share_requests_and_keep_result_shape(self):
+        detector = self.detector(self.batched_reply)
+        report = detector.batch_validate_bullets(self.BULLETS, "Profile: Python services", max_bullets_per_request=5)
+
+        self.assertEqual(len(detector.model.prompts), 3)  # 12 bullets, 5 per request
+        self.assertEqual(report["flagged_bullets"], [7])
+        self.assertFalse(report["overall_safe"])
+        self.assertEqual(report["total_unsupported_claims"], 1)
+        flagged = report["results"][7]
+        self.assertTrue(flagged["has_hallucinations"])
+        self.assertEqual(flagged["risk_score"], 0.5)
+        self.assertEqual(flagged["confidence_score"], 0.9)
+        self.assertEqual(set(flagged), set(report["results"][0]))
+
+    def test_unparsed_bullets_fall_back_to_single_checks(self):
+        single = ("CLAIM 1: Python\nCATEGORY: SUPPORTED\nREASONING: in profile\n\n"
+                  "OVERALL_ASSESSMENT: SAFE\nCONFIDENCE: 80\nRECOMMENDATION: ACCEPT\nSUMMARY: fine")
+
+        def reply(prompt):
+            if "GENERATED BULLETS" not in prompt:
+                return single
+            data = json.loads(self.batched_reply(prompt))
+            data["bullets"] = [b for b in data["bullets"] if b["id"] != 2]
+            data["bullets"][0]["recommendation"] = "MAYBE"  # id 1: invalid verdict
+            return json.dumps(data)
+
+        detector = self.detector(reply)
+        report = detector.batch_validate_bullets(self.BULLETS[:4], "Profile: Python services")
+
+        self.assertEqual(len(detector.model.prompts), 1 + 2)
+        self.assertEqual(report["results"][0]["confidence_score"], 0.8)
+        self.assertEqual(report["results"][1]["confidence_score"], 0.8)
+        self.assertEqual(report["results"][2]["confidence_score"], 0.9)
+        self.assertTrue(report["overall_safe"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,240 @@
+import asyncio
+import json
+import os
+import threading
+import time
+import unittest
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+import gemini_budget
+import gemini_compat
+from gemini_budget import GeminiBudget, gemini_lane
+from gemini_key_manager import GeminiKeyManager
+
+
+class FakeGeminiEndpoint:
+    """Local stand-in for generativelanguage.googleapis.com (generateContent only)."""
+
+    def __init__(self, delay: float = 0.0, rate_limited_keys=(), fail_first: int = 0):
+        self.delay = delay
+        self.rate_limited_keys = set(rate_limited_keys)
+        self.fail_first = fail_first
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                api_key = self.headers.get("x-goog-api-key", "")
+                with endpoint._lock:
+                    endpoint.requests.append((self.path, api_key, json.loads(body or b"{}")))
+                    number = len(endpoint.requests)
+                    endpoint.active += 1
+                    endpoint.peak = max(endpoint.peak, endpoint.active)
+                try:
+                    time.sleep(endpoint.delay)
+                    if api_key in endpoint.rate_limited_keys or number <= endpoint.fail_first:
+                        self._reply(429, {"error": {"code": 429, "message": "Resource has been exhausted",
+                                                    "status": "RESOURCE_EXHAUSTED"}})
+                    else:
+                        self._reply(200, {
+                            "candidates": [{"content": {"role": "model", "parts": [{"text": f"reply {number}"}]}}],
+                            "usageMetadata": {"promptTokenCount": 42, "totalTokenCount": 50},
+                        })
+                finally:
+                    with endpoint._lock:
+                        endpoint.active -= 1
+
+            def _reply(self, status, payload):
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class FakeEndpointTestCase(unittest.TestCase):
+    endpoint_options = {}
+
+    def setUp(self):
+        self.endpoint = FakeGeminiEndpoint(**self.endpoint_options)
+        self._saved_env = os.environ.get("GOOGLE_GEMINI_BASE_URL")
+        os.environ["GOOGLE_GEMINI_BASE_URL"] = self.endpoint.url
+        gemini_compat.genai.configure(api_key="test-key")
+        self.budget = GeminiBudget(max_in_flight=2)
+        gemini_budget.set_gemini_budget(self.budget)
+
+    def tearDown(self):
+        gemini_budget.set_gemini_budget(None)
+        gemini_compat.genai.configure(api_key="")
+        if self._saved_env is None:
+            os.environ.pop("GOOGLE_GEMINI_BASE_URL", None)
+        else:
+            os.environ["GOOGLE_GEMINI_BASE_URL"] = self._saved_env
+        self.endpoint.close()
+
+
+class GeminiCompatEndpointTests(FakeEndpointTestCase):
+    endpoint_options = {"delay": 0.1}
+
+    def test_sync_call_records_usage(self):
+        model = gemini_compat.genai.GenerativeModel("gemini-2.5-flash")
+        response = model.generate_content("hello there")
+
+        self.assertEqual(response.text, "reply 1")
+        self.assertIn(":generateContent", self.endpoint.requests[0][0])
+        stats = self.budget.get_stats()
+        self.assertEqual((stats["requests"], stats["tokens"]), (1, 42))
+
+    def test_async_calls_share_the_in_flight_limit(self):
+        model = gemini_compat.genai.GenerativeModel("gemini-2.5-flash")
+
+        async def run():
+            return await asyncio.gather(*(model.generate_content_async(f"prompt {i}") for i in range(6)))
+
+        responses = asyncio.run(run())
+
+        self.assertEqual(len({r.text for r in responses}), 6)
+        self.assertEqual(self.endpoint.peak, 2)
+        self.assertEqual(self.budget.get_stats()["requests"], 6)
+
+
+class GeminiBackoffEndpointTests(FakeEndpointTestCase):
+    endpoint_options = {"fail_first": 1}
+
+    def test_429_pauses_the_key_and_retry_awaits_it(self):
+        original = gemini_compat._backoff_seconds
+        gemini_compat._backoff_seconds = lambda attempt: 0.3
+        try:
+            model = gemini_compat.genai.GenerativeModel("gemini-2.5-flash")
+            started = time.monotonic()
+            response = asyncio.run(model.generate_content_async("hello"))
+            elapsed = time.monotonic() - started
+        finally:
+            gemini_compat._backoff_seconds = original
+
+        self.assertEqual(response.text, "reply 2")
+        self.assertGreaterEqual(elapsed, 0.25)
+        stats = self.budget.get_stats()
+        self.assertEqual((stats["rate_limited"], stats["errors"], stats["requests"]), (1, 1, 2))
+
+
+class GeminiKeyManagerEndpointTests(FakeEndpointTestCase):
+    endpoint_options = {"rate_limited_keys": ["primary-key"]}
+
+    def test_async_falls_back_to_secondary_key(self):
+        manager = GeminiKeyManager(
+            primary_mode="custom",
+            secondary_mode="launchway",
+            custom_api_key="primary-key",
+            launchway_api_key="secondary-key",
+        )
+
+        response = asyncio.run(manager.generate_content_async("gemini-2.5-flash", "hello"))
+
+        self.assertEqual(response.text, "reply 2")
+        self.assertEqual([key for _, key, _ in self.endpoint.requests], ["primary-key", "secondary-key"])
+
+
+class GeminiBudgetTests(unittest.TestCase):
+    def test_form_fill_lane_is_served_before_tailoring(self):
+        budget = GeminiBudget(max_in_flight=1)
+        order = []
+
+        async def call(lane, name):
+            async with budget.slot_async(lane=lane):
+                order.append(name)
+
+        async def run():
+            held = await budget.acquire_async()
+            tailoring = asyncio.ensure_future(call("tailoring", "tailoring"))
+            await asyncio.sleep(0.05)
+            form_fill = asyncio.ensure_future(call("form_fill", "form_fill"))
+            await asyncio.sleep(0.05)
+            budget.release(held)
+            await asyncio.gather(tailoring, form_fill)
+
+        asyncio.run(run())
+
+        self.assertEqual(order, ["form_fill", "tailoring"])
+        self.assertEqual(set(budget.get_stats()["lanes"]), {"default", "tailoring", "form_fill"})
+
+    def test_sync_acquire_on_loop_does_not_wait_behind_its_async_waiters(self):
+        budget = GeminiBudget(max_in_flight=1)
+        order = []
+
+        async def run():
+            held = budget.acquire()
+            threading.Timer(0.1, budget.release, args=(held,)).start()
+
+            async def async_call():
+                async with budget.slot_async(lane="form_fill"):
+                    order.append("async")
+
+            queued = asyncio.ensure_future(async_call())
+            await asyncio.sleep(0.02)  # async waiter is queued first
+            with budget.slot(lane="form_fill"):  # blocks this loop's thread
+                order.append("sync")
+            await queued
+
+        # A deadlock would hang the loop thread; run it where it can be abandoned
+        runner = threading.Thread(target=asyncio.run, args=(run(),), daemon=True)
+        runner.start()
+        runner.join(timeout=5)
+
+        self.assertFalse(runner.is_alive(), "sync acquire deadlocked behind an async waiter on its own loop")
+        self.assertEqual(order, ["sync", "async"])
+
+    def test_lane_follows_context_into_threads(self):
+        budget = GeminiBudget()
+
+        async def run():
+            with gemini_lane("tailoring"):
+                await asyncio.to_thread(lambda: budget.release(budget.acquire()))
+
+        asyncio.run(run())
+        self.assertEqual(budget.get_stats()["lanes"]["tailoring"]["requests"], 1)
+
+    def test_tokens_per_minute_bucket_delays_large_prompts(self):
+        budget = GeminiBudget(tokens_per_minute=6000)  # refills 100 tokens/s
+        budget.release(budget.acquire(tokens=6000))
+
+        started = time.monotonic()
+        budget.release(budget.acquire(tokens=50))
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+
+    def test_rate_limit_pause_is_per_key(self):
+        budget = GeminiBudget()
+        budget.note_rate_limited(0.5, key="a")
+
+        started = time.monotonic()
+        budget.release(budget.acquire(key="b"))
+        self.assertLess(time.monotonic() - started, 0.1)
+
+        budget.release(budget.acquire(key="a"))
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import unittest
+import sys
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from components.brains.gemini_page_analyzer import GeminiPageAnalyzer, perceptual_hash
+
+
+def screenshot(dialog: bool = False, quality: int = 50) -> bytes:
+    image = Image.new("RGB", (1600, 900), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((100, 100, 700, 160), fill="navy")
+    if dialog:
+        draw.rectangle((500, 250, 1100, 650), fill="gray")
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
+
+
+class FakeVisionModel:
+    def __init__(self):
+        self.calls = []
+
+    async def generate_content_async(self, contents):
+        self.calls.append(contents)
+        return type("Response", (), {"text": '{"page_type": "APPLICATION_FORM", "confidence": 0.9}'})()
+
+
+class GeminiPageAnalyzerTests(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = GeminiPageAnalyzer()
+        self.model = FakeVisionModel()
+        self.analyzer.model = self.model
+
+    def _analyze(self, data, prompt="classify", url="https://ats.example/apply"):
+        return asyncio.run(self.analyzer.analyze_screenshot(data, prompt, url=url))
+
+    def test_unchanged_page_is_not_sent_twice(self):
+        self._analyze(screenshot(quality=50))
+        self._analyze(screenshot(quality=70))  # different bytes, same page
+
+        self.assertEqual(len(self.model.calls), 1)
+        stats = self.analyzer.get_stats()
+        self.assertEqual((stats["calls"], stats["cache_hits"]), (2, 1))
+
+    def test_changed_page_url_or_prompt_is_sent_again(self):
+        self._analyze(screenshot())
+        self._analyze(screenshot(dialog=True))
+        self._analyze(screenshot(), url="https://ats.example/apply/step-2")
+        self._analyze(screenshot(), prompt="classify again")
+
+        self.assertEqual(len(self.model.calls), 4)
+
+    def test_screenshot_is_prepared_off_the_event_loop(self):
+        seen = []
+        original = Image.Image.resize
+
+        def resize(image, *args, **kwargs):
+            seen.append(threading.current_thread() is threading.main_thread())
+            return original(image, *args, **kwargs)
+
+        Image.Image.resize = resize
+        try:
+            self._analyze(screenshot())
+        finally:
+            Image.Image.resize = original
+
+        self.assertTrue(seen)
+        self.assertFalse(any(seen))
+        part = self.model.calls[0][0]
+        self.assertEqual(part["mime_type"], "image/jpeg")
+
+    def test_perceptual_hash_ignores_jpeg_noise(self):
+        low = Image.open(BytesIO(screenshot(quality=30)))
+        high = Image.open(BytesIO(screenshot(quality=95)))
+
+        self.assertEqual(perceptual_hash(low), perceptual_hash(high))
+
+
+if __name__ == "__main__":
+    unittest.main()
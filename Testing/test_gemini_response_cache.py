@@ -0,0 +1,81 @@
+import asyncio
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+import gemini_budget
+import gemini_compat
+import gemini_response_cache
+from gemini_budget import GeminiBudget
+from gemini_response_cache import GeminiResponseCache, cache_gemini_responses, gemini_cache_key
+from job_search_cache import SQLiteSearchCacheBackend
+from test_gemini_budget import FakeGeminiEndpoint
+
+
+class GeminiCacheKeyTests(unittest.TestCase):
+    def test_whitespace_does_not_change_the_key(self):
+        self.assertEqual(
+            gemini_cache_key("gemini-2.5-flash", "Extract  keywords\nfrom this resume "),
+            gemini_cache_key("gemini-2.5-flash", "Extract keywords from this resume"),
+        )
+
+    def test_model_config_and_image_are_part_of_the_key(self):
+        base = gemini_cache_key("gemini-2.5-flash", ["prompt", {"mime_type": "image/png", "data": b"a"}])
+
+        self.assertNotEqual(base, gemini_cache_key("gemini-2.5-pro", ["prompt", {"mime_type": "image/png", "data": b"a"}]))
+        self.assertNotEqual(base, gemini_cache_key("gemini-2.5-flash", ["prompt", {"mime_type": "image/png", "data": b"b"}]))
+        self.assertNotEqual(
+            base,
+            gemini_cache_key("gemini-2.5-flash", ["prompt", {"mime_type": "image/png", "data": b"a"}], {"temperature": 0.1}),
+        )
+
+
+class GeminiResponseCacheEndpointTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.cache = GeminiResponseCache(SQLiteSearchCacheBackend(Path(self._tmp.name) / "cache.sqlite3", max_entries=10))
+        self._previous_cache = gemini_response_cache.set_default_gemini_cache(self.cache)
+        self.endpoint = FakeGeminiEndpoint()
+        self._saved_env = os.environ.get("GOOGLE_GEMINI_BASE_URL")
+        os.environ["GOOGLE_GEMINI_BASE_URL"] = self.endpoint.url
+        gemini_compat.genai.configure(api_key="test-key")
+        gemini_budget.set_gemini_budget(GeminiBudget())
+        self.model = gemini_compat.genai.GenerativeModel("gemini-2.5-flash")
+
+    def tearDown(self):
+        gemini_budget.set_gemini_budget(None)
+        gemini_compat.genai.configure(api_key="")
+        if self._saved_env is None:
+            os.environ.pop("GOOGLE_GEMINI_BASE_URL", None)
+        else:
+            os.environ["GOOGLE_GEMINI_BASE_URL"] = self._saved_env
+        self.endpoint.close()
+        gemini_response_cache.set_default_gemini_cache(self._previous_cache)
+        self._tmp.cleanup()
+
+    def test_repeated_prompt_is_served_from_cache(self):
+        with cache_gemini_responses("resume_keywords"):
+            first = self.model.generate_content("extract keywords")
+            second = asyncio.run(self.model.generate_content_async("extract   keywords"))
+
+        self.assertEqual((first.text, second.text), ("reply 1", "reply 1"))
+        self.assertEqual(len(self.endpoint.requests), 1)
+        stats = self.cache.get_stats()
+        self.assertEqual(stats["namespaces"]["resume_keywords"]["prompt_tokens_saved"], 42)
+        self.assertEqual(stats["totals"]["hit_rate"], 0.5)
+
+    def test_calls_outside_the_context_are_not_cached(self):
+        self.model.generate_content("extract keywords")
+        self.model.generate_content("extract keywords")
+
+        self.assertEqual(len(self.endpoint.requests), 2)
+        self.assertEqual(self.cache.get_stats()["totals"]["hit_rate"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,263 @@
+import copy
+import sys
+import unittest
+from pathlib import Path
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from google_doc_model import LocalGoogleDoc
+
+
+def units(text):
+    """Length in UTF-16 code units, as the Docs API counts indices."""
+    return len(text.encode("utf-16-le")) // 2
+
+
+def paragraph(index, runs, **para):
+    """Paragraph element starting at `index`; runs are text or (text, textStyle)."""
+    elements = []
+    for run in runs:
+        text, style = run if isinstance(run, tuple) else (run, {})
+        elements.append({"startIndex": index, "endIndex": index + units(text),
+                         "textRun": {"content": text, "textStyle": dict(style)}})
+        index += units(text)
+    return {"startIndex": elements[0]["startIndex"], "endIndex": index,
+            "paragraph": {"elements": elements, "paragraphStyle": para.get("style", {}),
+                          **({"bullet": para["bullet"]} if "bullet" in para else {})}}
+
+
+def build_doc(blocks):
+    """Docs API shaped document; blocks are paragraph run lists or ("table", [[cell runs, ...]])."""
+    content = [{"endIndex": 1, "sectionBreak": {}}]
+    index = 1
+    for block in blocks:
+        if isinstance(block, tuple) and block[0] == "table":
+            table_start, rows = index, []
+            index += 1
+            for row in block[1]:
+                row_start, cells = index, []
+                index += 1
+                for runs in row:
+                    cell_start = index
+                    index += 1
+                    para = paragraph(index, runs)
+                    index = para["endIndex"]
+                    cells.append({"startIndex": cell_start, "endIndex": index, "content": [para]})
+                rows.append({"startIndex": row_start, "endIndex": index, "tableCells": cells})
+            index += 1
+            content.append({"startIndex": table_start, "endIndex": index,
+                            "table": {"rows": len(rows), "tableRows": rows}})
+        else:
+            para = paragraph(index, block)
+            index = para["endIndex"]
+            content.append(para)
+    return {"documentId": "doc-1", "body": {"content": content}}
+
+
+def layout(document):
+    """(startIndex, endIndex, text) for every indexed element, for comparing index shifts."""
+    out = []
+
+    def walk(content):
+        for element in content:
+            out.append((element.get("startIndex", 0), element["endIndex"], None))
+            if "paragraph" in element:
+                for elem in element["paragraph"]["elements"]:
+                    out.append((elem["startIndex"], elem["endIndex"], elem["textRun"]["content"]))
+            elif "table" in element:
+                for row in element["table"]["tableRows"]:
+                    out.append((row["startIndex"], row["endIndex"], None))
+                    for cell in row["tableCells"]:
+                        out.append((cell["startIndex"], cell["endIndex"], None))
+                        walk(cell["content"])
+
+    walk(document["body"]["content"])
+    return out
+
+
+class FakeDocsService:
+    """Records documents().get / batchUpdate calls like the Docs API client."""
+
+    def __init__(self, document, status=400, invalid=lambda request: False):
+        self.document = document
+        self.gets = 0
+        self.batch_updates = []
+        self.status = status
+        self.invalid = invalid
+
+    def documents(self):
+        return self
+
+    def get(self, documentId):
+        self.gets += 1
+        return _Execute(lambda: copy.deepcopy(self.document))
+
+    def batchUpdate(self, documentId, body):
+        self.batch_updates.append(body["requests"])
+
+        def execute():
+            # Like the API, one invalid request rejects the whole (atomic) batch
+            if any(self.invalid(request) for request in body["requests"]):
+                raise HttpError(httplib2.Response({"status": self.status}), b"Invalid requests")
+            return {"replies": [{"ok": True} for _ in body["requests"]]}
+
+        return _Execute(execute)
+
+
+class _Execute:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def execute(self):
+        return self.fn()
+
+
+RESUME = [
+    [("Jane Doe\n", {"bold": True})],
+    ["Built ", ("ETL pipelines", {"bold": True}), " in Python for 3 teams\n"],
+    ("table", [[["Skills: SQL\n"], ["Python\n"]]]),
+    ["Led migration to Postgres\n"],
+]
+
+
+class LocalGoogleDocTests(unittest.TestCase):
+    def test_replace_shifts_indices_like_a_refetch(self):
+        doc = LocalGoogleDoc(build_doc(RESUME))
+        self.assertEqual(doc.replace_all_text("ETL pipelines in Python", "streaming pipelines in Go"), 1)
+        self.assertEqual(doc.replace_all_text("SQL", "SQL, Spark"), 1)
+
+        expected = build_doc([
+            [("Jane Doe\n", {"bold": True})],
+            ["Built ", ("streaming pipelines in Go", {"bold": True}), " for 3 teams\n"],
+            ("table", [[["Skills: SQL, Spark\n"], ["Python\n"]]]),
+            ["Led migration to Postgres\n"],
+        ])
+        self.assertEqual(layout(doc.document), layout(expected))
+        # The replacement takes the style of the run where the match starts
+        run = doc.body_content[2]["paragraph"]["elements"][1]["textRun"]
+        self.assertEqual(run["textStyle"], {"bold": True})
+
+    def test_no_match_queues_nothing_and_matches_stay_inside_paragraphs(self):
+        doc = LocalGoogleDoc(build_doc(RESUME))
+        self.assertEqual(doc.replace_all_text("Doe\nBuilt", "x"), 0)
+        self.assertEqual(doc.replace_all_text("missing", "x"), 0)
+        self.assertEqual(doc.pending, [])
+        self.assertEqual(doc.count("Python"), 2)
+        self.assertEqual(doc.replace_all_text("Python", "Rust"), 2)
+
+    def test_style_range_after_replacement(self):
+        doc = LocalGoogleDoc(build_doc(RESUME))
+        doc.replace_all_text("Led migration", "Led zero-downtime migration")
+        start = doc.find("zero-downtime")
+        doc.update_text_style(start, start + len("zero-downtime"), {"italic": True}, "italic")
+
+        last = doc.body_content[-1]
+        self.assertEqual(start, last["startIndex"] + len("Led "))
+        runs = [(e["textRun"]["content"], e["textRun"]["textStyle"]) for e in last["paragraph"]["elements"]]
+        self.assertEqual(runs, [("Led ", {}), ("zero-downtime", {"italic": True}), (" migration to Postgres\n", {})])
+
+    def test_indices_count_utf16_units_after_astral_characters(self):
+        blocks = [["Jane Doe \U0001F4E7 jane@x.io | Skills: SQL\n"], ["\U0001F680 Led migration\n"]]
+        doc = LocalGoogleDoc(build_doc(blocks))
+        # The emoji is two UTF-16 code units on the server
+        self.assertEqual(doc.find("Skills"), 1 + units("Jane Doe \U0001F4E7 jane@x.io | "))
+
+        self.assertEqual(doc.replace_all_text("SQL", "SQL, Spark"), 1)
+        self.assertEqual(doc.replace_all_text("Led", "Led \U0001F525"), 1)
+        expected = build_doc([["Jane Doe \U0001F4E7 jane@x.io | Skills: SQL, Spark\n"],
+                              ["\U0001F680 Led \U0001F525 migration\n"]])
+        self.assertEqual(layout(doc.document), layout(expected))
+
+        start = doc.find("migration")
+        self.assertEqual(start, expected["body"]["content"][2]["startIndex"] + units("\U0001F680 Led \U0001F525 "))
+        doc.update_text_style(start, start + len("migration"), {"bold": True}, "bold")
+        runs = [e["textRun"]["content"] for e in doc.body_content[2]["paragraph"]["elements"]]
+        self.assertEqual(runs, ["\U0001F680 Led \U0001F525 ", "migration", "\n"])
+
+    def test_single_get_and_single_batch_update(self):
+        service = FakeDocsService(build_doc(RESUME))
+        doc = LocalGoogleDoc.fetch(service, "doc-1")
+        doc.replace_all_text("Python", "Go")
+        start = doc.find("Go")
+        doc.update_text_style(start, start + 2, {"bold": False}, "bold")
+        doc.flush(service)
+        doc.flush(service)  # nothing pending: no call
+
+        self.assertEqual(service.gets, 1)
+        self.assertEqual(len(service.batch_updates), 1)
+        kinds = [next(iter(request)) for request in service.batch_updates[0]]
+        self.assertEqual(kinds, ["replaceAllText", "updateTextStyle"])
+        self.assertEqual(service.batch_updates[0][1]["updateTextStyle"]["range"],
+                         {"startIndex": start, "endIndex": start + 2})
+
+    def test_rejected_batch_is_bisected_and_bad_requests_skipped(self):
+        bad = lambda request: "updateTextStyle" in request and request["updateTextStyle"]["range"]["startIndex"] > 10_000
+        service = FakeDocsService(build_doc(RESUME), invalid=bad)
+        doc = LocalGoogleDoc.fetch(service, "doc-1")
+        doc.replace_all_text("Python", "Go")
+        doc.pending.append({"updateTextStyle": {"range": {"startIndex": 20_000, "endIndex": 20_002},
+                                                "textStyle": {}, "fields": "bold"}})
+        doc.replace_all_text("SQL", "Postgres")
+        doc.replace_all_text("Led", "Drove")
+
+        replies = doc.flush(service)
+
+        sent = [request for batch in service.batch_updates for request in batch if not any(map(bad, batch))]
+        self.assertEqual([next(iter(r)) for r in sent], ["replaceAllText"] * 3)  # valid ones still go out, in order
+        self.assertEqual([r["replaceAllText"]["replaceText"] for r in sent], ["Go", "Postgres", "Drove"])
+        self.assertEqual(replies, [{"ok": True}, {}, {"ok": True}, {"ok": True}])
+        self.assertEqual(len(doc.skipped), 1)
+        self.assertEqual(doc.pending, [])
+
+    def test_style_after_a_skipped_replace_uses_the_server_indices(self):
+        bad = lambda request: "replaceAllText" in request and request["replaceAllText"]["containsText"]["text"] == "Alpha"
+        service = FakeDocsService(build_doc([["Alpha beta gamma delta\n"], ["Alpha again, delta\n"]]), invalid=bad)
+        doc = LocalGoogleDoc.fetch(service, "doc-1")
+        doc.replace_all_text("Alpha", "A much longer alpha")
+        doc.replace_all_text("beta", "b")
+        start = doc.find("delta")
+        doc.update_text_style(start, start + len("delta"), {"italic": True}, "italic")
+        second = doc.body_content[2]["startIndex"] + len("A much longer alpha again, ")
+        doc.update_text_style(second, second + len("delta"), {"bold": True}, "bold")
+
+        doc.flush(service)
+
+        sent = [request["updateTextStyle"]["range"] for request in service.batch_updates[-1]
+                if "updateTextStyle" in request]
+        # On the server "beta" became "b", but "Alpha" is unchanged
+        self.assertEqual(sent, [{"startIndex": 15, "endIndex": 20},
+                                {"startIndex": 21 + len("Alpha again, "), "endIndex": 26 + len("Alpha again, ")}])
+        self.assertEqual([request for request, _ in doc.skipped], [service.batch_updates[0][0]])
+        # The copy is re-fetched, so it no longer holds the rejected text
+        self.assertEqual(service.gets, 2)
+        self.assertIsNone(doc.find("A much longer"))
+        self.assertEqual(doc.find("delta"), 18)
+
+    def test_other_errors_are_not_bisected(self):
+        service = FakeDocsService(build_doc(RESUME), status=503, invalid=lambda request: True)
+        doc = LocalGoogleDoc.fetch(service, "doc-1")
+        doc.replace_all_text("Python", "Go")
+        doc.replace_all_text("SQL", "Postgres")
+        with self.assertRaises(HttpError):
+            doc.flush(service)
+        self.assertEqual(len(service.batch_updates), 1)
+        self.assertEqual(len(doc.pending), 2)  # kept for a retry
+
+    def test_page_estimate_grows_with_text(self):
+        bullet = ["Designed and shipped data pipelines processing millions of events per day\n"]
+        short = LocalGoogleDoc(build_doc([bullet] * 20))
+        long = LocalGoogleDoc(build_doc([bullet] * 80))
+        self.assertEqual(short.estimated_pages(), 1)
+        self.assertGreater(long.estimated_pages(), 1)
+
+        wrapped = LocalGoogleDoc(build_doc([bullet] * 20))
+        wrapped.replace_all_text("Designed", "Designed, built, tested, documented and operated" * 2)
+        self.assertGreater(wrapped.estimated_height(), short.estimated_height())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import random
+import tempfile
+import time
+import unittest
+import sys
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from job_dedup_index import NearDuplicateJobIndex, canonicalize_job_url
+
+
+_rng = random.Random(7)
+VOCAB = ["".join(_rng.choice("abcdefghijklmnop") for _ in range(6)) for _ in range(4000)]
+
+
+def text(words, seed):
+    rng = random.Random(seed)
+    return " ".join(rng.choice(VOCAB) for _ in range(words))
+
+
+def job(n, **overrides):
+    data = {
+        "title": f"Backend Engineer {n}",
+        "company": f"Company {n % 40}",
+        "location": "New York, NY",
+        "job_url": f"https://boards.example.com/jobs/{n}",
+        "description": text(250, n),
+    }
+    data.update(overrides)
+    return data
+
+
+class CanonicalUrlTests(unittest.TestCase):
+    def test_strips_tracking_but_keeps_job_ids(self):
+        self.assertEqual(
+            canonicalize_job_url("HTTPS://Boards.Greenhouse.io/acme/jobs/1/?gh_jid=5&utm_source=jsearch#apply"),
+            "https://boards.greenhouse.io/acme/jobs/1?gh_jid=5",
+        )
+        self.assertEqual(canonicalize_job_url(""), "")
+
+
+class NearDuplicateJobIndexTests(unittest.TestCase):
+    def test_same_posting_from_other_sources_is_a_duplicate(self):
+        index = NearDuplicateJobIndex()
+        original = job(1, title="Senior Backend Engineer", company="Acme, Inc.")
+        self.assertTrue(index.add(original))
+
+        tracking_copy = dict(original, job_url=original["job_url"] + "?utm_campaign=adzuna")
+        snippet_copy = dict(
+            original,
+            title="Senior Backend Engineer (Remote)",
+            company="ACME",
+            location="United States",
+            job_url="https://www.adzuna.com/details/998877",
+            description=" ".join(original["description"].split()[:45]) + " ...",
+        )
+        self.assertFalse(index.add(tracking_copy))
+        self.assertIsNotNone(index.find_duplicate(snippet_copy))
+        self.assertFalse(index.add(snippet_copy))
+        self.assertEqual(len(index), 1)
+
+    def test_different_postings_are_kept(self):
+        index = NearDuplicateJobIndex()
+        jobs = [job(n) for n in range(500)]
+        self.assertEqual(sum(index.add(j) for j in jobs), 500)
+
+        # Same description text at another company is a different posting
+        self.assertTrue(index.add(dict(jobs[0], company="Other Corp", job_url="https://other.example.com/1")))
+
+    def test_roles_sharing_a_company_blurb_are_kept(self):
+        blurb = text(73, "blurb")
+        index = NearDuplicateJobIndex()
+        backend = job(1, title="Senior Backend Engineer", company="Acme",
+                      description=blurb + " " + text(150, "backend"))
+        marketing = job(2, title="Marketing Manager", company="Acme",
+                        description=blurb + " " + text(150, "marketing"))
+
+        self.assertTrue(index.add(backend))
+        self.assertIsNone(index.find_duplicate(marketing))
+        self.assertTrue(index.add(marketing))
+        # A syndicated copy of either role still matches it
+        self.assertFalse(index.add(dict(marketing, title="Marketing Manager - Remote",
+                                        job_url="https://www.adzuna.com/details/42")))
+
+    def test_exact_title_company_location_without_description(self):
+        index = NearDuplicateJobIndex()
+        self.assertTrue(index.add(job(1, description="", job_url="")))
+        self.assertFalse(index.add(job(1, description="", job_url="https://jobs.example.com/a")))
+        self.assertTrue(index.add(job(1, description="", job_url="", location="Austin, TX")))
+        self.assertFalse(index.add({"title": "", "company": "", "job_url": ""}))
+
+    def test_indexing_scales_near_linearly(self):
+        index = NearDuplicateJobIndex()
+        started = time.perf_counter()
+        for n in range(1000):
+            index.add(job(n))
+        small = time.perf_counter() - started
+        started = time.perf_counter()
+        for n in range(1000, 5000):
+            index.add(job(n))
+        large = time.perf_counter() - started
+        self.assertLess(large / small, 8)
+
+    def test_save_and_load_round_trip_with_ttl(self):
+        index = NearDuplicateJobIndex()
+        index.add(job(1))
+        index.add(dict(job(1), job_url="https://mirror.example.com/1"))
+        index.add(job(2))
+        index._entries[1]["added_at"] -= 3600
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "index.json"
+            index.save(path)
+            loaded = NearDuplicateJobIndex.load(path)
+            self.assertEqual(len(loaded), 2)
+            self.assertIsNotNone(loaded.find_duplicate({"job_url": "https://mirror.example.com/1"}))
+            self.assertIsNotNone(loaded.find_duplicate(dict(job(2), job_url="https://x.example.com/2")))
+
+            fresh_only = NearDuplicateJobIndex.load(path, max_age_seconds=60)
+            self.assertEqual(len(fresh_only), 1)
+            self.assertEqual(len(NearDuplicateJobIndex.load(Path(tmp) / "missing.json")), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
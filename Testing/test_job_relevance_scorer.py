@@ -0,0 +1,51 @@
+import copy
+import unittest
+import sys
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from job_relevance_scorer import JobRelevanceScorer, np, rank_jobs
+from benchmark_relevance_scoring import PROFILE, synthetic_jobs
+
+
+EDGE_JOBS = [
+    {},
+    {"title": None, "description": None},
+    {"title": "", "description": "python spark kafka airflow"},
+    {"title": "Senior Data Engineer", "requirements": "python"},
+    {"title": "Software Engineer II", "description": "Python, Go & SQL!", "salary_min": "n/a"},
+    {"title": "Backend Engineer", "location": None, "is_remote": True, "posted_date": "not a date"},
+    {"title": "Data Engineer", "job_type": ["full-time"], "experience_level": None},
+]
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class BatchScoringParityTests(unittest.TestCase):
+    def assert_parity(self, profile, jobs):
+        expected = [JobRelevanceScorer(copy.deepcopy(profile)).calculate_score(j) for j in jobs]
+        self.assertEqual(JobRelevanceScorer(copy.deepcopy(profile)).calculate_scores(jobs), expected)
+
+    def test_batch_matches_per_job_scores(self):
+        self.assert_parity(PROFILE, synthetic_jobs(500, seed=3) + EDGE_JOBS)
+
+    def test_edge_case_profiles(self):
+        no_keywords = {"preferred location": ["Remote"]}
+        bad_history = dict(PROFILE, work_experience=[{"title": None}, "intern"],
+                           resume_keywords={"job_titles": None})
+        for profile in (no_keywords, bad_history, {}):
+            with self.subTest(profile=profile):
+                self.assert_parity(profile, synthetic_jobs(50, seed=5) + EDGE_JOBS)
+
+    def test_rank_jobs_uses_batch_scores(self):
+        jobs = synthetic_jobs(200, seed=9)
+        ranked = rank_jobs(copy.deepcopy(jobs), copy.deepcopy(PROFILE), min_score=40)
+        scorer = JobRelevanceScorer(copy.deepcopy(PROFILE))
+        expected = sorted((s for s in (scorer.calculate_score(j) for j in jobs) if s >= 40), reverse=True)
+        self.assertEqual([j["relevance_score"] for j in ranked], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
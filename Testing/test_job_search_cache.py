@@ -0,0 +1,174 @@
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from job_search_cache import (
+    CachedJobAPIAdapter,
+    JobSearchCache,
+    SQLiteSearchCacheBackend,
+    canonical_query_key,
+)
+from multi_source_job_discovery_agent import MultiSourceJobDiscoveryAgent
+
+
+class StubAdapter:
+    def __init__(self, name="Stub", jobs=None):
+        self.api_name = name
+        self.jobs = jobs if jobs is not None else [{"title": "Engineer", "job_url": "https://x/1"}]
+        self.calls = 0
+        self.refreshed = threading.Event()
+
+    def search_jobs(self, query_params):
+        self.calls += 1
+        self.refreshed.set()
+        return {"data": list(self.jobs), "count": len(self.jobs), "source": self.api_name}
+
+
+class JobSearchCacheTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.backend = SQLiteSearchCacheBackend(Path(self._tmp.name) / "cache.sqlite3", max_entries=3)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_canonical_key_ignores_formatting_differences(self):
+        a = canonical_query_key("JobSpy", {"keywords": "Data  Scientist", "sites": ["indeed", "linkedin"],
+                                           "location": None})
+        b = canonical_query_key("JobSpy", {"sites": ["linkedin", "indeed"], "keywords": "data scientist ",
+                                           "location": ""})
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, canonical_query_key("GoogleCustomSearch", {"keywords": "data scientist"}))
+
+    def test_second_search_is_served_from_cache(self):
+        adapter = StubAdapter()
+        cached = CachedJobAPIAdapter(adapter, JobSearchCache(self.backend))
+
+        first = cached.search_jobs({"keywords": "python"})
+        second = cached.search_jobs({"keywords": "Python"})
+
+        self.assertEqual(adapter.calls, 1)
+        self.assertEqual(second["data"], first["data"])
+        self.assertTrue(second["cached"])
+        totals = cached._cache.get_stats()["totals"]
+        self.assertEqual((totals["hits"], totals["misses"], totals["calls_saved"]), (1, 1, 1))
+        self.assertEqual(totals["hit_rate"], 0.5)
+
+    def test_empty_results_are_not_cached(self):
+        adapter = StubAdapter(jobs=[])
+        cache = JobSearchCache(self.backend)
+        cache.search(adapter, {"keywords": "python"})
+        cache.search(adapter, {"keywords": "python"})
+        self.assertEqual(adapter.calls, 2)
+
+    def test_stale_entry_is_returned_and_refreshed_in_background(self):
+        adapter = StubAdapter()
+        cache = JobSearchCache(self.backend, source_ttls={"Stub": 0.05}, stale_ttl=60)
+        cache.search(adapter, {"keywords": "python"})
+        time.sleep(0.1)
+        adapter.refreshed.clear()
+
+        response = cache.search(adapter, {"keywords": "python"})
+
+        self.assertTrue(response["cached"])
+        self.assertTrue(adapter.refreshed.wait(2))
+        self.assertEqual(adapter.calls, 2)
+        self.assertEqual(cache.get_stats()["sources"]["Stub"]["stale_hits"], 1)
+
+    def test_entries_past_stale_window_are_misses(self):
+        adapter = StubAdapter()
+        cache = JobSearchCache(self.backend, source_ttls={"Stub": 0.05}, stale_ttl=0.05)
+        cache.search(adapter, {"keywords": "python"})
+        time.sleep(0.15)
+        response = cache.search(adapter, {"keywords": "python"})
+        self.assertNotIn("cached", response)
+        self.assertEqual(adapter.calls, 2)
+
+    def test_generated_params_are_reused_for_the_same_user_query(self):
+        adapter = StubAdapter(name="TheMuse")
+        cache = JobSearchCache(self.backend)
+        generated = []
+
+        def search(user_query):
+            def generate():
+                # Model output varies between calls for the same query
+                generated.append(user_query)
+                return {"category": "Data Science", "page": 1, "locations": [f"variant {len(generated)}"]}
+            return cache.search(adapter, cache.source_params("TheMuse", user_query, generate))
+
+        search({"keywords": "Data Scientist", "location": "NYC"})
+        second = search({"keywords": "data  scientist", "location": "nyc"})
+        search({"keywords": "Data Engineer", "location": "NYC"})
+
+        self.assertEqual(len(generated), 2)
+        self.assertTrue(second["cached"])
+        self.assertEqual(adapter.calls, 2)
+        self.assertEqual(cache.get_stats()["sources"]["TheMuse"]["params_reused"], 1)
+
+    def test_generated_params_are_not_shared_across_profiles(self):
+        cache = JobSearchCache(self.backend)
+        adapter = StubAdapter(name="JSearch")
+
+        def discovery_agent(profile):
+            agent = MultiSourceJobDiscoveryAgent.__new__(MultiSourceJobDiscoveryAgent)
+            agent.profile_data = profile
+            agent.search_cache = cache
+            agent.generated = 0
+
+            def generate(_adapter):
+                agent.generated += 1
+                return {"keywords": f"data scientist {agent.profile_data['skills']}"}
+
+            agent._generate_api_params_with_gemini = generate
+            return agent
+
+        query = {"keywords": "Data Scientist", "location": "NYC"}
+        alice = discovery_agent({"name": "Alice", "skills": "python"})
+        bob = discovery_agent({"name": "Bob", "skills": "spark"})
+
+        alice_params = alice._adapt_params_for_source(query, adapter)
+        bob_params = bob._adapt_params_for_source(query, adapter)
+        self.assertEqual((alice.generated, bob.generated), (1, 1))
+        self.assertNotEqual(alice_params, bob_params)
+
+        # Same profile and query: reused
+        self.assertEqual(alice._adapt_params_for_source(query, adapter), alice_params)
+        self.assertEqual(alice.generated, 1)
+
+        # A profile edit generates new params
+        alice.profile_data = {"name": "Alice", "skills": "python, sql"}
+        self.assertNotEqual(alice._adapt_params_for_source(query, adapter), alice_params)
+        self.assertEqual(alice.generated, 2)
+
+    def test_failed_param_generation_is_not_stored(self):
+        cache = JobSearchCache(self.backend)
+        calls = []
+
+        def generate():
+            calls.append(1)
+            return None
+
+        self.assertIsNone(cache.source_params("JSearch", {"keywords": "python"}, generate))
+        self.assertIsNone(cache.source_params("JSearch", {"keywords": "python"}, generate))
+        self.assertEqual(len(calls), 2)
+
+    def test_sqlite_backend_evicts_least_recently_used(self):
+        for i in range(3):
+            self.backend.set(f"k{i}", {"response": {"data": [i]}}, 60)
+            time.sleep(0.01)
+        self.backend.get("k0")  # k1 is now least recently used
+        self.backend.set("k3", {"response": {"data": [3]}}, 60)
+
+        self.assertIsNone(self.backend.get("k1"))
+        self.assertIsNotNone(self.backend.get("k0"))
+        self.assertIsNotNone(self.backend.get("k3"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import time
+import unittest
+import sys
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from job_search_fanout import JobSearchFanOut
+
+
+class StubAdapter:
+    def __init__(self, name, jobs=None, delay=0.0, error=None):
+        self.api_name = name
+        self.jobs = jobs or []
+        self.delay = delay
+        self.error = error
+        self.calls = []
+
+    def search_jobs(self, query_params):
+        self.calls.append(query_params)
+        time.sleep(self.delay)
+        if self.error:
+            raise RuntimeError(self.error)
+        return {"data": list(self.jobs), "count": len(self.jobs), "source": self.api_name}
+
+
+def _jobs(prefix, n):
+    return [{"title": f"{prefix} {i}", "company": "Acme", "job_url": f"https://x/{prefix}/{i}"} for i in range(n)]
+
+
+class JobSearchFanOutTests(unittest.TestCase):
+    def test_sources_run_concurrently(self):
+        adapters = [StubAdapter(f"S{i}", _jobs(f"s{i}", 2), delay=0.2) for i in range(5)]
+        started = time.monotonic()
+        results = JobSearchFanOut(max_workers=5, deadline=5).run(adapters, lambda a: {"q": a.api_name})
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.6)
+        self.assertEqual(list(results), ["S0", "S1", "S2", "S3", "S4"])
+        self.assertTrue(all(r.status == "ok" and len(r.jobs) == 2 for r in results.values()))
+        self.assertEqual(adapters[3].calls, [{"q": "S3"}])
+
+    def test_errors_and_empty_sources_are_reported(self):
+        adapters = [StubAdapter("Good", _jobs("g", 1)), StubAdapter("Empty"), StubAdapter("Bad", error="boom")]
+        results = JobSearchFanOut(deadline=5).run(adapters, lambda a: {})
+
+        self.assertEqual(results["Good"].status, "ok")
+        self.assertEqual(results["Empty"].status, "empty")
+        self.assertEqual(results["Bad"].status, "error")
+        self.assertIn("boom", results["Bad"].error)
+        self.assertEqual(results["Bad"].to_stats()["count"], 0)
+
+    def test_per_source_timeout_returns_without_waiting(self):
+        adapters = [StubAdapter("Fast", _jobs("f", 3)), StubAdapter("Slow", _jobs("s", 3), delay=2.0)]
+        started = time.monotonic()
+        results = JobSearchFanOut(source_timeout=5, deadline=10, source_timeouts={"Slow": 0.2}).run(
+            adapters, lambda a: {}
+        )
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(results["Fast"].status, "ok")
+        self.assertEqual(results["Slow"].status, "timeout")
+        self.assertEqual(results["Slow"].jobs, [])
+
+    def test_global_deadline_returns_partial_results(self):
+        adapters = [
+            StubAdapter("Fast", _jobs("f", 1)),
+            StubAdapter("Slow", delay=2.0),
+            StubAdapter("Queued", _jobs("q", 1)),
+        ]
+        started = time.monotonic()
+        results = JobSearchFanOut(max_workers=2, source_timeout=10, deadline=0.3).run(
+            adapters, lambda a: {}
+        )
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(results["Fast"].status, "ok")
+        self.assertEqual(results["Slow"].status, "timeout")
+        # "Queued" ran on the worker freed by "Fast", so it completes before the deadline
+        self.assertEqual(results["Queued"].status, "ok")
+
+    def test_results_stream_to_callback_as_they_complete(self):
+        adapters = [StubAdapter("Slow", _jobs("s", 1), delay=0.3), StubAdapter("Fast", _jobs("f", 1))]
+        order = []
+        JobSearchFanOut(deadline=5).run(adapters, lambda a: {}, on_result=lambda r: order.append(r.source))
+
+        self.assertEqual(order, ["Fast", "Slow"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import unittest
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+os.environ.setdefault("DB_PASSWORD", "unused-in-tests")
+
+import job_search_service
+from database_config import JobListing
+from job_search_service import JobSearchService
+
+
+def sqlite_session_factory():
+    """In-memory SQLite with a 'public' schema so JobListing maps unchanged."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+
+    @event.listens_for(engine, "connect")
+    def attach_public(dbapi_connection, _):
+        dbapi_connection.execute("ATTACH DATABASE ':memory:' AS public")
+
+    JobListing.__table__.create(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine), statements
+
+
+def job(n, **overrides):
+    data = {
+        "title": f"Engineer {n}",
+        "company": f"Company {n}",
+        "location": "Remote",
+        "job_url": f"https://jobs.example.com/{n}",
+        "posted_date": "2026-10-01",
+    }
+    data.update(overrides)
+    return data
+
+
+class SaveJobListingsTests(unittest.TestCase):
+    def setUp(self):
+        self.SessionLocal, self.statements = sqlite_session_factory()
+        original = job_search_service.SessionLocal
+        job_search_service.SessionLocal = self.SessionLocal
+        self.addCleanup(setattr, job_search_service, "SessionLocal", original)
+
+    def rows(self):
+        db = self.SessionLocal()
+        try:
+            return {r.external_id: r for r in db.query(JobListing).all()}
+        finally:
+            db.close()
+
+    def test_counts_and_round_trips(self):
+        JobSearchService.BULK_CHUNK_SIZE = 100
+        self.addCleanup(setattr, JobSearchService, "BULK_CHUNK_SIZE", 500)
+
+        result = JobSearchService.save_job_listings(1, [job(n) for n in range(250)])
+        self.assertEqual((result["saved_count"], result["updated_count"], result["total_processed"]), (250, 0, 250))
+        # 3 IN lookups + 3 chunked inserts, not one SELECT per job
+        self.assertLessEqual(len([s for s in self.statements if not s.startswith("CREATE")]), 6)
+
+        result = JobSearchService.save_job_listings(1, [job(n) for n in range(200, 300)])
+        self.assertEqual((result["saved_count"], result["updated_count"]), (50, 50))
+        self.assertEqual(len(self.rows()), 300)
+
+    def test_update_keeps_fields_missing_from_job_data(self):
+        JobSearchService.save_job_listings(1, [job(1, salary="$100k")])
+        JobSearchService.save_job_listings(1, [{"job_url": job(1)["job_url"], "title": "Staff Engineer"}], "multi_source")
+
+        row = self.rows()[job(1)["job_url"]]
+        self.assertEqual((row.title, row.company, row.salary, row.source), ("Staff Engineer", "Company 1", "$100k", "multi_source"))
+        self.assertEqual(row.posted_date.isoformat(), "2026-10-01T00:00:00")
+
+    def test_repeated_job_in_one_batch_inserts_then_updates(self):
+        result = JobSearchService.save_job_listings(1, [job(1), job(1, title="Renamed"), job(2)])
+        self.assertEqual((result["saved_count"], result["updated_count"]), (2, 1))
+        self.assertEqual(self.rows()[job(1)["job_url"]].title, "Renamed")
+
+    def test_jobs_without_url_use_title_company_hash(self):
+        result = JobSearchService.save_job_listings(1, [job(1, job_url=""), job(1, job_url="")])
+        self.assertEqual((result["saved_count"], result["updated_count"]), (1, 1))
+        self.assertEqual(len(self.rows()), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,200 @@
+import io
+import os
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+import sys
+from pathlib import Path
+
+from PyPDF2 import PdfWriter
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from latex_compile_service import LatexCompileService, preamble_key, project_hash
+
+PREAMBLE = "\\documentclass{article}\n\\input{custom-commands}\n"
+
+
+def pdf_with_pages(pages):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=612, height=792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+class FakePdflatex:
+    """Stands in for pdflatex: .aux holds the labels, the PDF has one page per \\newpage + 1."""
+
+    def __init__(self, delay=0.0, fail_ini=False, fail_fmt=False):
+        self.calls = []
+        self.delay = delay
+        self.fail_ini = fail_ini
+        self.fail_fmt = fail_fmt
+        self.lock = threading.Lock()
+
+    def __call__(self, cmd, cwd, **kwargs):
+        with self.lock:
+            self.calls.append(list(cmd))
+        time.sleep(self.delay)
+        if "-ini" in cmd:
+            if self.fail_ini:
+                raise subprocess.CalledProcessError(1, cmd, "! mylatexformat error", "")
+            jobname = next(arg.split("=", 1)[1] for arg in cmd if arg.startswith("-jobname="))
+            Path(cwd, jobname + ".fmt").write_bytes(b"format")
+            return subprocess.CompletedProcess(cmd, 0, "", "")
+        if self.fail_fmt and any(arg.startswith("-fmt=") for arg in cmd):
+            raise subprocess.CalledProcessError(1, cmd, "! format made by different executable", "")
+        main = Path(cwd, cmd[-1])
+        tex = main.read_text()
+        if "\\undefined" in tex:
+            raise subprocess.CalledProcessError(1, cmd, "! Undefined control sequence.", "")
+        labels = sorted(part.split("}")[0] for part in tex.split("\\label{")[1:])
+        main.with_suffix(".aux").write_text("\n".join(labels))
+        main.with_suffix(".pdf").write_bytes(pdf_with_pages(tex.count("\\newpage") + 1))
+        return subprocess.CompletedProcess(cmd, 0, "Output written", "")
+
+    def compiles(self):
+        return [c for c in self.calls if "-ini" not in c]
+
+
+def make_project(root, body, preamble=PREAMBLE):
+    os.makedirs(root, exist_ok=True)
+    Path(root, "main.tex").write_text(preamble + "\\begin{document}\n" + body + "\n\\end{document}\n")
+    Path(root, "custom-commands.tex").write_text("\\newcommand{\\resumeItem}[1]{\\item #1}\n")
+    return root
+
+
+class LatexCompileServiceTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_dir = Path(self.tmp.name, "cache")
+
+    def service(self, runner, **kwargs):
+        service = LatexCompileService(cache_dir=self.cache_dir, runner=runner, **kwargs)
+        self.addCleanup(service._executor.shutdown)
+        return service
+
+    def project(self, name, body, **kwargs):
+        return make_project(os.path.join(self.tmp.name, name), body, **kwargs)
+
+    def test_identical_projects_hit_the_cache(self):
+        runner = FakePdflatex()
+        service = self.service(runner, use_preamble_formats=False)
+        first, meta = service.compile(self.project("a", "Hello\\newpage World"), "main.tex")
+        second, cached_meta = service.compile(self.project("b", "Hello\\newpage World"), "main.tex")
+
+        self.assertEqual(first, second)
+        self.assertTrue(cached_meta["cached"])
+        self.assertEqual(cached_meta["page_count"], 2)
+        self.assertEqual(len(runner.compiles()), meta["passes"])
+        stats = service.get_stats()
+        self.assertEqual((stats["requests"], stats["cache_hits"], stats["hit_rate"]), (2, 1, 0.5))
+
+        # Build artifacts do not change the key; sources do
+        project = os.path.join(self.tmp.name, "a")
+        key = project_hash(project, "main.tex")
+        Path(project, "main.log").write_text("log")
+        Path(project, "main.pdf").write_bytes(b"%PDF-1.5 build output")
+        self.assertEqual(project_hash(project, "main.tex"), key)
+        # A PDF figure is a source
+        Path(project, "figure.pdf").write_bytes(b"%PDF-1.5 figure")
+        figure_key = project_hash(project, "main.tex")
+        self.assertNotEqual(figure_key, key)
+        Path(project, "figure.pdf").write_bytes(b"%PDF-1.5 new figure")
+        self.assertNotEqual(project_hash(project, "main.tex"), figure_key)
+        key = project_hash(project, "main.tex")
+        Path(project, "custom-commands.tex").write_text("changed")
+        self.assertNotEqual(project_hash(project, "main.tex"), key)
+
+    def test_second_pass_only_when_aux_changes(self):
+        runner = FakePdflatex()
+        service = self.service(runner, use_cache=False, use_preamble_formats=False)
+        project = self.project("a", "See \\label{sec:one}")
+        self.assertEqual(service.compile(project, "main.tex")[1]["passes"], 2)
+
+        # Body edit with the same labels: the .aux from the last compile is still right
+        make_project(project, "Edited \\label{sec:one}")
+        _, meta = service.compile(project, "main.tex")
+        self.assertEqual(meta["passes"], 1)
+        self.assertEqual(service.get_stats()["single_pass"], 1)
+
+    def test_preamble_format_built_once_per_template(self):
+        runner = FakePdflatex()
+        service = self.service(runner, use_cache=False)
+        first = self.project("a", "One")
+        second = self.project("b", "Two")
+        self.assertEqual(preamble_key(first, "main.tex"), preamble_key(second, "main.tex"))
+
+        self.assertTrue(service.compile(first, "main.tex")[1]["preamble_format"])
+        self.assertTrue(service.compile(second, "main.tex")[1]["preamble_format"])
+        self.assertEqual(sum("-ini" in c for c in runner.calls), 1)
+        self.assertTrue(all(any(a.startswith("-fmt=") for a in c) for c in runner.compiles()))
+        self.assertFalse(list(Path(second).glob("*.fmt")))
+
+        # A changed \input file is a different template
+        Path(second, "custom-commands.tex").write_text("\\newcommand{\\x}{y}\n")
+        self.assertNotEqual(preamble_key(first, "main.tex"), preamble_key(second, "main.tex"))
+
+    def test_unusable_formats_fall_back_to_plain_compiles(self):
+        runner = FakePdflatex(fail_ini=True)
+        service = self.service(runner, use_cache=False)
+        pdf, meta = service.compile(self.project("a", "One"), "main.tex")
+        self.assertIsNotNone(pdf)
+        self.assertFalse(meta["preamble_format"])
+        service.compile(self.project("b", "Two"), "main.tex")
+        self.assertEqual(sum("-ini" in c for c in runner.calls), 1)  # remembered as unsupported
+
+        runner = FakePdflatex(fail_fmt=True)
+        service = self.service(runner, use_cache=False, use_preamble_formats=True)
+        service.cache_dir = Path(self.tmp.name, "cache2")
+        pdf, meta = service.compile(self.project("c", "Three"), "main.tex")
+        self.assertIsNotNone(pdf)
+        self.assertFalse(meta["preamble_format"])
+
+    def test_failures_are_reported_and_not_cached(self):
+        runner = FakePdflatex()
+        service = self.service(runner, use_preamble_formats=False)
+        project = self.project("a", "\\undefined")
+        for _ in range(2):
+            pdf, meta = service.compile(project, "main.tex")
+            self.assertIsNone(pdf)
+            self.assertIn("Undefined control sequence", meta["stdout"])
+            self.assertEqual(meta["error"], "LaTeX compilation failed (compiler=pdflatex).")
+        self.assertEqual(service.get_stats()["failures"], 2)
+        self.assertEqual(service.compile(project, "missing.tex")[1]["error"], "Main .tex file not found at: missing.tex")
+
+    def test_concurrent_identical_compiles_run_once(self):
+        runner = FakePdflatex(delay=0.2)
+        service = self.service(runner, use_cache=False, use_preamble_formats=False)
+        project = self.project("a", "Hello")
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(service.compile(project, "main.tex")))
+                   for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(results), 4)
+        self.assertTrue(all(pdf == results[0][0] for pdf, _ in results))
+        self.assertEqual(len(runner.compiles()), 2)  # one compile, two passes
+        self.assertEqual(service.get_stats()["coalesced"], 3)
+
+    def test_cache_is_pruned_to_max_entries(self):
+        runner = FakePdflatex()
+        service = self.service(runner, use_preamble_formats=False, max_entries=2)
+        for n in range(4):
+            service.compile(self.project(f"p{n}", f"Body {n}"), "main.tex")
+            time.sleep(0.01)
+        self.assertEqual(len(list(self.cache_dir.glob("*.json"))), 2)
+        self.assertEqual(len(list(self.cache_dir.glob("*.pdf"))), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,217 @@
+import unittest
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from components.executors.learned_patterns_mapper import (
+    LearnedPatternsMapper,
+    invalidate_learned_patterns,
+    trigram_similarity,
+)
+
+
+NOW = datetime.now()
+
+# (source, label, id, profile_field, field_category, confidence, occurrences, last_used, cached_value, scope_rank)
+ROWS = [
+    ("user_override", "preferred pronouns", 1, None, "text_input", 0.9, 1, NOW, "they/them", 0),
+    ("user_override", "phone number", 2, "phone", "text_input", 0.6, 1, NOW, "555-0100", 0),
+    ("user_override", "phone number", 3, "mobile_phone", "text_input", 0.6, 1, NOW, "555-0199", 1),
+    ("global", "first name", 10, "first_name", "text_input", 0.95, 40, NOW, None, 0),
+    ("global", "first name", 11, "preferred_name", "dropdown", 0.80, 3, NOW, None, 0),
+    ("global", "veteran status", 12, "veteran_status", "dropdown", 0.9, 12, NOW - timedelta(days=30), None, 0),
+    ("global", "veteran status", 13, "military_status", "dropdown", 0.9, 12, NOW, None, 0),
+    ("global", "linkedin profile url", 14, "linkedin", "text_input", 0.9, 8, NOW, None, 0),
+]
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+
+class FakeDatabase:
+    """SessionLocal stand-in: the prefetch query returns ROWS, per-field queries return nothing."""
+
+    def __init__(self, rows=ROWS):
+        self.rows = rows
+        self.queries = []
+
+    def __call__(self):
+        return self
+
+    def execute(self, query, params):
+        sql = str(query)
+        self.queries.append(sql)
+        if "UNION ALL" in sql or "'global' AS source" in sql:
+            rows = [r for r in self.rows if params.get("user_id") or r[0] == "global"]
+            return FakeResult(rows)
+        return FakeResult([])
+
+    def close(self):
+        pass
+
+    def per_field_queries(self):
+        return [q for q in self.queries if "AS source" not in q]
+
+
+def make_mapper(user_id="user-1", rows=ROWS):
+    mapper = LearnedPatternsMapper(user_id=user_id)
+    mapper.engine = object()
+    mapper.SessionLocal = db = FakeDatabase(rows)
+    return mapper, db
+
+
+class TrigramSimilarityTests(unittest.TestCase):
+    def test_matches_pg_trgm(self):
+        # Reference values from PostgreSQL's pg_trgm
+        self.assertAlmostEqual(trigram_similarity("word", "two words"), 0.363636, places=5)
+        self.assertEqual(trigram_similarity("first name", "first name"), 1.0)
+        self.assertEqual(trigram_similarity("", "first name"), 0.0)
+
+
+class PrefetchedLookupTests(unittest.TestCase):
+    def test_prefetch_is_one_query_and_lookups_stay_local(self):
+        mapper, db = make_mapper()
+        self.assertTrue(mapper.prefetch("greenhouse.io"))
+        self.assertEqual(len(db.queries), 1)
+        self.assertIn("user_field_overrides", db.queries[0])
+        self.assertIn("field_label_patterns", db.queries[0])
+
+        for label in ("First Name*", "Veteran Status", "Preferred pronouns", "Favourite colour"):
+            mapper.map_field(label, "text_input", {})
+        self.assertEqual(len(db.queries), 1)
+
+    def test_user_override_ranking(self):
+        mapper, _ = make_mapper()
+        mapper.prefetch("greenhouse.io")
+
+        pronouns = mapper.map_field("Preferred Pronouns:", "text_input", {})
+        self.assertEqual((pronouns.source, pronouns.profile_field, pronouns.cached_value),
+                         ("user_override", "", "they/them"))
+
+        # Site-scoped row wins over the global (NULL site) row
+        phone = mapper.map_field("Phone number", "text_input", {})
+        self.assertEqual(phone.pattern_id, 3)
+
+    def test_global_exact_ranking_prefers_category_then_recency(self):
+        mapper, _ = make_mapper(user_id=None)
+        mapper.prefetch()
+        self.assertEqual(mapper.map_field("First name", "text_input", {}).pattern_id, 10)
+        self.assertEqual(mapper.map_field("First name", "dropdown", {}).pattern_id, 11)
+        self.assertEqual(mapper.map_field("Veteran status", "dropdown", {}).pattern_id, 13)
+
+    def test_fuzzy_lookup_uses_trigram_threshold(self):
+        mapper, _ = make_mapper(user_id=None)
+        mapper.prefetch()
+        self.assertEqual(mapper.map_field("LinkedIn profile URLs", "text_input", {}).profile_field, "linkedin")
+        self.assertIsNone(mapper.map_field("Last name", "text_input", {}))
+
+    def test_no_prefetch_keeps_per_field_queries(self):
+        mapper, db = make_mapper()
+        mapper.map_field("First name", "text_input", {})
+        self.assertGreaterEqual(len(db.per_field_queries()), 1)
+
+    def test_other_site_falls_back_to_queries(self):
+        mapper, db = make_mapper()
+        mapper.prefetch("greenhouse.io")
+        mapper.map_field("First name", "text_input", {}, site_domain="lever.co")
+        self.assertGreaterEqual(len(db.per_field_queries()), 1)
+
+    def test_expired_index_is_refetched_in_background(self):
+        mapper, db = make_mapper()
+        mapper.prefetch("greenhouse.io")
+        expired = mapper._index
+        expired.built_at -= mapper.CACHE_TTL_SECONDS + 1
+        # Answered from the expired index while the refresh runs off the caller's thread
+        self.assertEqual(mapper.map_field("First name", "text_input", {}).pattern_id, 10)
+        mapper._refresh_thread.join(timeout=5)
+        self.assertEqual(len(db.queries), 2)
+        self.assertEqual(db.per_field_queries(), [])
+        self.assertIsNot(mapper._index, expired)
+
+    def test_truncated_prefetch_misses_go_to_database(self):
+        mapper, db = make_mapper(user_id=None)
+        mapper.PREFETCH_GLOBAL_LIMIT = sum(1 for r in ROWS if r[0] == "global")
+        mapper.prefetch()
+        self.assertTrue(mapper._index.truncated)
+
+        self.assertEqual(mapper.map_field("First name", "text_input", {}).pattern_id, 10)
+        self.assertEqual(db.per_field_queries(), [])
+        mapper.map_field("Favourite colour", "text_input", {})
+        self.assertGreaterEqual(len(db.per_field_queries()), 1)
+
+    def test_untruncated_prefetch_miss_is_final(self):
+        mapper, db = make_mapper(user_id=None)
+        mapper.prefetch()
+        self.assertFalse(mapper._index.truncated)
+        self.assertIsNone(mapper.map_field("Favourite colour", "text_input", {}))
+        self.assertEqual(db.per_field_queries(), [])
+
+
+class InvalidationTests(unittest.TestCase):
+    def test_written_label_goes_back_to_database(self):
+        mapper, db = make_mapper()
+        mapper.prefetch("greenhouse.io")
+        invalidate_learned_patterns(["first name"])
+
+        mapper.map_field("First name", "text_input", {})
+        self.assertGreaterEqual(len(db.per_field_queries()), 1)
+
+        db.queries.clear()
+        mapper.map_field("Veteran status", "dropdown", {})
+        self.assertEqual(db.per_field_queries(), [])
+
+    def test_written_label_near_lookup_goes_back_to_database(self):
+        mapper, db = make_mapper()
+        mapper.prefetch("greenhouse.io")
+        invalidate_learned_patterns(["linkedin profile"])
+        mapper.map_field("LinkedIn profile URL", "text_input", {})
+        self.assertGreaterEqual(len(db.per_field_queries()), 1)
+
+    def test_other_users_overrides_do_not_invalidate(self):
+        mapper, db = make_mapper()
+        mapper.prefetch("greenhouse.io")
+        invalidate_learned_patterns(["first name"], user_id="someone-else")
+        mapper.map_field("First name", "text_input", {})
+        self.assertEqual(db.per_field_queries(), [])
+
+    def test_write_during_prefetch_marks_new_index_stale(self):
+        mapper, db = make_mapper()
+        execute = db.execute
+
+        def execute_with_write(query, params):
+            invalidate_learned_patterns(["first name"])
+            return execute(query, params)
+
+        db.execute = execute_with_write
+        mapper.prefetch("greenhouse.io")
+        self.assertIn("first name", mapper._index.stale_labels)
+
+    def test_full_invalidation_drops_index(self):
+        mapper, db = make_mapper()
+        mapper.prefetch("greenhouse.io")
+        invalidate_learned_patterns()
+        self.assertIsNone(mapper._index)
+
+
+class SiteDomainTests(unittest.TestCase):
+    def test_matches_human_fill_tracker_domain(self):
+        self.assertEqual(
+            LearnedPatternsMapper.site_domain_from_url("https://boards.Greenhouse.io/acme/jobs/1"),
+            "greenhouse.io",
+        )
+        self.assertIsNone(LearnedPatternsMapper.site_domain_from_url(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
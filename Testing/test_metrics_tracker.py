@@ -7,12 +7,17 @@ import csv
 import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 
 class TestMetricsTracker:
     """Tracks and persists test metrics for job application agent testing"""
 
+    TIME_ANALYSIS_HEADERS = [
+        "Application Complexity", "Count", "Avg Time (seconds)", "Manual Time Estimate (seconds)", "Time Saved (seconds)",
+        "Avg Settle Wait (seconds)", "Avg Settle Wait Saved (seconds)"
+    ]
+
     def __init__(self, base_dir: str = "Testing"):
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(exist_ok=True)
@@ -81,6 +86,8 @@ class TestMetricsTracker:
             "Failure Point",
             "State Saved for User?",
             "Total Time Taken (seconds)",
+            "Settle Wait Time (seconds)",
+            "Settle Wait Saved (seconds)",
 
             # Quality Metrics
             "Accuracy Score (1-10)",
@@ -97,6 +104,8 @@ class TestMetricsTracker:
             with open(self.main_results_file, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 writer.writerow(main_headers)
+        else:
+            self._upgrade_main_results_headers(main_headers)
 
         # Failure Analysis CSV
         failure_headers = ["Failure Type", "Count", "% of Total", "Fix Priority"]
@@ -113,12 +122,40 @@ class TestMetricsTracker:
                 writer.writerow(job_board_headers)
 
         # Time Analysis CSV
-        time_headers = ["Application Complexity", "Count", "Avg Time (seconds)", "Manual Time Estimate (seconds)", "Time Saved (seconds)"]
+        time_headers = self.TIME_ANALYSIS_HEADERS
         if not self.time_analysis_file.exists():
             with open(self.time_analysis_file, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 writer.writerow(time_headers)
 
+    @staticmethod
+    def _line_terminator(path: Path) -> str:
+        """Line ending of an existing CSV file, so rewrites keep it (csv's default for new files)"""
+        try:
+            with open(path, 'rb') as f:
+                first_line = f.readline()
+        except OSError:
+            return "\r\n"
+        return "\n" if first_line.endswith(b"\n") and not first_line.endswith(b"\r\n") else "\r\n"
+
+    def _upgrade_main_results_headers(self, main_headers: List[str]):
+        """Add columns introduced since the main results file was created, keeping existing rows"""
+        line_terminator = self._line_terminator(self.main_results_file)
+        with open(self.main_results_file, 'r', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            headers = reader.fieldnames or []
+            rows = list(reader)
+
+        missing = [h for h in main_headers if h not in headers]
+        if not missing:
+            return
+
+        with open(self.main_results_file, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=main_headers + [h for h in headers if h not in main_headers],
+                                    lineterminator=line_terminator)
+            writer.writeheader()
+            writer.writerows(rows)
+
     def record_test_result(self, metrics: Dict[str, Any]):
         """
         Record a test result to the main CSV file
@@ -263,30 +300,44 @@ class TestMetricsTracker:
 
         # Group by complexity
         complexity_stats = {
-            "Simple (<10 fields)": {"times": [], "manual_estimate": 15 * 60},
-            "Medium (10-20 fields)": {"times": [], "manual_estimate": 25 * 60},
-            "Complex (>20 fields)": {"times": [], "manual_estimate": 40 * 60}
+            "Simple (<10 fields)": {"times": [], "settle_waits": [], "settle_saved": [], "manual_estimate": 15 * 60},
+            "Medium (10-20 fields)": {"times": [], "settle_waits": [], "settle_saved": [], "manual_estimate": 25 * 60},
+            "Complex (>20 fields)": {"times": [], "settle_waits": [], "settle_saved": [], "manual_estimate": 40 * 60}
         }
 
         for result in results:
             form_type = result.get("Form Type", "")
 
+            if "simple" in form_type.lower():
+                stats = complexity_stats["Simple (<10 fields)"]
+            elif "medium" in form_type.lower():
+                stats = complexity_stats["Medium (10-20 fields)"]
+            elif "complex" in form_type.lower():
+                stats = complexity_stats["Complex (>20 fields)"]
+            else:
+                continue
+
             try:
                 time_taken = float(result.get("Total Time Taken (seconds)", 0))
                 if time_taken > 0:
-                    if "simple" in form_type.lower():
-                        complexity_stats["Simple (<10 fields)"]["times"].append(time_taken)
-                    elif "medium" in form_type.lower():
-                        complexity_stats["Medium (10-20 fields)"]["times"].append(time_taken)
-                    elif "complex" in form_type.lower():
-                        complexity_stats["Complex (>20 fields)"]["times"].append(time_taken)
+                    stats["times"].append(time_taken)
+            except (ValueError, TypeError):
+                pass
+
+            # Only runs that recorded settle waits (older rows leave these blank)
+            try:
+                settle_wait = float(result.get("Settle Wait Time (seconds)") or 0)
+                if settle_wait > 0:
+                    stats["settle_waits"].append(settle_wait)
+                    stats["settle_saved"].append(float(result.get("Settle Wait Saved (seconds)") or 0))
             except (ValueError, TypeError):
                 pass
 
         # Write to time analysis CSV
+        line_terminator = self._line_terminator(self.time_analysis_file)
         with open(self.time_analysis_file, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(["Application Complexity", "Count", "Avg Time (seconds)", "Manual Time Estimate (seconds)", "Time Saved (seconds)"])
+            writer = csv.writer(f, lineterminator=line_terminator)
+            writer.writerow(self.TIME_ANALYSIS_HEADERS)
 
             for complexity, stats in complexity_stats.items():
                 count = len(stats["times"])
@@ -294,7 +345,13 @@ class TestMetricsTracker:
                 manual_estimate = stats["manual_estimate"]
                 time_saved = manual_estimate - avg_time if avg_time > 0 else 0
 
-                writer.writerow([complexity, count, f"{avg_time:.1f}", manual_estimate, f"{time_saved:.1f}"])
+                # Blank (not 0.0) when no run in this bucket recorded settle waits
+                settle_count = len(stats["settle_waits"])
+                avg_settle_wait = f"{sum(stats['settle_waits']) / settle_count:.1f}" if settle_count > 0 else ""
+                avg_settle_saved = f"{sum(stats['settle_saved']) / settle_count:.1f}" if settle_count > 0 else ""
+
+                writer.writerow([complexity, count, f"{avg_time:.1f}", manual_estimate, f"{time_saved:.1f}",
+                                 avg_settle_wait, avg_settle_saved])
 
         print(f"✓ Time analysis updated")
 
@@ -356,6 +413,8 @@ class TestMetricsTracker:
             "Failure Point": "",  # Auth/CAPTCHA/Field Detection/Form Submission/Other
             "State Saved for User?": "No",
             "Total Time Taken (seconds)": 0,
+            "Settle Wait Time (seconds)": "",  # blank when the run logged no settle waits
+            "Settle Wait Saved (seconds)": "",
 
             # Quality Metrics
             "Accuracy Score (1-10)": 0,
@@ -0,0 +1,139 @@
+import asyncio
+import time
+import unittest
+import sys
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from components.page_settle import track_waits, wait_for_settle
+
+
+class FakeRequest:
+    def __init__(self, resource_type="xhr"):
+        self.resource_type = resource_type
+
+
+class FakePage:
+    """Reports DOM quiet time from a scripted last-mutation timestamp."""
+
+    def __init__(self, busy_for: float = 0.0, visible_after: float = 0.0):
+        self.created = time.monotonic()
+        self.busy_until = self.created + busy_for
+        self.visible_at = self.created + visible_after
+        self.handlers = {}
+        self.probes = 0
+
+    def on(self, event, handler):
+        self.handlers.setdefault(event, []).append(handler)
+
+    def emit(self, event, request):
+        for handler in self.handlers.get(event, []):
+            handler(request)
+
+    async def evaluate(self, script, selector):
+        self.probes += 1
+        now = time.monotonic()
+        last_mutation = min(now, self.busy_until)
+        visible = selector is None or now >= self.visible_at
+        return {"quietMs": (now - last_mutation) * 1000, "visible": visible}
+
+
+class NavigatingPage(FakePage):
+    async def evaluate(self, script, selector):
+        raise RuntimeError("Execution context was destroyed")
+
+
+class WaitForSettleTests(unittest.TestCase):
+    def test_quiet_page_returns_after_quiet_window(self):
+        page = FakePage()
+        started = time.monotonic()
+        settled = asyncio.run(wait_for_settle(page, quiet_ms=100, timeout_ms=2000))
+        self.assertTrue(settled)
+        self.assertLess(time.monotonic() - started, 0.5)
+
+    def test_waits_for_dom_mutations_to_stop(self):
+        page = FakePage(busy_for=0.3)
+        started = time.monotonic()
+        settled = asyncio.run(wait_for_settle(page, quiet_ms=100, timeout_ms=2000, network_idle=False))
+        elapsed = time.monotonic() - started
+        self.assertTrue(settled)
+        self.assertGreaterEqual(elapsed, 0.4)
+        self.assertLess(elapsed, 1.0)
+
+    def test_waits_for_in_flight_requests(self):
+        page = FakePage()
+        request = FakeRequest()
+
+        async def run():
+            waiter = asyncio.create_task(wait_for_settle(page, quiet_ms=100, timeout_ms=2000))
+            await asyncio.sleep(0.01)
+            page.emit("request", request)
+            await asyncio.sleep(0.3)
+            self.assertFalse(waiter.done())
+            page.emit("requestfinished", request)
+            return await waiter
+
+        started = time.monotonic()
+        self.assertTrue(asyncio.run(run()))
+        self.assertGreaterEqual(time.monotonic() - started, 0.4)
+
+    def test_ignores_long_lived_resource_types(self):
+        page = FakePage()
+
+        async def run():
+            waiter = asyncio.create_task(wait_for_settle(page, quiet_ms=100, timeout_ms=1000))
+            await asyncio.sleep(0.01)
+            page.emit("request", FakeRequest("websocket"))
+            return await waiter
+
+        self.assertTrue(asyncio.run(run()))
+
+    def test_waits_for_selector_visibility(self):
+        page = FakePage(visible_after=0.3)
+        started = time.monotonic()
+        settled = asyncio.run(wait_for_settle(page, selector="#form", quiet_ms=50, timeout_ms=2000))
+        self.assertTrue(settled)
+        self.assertGreaterEqual(time.monotonic() - started, 0.3)
+
+    def test_gives_up_at_timeout(self):
+        page = FakePage(busy_for=10)
+        started = time.monotonic()
+        settled = asyncio.run(wait_for_settle(page, quiet_ms=100, timeout_ms=300))
+        self.assertFalse(settled)
+        self.assertLess(time.monotonic() - started, 0.6)
+
+    def test_navigation_counts_as_busy(self):
+        settled = asyncio.run(wait_for_settle(NavigatingPage(), quiet_ms=50, timeout_ms=200))
+        self.assertFalse(settled)
+
+
+class TrackWaitsTests(unittest.TestCase):
+    def test_records_waits_and_replaced_pauses(self):
+        async def run():
+            with track_waits() as stats:
+                await wait_for_settle(FakePage(), quiet_ms=50, timeout_ms=1000, replaces_ms=1000, reason="next_page")
+                await wait_for_settle(FakePage(busy_for=10), quiet_ms=50, timeout_ms=100, replaces_ms=300, reason="next_page")
+            return stats
+
+        stats = asyncio.run(run())
+        self.assertEqual(stats.waits, 2)
+        self.assertEqual(stats.capped, 1)
+        self.assertAlmostEqual(stats.replaced_seconds, 1.3)
+        self.assertGreater(stats.saved_seconds, 0.5)
+        self.assertEqual(list(stats.by_reason), ["next_page"])
+        self.assertIn("Settle waits", stats.summary())
+
+    def test_untracked_waits_are_not_recorded(self):
+        async def run():
+            await wait_for_settle(FakePage(), quiet_ms=50, timeout_ms=500)
+            with track_waits() as stats:
+                pass
+            return stats
+
+        self.assertEqual(asyncio.run(run()).waits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
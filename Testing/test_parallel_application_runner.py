@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import time
+import unittest
+import sys
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+import gemini_budget
+from gemini_budget import GeminiBudget, gemini_call_slot
+from parallel_application_runner import ParallelApplicationRunner, domain_of
+
+
+class ParallelApplicationRunnerTests(unittest.TestCase):
+    def run_async(self, coro):
+        return asyncio.run(coro)
+
+    def test_throughput_scales_with_concurrency(self):
+        urls = [f"https://site{i}.example.com/job" for i in range(6)]
+
+        async def apply(url):
+            await asyncio.sleep(0.2)
+            return url
+
+        started = time.monotonic()
+        runner = ParallelApplicationRunner(max_concurrency=3, start_interval_s=0)
+        outcomes = self.run_async(runner.run(list(urls), apply))
+        elapsed = time.monotonic() - started
+
+        self.assertLess(elapsed, 0.6)  # two waves of three, not six in a row
+        self.assertEqual(sorted(o.result for o in outcomes), sorted(urls))
+
+    def test_per_domain_cap_skips_saturated_hosts(self):
+        urls = deque([
+            "https://boards.greenhouse.io/a/1",
+            "https://boards.greenhouse.io/b/2",
+            "https://www.lever.co/c/3",
+        ])
+        active = {}
+        peak = {}
+
+        async def apply(url):
+            domain = domain_of(url)
+            active[domain] = active.get(domain, 0) + 1
+            peak[domain] = max(peak.get(domain, 0), active[domain])
+            await asyncio.sleep(0.1)
+            active[domain] -= 1
+
+        order = []
+        runner = ParallelApplicationRunner(max_concurrency=3, per_domain_limit=1, start_interval_s=0)
+        self.run_async(runner.run(urls, apply, on_result=lambda o: order.append(o.item)))
+
+        self.assertEqual(peak, {"boards.greenhouse.io": 1, "lever.co": 1})
+        # lever.co started alongside the first greenhouse job instead of waiting behind the second
+        self.assertEqual(order[-1], "https://boards.greenhouse.io/b/2")
+
+    def test_should_start_false_stops_launching_and_leaves_rest_pending(self):
+        pending = deque(f"https://s{i}.example.com" for i in range(5))
+        ran = []
+
+        async def apply(url):
+            ran.append(url)
+
+        runner = ParallelApplicationRunner(max_concurrency=2, start_interval_s=0)
+        self.run_async(runner.run(pending, apply, should_start=lambda url: len(ran) < 2))
+
+        self.assertEqual(len(ran), 2)
+        self.assertEqual(len(pending), 3)
+
+    def test_errors_are_reported_and_budget_is_scoped_to_run(self):
+        budget = GeminiBudget(max_in_flight=1)
+        seen = []
+
+        async def apply(url):
+            seen.append(gemini_budget.get_gemini_budget())
+            raise RuntimeError("boom")
+
+        runner = ParallelApplicationRunner(gemini_budget=budget, start_interval_s=0)
+        outcomes = self.run_async(runner.run(["https://x.example.com"], apply))
+
+        self.assertIs(seen[0], budget)
+        self.assertIsNone(gemini_budget.get_gemini_budget())
+        self.assertIsInstance(outcomes[0].error, RuntimeError)
+
+
+class RunLinksParallelTests(unittest.TestCase):
+    LINKS = ["https://a.example.com/job", "https://b.example.com/job"]
+
+    def run_links(self, jobs_dict, user_id, hold_s=0.05):
+        import job_application_agent
+
+        calls = []
+        active = {"now": 0, "max": 0}
+
+        async def process_link(agent, link):
+            calls.append((agent.job_id, link))
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(hold_s)
+            active["now"] -= 1
+            agent._update_job_and_session_status("completed" if "a." in link else "failed")
+
+        class FakePlaywright:
+            async def start(self):
+                return self
+
+            async def stop(self):
+                pass
+
+        async def playwright_instance():
+            return FakePlaywright()
+
+        with mock.patch.object(job_application_agent.RefactoredJobAgent, "process_link", process_link), \
+                mock.patch.object(job_application_agent, "_get_or_create_playwright", playwright_instance), \
+                mock.patch.object(job_application_agent, "async_playwright", FakePlaywright):
+            asyncio.run(job_application_agent.run_links_with_refactored_agent(
+                list(self.LINKS), headless=True, keep_open=False, debug=False, hold_seconds=0,
+                slow_mo_ms=0, job_id="job-1", jobs_dict=jobs_dict, user_id=user_id, max_parallel=2,
+            ))
+        return calls, active["max"]
+
+    def test_each_link_reports_to_its_own_entry(self):
+        jobs = {"job-1": {"status": "queued", "logs": [], "last_updated": 0}}
+        # Held past the runner's one-second launch stagger so both overlap
+        calls, concurrent = self.run_links(jobs, user_id="42", hold_s=1.2)
+
+        self.assertEqual(concurrent, 2)
+        self.assertEqual(sorted(calls), [("job-1-1", self.LINKS[0]), ("job-1-2", self.LINKS[1])])
+        self.assertEqual(jobs["job-1-1"]["status"], "completed")
+        self.assertEqual(jobs["job-1-2"]["status"], "failed")
+        # The first link to finish must not mark the whole job completed
+        self.assertEqual(jobs["job-1"]["status"], "failed")
+        self.assertEqual(jobs["job-1"]["link_job_ids"], ["job-1-1", "job-1-2"])
+
+    def test_without_user_id_links_run_one_at_a_time(self):
+        jobs = {"job-1": {"status": "queued", "logs": [], "last_updated": 0}}
+        calls, concurrent = self.run_links(jobs, user_id=None)
+
+        self.assertEqual(concurrent, 1)
+        self.assertEqual([job_id for job_id, _ in calls], ["job-1", "job-1"])
+
+
+class GeminiBudgetTests(unittest.TestCase):
+    def tearDown(self):
+        gemini_budget.set_gemini_budget(None)
+
+    def test_max_in_flight_is_shared_across_threads(self):
+        gemini_budget.set_gemini_budget(GeminiBudget(max_in_flight=2))
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def call():
+            with gemini_call_slot():
+                with lock:
+                    state["active"] += 1
+                    state["peak"] = max(state["peak"], state["active"])
+                time.sleep(0.05)
+                with lock:
+                    state["active"] -= 1
+
+        with ThreadPoolExecutor(max_workers=6) as pool:
+            list(pool.map(lambda _: call(), range(6)))
+
+        self.assertEqual(state["peak"], 2)
+        self.assertEqual(gemini_budget.get_gemini_budget().get_stats()["requests"], 6)
+
+    def test_rate_limit_pauses_all_callers(self):
+        budget = GeminiBudget()
+        budget.note_rate_limited(0.2)
+        started = time.monotonic()
+        with budget.slot():
+            pass
+        self.assertGreaterEqual(time.monotonic() - started, 0.15)
+
+
+if __name__ == "__main__":
+    unittest.main()
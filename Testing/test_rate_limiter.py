@@ -0,0 +1,88 @@
+import os
+import threading
+import unittest
+import sys
+from pathlib import Path
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / "server"))
+os.environ.setdefault("DB_PASSWORD", "unused-in-tests")
+
+from rate_limiter import ProductionRateLimiter, UserLimitCache, UserLimitProfile
+
+
+class CountingLoader:
+    def __init__(self, profiles):
+        self.profiles = profiles
+        self.calls = 0
+
+    def __call__(self, user_id):
+        self.calls += 1
+        return self.profiles.get(user_id)
+
+
+class UserLimitCacheTests(unittest.TestCase):
+    def test_hits_until_ttl_or_invalidation(self):
+        loader = CountingLoader({"u1": UserLimitProfile("u1", is_admin=True)})
+        cache = UserLimitCache(loader, ttl_seconds=60)
+        for _ in range(100):
+            self.assertTrue(cache.get("u1").is_admin)
+            self.assertIsNone(cache.get("missing"))
+        self.assertEqual(loader.calls, 2)
+
+        loader.profiles["u1"] = UserLimitProfile("u1", is_admin=False)
+        cache.invalidate("u1")
+        self.assertFalse(cache.get("u1").is_admin)
+        self.assertEqual(loader.calls, 3)
+
+        expired = UserLimitCache(loader, ttl_seconds=0)
+        expired.get("u1")
+        expired.get("u1")
+        self.assertEqual(loader.calls, 5)
+
+    def test_invalidation_during_load_is_not_overwritten(self):
+        started, release = threading.Event(), threading.Event()
+
+        def slow_loader(user_id):
+            started.set()
+            release.wait(5)
+            return UserLimitProfile(user_id, bonus_job_applications_max=1)
+
+        cache = UserLimitCache(slow_loader, ttl_seconds=60)
+        worker = threading.Thread(target=cache.get, args=("u1",))
+        worker.start()
+        started.wait(5)
+        cache.invalidate("u1")  # e.g. a bonus was awarded mid-load
+        release.set()
+        worker.join(5)
+        self.assertNotIn("u1", cache._entries)
+
+
+class UserLimitTests(unittest.TestCase):
+    def setUp(self):
+        self.limiter = ProductionRateLimiter()
+        self.loader = CountingLoader({
+            "u1": UserLimitProfile("u1", bonus_resume_tailoring_max=3, bonus_job_applications_max=2),
+        })
+        self.limiter.user_cache = UserLimitCache(self.loader, ttl_seconds=60)
+
+    def test_bonus_applies_to_matching_limit_only(self):
+        profile, limit = self.limiter.get_user_limit("u1", "resume_tailoring_per_user_per_day")
+        self.assertEqual((profile.user_id, limit), ("u1", 5 + 3))
+        self.assertEqual(self.limiter.get_user_limit("u1", "job_applications_per_user_per_day")[1], 10 + 2)
+        self.assertEqual(self.limiter.get_user_limit("u1", "job_search_per_user_per_day")[1], 20)
+        self.assertEqual(self.limiter.get_user_limit("nobody", "job_search_per_user_per_day"), (None, 20))
+        self.assertEqual(self.loader.calls, 2)
+
+    def test_loader_errors_fall_back_to_base_limit(self):
+        def broken(user_id):
+            raise RuntimeError("database down")
+
+        self.limiter.user_cache = UserLimitCache(broken, ttl_seconds=60)
+        self.assertEqual(self.limiter.get_user_limit("u1", "resume_tailoring_per_user_per_day"), (None, 5))
+        self.assertFalse(self.limiter.is_admin_user("u1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
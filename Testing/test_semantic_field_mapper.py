@@ -0,0 +1,172 @@
+import tempfile
+import unittest
+import sys
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from components.executors.semantic_field_mapper import (
+    AnchorEmbeddingStore,
+    FIELD_ANCHORS,
+    SemanticFieldMapper,
+)
+
+
+class FakeModel:
+    """Bag-of-words embedding: labels sharing words get high cosine similarity."""
+
+    dim = 64
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, normalize_embeddings=True, batch_size=32, show_progress_bar=False):
+        self.calls.append(list(texts))
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for word in text.lower().replace("/", " ").split():
+                out[i, zlib.crc32(word.encode()) % self.dim] += 1.0
+            norm = np.linalg.norm(out[i])
+            if norm:
+                out[i] /= norm
+        return out
+
+    @property
+    def encoded_texts(self):
+        return sum(len(c) for c in self.calls)
+
+
+class SemanticFieldMapperTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self._saved = {k: getattr(SemanticFieldMapper, k) for k in (
+            "_model", "_anchor_matrix", "_anchor_fields", "_anchor_texts", "_anchor_keys",
+            "_anchor_store", "_label_cache", "_initialized", "_init_failed", "ANCHOR_STORE_DIR",
+        )}
+        self.addCleanup(self._restore)
+        self.fresh_process()
+
+    def _restore(self):
+        for k, v in self._saved.items():
+            setattr(SemanticFieldMapper, k, v)
+
+    def fresh_process(self, model=None):
+        """Reset class-level state as if the process had just started."""
+        SemanticFieldMapper.ANCHOR_STORE_DIR = self.tmp.name
+        SemanticFieldMapper._model = model or FakeModel()
+        SemanticFieldMapper._anchor_matrix = None
+        SemanticFieldMapper._anchor_fields = None
+        SemanticFieldMapper._anchor_texts = None
+        SemanticFieldMapper._anchor_keys = None
+        SemanticFieldMapper._anchor_store = None
+        SemanticFieldMapper._label_cache = OrderedDict()
+        SemanticFieldMapper._initialized = False
+        SemanticFieldMapper._init_failed = False
+        return SemanticFieldMapper._model
+
+    def test_map_fields_encodes_all_labels_in_one_pass(self):
+        model = SemanticFieldMapper._model
+        mapper = SemanticFieldMapper()
+        self.assertTrue(mapper._ensure_initialized())
+        model.calls.clear()
+
+        labels = ["Legal first name", "Email address", "Favourite colour", "Email address"]
+        matches = mapper.map_fields(labels)
+
+        self.assertEqual(model.calls, [["Legal first name", "Email address", "Favourite colour"]])
+        self.assertEqual(matches[0].profile_field, "first_name")
+        self.assertEqual(matches[1].profile_field, "email")
+        self.assertIsNone(matches[2])
+        self.assertEqual(matches[3], matches[1])
+
+    def test_map_field_matches_batch_result(self):
+        mapper = SemanticFieldMapper()
+        batch = mapper.map_fields(["Postal code", "Mobile phone number"])
+        self.assertEqual([mapper.map_field("Postal code"), mapper.map_field("Mobile phone number")], batch)
+
+    def test_label_cache_skips_repeat_encodes(self):
+        model = SemanticFieldMapper._model
+        mapper = SemanticFieldMapper()
+        mapper.map_fields(["Email address"])
+        encoded = model.encoded_texts
+        mapper.map_fields(["Email address"])
+        self.assertEqual(model.encoded_texts, encoded)
+
+    def test_label_cache_is_bounded(self):
+        mapper = SemanticFieldMapper()
+        mapper.LABEL_CACHE_SIZE = 3
+        mapper.map_fields([f"label {i}" for i in range(5)])
+        self.assertEqual(list(SemanticFieldMapper._label_cache), ["label 2", "label 3", "label 4"])
+
+    def test_restart_loads_anchors_from_store(self):
+        total = sum(len(a) for a in FIELD_ANCHORS.values())
+        first = SemanticFieldMapper._model
+        self.assertTrue(SemanticFieldMapper()._ensure_initialized())
+        self.assertEqual(first.encoded_texts, total)
+        expected = SemanticFieldMapper()._anchor_matrix.copy()
+
+        second = self.fresh_process()
+        self.assertTrue(SemanticFieldMapper()._ensure_initialized())
+        self.assertEqual(second.calls, [])
+        np.testing.assert_allclose(SemanticFieldMapper._anchor_matrix, expected)
+
+    def test_index_builds_without_model_when_store_is_warm(self):
+        SemanticFieldMapper()._ensure_initialized()
+        SemanticFieldMapper._model = None
+        SemanticFieldMapper._anchor_store = None
+        SemanticFieldMapper._initialized = False
+        self.assertTrue(SemanticFieldMapper()._ensure_initialized())
+        self.assertIsNone(SemanticFieldMapper._model)
+
+    def test_add_db_anchors_appends_only_new_anchors(self):
+        model = SemanticFieldMapper._model
+        mapper = SemanticFieldMapper()
+        mapper._ensure_initialized()
+        rows = SemanticFieldMapper._anchor_matrix.shape[0]
+        model.calls.clear()
+
+        mapper.add_db_anchors({"first_name": ["first name", "Prénom"], "pronouns": ["Pronouns"]})
+        self.assertEqual(model.calls, [["Prénom", "Pronouns"]])
+        self.assertEqual(SemanticFieldMapper._anchor_matrix.shape[0], rows + 2)
+        self.assertTrue(SemanticFieldMapper._initialized)
+        self.assertEqual(mapper.map_field("Pronouns").profile_field, "pronouns")
+
+        model.calls.clear()
+        SemanticFieldMapper().add_db_anchors({"pronouns": ["Pronouns"]})
+        self.assertEqual(model.calls, [])
+
+    def test_add_db_anchors_before_first_use_is_indexed_on_build(self):
+        mapper = SemanticFieldMapper()
+        mapper.add_db_anchors({"pronouns": ["Pronouns"]})
+        self.assertFalse(SemanticFieldMapper._initialized)
+        self.assertEqual(mapper.map_field("Pronouns").profile_field, "pronouns")
+
+
+class AnchorEmbeddingStoreTests(unittest.TestCase):
+    def test_round_trip_and_inconsistent_manifest(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            store = AnchorEmbeddingStore(tmp)
+            vectors = np.eye(3, dtype=np.float32)
+            store.append(["a", "b", "c"], vectors)
+            store.append(["b", "d"], np.ones((2, 3), dtype=np.float32))
+
+            reloaded = AnchorEmbeddingStore(tmp)
+            found, missing = reloaded.lookup(["d", "x", "a"])
+            self.assertEqual(missing, [1])
+            np.testing.assert_array_equal(found[2], vectors[0])
+            np.testing.assert_array_equal(found[0], np.ones(3))
+            self.assertEqual(len(reloaded), 4)
+            self.assertEqual(len([p for p in Path(tmp).glob("anchors-*.npy")]), 1)
+
+            other_model = AnchorEmbeddingStore(tmp, model_name="other-model")
+            self.assertEqual(len(other_model), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import asyncio
+import io
+import json
+import os
+import tempfile
+import unittest
+import sys
+from pathlib import Path
+
+from PIL import Image
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from components.session import session_store
+from components.session.session_manager import ApplicationSession, SessionManager
+from components.session.session_store import SessionStore
+
+
+def noisy_png(width=400, height=400):
+    img = Image.frombytes("RGB", (width, height), os.urandom(width * height * 3))
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+class CountingStore(SessionStore):
+    def __init__(self, storage_dir):
+        super().__init__(storage_dir)
+        self.shard_reads = 0
+        self.shard_writes = 0
+
+    def read_shard(self, session_id):
+        self.shard_reads += 1
+        return super().read_shard(session_id)
+
+    def write_shard(self, data):
+        self.shard_writes += 1
+        super().write_shard(data)
+
+
+class SessionManagerStorageTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = self.tmp.name
+
+    def manager(self):
+        manager = SessionManager(self.dir)
+        manager.store = CountingStore(self.dir)
+        return manager
+
+    def test_legacy_sessions_file_is_migrated(self):
+        legacy = [ApplicationSession(f"https://jobs.example.com/{i}", company="Acme").to_dict() for i in range(3)]
+        legacy[0]["action_history"] = [{"type": "fill", "success": True}]
+        with open(os.path.join(self.dir, "sessions.json"), "w", encoding="utf-8") as f:
+            json.dump(legacy, f)
+
+        manager = SessionManager(self.dir)
+        self.assertFalse(os.path.exists(os.path.join(self.dir, "sessions.json")))
+        self.assertEqual(len(manager.index), 3)
+        self.assertEqual(manager.sessions, {})
+        session = manager.get_session(legacy[0]["session_id"])
+        self.assertEqual(session.action_history, [{"type": "fill", "success": True}])
+
+    def test_restart_reads_index_only_and_loads_shards_lazily(self):
+        first = SessionManager(self.dir)
+        ids = [first.create_session(f"https://jobs.example.com/{i}").session_id for i in range(5)]
+        first.update_session(ids[0], status="completed")
+
+        manager = self.manager()
+        dashboard = manager.get_dashboard_data()
+        self.assertEqual(dashboard["total_sessions"], 5)
+        self.assertEqual(dashboard["status_counts"]["completed"], 1)
+        self.assertEqual(manager.store.shard_reads, 0)
+
+        self.assertEqual(manager.get_session(ids[0]).status, "completed")
+        self.assertEqual(manager.store.shard_reads, 1)
+        self.assertEqual(len(manager.get_sessions_by_status("in_progress")), 4)
+
+    def test_save_rewrites_only_changed_sessions(self):
+        manager = self.manager()
+        a = manager.create_session("https://jobs.example.com/a")
+        manager.create_session("https://jobs.example.com/b")
+        manager.store.shard_writes = 0
+
+        a.completion_percentage = 80
+        manager.save_sessions()
+        manager.save_sessions()
+        self.assertEqual(manager.store.shard_writes, 1)
+        self.assertEqual(SessionManager(self.dir).index[a.session_id]["completion_percentage"], 80)
+
+    def test_index_keeps_sessions_written_by_other_managers(self):
+        one, two = SessionManager(self.dir), SessionManager(self.dir)
+        one.create_session("https://jobs.example.com/1")
+        two.create_session("https://jobs.example.com/2")
+        self.assertEqual(len(SessionManager(self.dir).index), 2)
+
+    def test_delete_keeps_screenshot_shared_with_another_session(self):
+        manager = SessionManager(self.dir)
+        path = manager.store.put_screenshot(noisy_png(50, 50))
+        a = manager.create_session("https://jobs.example.com/a")
+        b = manager.create_session("https://jobs.example.com/b")
+        manager.update_session(a.session_id, screenshot_path=path)
+        manager.update_session(b.session_id, screenshot_path=path)
+
+        manager.delete_session(a.session_id)
+        self.assertTrue(os.path.exists(path))
+        manager.delete_session(b.session_id)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(SessionManager(self.dir).index, {})
+
+    def test_freeze_writes_compressed_state_and_deduplicated_screenshot(self):
+        class FakeContext:
+            async def cookies(self):
+                return [{"name": "sid", "value": "1"}]
+
+        class FakePage:
+            url = "https://jobs.example.com/apply/form"
+            viewport_size = {"width": 1280, "height": 720}
+            context = FakeContext()
+
+            async def screenshot(self, **kwargs):
+                return JPEG
+
+            async def evaluate(self, script):
+                return "{}"
+
+            async def content(self):
+                return "<html>" + "<input value='x'>" * 500 + "</html>"
+
+            async def title(self):
+                return "Application"
+
+        buf = io.BytesIO()
+        Image.new("RGB", (60, 60), "white").save(buf, format="JPEG")
+        JPEG = buf.getvalue()
+
+        manager = SessionManager(self.dir)
+        a = manager.create_session("https://jobs.example.com/a")
+        b = manager.create_session("https://jobs.example.com/b")
+        self.assertTrue(asyncio.run(manager.freeze_session(a.session_id, FakePage())))
+        self.assertTrue(asyncio.run(manager.freeze_session(b.session_id, FakePage())))
+
+        self.assertEqual(a.screenshot_path, b.screenshot_path)
+        state_file = a.browser_state["state_file"]
+        self.assertTrue(state_file.endswith(".json.gz"))
+        self.assertEqual(SessionStore.read_state(state_file)["cookies"][0]["name"], "sid")
+
+
+class ScreenshotCapTests(unittest.TestCase):
+    def test_large_screenshots_are_downscaled_under_the_cap(self):
+        original = session_store.SCREENSHOT_MAX_BYTES
+        session_store.SCREENSHOT_MAX_BYTES = 60_000
+        self.addCleanup(setattr, session_store, "SCREENSHOT_MAX_BYTES", original)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = SessionStore(tmp).put_screenshot(noisy_png())
+            self.assertLessEqual(os.path.getsize(path), 60_000)
+            with Image.open(path) as img:
+                self.assertEqual(img.format, "JPEG")
+                self.assertLess(img.width, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
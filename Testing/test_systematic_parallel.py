@@ -0,0 +1,159 @@
+import json
+import os
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "Agents"))
+
+from gemini_budget import gemini_lane, _current_lane
+from systematic_tailoring_complete import OverflowRecoveryComplete, SystematicEditorComplete
+
+
+def line(text, bullet_level=0, visual_lines=1):
+    """extract_document_structure-shaped line metadata."""
+    return {"text": text, "bullet_level": bullet_level, "visual_lines": visual_lines, "char_limit": 40,
+            "current_length": len(text), "line_number": 0}
+
+
+RESUME = [
+    line("PROFILE"),
+    line("Backend engineer building data platforms"),
+    line("EXPERIENCE"),
+    line("Built ingestion service in Python", bullet_level=1),
+    line("PROJECTS"),
+    line("Stream processor for click events", bullet_level=1),
+    line("SKILLS"),
+    line("Python, SQL, Kafka"),
+]
+
+VALIDATION = {"feasible_keywords": ["Python", "Kafka", "Spark"]}
+
+
+class SlowEditor(SystematicEditorComplete):
+    """Section editors that sleep instead of calling Gemini; profile is the slowest."""
+
+    DELAYS = {"profile": 0.3, "experience": 0.1, "projects": 0.2, "skills": 0.05}
+
+    def __init__(self):
+        super().__init__(genai_client=None)
+        self.lanes = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def _edit(self, section):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            self.lanes.append(_current_lane.get())
+        time.sleep(self.DELAYS[section["type"]])
+        with self.lock:
+            self.active -= 1
+        old = section["lines"][0]["text"]
+        return [{"old_text": old, "new_text": old + " (tailored)", "type": section["type"]}]
+
+    def _edit_profile_section(self, section, *args, **kwargs):
+        return self._edit(section)
+
+    _edit_experience_section = _edit_profile_section
+    _edit_projects_section = _edit_profile_section
+    _edit_skills_section = _edit_profile_section
+
+
+class FakeModels:
+    def __init__(self, reply):
+        self.reply = reply
+        self.prompts = []
+
+    def generate_content(self, model, contents, config=None):
+        self.prompts.append(contents)
+        return mock.Mock(text=self.reply(contents), usage_metadata=None)
+
+
+class FakeClient:
+    def __init__(self, reply):
+        self.models = FakeModels(reply)
+
+
+class SectionParallelTests(unittest.TestCase):
+    def run_phase_2(self, parallel):
+        editor = SlowEditor()
+        env = {"LAUNCHWAY_SECTION_PARALLEL": "on" if parallel else "off"}
+        with mock.patch.dict(os.environ, env), gemini_lane("tailoring"):
+            started = time.perf_counter()
+            results = editor.execute_phase_2(RESUME, VALIDATION, "", "Kafka role", conservative_mode=False)
+        return editor, results, time.perf_counter() - started
+
+    def test_parallel_matches_sequential_in_document_order(self):
+        serial_editor, serial, serial_time = self.run_phase_2(parallel=False)
+        editor, parallel, parallel_time = self.run_phase_2(parallel=True)
+
+        self.assertEqual(parallel["replacements"], serial["replacements"])
+        self.assertEqual([r["type"] for r in parallel["replacements"]],
+                         ["profile", "experience", "projects", "skills"])
+        self.assertEqual(parallel["section_line_changes"], serial["section_line_changes"])
+        self.assertTrue(parallel["parallel"])
+        self.assertFalse(serial["parallel"])
+        self.assertEqual(serial_editor.max_active, 1)
+        self.assertGreater(editor.max_active, 1)
+        self.assertLess(parallel_time, serial_time)
+        self.assertEqual(set(parallel["section_timings"]), {"PROFILE", "EXPERIENCE", "PROJECTS", "SKILLS"})
+        # Workers keep the caller's Gemini lane
+        self.assertEqual(set(editor.lanes), {"tailoring"})
+
+
+class BatchedCondensationTests(unittest.TestCase):
+    BULLETS = [
+        line("Successfully implemented various improvements to the ingestion pipeline throughput by 40% "
+             "across multiple teams and regions over two years", bullet_level=1, visual_lines=5),
+        line("Worked collaboratively with cross-functional team to develop and deploy new Kafka features "
+             "for the analytics platform used by 20 teams", bullet_level=1, visual_lines=5),
+        line("Effectively helped migrate various legacy services to Spark and reduced cost by 30% "
+             "while keeping all SLAs for the reporting stack", bullet_level=1, visual_lines=5),
+    ]
+
+    def recover(self, reply):
+        client = FakeClient(reply)
+        with mock.patch.dict(os.environ, {"GOOGLE_API_KEY": "", "GEMINI_API_KEY": ""}):
+            recovery = OverflowRecoveryComplete(client)
+        results = recovery.recover_from_overflow(self.BULLETS, ["Kafka"], current_pages=2, target_pages=1)
+        return client.models.prompts, results
+
+    @staticmethod
+    def batch_items(prompt):
+        return json.loads(prompt.split("max chars):\n", 1)[1].split("\n\nCONTEXT", 1)[0])
+
+    def test_one_request_for_all_bullets(self):
+        def reply(prompt):
+            items = self.batch_items(prompt)
+            return json.dumps({"condensed": [{"id": item["id"], "text": "Condensed bullet %d keeping 40%% and Kafka, Spark facts" % item["id"]}
+                                             for item in items]})
+
+        prompts, results = self.recover(reply)
+        self.assertEqual(len(prompts), 1)
+        self.assertEqual(results["lines_condensed"], 3)
+        self.assertTrue(all(r["type"] == "overflow_recovery_condense_incremental" for r in results["replacements"]))
+
+    def test_missing_answers_fall_back_to_single_requests(self):
+        def reply(prompt):
+            if prompt.startswith("Condense each"):
+                kafka = next(item["id"] for item in self.batch_items(prompt) if "Kafka" in item["text"])
+                answer = {"condensed": [{"id": kafka, "text": "Built Kafka features for 20 teams on the analytics platform"},
+                                        {"id": 99, "text": "unknown id"}]}
+                return "```json\n" + json.dumps(answer) + "\n```"
+            return "Condensed single bullet keeping every fact and all the metrics"
+
+        prompts, results = self.recover(reply)
+        self.assertEqual(len(prompts), 3)  # one batch, two singles
+        self.assertEqual(results["lines_condensed"], 3)
+        by_old_text = {r["old_text"]: r["new_text"] for r in results["replacements"]}
+        self.assertIn("Kafka features", by_old_text[self.BULLETS[1]["text"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
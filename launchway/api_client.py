@@ -320,6 +320,17 @@ class LaunchwayClient:
             logger.error(f"Failed to fetch applied job URLs: {e}")
             return set()
 
+    def get_applied_jobs_delta(self, since: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Applied-jobs membership keys changed since `since` (ISO timestamp), or
+        all of them when `since` is None.  Returns {full, version, added, removed}.
+        Raises LaunchwayAPIError so callers can fall back to their cached copy.
+        """
+        params = {"membership": "true"}
+        if since:
+            params["since"] = since
+        return self._get("/api/cli/applications", params=params)
+
     def get_ats_confidence(self, url: str) -> Dict[str, Any]:
         """
         Pre-run ATS compatibility check for a job URL.
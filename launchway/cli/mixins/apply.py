@@ -8,7 +8,6 @@ import re
 import time
 from datetime import datetime
 from pathlib import Path
-from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 from launchway.api_client import LaunchwayAPIError
 from launchway.cli.utils import Colors, format_credits
@@ -255,26 +254,9 @@ class ApplyMixin:
         return v in {"", "unknown", "unknown company", "unknown position", "n/a", "na"}
 
     def _canonicalize_job_url(self, url: str) -> str:
-        raw = (url or "").strip()
-        if not raw:
-            return ""
-        try:
-            split = urlsplit(raw)
-            scheme = (split.scheme or "https").lower()
-            netloc = split.netloc.lower()
-            path = split.path.rstrip("/")
-            keep_query_keys = {
-                "id", "jobid", "job_id", "pid", "jk", "gh_jid", "reqid", "requisitionid"
-            }
-            query_pairs = [
-                (k.lower(), v)
-                for k, v in parse_qsl(split.query, keep_blank_values=False)
-                if k and k.lower() in keep_query_keys
-            ]
-            query = urlencode(sorted(query_pairs))
-            return urlunsplit((scheme, netloc, path, query, ""))
-        except Exception:
-            return raw.rstrip("/").lower()
+        from Agents.job_dedup_index import canonicalize_job_url
+
+        return canonicalize_job_url(url)
 
     def _attempt_tracker_path(self) -> Path:
         return Path.home() / ".launchway" / "job_attempt_tracker.json"
@@ -1294,3 +1276,14 @@ Job description snippet:
                 urls.add(canonical)
         urls |= self._blocked_urls_from_tracker()
         return urls
+
+    def get_applied_jobs_membership(self):
+        """Full application history as an AppliedJobsMembership.
+
+        Cached per user under ~/.launchway; only applications changed since the
+        cached version are fetched (with a periodic full resync).
+        """
+        from Agents.applied_jobs_membership import DEFAULT_CACHE_DIR, sync_applied_jobs
+
+        cache_path = DEFAULT_CACHE_DIR / f"applied_jobs_{self.current_user['id']}.json"
+        return sync_applied_jobs(self.api.get_applied_jobs_delta, cache_path)
@@ -11,12 +11,11 @@ from collections import deque
 from datetime import datetime, timedelta
 from html.parser import HTMLParser
 from typing import Any, Dict, Optional
-from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import requests
 
 from launchway.api_client import LaunchwayAPIError
-from launchway.cli.utils import Colors, format_credits
+from launchway.cli.utils import Colors, format_credits, format_source_stats, source_job_count
 
 logger = logging.getLogger(__name__)
 
@@ -38,33 +37,9 @@ class ContinuousApplyMixin:
         return company_name if company_name else "Unknown Company"
 
     def _canonicalize_job_url(self, url: str) -> str:
-        raw = (url or "").strip()
-        if not raw:
-            return ""
-        try:
-            split = urlsplit(raw)
-            scheme = (split.scheme or "https").lower()
-            netloc = split.netloc.lower()
-            path = split.path.rstrip("/")
-            keep_query_keys = {
-                "id",
-                "jobid",
-                "job_id",
-                "pid",
-                "jk",
-                "gh_jid",
-                "reqid",
-                "requisitionid",
-            }
-            query_pairs = [
-                (k.lower(), v)
-                for k, v in parse_qsl(split.query, keep_blank_values=False)
-                if k and k.lower() in keep_query_keys
-            ]
-            query = urlencode(sorted(query_pairs))
-            return urlunsplit((scheme, netloc, path, query, ""))
-        except Exception:
-            return raw.rstrip("/").lower()
+        from Agents.job_dedup_index import canonicalize_job_url
+
+        return canonicalize_job_url(url)
 
     def _extract_job_url(self, job: Dict[str, Any]) -> Optional[str]:
         apply_links = job.get('apply_links', {})
@@ -126,8 +101,8 @@ class ContinuousApplyMixin:
         """Warm heavy local models once so first application run is smoother."""
         try:
             from Agents.components.executors.semantic_field_mapper import SemanticFieldMapper
-            mapper = SemanticFieldMapper()
-            if mapper._ensure_initialized():
+            # Anchor index comes from the on-disk store; the model loads in the background
+            if SemanticFieldMapper.prewarm():
                 self.print_info("✓ Semantic mapper pre-warmed")
         except Exception as e:
             logger.debug(f"Semantic mapper prewarm skipped: {e}")
@@ -601,6 +576,14 @@ class ContinuousApplyMixin:
         except ValueError:
             cooldown_minutes = 60
 
+        parallel_str = self.get_input("Applications to run at once, one tab each (max 4, default: 1): ").strip()
+        try:
+            parallel_applications = min(4, max(1, int(parallel_str))) if parallel_str else 1
+        except ValueError:
+            parallel_applications = 1
+        if parallel_applications > 1 and tailor_all:
+            self.print_info("Parallel mode: the tailoring choices above apply to every job (no per-job prompt).")
+
         print(f"\n{Colors.BOLD}Summary:{Colors.ENDC}")
         print(f"  Keywords:         {keywords}")
         print(f"  Location:         {location or 'Any'}")
@@ -612,6 +595,7 @@ class ContinuousApplyMixin:
         print(f"  Proxies:          {proxy_manager.get_stats()['active_proxies'] if proxy_manager else 'None (direct)'}")
         print(f"  Round Goal:       {session_goal} jobs per round")
         print(f"  Cooldown:         {cooldown_minutes} min after each completed round")
+        print(f"  Parallel:         {parallel_applications} application(s) at once")
 
         confirm = self.get_input(
             f"\n{Colors.WARNING}Start continuous automation? (type 'START' to confirm): {Colors.ENDC}"
@@ -653,6 +637,7 @@ class ContinuousApplyMixin:
             session_goal=session_goal,
             cooldown_minutes=cooldown_minutes,
             proxy_manager=proxy_manager,
+            parallel_applications=parallel_applications,
         )
 
     async def run_continuous_automation(
@@ -668,9 +653,11 @@ class ContinuousApplyMixin:
         session_goal:     int  = 5,
         cooldown_minutes: int  = 60,
         proxy_manager=None,
+        parallel_applications: int = 1,
     ):
         from Agents.multi_source_job_discovery_agent import MultiSourceJobDiscoveryAgent
         from Agents.gemini_query_optimizer import GeminiQueryOptimizer
+        from Agents.job_dedup_index import NearDuplicateJobIndex
 
         self.print_header("🚀 STARTING AUTOMATION ENGINE")
         max_rounds = max(1, int(os.getenv("LAUNCHWAY_CONTINUOUS_MAX_ROUNDS", "12")))
@@ -767,15 +754,22 @@ class ContinuousApplyMixin:
         overflow_queue          = deque()
 
         self.print_info("📋 Loading application history for deduplication...")
-        previously_applied_urls = self.get_applied_job_urls()
-        previously_applied_urls |= {
-            self._canonicalize_job_url(u) for u in list(previously_applied_urls) if u
-        }
-        if previously_applied_urls:
-            self.print_success(f"✓ Loaded {len(previously_applied_urls)} previously applied jobs")
+        # Server history comes from the cached membership (delta-synced); this
+        # set holds the local tracker's blocked URLs plus this run's submissions
+        applied_jobs = self.get_applied_jobs_membership()
+        previously_applied_urls = self._blocked_urls_from_tracker()
+        if len(applied_jobs) or previously_applied_urls:
+            self.print_success("✓ Loaded previous applications for deduplication")
         else:
             self.print_info("  → No previous applications found (fresh start)")
 
+        # Jobs queued in earlier rounds (or a run restarted within the TTL):
+        # discovery drops their copies from other sources before ranking
+        dedup_ttl_hours = max(0.0, float(os.getenv("LAUNCHWAY_JOB_DEDUP_TTL_HOURS", "12")))
+        known_jobs = NearDuplicateJobIndex.load(max_age_seconds=dedup_ttl_hours * 3600)
+        if len(known_jobs):
+            self.print_info(f"  → {len(known_jobs)} recently queued jobs loaded for near-duplicate filtering")
+
         def signal_handler(sig, frame):
             self.print_warning("\n\n⚠️  Stopping automation... (finishing current job)")
             automation_state['running'] = False
@@ -802,7 +796,10 @@ class ContinuousApplyMixin:
                     skipped_no_url += 1
                     continue
                 canonical_url = self._canonicalize_job_url(url)
-                if canonical_url in previously_applied_urls or url in previously_applied_urls:
+                # Same URL or company|title keys as discovery's already-applied filter
+                if (canonical_url in previously_applied_urls or url in previously_applied_urls
+                        or applied_jobs.contains(job_url=url, company=job.get('company'),
+                                                 title=job.get('title'))):
                     skipped_applied += 1
                     continue
                 title = str(job.get('title', 'Unknown')).strip() or "Unknown"
@@ -820,6 +817,7 @@ class ContinuousApplyMixin:
                     'relevance_score': job.get('relevance_score', 0),
                 }
                 processed_urls.add(dedupe_key)
+                known_jobs.add(job)
                 needed = session_goal - len(job_queue)
                 if needed > 0:
                     job_queue.append(entry)
@@ -942,6 +940,7 @@ class ContinuousApplyMixin:
                     user_id=str(self.current_user['id']),
                     proxy_manager=proxy_manager,
                     profile_data=self.current_profile,
+                    known_jobs=known_jobs,
                 )
                 for idx, q in enumerate(all_queries):
                     if len(job_queue) >= session_goal:
@@ -965,7 +964,7 @@ class ContinuousApplyMixin:
                         total_added += added
                         automation_state['jobs_discovered'] += added
                         source_counts = result.get('sources', {}) or {}
-                        raw_total = sum(int(v or 0) for v in source_counts.values())
+                        raw_total = sum(source_job_count(v) for v in source_counts.values())
                         after_dedup = int(result.get('total_before_filter', len(new_jobs)) or 0)
                         after_rank_and_applied = int(result.get('count', len(new_jobs)) or 0)
                         dropped_upstream = max(0, after_dedup - after_rank_and_applied)
@@ -985,8 +984,13 @@ class ContinuousApplyMixin:
                             f"upstream_dropped={dropped_upstream}, added={added}, queued_now={queued_now}, overflow={overflow_count}"
                         )
                         if source_counts:
-                            src_parts = ", ".join(f"{k}:{v}" for k, v in sorted(source_counts.items()))
-                            self.print_info(f"      sources: {src_parts}")
+                            self.print_info(f"      sources: {format_source_stats(source_counts)}")
+                        cache_totals = (result.get('cache_stats') or {}).get('totals') or {}
+                        if cache_totals.get('calls_saved'):
+                            self.print_info(
+                                f"      search cache: hit rate {cache_totals.get('hit_rate', 0):.0%}, "
+                                f"{int(cache_totals['calls_saved'])} API searches saved this session"
+                            )
                     except Exception as qe:
                         self.print_warning(f"    ⚠ Query error: {str(qe)[:80]}")
                         if self._is_rate_limit_error(qe):
@@ -997,6 +1001,11 @@ class ContinuousApplyMixin:
                 self.print_error(f"Discovery error: {str(e)[:100]}")
                 logger.error(f"Job discovery error: {e}", exc_info=True)
 
+            try:
+                known_jobs.save()
+            except Exception as e:
+                logger.debug(f"Could not save job dedup index: {e}")
+
             if len(job_queue) >= session_goal:
                 self.print_success(f"✓ Goal reached - {len(job_queue)} jobs queued"
                                    + (f" (+{len(overflow_queue)} overflow for next round)" if overflow_queue else ""))
@@ -1006,17 +1015,23 @@ class ContinuousApplyMixin:
             return len(job_queue) > 0
 
         async def _run_round() -> int:
-            round_submitted = 0
-            round_attempted = 0
-            round_goal      = min(session_goal, len(job_queue))
-            while job_queue and round_submitted < session_goal and automation_state['running']:
+            # GeminiBudget via the runner module so it is the instance gemini_compat sees
+            from Agents.parallel_application_runner import GeminiBudget, ParallelApplicationRunner
+
+            counters   = {'submitted': 0, 'attempted': 0}
+            round_goal = min(session_goal, len(job_queue))
+
+            def _should_start(job) -> bool:
+                # Stop launching once the goal is covered by submitted + in-flight jobs
+                if not automation_state['running'] or counters['submitted'] + runner.in_flight >= session_goal:
+                    return False
                 # Check credits before each job - stop gracefully when exhausted
                 try:
                     _avail, _daily = self.api.check_credit_available("job_applications")
                     if _daily.get("error") == "credit_check_unavailable":
                         self.print_error("Credit check unavailable mid-run. Stopping automation.")
                         automation_state['running'] = False
-                        break
+                        return False
                     if not _avail:
                         _cs = format_credits(
                             _daily.get("remaining"), _daily.get("limit"), _daily.get("reset_time")
@@ -1024,27 +1039,28 @@ class ContinuousApplyMixin:
                         self.print_warning(f"\nDaily job application limit reached ({_cs}).")
                         self.print_info("Stopping continuous mode. Limits reset at midnight UTC.")
                         automation_state['running'] = False
-                        break
+                        return False
                 except LaunchwayAPIError:
                     self.print_error("Credit check failed mid-run. Stopping automation.")
                     automation_state['running'] = False
-                    break
+                    return False
+                return True
 
-                job = job_queue.popleft()
-                round_attempted += 1
+            async def _apply(job) -> Dict[str, Any]:
+                counters['attempted'] += 1
                 automation_state['jobs_processed'] += 1
 
                 self.print_header(
                     f"ROUND {automation_state['round_number']}  •  "
-                    f"JOB {round_attempted}/{round_goal}  -  {job['company']}"
+                    f"JOB {counters['attempted']}/{round_goal}  -  {job['company']}"
                 )
                 self.print_info(f"Title:     {job['title']}")
                 self.print_info(f"URL:       {job['url'][:70]}...")
                 self.print_info(f"Relevance: {job['relevance_score']:.1f}%")
 
                 tailor_for_job = tailor_resume
-                replace_projects_for_job = False
-                if tailor_resume:
+                replace_projects_for_job = replace_projects_on_tailor if parallel_applications > 1 else False
+                if tailor_resume and parallel_applications == 1:
                     tailor_for_job = self.get_input_yn(
                         "Tailor resume for this job? (y/n, default: y): ",
                         default='y'
@@ -1055,7 +1071,7 @@ class ContinuousApplyMixin:
                             default='y' if replace_projects_on_tailor else 'n'
                         )
 
-                job_result = await self._apply_to_single_job_automated(
+                return await self._apply_to_single_job_automated(
                     job_url=job['url'],
                     job_title=job['title'],
                     company=job['company'],
@@ -1065,6 +1081,20 @@ class ContinuousApplyMixin:
                     headless=headless,
                     automation_state=automation_state,
                 )
+
+            async def _on_result(outcome) -> None:
+                job = outcome.item
+                job_result = outcome.result
+                if job_result is None:
+                    job_result = {
+                        'job_url':   job['url'],
+                        'job_title': job['title'],
+                        'company':   job['company'],
+                        'timestamp': datetime.now().isoformat(),
+                        'success':   False,
+                        'submitted': False,
+                        'error':     str(outcome.error)[:200],
+                    }
                 automation_state['progress_log'].append(job_result)
 
                 if job_result.get('success') or job_result.get('submitted'):
@@ -1072,7 +1102,7 @@ class ContinuousApplyMixin:
                     canonical = job.get('canonical_url') or self._canonicalize_job_url(job['url'])
                     if canonical:
                         previously_applied_urls.add(canonical)
-                    round_submitted += 1
+                    counters['submitted'] += 1
 
                 self._save_progress_report(report_filename, automation_state, job_queue)
 
@@ -1080,9 +1110,25 @@ class ContinuousApplyMixin:
                     automation_state['rate_limit_hits'] += 1
                     await self._handle_rate_limit(automation_state)
 
-                await asyncio.sleep(3)
+            # One application per tab; parallel_applications=1 runs jobs one at a time
+            runner = ParallelApplicationRunner(
+                max_concurrency=parallel_applications,
+                per_domain_limit=1,
+                start_interval_s=3.0,
+                gemini_budget=GeminiBudget(
+                    requests_per_minute=int(os.getenv("LAUNCHWAY_GEMINI_RPM", "0")) or None,
+                    max_in_flight=parallel_applications * 2,
+                ) if parallel_applications > 1 else None,
+            )
+            await runner.run(
+                job_queue,
+                _apply,
+                url_of=lambda job: job['url'],
+                should_start=_should_start,
+                on_result=_on_result,
+            )
 
-            return round_submitted
+            return counters['submitted']
 
         async def _cooldown():
             total_secs   = cooldown_minutes * 60
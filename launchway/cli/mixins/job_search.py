@@ -7,7 +7,7 @@ import sys
 from datetime import datetime
 
 from launchway.api_client import LaunchwayAPIError
-from launchway.cli.utils import Colors, format_credits
+from launchway.cli.utils import Colors, format_credits, format_source_stats
 
 logger = logging.getLogger(__name__)
 
@@ -136,7 +136,7 @@ class JobSearchMixin:
             results = result.get('data', [])
             if not results:
                 self.print_warning("No jobs found matching your criteria.")
-                self.print_info(f"Sources searched: {result.get('sources', {})}")
+                self.print_info(f"Sources searched: {format_source_stats(result.get('sources'))}")
                 self.pause()
                 return
 
@@ -155,7 +155,7 @@ class JobSearchMixin:
             self.clear_screen()
             self.print_header(f"SEARCH RESULTS ({len(results)} jobs found)")
             self.print_info(f"Average relevance score: {result.get('average_score', 0):.1f}%")
-            self.print_info(f"Sources: {result.get('sources', {})}\n")
+            self.print_info(f"Sources: {format_source_stats(result.get('sources'))}\n")
 
             for i, job in enumerate(results[:max_results], 1):
                 print(f"\n{Colors.BOLD}{i}. {job.get('title', 'Unknown Title')}{Colors.ENDC}")
@@ -30,6 +30,34 @@ def format_credits(remaining, limit, reset_time=None) -> str:
     return f"{remaining}/{limit} remaining today{resets}"
 
 
+def format_source_stats(sources) -> str:
+    """
+    Format the per-source map returned by search_all_sources,
+    e.g. 'Adzuna:12, JSearch:0 (timeout, 40012ms), TheMuse:7'.
+    Accepts both stats dicts and plain counts (older agent bundles).
+    """
+    parts = []
+    for name, stats in sorted((sources or {}).items()):
+        if not isinstance(stats, dict):
+            parts.append(f"{name}:{stats}")
+            continue
+        part = f"{name}:{stats.get('count', 0)}"
+        if stats.get('status') not in (None, 'ok', 'empty'):
+            part += f" ({stats.get('status')}, {stats.get('latency_ms') or 0:.0f}ms)"
+        parts.append(part)
+    return ", ".join(parts) if parts else "none"
+
+
+def source_job_count(stats) -> int:
+    """Job count from one search_all_sources `sources` entry (stats dict or plain count)."""
+    if isinstance(stats, dict):
+        stats = stats.get('count')
+    try:
+        return int(stats or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
 class Colors:
     """ANSI color codes for terminal output."""
     HEADER    = '\033[95m'
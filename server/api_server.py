@@ -26,10 +26,6 @@ from job_queue import job_queue
 from security_manager import require_secure_headers
 from database_optimizer import setup_database_optimizations
 from backup_manager import schedule_backups
-from bug_bounty import (
-    get_user_bonus_for_limit,
-    effective_limit,
-)
 from routes.account import create_account_blueprint
 from routes.auth import create_auth_blueprint
 from routes.beta import create_beta_blueprint
@@ -783,23 +779,8 @@ def _invalidate_credits_cache(user_id: str) -> None:
 
 
 def _get_user_and_limit(user_id: str, limit_type: str):
-    """Return (user_obj_or_none, effective_limit_int)."""
-    from database_config import SessionLocal, User
-    import uuid as uuid_module
-
-    base_limit = int(rate_limiter.LIMITS[limit_type].requests)
-    db = SessionLocal()
-    try:
-        user_uuid = uuid_module.UUID(str(user_id))
-        user = db.query(User).filter(User.id == user_uuid).first()
-        if not user:
-            return None, base_limit
-        bonus_limit = get_user_bonus_for_limit(user, limit_type)
-        return user, effective_limit(base_limit, bonus_limit)
-    except Exception:
-        return None, base_limit
-    finally:
-        db.close()
+    """Return (cached user limit profile or None, effective_limit_int)."""
+    return rate_limiter.get_user_limit(user_id, limit_type)
 
 
 # Auto job apply endpoint removed - feature only available via CLI
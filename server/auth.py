@@ -476,6 +476,10 @@ class AuthService:
             user.email_change_token_expires = None
             db.commit()
 
+            # Admin status is keyed on email; drop the rate limiter's cached copy
+            from rate_limiter import rate_limiter
+            rate_limiter.invalidate_user(str(user.id))
+
             logging.info(f"Email changed for user {user.id}: {old_email} → {new_email}")
 
             # Issue a fresh JWT with the new email so the user can stay logged in
@@ -24,6 +24,7 @@ from profile_strength import score_profile_strength, MIN_TAILORING_SCORE
 from resume_tailoring_agent import tailor_resume_and_return_url
 from latex_tailoring_agent import tailor_latex_resume_from_base64
 from job_application_agent import run_links_with_refactored_agent
+from gemini_budget import gemini_lane
 from multi_source_job_discovery_agent import MultiSourceJobDiscoveryAgent
 
 logger = logging.getLogger(__name__)
@@ -31,23 +32,7 @@ logger = logging.getLogger(__name__)
 
 def _get_effective_daily_limit(user_id: str, limit_type: str) -> int:
     """Return base daily limit plus any approved bug bounty bonus."""
-    from database_config import SessionLocal, User
-    from bug_bounty import get_user_bonus_for_limit, effective_limit
-    from uuid import UUID
-
-    base_limit = int(rate_limiter.LIMITS[limit_type].requests)
-    db = SessionLocal()
-    try:
-        user_uuid = UUID(str(user_id))
-        user = db.query(User).filter(User.id == user_uuid).first()
-        if not user:
-            return base_limit
-        bonus_limit = get_user_bonus_for_limit(user, limit_type)
-        return effective_limit(base_limit, bonus_limit)
-    except Exception:
-        return base_limit
-    finally:
-        db.close()
+    return rate_limiter.get_user_limit(user_id, limit_type)[1]
 
 
 @job_handler("resume_tailoring")
@@ -134,25 +119,27 @@ def handle_resume_tailoring(payload: Dict[str, Any]) -> Dict[str, Any]:
                     main_tex_path = profile.latex_main_tex_path or payload.get('latex_main_tex_path')
                 finally:
                     db.close()
-                tailoring_result = tailor_latex_resume_from_base64(
-                    latex_zip_base64=latex_zip_base64,
-                    main_tex_file=main_tex_path,
-                    job_description=job_description,
-                    job_title=job_title,
-                    company=company,
-                )
+                with gemini_lane("tailoring"):
+                    tailoring_result = tailor_latex_resume_from_base64(
+                        latex_zip_base64=latex_zip_base64,
+                        main_tex_file=main_tex_path,
+                        job_description=job_description,
+                        job_title=job_title,
+                        company=company,
+                    )
             else:
                 # Execute Google Docs resume tailoring
-                tailoring_result = tailor_resume_and_return_url(
-                    original_resume_url=original_resume_url,
-                    job_description=job_description,
-                    job_title=job_title,
-                    company=company,
-                    credentials=credentials,
-                    replace_projects_on_tailor=bool(payload.get("replace_projects_on_tailor", False)),
-                    user_full_name=user_full_name,
-                    user_id=user_id,
-                )
+                with gemini_lane("tailoring"):
+                    tailoring_result = tailor_resume_and_return_url(
+                        original_resume_url=original_resume_url,
+                        job_description=job_description,
+                        job_title=job_title,
+                        company=company,
+                        credentials=credentials,
+                        replace_projects_on_tailor=bool(payload.get("replace_projects_on_tailor", False)),
+                        user_full_name=user_full_name,
+                        user_id=user_id,
+                    )
 
             # Increment global Gemini usage counters
             # Note: User-specific resume_tailoring counter was already incremented by check_limit()
@@ -172,12 +159,14 @@ def handle_resume_tailoring(payload: Dict[str, Any]) -> Dict[str, Any]:
             )
             
             execution_time = time.time() - start_time
-            logger.info(f"Resume tailoring completed for user {user_id} in {execution_time:.2f}s")
+            phase_timings = (tailoring_result or {}).get('timings', {})
+            logger.info(f"Resume tailoring completed for user {user_id} in {execution_time:.2f}s (phases: {phase_timings})")
             
             return {
                 'success': True,
                 'tailoring_result': tailoring_result,
                 'execution_time': execution_time,
+                'phase_timings': phase_timings,
                 'job_title': job_title,
                 'company': company
             }
@@ -278,6 +267,12 @@ def handle_job_application(payload: Dict[str, Any]) -> Dict[str, Any]:
                 replace_projects_on_tailor=bool(payload.get("replace_projects_on_tailor", False)),
             )
         
+        # Each job runs in its own event loop; the browser pool keeps the
+        # user's Chrome warm between jobs instead of cold-starting it per job
+        if os.getenv("BROWSER_POOL_ENABLED", "true").lower() == "true":
+            from persistent_browser_manager import enable_browser_pool
+            enable_browser_pool()
+
         # Run the async job application
         loop = asyncio.new_event_loop()
         asyncio.set_event_loop(loop)
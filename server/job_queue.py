@@ -6,9 +6,10 @@ Handles concurrent users, priority scheduling, and resource management
 import asyncio
 import json
 import logging
+import math
 import time
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from enum import Enum
 from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass
@@ -49,6 +50,64 @@ else:
         decode_responses=True
     )
 
+# Lua scripts for the dispatch path. Each runs as a single EVALSHA, so the
+# worker's Redis cost per job is: BZPOPMAX + claim + release.
+
+# KEYS: delayed zset, delayed-score hash, ready queue
+# ARGV: now (epoch seconds), max jobs to promote
+# Moves due delayed jobs into the ready queue; returns {promoted, next_due|false}
+_PROMOTE_DUE_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, tonumber(ARGV[2]))
+for _, job_id in ipairs(due) do
+    local score = redis.call('HGET', KEYS[2], job_id)
+    redis.call('ZREM', KEYS[1], job_id)
+    redis.call('HDEL', KEYS[2], job_id)
+    if score then
+        redis.call('ZADD', KEYS[3], score, job_id)
+    end
+end
+local nxt = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+return {#due, nxt[2] or false}
+"""
+
+# KEYS: active set, ready queue, job_data:<id>, cancel_signal:<id>
+# ARGV: job_id, queue score, max active jobs
+# Takes an active slot for a popped job: {1, job_data, cancelled} on success,
+# {-1} if all slots are busy (job is put back), {0} if the job data expired
+_CLAIM_JOB_LUA = """
+local data = redis.call('HGETALL', KEYS[3])
+if #data == 0 then
+    return {0}
+end
+if redis.call('SCARD', KEYS[1]) >= tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[2], ARGV[2], ARGV[1])
+    return {-1}
+end
+redis.call('SADD', KEYS[1], ARGV[1])
+return {1, data, redis.call('EXISTS', KEYS[4])}
+"""
+
+# KEYS: active set, job_results:<id>, cancel_signal:<id>
+# ARGV: job_id, result ttl, field1, value1, ...
+# Stores the result (if any) and frees the job's active slot
+_RELEASE_JOB_LUA = """
+if #ARGV > 2 then
+    redis.call('HSET', KEYS[2], unpack(ARGV, 3))
+    redis.call('EXPIRE', KEYS[2], ARGV[2])
+end
+redis.call('SREM', KEYS[1], ARGV[1])
+redis.call('DEL', KEYS[3])
+return 1
+"""
+
+
+def _epoch(dt: datetime) -> float:
+    """Epoch seconds for a naive UTC datetime (as produced by datetime.utcnow())"""
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
 class JobStatus(Enum):
     QUEUED = "queued"
     RUNNING = "running"
@@ -211,8 +270,19 @@ class JobResult:
 class JobQueue:
     """
     Production job queue with priority scheduling and resource management
+
+    Dispatch is event driven: the worker blocks on BZPOPMAX over the ready
+    queue (plus a wake-up key) instead of polling, so an idle queue costs one
+    Redis command per DISPATCH_BLOCK_SECONDS. Jobs with a future scheduled_at
+    wait in a separate delayed sorted set and are promoted only once due.
     """
-    
+
+    # Longest a single BZPOPMAX blocks (bounds idle Redis usage and how long a
+    # newly submitted delayed job can go unnoticed by other processes' workers)
+    DISPATCH_BLOCK_SECONDS = 25
+    # Max delayed jobs moved to the ready queue per promotion
+    PROMOTE_BATCH = 100
+
     def __init__(self, max_workers: int = 5, max_concurrent_per_user: int = 2):
         self.max_workers = max_workers
         self.max_concurrent_per_user = max_concurrent_per_user
@@ -223,9 +293,28 @@ class JobQueue:
         self.active_jobs_key = "active_jobs"
         self.results_key = "job_results"
         self.user_jobs_key = "user_jobs"
+        self.delayed_key = f"{self.queue_key}:delayed"
+        self.delayed_scores_key = f"{self.queue_key}:delayed_scores"
+        self.wake_key = f"{self.queue_key}:wake"
         
-        # Thread pool for job execution
+        # Thread pool for job execution; a local slot is held from pop to completion
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_workers)
+
+        # Dispatch-path Lua scripts (EVALSHA, loaded on first use)
+        self._promote_script = redis_client.register_script(_PROMOTE_DUE_LUA)
+        self._claim_script = redis_client.register_script(_CLAIM_JOB_LUA)
+        self._release_script = redis_client.register_script(_RELEASE_JOB_LUA)
+
+        # Dispatch metrics (Redis commands issued by the worker/executor path)
+        self._stats_lock = threading.Lock()
+        self.dispatch_stats = {
+            "dispatched": 0,
+            "redis_ops": 0,
+            "idle_timeouts": 0,
+            "promoted": 0,
+            "requeued": 0,
+        }
         
         # Job handlers registry
         self.job_handlers: Dict[str, Callable] = {}
@@ -275,18 +364,29 @@ class JobQueue:
         priority_score = self._calculate_priority_score(job_request)
         
         try:
+            # All writes go out as one MULTI/EXEC round trip
+            pipe = redis_client.pipeline(transaction=True)
+            
             # Store job data
-            redis_client.hset(f"job_data:{job_id}", mapping=job_request.to_dict())
+            pipe.hset(f"job_data:{job_id}", mapping=job_request.to_dict())
             
-            # Add to priority queue
-            redis_client.zadd(self.queue_key, {job_id: priority_score})
+            if scheduled_at and scheduled_at > datetime.utcnow():
+                # Park in the delayed set until due; wake the worker so it
+                # re-reads the earliest due time
+                pipe.hset(self.delayed_scores_key, job_id, priority_score)
+                pipe.zadd(self.delayed_key, {job_id: _epoch(scheduled_at)})
+                pipe.zadd(self.wake_key, {"wake": 0})
+            else:
+                # Add to priority queue
+                pipe.zadd(self.queue_key, {job_id: priority_score})
             
             # Track user jobs
-            redis_client.sadd(f"{self.user_jobs_key}:{user_id}", job_id)
+            pipe.sadd(f"{self.user_jobs_key}:{user_id}", job_id)
             
             # Set expiration (24 hours)
-            redis_client.expire(f"job_data:{job_id}", 86400)
-            redis_client.expire(f"{self.user_jobs_key}:{user_id}", 86400)
+            pipe.expire(f"job_data:{job_id}", 86400)
+            pipe.expire(f"{self.user_jobs_key}:{user_id}", 86400)
+            pipe.execute()
             
             self.logger.info(f"Job {job_id} submitted for user {user_id} with priority {priority.name}")
             
@@ -296,24 +396,40 @@ class JobQueue:
             self.logger.error(f"Failed to submit job {job_id}: {e}")
             raise Exception(f"Failed to submit job: {e}")
     
+    # Number of replies _queue_status_reads adds to a pipeline
+    _STATUS_READS = 4
+
+    def _queue_status_reads(self, pipe, job_id: str):
+        """Queue the reads needed to resolve a job's status onto a pipeline"""
+        pipe.sismember(self.active_jobs_key, job_id)
+        pipe.zscore(self.queue_key, job_id)
+        pipe.zscore(self.delayed_key, job_id)
+        pipe.hgetall(f"{self.results_key}:{job_id}")
+
+    def _status_from_reads(self, job_id: str, reads: List[Any]) -> Optional[JobResult]:
+        """Resolve a job's status from the replies of _queue_status_reads"""
+        is_active, queue_score, delayed_score, result_data = reads
+        
+        # Check if job is active
+        if is_active:
+            return JobResult(job_id=job_id, status=JobStatus.RUNNING)
+        
+        # Check if job is in queue (ready or delayed)
+        if queue_score is not None or delayed_score is not None:
+            return JobResult(job_id=job_id, status=JobStatus.QUEUED)
+        
+        # Check results
+        if result_data:
+            return JobResult.from_dict(result_data)
+        
+        return None
+
     def get_job_status(self, job_id: str) -> Optional[JobResult]:
-        """Get job status and result"""
+        """Get job status and result (one round trip)"""
         try:
-            # Check if job is active
-            if redis_client.sismember(self.active_jobs_key, job_id):
-                return JobResult(job_id=job_id, status=JobStatus.RUNNING)
-            
-            # Check if job is in queue
-            if redis_client.zscore(self.queue_key, job_id) is not None:
-                return JobResult(job_id=job_id, status=JobStatus.QUEUED)
-            
-            # Check results
-            result_data = redis_client.hgetall(f"{self.results_key}:{job_id}")
-            if result_data:
-                result = JobResult.from_dict(result_data)
-                return result
-            
-            return None
+            pipe = redis_client.pipeline(transaction=False)
+            self._queue_status_reads(pipe, job_id)
+            return self._status_from_reads(job_id, pipe.execute())
             
         except Exception as e:
             self.logger.error(f"Error getting job status for {job_id}: {e}")
@@ -327,21 +443,28 @@ class JobQueue:
             if not job_data or job_data.get('user_id') != str(user_id):
                 return False
             
-            # Remove from queue
-            redis_client.zrem(self.queue_key, job_id)
-            
-            # If running, mark as cancelled (worker will handle)
-            if redis_client.sismember(self.active_jobs_key, job_id):
-                redis_client.hset(f"cancel_signal:{job_id}", "cancelled", "true")
-                redis_client.expire(f"cancel_signal:{job_id}", 300)
-            
             # Store cancelled result
             result = JobResult(
                 job_id=job_id,
                 status=JobStatus.CANCELLED,
                 completed_at=datetime.utcnow()
             )
-            redis_client.hset(f"{self.results_key}:{job_id}", mapping=result.to_dict())
+            
+            pipe = redis_client.pipeline(transaction=True)
+            # Remove from queue
+            pipe.zrem(self.queue_key, job_id)
+            pipe.zrem(self.delayed_key, job_id)
+            pipe.hdel(self.delayed_scores_key, job_id)
+            pipe.sismember(self.active_jobs_key, job_id)
+            pipe.hset(f"{self.results_key}:{job_id}", mapping=result.to_dict())
+            is_active = pipe.execute()[3]
+            
+            # If running, mark as cancelled (worker will handle)
+            if is_active:
+                pipe = redis_client.pipeline(transaction=True)
+                pipe.hset(f"cancel_signal:{job_id}", "cancelled", "true")
+                pipe.expire(f"cancel_signal:{job_id}", 300)
+                pipe.execute()
             
             self.logger.info(f"Job {job_id} cancelled by user {user_id}")
             return True
@@ -353,23 +476,30 @@ class JobQueue:
     def get_queue_stats(self) -> Dict[str, Any]:
         """Get queue statistics"""
         try:
-            queue_size = redis_client.zcard(self.queue_key)
-            active_jobs = redis_client.scard(self.active_jobs_key)
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.zcard(self.queue_key)
+            pipe.zcard(self.delayed_key)
+            pipe.scard(self.active_jobs_key)
             
             # Get priority breakdown
-            priority_breakdown = {}
             for priority in JobPriority:
                 min_score = priority.value * 1000000
                 max_score = (priority.value + 1) * 1000000 - 1
-                count = redis_client.zcount(self.queue_key, min_score, max_score)
-                priority_breakdown[priority.name] = count
+                pipe.zcount(self.queue_key, min_score, max_score)
+            
+            queue_size, delayed_jobs, active_jobs, *counts = pipe.execute()
+            priority_breakdown = {
+                priority.name: count for priority, count in zip(JobPriority, counts)
+            }
             
             return {
                 "queue_size": queue_size,
+                "delayed_jobs": delayed_jobs,
                 "active_jobs": active_jobs,
                 "max_workers": self.max_workers,
                 "priority_breakdown": priority_breakdown,
-                "worker_running": self.running
+                "worker_running": self.running,
+                "dispatch": self.get_dispatch_stats()
             }
             
         except Exception as e:
@@ -377,22 +507,32 @@ class JobQueue:
             return {"error": str(e)}
     
     def get_user_jobs(self, user_id: str) -> List[Dict[str, Any]]:
-        """Get all jobs for a user"""
+        """Get all jobs for a user (two round trips regardless of job count)"""
         try:
-            job_ids = redis_client.smembers(f"{self.user_jobs_key}:{user_id}")
-            jobs = []
+            job_ids = list(redis_client.smembers(f"{self.user_jobs_key}:{user_id}"))
+            if not job_ids:
+                return []
             
+            pipe = redis_client.pipeline(transaction=False)
             for job_id in job_ids:
-                status = self.get_job_status(job_id)
+                self._queue_status_reads(pipe, job_id)
+                pipe.hmget(f"job_data:{job_id}", "job_type", "created_at", "priority")
+            replies = pipe.execute()
+            
+            jobs = []
+            stride = self._STATUS_READS + 1
+            for i, job_id in enumerate(job_ids):
+                reads = replies[i * stride:(i + 1) * stride]
+                status = self._status_from_reads(job_id, reads[:-1])
                 if status:
-                    job_data = redis_client.hgetall(f"job_data:{job_id}")
-                    if job_data:
+                    job_type, created_at, priority = reads[-1]
+                    if created_at is not None:
                         jobs.append({
                             "job_id": job_id,
-                            "job_type": job_data.get("job_type"),
+                            "job_type": job_type,
                             "status": status.status.value,
-                            "created_at": job_data.get("created_at"),
-                            "priority": job_data.get("priority")
+                            "created_at": created_at,
+                            "priority": priority
                         })
             
             return sorted(jobs, key=lambda x: x["created_at"], reverse=True)
@@ -416,6 +556,11 @@ class JobQueue:
     def stop_worker(self):
         """Stop the background job worker"""
         self.running = False
+        try:
+            # Unblock the worker's BZPOPMAX instead of waiting out its timeout
+            redis_client.zadd(self.wake_key, {"wake": 0})
+        except Exception as e:
+            self.logger.warning(f"Could not wake job queue worker: {e}")
         if self.worker_thread:
             self.worker_thread.join(timeout=10)
         self.executor.shutdown(wait=True)
@@ -432,46 +577,119 @@ class JobQueue:
         error_lower = str(error_msg).lower()
         return any(keyword in error_lower for keyword in quota_keywords)
     
+    def get_dispatch_stats(self) -> Dict[str, Any]:
+        """Dispatch counters, including Redis commands per dispatched job"""
+        with self._stats_lock:
+            stats = dict(self.dispatch_stats)
+        stats["redis_ops_per_job"] = (
+            round(stats["redis_ops"] / stats["dispatched"], 2) if stats["dispatched"] else None
+        )
+        return stats
+
+    def _record(self, redis_ops: int = 1, **counters):
+        with self._stats_lock:
+            self.dispatch_stats["redis_ops"] += redis_ops
+            for name, value in counters.items():
+                self.dispatch_stats[name] += value
+
+    def _promote_due_jobs(self) -> float:
+        """Move due delayed jobs to the ready queue; returns the next due time (or inf)"""
+        promoted, next_due = self._promote_script(
+            keys=[self.delayed_key, self.delayed_scores_key, self.queue_key],
+            args=[time.time(), self.PROMOTE_BATCH],
+        )
+        self._record(promoted=int(promoted))
+        if promoted:
+            self.logger.info(f"Promoted {promoted} scheduled job(s) to the ready queue")
+        if int(promoted) >= self.PROMOTE_BATCH:
+            return 0.0  # more may be due already
+        return float(next_due) if next_due else math.inf
+
+    def _claim_job(self, job_id: str, priority_score: float) -> Optional[tuple]:
+        """Atomically take an active slot for a popped job; returns (JobRequest, cancelled)"""
+        reply = self._claim_script(
+            keys=[self.active_jobs_key, self.queue_key, f"job_data:{job_id}", f"cancel_signal:{job_id}"],
+            args=[job_id, priority_score, self.max_workers],
+        )
+        self._record()
+        outcome = int(reply[0])
+        if outcome == 0:
+            self.logger.warning(f"Job {job_id} has no data (expired?) - dropping")
+            return None
+        if outcome < 0:
+            # Every active slot is held (e.g. by another process's workers)
+            self._record(redis_ops=0, requeued=1)
+            time.sleep(1)
+            return None
+
+        flat = reply[1]
+        job_request = JobRequest.from_dict(dict(zip(flat[::2], flat[1::2])))
+
+        # Job queued by an older worker with a future scheduled_at: park it
+        if job_request.scheduled_at and job_request.scheduled_at > datetime.utcnow():
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.hset(self.delayed_scores_key, job_id, priority_score)
+            pipe.zadd(self.delayed_key, {job_id: _epoch(job_request.scheduled_at)})
+            pipe.srem(self.active_jobs_key, job_id)
+            pipe.execute()
+            self._record()
+            return None
+
+        return job_request, bool(int(reply[2]))
+
+    def _release_job(self, job_id: str, result: Optional[JobResult]):
+        """Store the job result (if any) and free its active slot in one round trip"""
+        args = [job_id, 86400]  # results kept 24 hours
+        if result is not None:
+            for field_name, value in result.to_dict().items():
+                args.extend([field_name, value])
+        self._release_script(
+            keys=[self.active_jobs_key, f"{self.results_key}:{job_id}", f"cancel_signal:{job_id}"],
+            args=args,
+        )
+        self._record()
+
     def _worker_loop(self):
         """Main worker loop with exponential backoff for Redis errors"""
         consecutive_errors = 0
         max_backoff = 300  # Maximum 5 minutes backoff
+        next_due = 0.0  # check the delayed set on startup
         
         while self.running:
+            # Wait (locally, no Redis traffic) for a free execution slot
+            if not self._slots.acquire(timeout=1):
+                continue
+            slot_held = True
             try:
-                # Check if we can process more jobs
-                active_count = redis_client.scard(self.active_jobs_key)
-                if active_count >= self.max_workers:
-                    time.sleep(1)
-                    continue
+                now = time.time()
+                if next_due <= now:
+                    next_due = self._promote_due_jobs()
+                block_for = self.DISPATCH_BLOCK_SECONDS
+                if next_due - now < block_for:
+                    block_for = max(1, math.ceil(next_due - now))
                 
-                # Get next job from queue
-                job_data = redis_client.zpopmax(self.queue_key, 1)
-                if not job_data:
-                    time.sleep(1)
+                # Block until a job (or a wake-up) arrives
+                popped = redis_client.bzpopmax([self.queue_key, self.wake_key], timeout=block_for)
+                self._record()
+                if not popped:
+                    self._record(redis_ops=0, idle_timeouts=1)
                     continue
                 
-                job_id, priority_score = job_data[0]
-                
-                # Load job details
-                job_details = redis_client.hgetall(f"job_data:{job_id}")
-                if not job_details:
+                key, job_id, priority_score = popped
+                if key == self.wake_key:
+                    # A delayed job was submitted (or we're stopping): re-read the due time
+                    next_due = 0.0
                     continue
                 
-                job_request = JobRequest.from_dict(job_details)
-                
-                # Check if job is scheduled for future
-                if job_request.scheduled_at and job_request.scheduled_at > datetime.utcnow():
-                    # Put back in queue
-                    redis_client.zadd(self.queue_key, {job_id: priority_score})
-                    time.sleep(1)
+                claimed = self._claim_job(job_id, priority_score)
+                if claimed is None:
                     continue
+                job_request, cancelled = claimed
                 
-                # Mark as active
-                redis_client.sadd(self.active_jobs_key, job_id)
-                
-                # Submit to thread pool
-                future = self.executor.submit(self._execute_job, job_request)
+                # Submit to thread pool; the slot is released when the job finishes
+                self.executor.submit(self._execute_job, job_request, cancelled)
+                slot_held = False
+                self._record(redis_ops=0, dispatched=1)
                 
                 # Don't wait for completion here - let it run async
                 
@@ -510,11 +728,15 @@ class JobQueue:
                     # Exponential backoff for other errors (shorter)
                     backoff_time = min(60, 5 * (2 ** min(consecutive_errors - 1, 3)))
                     time.sleep(backoff_time)
+            finally:
+                if slot_held:
+                    self._slots.release()
     
-    def _execute_job(self, job_request: JobRequest):
+    def _execute_job(self, job_request: JobRequest, cancelled: bool = False):
         """Execute a single job"""
         job_id = job_request.job_id
         start_time = time.time()
+        result = None
         
         try:
             self.logger.info(f"Starting job {job_id} (type: {job_request.job_type})")
@@ -528,8 +750,8 @@ class JobQueue:
             # Execute with timeout
             result_data = None
             try:
-                # Check for cancellation signal
-                if redis_client.exists(f"cancel_signal:{job_id}"):
+                # Check for cancellation signal (read when the job was claimed)
+                if cancelled:
                     raise Exception("Job was cancelled")
                 
                 # Execute handler
@@ -557,26 +779,21 @@ class JobQueue:
                 )
                 
                 self.logger.error(f"Job {job_id} failed: {e}")
-            
-            # Store result
-            try:
-                result_dict = result.to_dict()
-                redis_client.hset(f"{self.results_key}:{job_id}", mapping=result_dict)
-                redis_client.expire(f"{self.results_key}:{job_id}", 86400)  # 24 hours
-                self.logger.info(f"Job {job_id} completed with status {result.status.value}")
-            except Exception as store_error:
-                self.logger.error(f"Failed to store job result for {job_id}: {store_error}")
-                self.logger.error(f"Result dict: {result_dict if 'result_dict' in locals() else 'N/A'}")
 
         except Exception as e:
             self.logger.error(f"Critical error executing job {job_id}: {e}")
             
         finally:
-            # Always remove from active jobs
-            redis_client.srem(self.active_jobs_key, job_id)
-            
-            # Clean up cancellation signal
-            redis_client.delete(f"cancel_signal:{job_id}")
+            # Store result, remove from active jobs and clean up the cancellation
+            # signal in one script; always free the local slot
+            try:
+                self._release_job(job_id, result)
+                if result is not None:
+                    self.logger.info(f"Job {job_id} completed with status {result.status.value}")
+            except Exception as store_error:
+                self.logger.error(f"Failed to store job result for {job_id}: {store_error}")
+            finally:
+                self._slots.release()
     
     def _calculate_priority_score(self, job_request: JobRequest) -> float:
         """Calculate priority score for job ordering"""
@@ -592,16 +809,21 @@ class JobQueue:
     def _get_user_active_jobs(self, user_id: str) -> List[str]:
         """Get list of active jobs for a user"""
         try:
-            user_jobs = redis_client.smembers(f"{self.user_jobs_key}:{user_id}")
-            active_jobs = []
+            user_jobs = list(redis_client.smembers(f"{self.user_jobs_key}:{user_id}"))
+            if not user_jobs:
+                return []
             
+            pipe = redis_client.pipeline(transaction=False)
             for job_id in user_jobs:
-                if redis_client.sismember(self.active_jobs_key, job_id):
-                    active_jobs.append(job_id)
-                elif redis_client.zscore(self.queue_key, job_id) is not None:
-                    active_jobs.append(job_id)
+                pipe.sismember(self.active_jobs_key, job_id)
+                pipe.zscore(self.queue_key, job_id)
+                pipe.zscore(self.delayed_key, job_id)
+            replies = pipe.execute()
             
-            return active_jobs
+            return [
+                job_id for i, job_id in enumerate(user_jobs)
+                if replies[3 * i] or replies[3 * i + 1] is not None or replies[3 * i + 2] is not None
+            ]
             
         except Exception as e:
             self.logger.error(f"Error getting user active jobs: {e}")
@@ -7,41 +7,62 @@ import hashlib
 
 class JobSearchService:
     
+    # Rows per IN lookup / bulk INSERT / bulk UPDATE statement
+    BULK_CHUNK_SIZE = 500
+
     @staticmethod
     def save_job_listings(user_id: int, jobs_data: List[Dict[str, Any]], search_source: str = "rapidapi") -> Dict[str, Any]:
-        """Save job listings to PostgreSQL database"""
+        """Save job listings to PostgreSQL database
+
+        Existing rows are looked up with one IN query per chunk and written
+        with bulk INSERT/UPDATE statements, so a search result costs a few
+        round trips instead of one SELECT per job.
+        """
         db = SessionLocal()
         try:
             saved_count = 0
             updated_count = 0
-            
+            now = datetime.utcnow()
+
+            # Group repeats of an external_id so each row is written once;
+            # later repeats apply on top like successive updates would
+            batches: Dict[str, List[Dict[str, Any]]] = {}
             for job_data in jobs_data:
-                # Create a unique external_id from the job data
-                # Use job URL if available, otherwise create hash from title + company
-                if 'job_url' in job_data and job_data['job_url']:
-                    external_id = job_data['job_url']
-                else:
-                    # Create hash from title + company for uniqueness
-                    title = job_data.get('title', '')
-                    company = job_data.get('company', '')
-                    unique_string = f"{title}_{company}_{search_source}"
-                    external_id = hashlib.md5(unique_string.encode()).hexdigest()
-                
-                # Check if job listing already exists
-                existing_job = db.query(JobListing).filter(
-                    JobListing.external_id == external_id
-                ).first()
-                
-                if existing_job:
-                    # Update existing job listing
-                    JobSearchService._update_job_listing(existing_job, job_data, search_source)
-                    updated_count += 1
+                external_id = JobSearchService._external_id(job_data, search_source)
+                batches.setdefault(external_id, []).append(job_data)
+
+            external_ids = list(batches)
+            chunk_size = JobSearchService.BULK_CHUNK_SIZE
+            existing_ids: Dict[str, int] = {}
+            for i in range(0, len(external_ids), chunk_size):
+                chunk = external_ids[i:i + chunk_size]
+                existing_ids.update(
+                    db.query(JobListing.external_id, JobListing.id)
+                    .filter(JobListing.external_id.in_(chunk))
+                    .all()
+                )
+
+            new_rows = []
+            update_rows = []
+            for external_id, batch in batches.items():
+                if external_id in existing_ids:
+                    values = {'id': existing_ids[external_id]}
+                    rows, updates = update_rows, batch
+                    updated_count += len(batch)
                 else:
-                    # Create new job listing
-                    new_job = JobSearchService._create_job_listing(job_data, external_id, search_source)
-                    db.add(new_job)
+                    values = JobSearchService._listing_values(batch[0], external_id, search_source, now)
+                    rows, updates = new_rows, batch[1:]
                     saved_count += 1
-            
+                    updated_count += len(updates)
+                for job_data in updates:
+                    values.update(JobSearchService._update_values(job_data, search_source, now))
+                rows.append(values)
+
+            for i in range(0, len(new_rows), chunk_size):
+                db.bulk_insert_mappings(JobListing, new_rows[i:i + chunk_size])
+            for i in range(0, len(update_rows), chunk_size):
+                db.bulk_update_mappings(JobListing, update_rows[i:i + chunk_size])
+
             db.commit()
             
             return {
@@ -61,6 +82,16 @@ class JobSearchService:
         finally:
             db.close()
     
+    @staticmethod
+    def _external_id(job_data: Dict[str, Any], source: str) -> str:
+        """Unique external_id for a job: its URL, or a hash of title + company"""
+        if 'job_url' in job_data and job_data['job_url']:
+            return job_data['job_url']
+        title = job_data.get('title', '')
+        company = job_data.get('company', '')
+        unique_string = f"{title}_{company}_{source}"
+        return hashlib.md5(unique_string.encode()).hexdigest()
+    
     @staticmethod
     def get_job_listings(user_id: int = None, limit: int = 100, offset: int = 0) -> Dict[str, Any]:
         """Retrieve job listings from database"""
@@ -130,35 +161,47 @@ class JobSearchService:
     @staticmethod
     def _create_job_listing(job_data: Dict[str, Any], external_id: str, source: str) -> JobListing:
         """Create a new JobListing object from job data"""
-        return JobListing(
-            external_id=external_id,
-            title=job_data.get('title', ''),
-            company=job_data.get('company', ''),
-            location=job_data.get('location', ''),
-            salary=job_data.get('salary', ''),
-            description=job_data.get('description', ''),
-            requirements=job_data.get('requirements', ''),
-            job_url=job_data.get('job_url', ''),
-            source=source,
-            posted_date=JobSearchService._parse_date(job_data.get('posted_date', '')),
-            created_at=datetime.utcnow(),
-            updated_at=datetime.utcnow(),
-            is_active=True
-        )
+        return JobListing(**JobSearchService._listing_values(job_data, external_id, source, datetime.utcnow()))
     
     @staticmethod
     def _update_job_listing(job_listing: JobListing, job_data: Dict[str, Any], source: str):
         """Update existing job listing with new data"""
-        job_listing.title = job_data.get('title', job_listing.title)
-        job_listing.company = job_data.get('company', job_listing.company)
-        job_listing.location = job_data.get('location', job_listing.location)
-        job_listing.salary = job_data.get('salary', job_listing.salary)
-        job_listing.description = job_data.get('description', job_listing.description)
-        job_listing.requirements = job_data.get('requirements', job_listing.requirements)
-        job_listing.job_url = job_data.get('job_url', job_listing.job_url)
-        job_listing.source = source
-        job_listing.posted_date = JobSearchService._parse_date(job_data.get('posted_date', '')) or job_listing.posted_date
-        job_listing.updated_at = datetime.utcnow()
+        for column, value in JobSearchService._update_values(job_data, source, datetime.utcnow()).items():
+            setattr(job_listing, column, value)
+    
+    @staticmethod
+    def _listing_values(job_data: Dict[str, Any], external_id: str, source: str, now: datetime) -> Dict[str, Any]:
+        """Column values for a new job listing"""
+        return {
+            'external_id': external_id,
+            'title': job_data.get('title', ''),
+            'company': job_data.get('company', ''),
+            'location': job_data.get('location', ''),
+            'salary': job_data.get('salary', ''),
+            'description': job_data.get('description', ''),
+            'requirements': job_data.get('requirements', ''),
+            'job_url': job_data.get('job_url', ''),
+            'source': source,
+            'posted_date': JobSearchService._parse_date(job_data.get('posted_date', '')),
+            'created_at': now,
+            'updated_at': now,
+            'is_active': True,
+        }
+    
+    @staticmethod
+    def _update_values(job_data: Dict[str, Any], source: str, now: datetime) -> Dict[str, Any]:
+        """Columns to change on an existing listing: only fields present in job_data"""
+        values = {
+            column: job_data[column]
+            for column in ('title', 'company', 'location', 'salary', 'description', 'requirements', 'job_url')
+            if column in job_data
+        }
+        values['source'] = source
+        posted_date = JobSearchService._parse_date(job_data.get('posted_date', ''))
+        if posted_date:
+            values['posted_date'] = posted_date
+        values['updated_at'] = now
+        return values
     
     @staticmethod
     def _job_listing_to_dict(job_listing: JobListing) -> Dict[str, Any]:
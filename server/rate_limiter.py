@@ -10,7 +10,7 @@ import logging
 import threading
 import uuid
 from typing import Dict, Any, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from functools import wraps
 from collections import defaultdict, deque
 from flask import request, jsonify, g
@@ -41,6 +41,90 @@ else:
         decode_responses=True
     )
 
+# Lua scripts are registered once and invoked with EVALSHA; redis-py's Script
+# re-sends the source only if the server answers NOSCRIPT (e.g. after a restart)
+
+# Atomic prune+count+insert on a sorted set (sliding windows)
+SLIDING_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local now = tonumber(ARGV[1])
+local window_start = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local ttl = tonumber(ARGV[4])
+local member = ARGV[5]
+
+redis.call('ZREMRANGEBYSCORE', key, 0, window_start)
+local current = redis.call('ZCARD', key)
+if current >= limit then
+    return {0, current}
+end
+
+redis.call('ZADD', key, now, member)
+redis.call('EXPIRE', key, ttl)
+return {1, current + 1}
+"""
+
+# Atomic check+increment of a per-window counter (daily limits).  The first
+# check of a window carries over usage recorded in the legacy per-request
+# sorted set (KEYS[2]) so switching formats does not reset anyone's limits.
+FIXED_WINDOW_SCRIPT = """
+local key = KEYS[1]
+local legacy_key = KEYS[2]
+local limit = tonumber(ARGV[1])
+local expire_at = tonumber(ARGV[2])
+local window_start = tonumber(ARGV[3])
+local amount = tonumber(ARGV[4])
+
+local current = tonumber(redis.call('GET', key) or '-1')
+if current < 0 then
+    current = 0
+    if redis.call('TYPE', legacy_key).ok == 'zset' then
+        current = redis.call('ZCOUNT', legacy_key, '(' .. window_start, '+inf')
+    end
+    redis.call('SET', key, current)
+    redis.call('EXPIREAT', key, expire_at)
+end
+
+if limit >= 0 and current >= limit then
+    return {0, current}
+end
+return {1, redis.call('INCRBY', key, amount)}
+"""
+
+ACQUIRE_SLOT_SCRIPT = """
+local key = KEYS[1]
+local max_slots = tonumber(ARGV[1])
+local ttl = tonumber(ARGV[2])
+local current = tonumber(redis.call('GET', key) or '0')
+
+if current >= max_slots then
+    return {0, current}
+end
+
+local updated = redis.call('INCR', key)
+redis.call('EXPIRE', key, ttl)
+return {1, updated}
+"""
+
+RELEASE_SLOT_SCRIPT = """
+local key = KEYS[1]
+local current = tonumber(redis.call('GET', key) or '0')
+if current <= 1 then
+    redis.call('DEL', key)
+    return 0
+end
+return redis.call('DECR', key)
+"""
+
+sliding_window_script = redis_client.register_script(SLIDING_WINDOW_SCRIPT)
+fixed_window_script = redis_client.register_script(FIXED_WINDOW_SCRIPT)
+acquire_slot_script = redis_client.register_script(ACQUIRE_SLOT_SCRIPT)
+release_slot_script = redis_client.register_script(RELEASE_SLOT_SCRIPT)
+
+# Seconds a user's admin flag / bonus limits are cached per process (0 disables)
+USER_CACHE_TTL_SECONDS = float(os.getenv('RATE_LIMIT_USER_CACHE_TTL', '300'))
+
+
 @dataclass
 class RateLimit:
     """Rate limit configuration"""
@@ -48,6 +132,98 @@ class RateLimit:
     window: int  # seconds
     burst: int = None  # burst allowance
 
+
+@dataclass
+class UserLimitProfile:
+    """The parts of a user row the rate-limit path needs"""
+    user_id: str
+    is_admin: bool = False
+    bonus_resume_tailoring_max: int = 0
+    bonus_job_applications_max: int = 0
+
+
+class UserLimitCache:
+    """
+    TTL'd in-process cache of UserLimitProfile per user ID.
+
+    Code that changes a user's email or bonuses calls invalidate(), which is
+    broadcast over Redis pub/sub so every server process drops its copy; the
+    TTL bounds staleness if a message is missed.
+    """
+
+    CHANNEL = "rate_limit:user_invalidate"
+
+    def __init__(self, loader, ttl_seconds: float = USER_CACHE_TTL_SECONDS, redis_conn=None):
+        self.logger = logging.getLogger(__name__)
+        self._loader = loader
+        self.ttl_seconds = ttl_seconds
+        self._redis = redis_conn
+        self._entries: Dict[str, Tuple[float, Optional[UserLimitProfile]]] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._listener_started = False
+
+    def get(self, user_id: str) -> Optional[UserLimitProfile]:
+        """Cached profile for `user_id` (None if no such user); loader errors propagate."""
+        key = str(user_id)
+        if self.ttl_seconds <= 0:
+            return self._loader(key)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry and entry[0] > now:
+            return entry[1]
+
+        self._ensure_listener()
+        generation = self._generation
+        profile = self._loader(key)
+        with self._lock:
+            # An invalidation during the load means this profile may be stale
+            if generation == self._generation:
+                self._entries[key] = (now + self.ttl_seconds, profile)
+        return profile
+
+    def drop(self, user_id: Optional[str] = None) -> None:
+        """Forget one user (or everyone) in this process only."""
+        with self._lock:
+            self._generation += 1
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(str(user_id), None)
+
+    def invalidate(self, user_id: str) -> None:
+        """Forget `user_id` here and in every other process."""
+        self.drop(user_id)
+        if self._redis is None:
+            return
+        try:
+            self._redis.publish(self.CHANNEL, str(user_id))
+        except Exception as e:
+            self.logger.debug(f"Could not broadcast rate-limit cache invalidation: {e}")
+
+    def _ensure_listener(self) -> None:
+        if self._redis is None or self._listener_started:
+            return
+        with self._lock:
+            if self._listener_started:
+                return
+            self._listener_started = True
+        threading.Thread(target=self._listen, name="rate-limit-user-cache", daemon=True).start()
+
+    def _listen(self) -> None:
+        while True:
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.CHANNEL)
+                # Messages may have been missed while (re)connecting
+                self.drop()
+                for message in pubsub.listen():
+                    if message.get("type") == "message":
+                        self.drop(message.get("data"))
+            except Exception as e:
+                self.logger.debug(f"Rate-limit cache invalidation listener reconnecting: {e}")
+                time.sleep(30)
+
 class ProductionRateLimiter:
     """
     Production-grade rate limiter with Redis backend
@@ -101,6 +277,31 @@ class ProductionRateLimiter:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self.user_cache = UserLimitCache(self._load_user_profile, redis_conn=redis_client)
+
+    def _load_user_profile(self, user_id: str) -> Optional[UserLimitProfile]:
+        """Load the admin flag and bonus limits for a user (one column-only query)."""
+        # Import here to avoid circular imports
+        from database_config import SessionLocal, User
+
+        user_uuid = uuid.UUID(str(user_id))
+        db = SessionLocal()
+        try:
+            row = (
+                db.query(User.email, User.bonus_resume_tailoring_max, User.bonus_job_applications_max)
+                .filter(User.id == user_uuid)
+                .first()
+            )
+        finally:
+            db.close()
+        if row is None:
+            return None
+        return UserLimitProfile(
+            user_id=str(user_id),
+            is_admin=bool(row.email) and row.email in self.ADMIN_EMAILS,
+            bonus_resume_tailoring_max=int(row.bonus_resume_tailoring_max or 0),
+            bonus_job_applications_max=int(row.bonus_job_applications_max or 0),
+        )
 
     def is_admin_user(self, user_id: str) -> bool:
         """
@@ -113,36 +314,43 @@ class ProductionRateLimiter:
             True if user is admin, False otherwise
         """
         try:
-            # Import here to avoid circular imports
-            from database_config import get_db, get_user_by_id
-            import uuid
-
-            # Get database session
-            db = next(get_db())
-            try:
-                # Convert string user_id to UUID
-                user_uuid = uuid.UUID(str(user_id))
-
-                # Look up user by ID
-                user = get_user_by_id(db, user_uuid)
-
-                if user and user.email:
-                    return user.email in self.ADMIN_EMAILS
-
-                return False
-            finally:
-                db.close()
-
+            profile = self.user_cache.get(user_id)
+            return bool(profile and profile.is_admin)
         except Exception as e:
             self.logger.error(f"Error checking admin status for user {user_id}: {e}")
             return False
 
+    def get_user_limit(self, user_id: str, limit_type: str) -> Tuple[Optional[UserLimitProfile], int]:
+        """Return (cached profile or None, base limit plus any approved bug bounty bonus)."""
+        from bug_bounty import get_user_bonus_for_limit, effective_limit
+
+        base_limit = int(self.LIMITS[limit_type].requests)
+        try:
+            profile = self.user_cache.get(user_id)
+        except Exception as e:
+            self.logger.error(f"Error loading rate-limit profile for user {user_id}: {e}")
+            return None, base_limit
+        if profile is None:
+            return None, base_limit
+        return profile, effective_limit(base_limit, get_user_bonus_for_limit(profile, limit_type))
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Call after changing a user's email or bonus limits."""
+        self.user_cache.invalidate(user_id)
+
+    @staticmethod
+    def _daily_window() -> Tuple[int, int]:
+        """(today's UTC midnight, next UTC midnight) as timestamps."""
+        now_utc = datetime.now(timezone.utc)
+        today_midnight = now_utc.replace(hour=0, minute=0, second=0, microsecond=0)
+        return int(today_midnight.timestamp()), int((today_midnight + timedelta(days=1)).timestamp())
+
     def _get_key(self, limit_type: str, identifier: str) -> str:
         """Generate Redis key for rate limit tracking"""
         return f"rate_limit:{limit_type}:{identifier}"
     
     def _get_window_key(self, limit_type: str, identifier: str, window_start: int) -> str:
-        """Generate Redis key for sliding window"""
+        """Generate Redis key for a fixed window's counter"""
         return f"rate_limit_window:{limit_type}:{identifier}:{window_start}"
 
     def _check_limit_local_fallback(
@@ -230,80 +438,41 @@ class ProductionRateLimiter:
 
         # Check if identifier is a user ID (UUID string) and if that user is admin
         try:
-            # Try to parse as UUID - if successful, check if admin
-            import uuid
-            try:
-                user_uuid = uuid.UUID(str(identifier))
-                # It's a valid UUID, check if admin
-                if self.is_admin_user(str(identifier)):
-                    self.logger.info(f"Admin user {identifier} bypassing rate limit for {limit_type}")
-                    return True, {
-                        "allowed": True,
-                        "admin": True,
-                        "limit": "unlimited",
-                        "remaining": "unlimited"
-                    }
-            except ValueError:
-                # Not a UUID, probably an IP address - proceed with normal rate limiting
-                pass
-        except Exception as e:
-            # If anything goes wrong, proceed with normal rate limiting
-            self.logger.debug(f"Admin check skipped for identifier {identifier}: {e}")
+            uuid.UUID(str(identifier))
+        except ValueError:
+            # Not a UUID, probably an IP address - proceed with normal rate limiting
             pass
+        else:
+            if self.is_admin_user(str(identifier)):
+                self.logger.debug(f"Admin user {identifier} bypassing rate limit for {limit_type}")
+                return True, {
+                    "allowed": True,
+                    "admin": True,
+                    "limit": "unlimited",
+                    "remaining": "unlimited"
+                }
 
         limit = self.LIMITS[limit_type]
         limit_requests = int(custom_limit) if custom_limit is not None else int(limit.requests)
         key = self._get_key(limit_type, identifier)
 
         try:
-            # Calculate reset time and window start
-            from datetime import datetime, timezone, timedelta
             now = int(time.time())
 
-            # For daily limits, use UTC midnight
-            if limit.window == 86400:  # Daily limit
-                now_utc = datetime.now(timezone.utc)
-                today_midnight = now_utc.replace(hour=0, minute=0, second=0, microsecond=0)
-                next_midnight = (now_utc + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-                window_start = int(today_midnight.timestamp())
-                reset_time = int(next_midnight.timestamp())
+            if limit.window == 86400:  # Daily limit: counter per UTC day
+                window_start, reset_time = self._daily_window()
+                allowed_int, resulting_count = fixed_window_script(
+                    keys=[self._get_window_key(limit_type, identifier, window_start), key],
+                    args=[limit_requests, reset_time + 3600, window_start, 1],
+                )
             else:
                 # For other limits, use sliding window
                 window_start = now - limit.window
                 reset_time = now + limit.window
-
-            request_member = f"{now}:{uuid.uuid4().hex}"
-
-            # Atomic prune+count+insert to avoid race-condition bypasses.
-            script = """
-            local key = KEYS[1]
-            local now = tonumber(ARGV[1])
-            local window_start = tonumber(ARGV[2])
-            local limit = tonumber(ARGV[3])
-            local ttl = tonumber(ARGV[4])
-            local member = ARGV[5]
-
-            redis.call('ZREMRANGEBYSCORE', key, 0, window_start)
-            local current = redis.call('ZCARD', key)
-            if current >= limit then
-                return {0, current}
-            end
-
-            redis.call('ZADD', key, now, member)
-            redis.call('EXPIRE', key, ttl)
-            return {1, current + 1}
-            """
-
-            allowed_int, resulting_count = redis_client.eval(
-                script,
-                1,
-                key,
-                now,
-                window_start,
-                limit_requests,
-                limit.window * 2,
-                request_member
-            )
+                allowed_int, resulting_count = sliding_window_script(
+                    keys=[key],
+                    args=[now, window_start, limit_requests, limit.window * 2, f"{now}:{uuid.uuid4().hex}"],
+                )
 
             if int(allowed_int) == 0:
                 return False, {
@@ -357,6 +526,14 @@ class ProductionRateLimiter:
         now = int(time.time())
         
         try:
+            if limit_type in self.LIMITS and self.LIMITS[limit_type].window == 86400:
+                window_start, reset_time = self._daily_window()
+                fixed_window_script(
+                    keys=[self._get_window_key(limit_type, identifier, window_start), key],
+                    args=[-1, reset_time + 3600, window_start, amount],
+                )
+                return
+
             for _ in range(amount):
                 redis_client.zadd(key, {f"{now}_{_}": now})
             
@@ -377,21 +554,7 @@ class ProductionRateLimiter:
         """
         key = f"concurrency:{slot_type}:{identifier}"
         try:
-            script = """
-            local key = KEYS[1]
-            local max_slots = tonumber(ARGV[1])
-            local ttl = tonumber(ARGV[2])
-            local current = tonumber(redis.call('GET', key) or '0')
-
-            if current >= max_slots then
-                return {0, current}
-            end
-
-            local updated = redis.call('INCR', key)
-            redis.call('EXPIRE', key, ttl)
-            return {1, updated}
-            """
-            allowed_int, current = redis_client.eval(script, 1, key, int(limit), int(ttl_seconds))
+            allowed_int, current = acquire_slot_script(keys=[key], args=[int(limit), int(ttl_seconds)])
             allowed = int(allowed_int) == 1
             return allowed, {
                 "allowed": allowed,
@@ -409,16 +572,7 @@ class ProductionRateLimiter:
         if not slot_key:
             return
         try:
-            script = """
-            local key = KEYS[1]
-            local current = tonumber(redis.call('GET', key) or '0')
-            if current <= 1 then
-                redis.call('DEL', key)
-                return 0
-            end
-            return redis.call('DECR', key)
-            """
-            redis_client.eval(script, 1, slot_key)
+            release_slot_script(keys=[slot_key])
         except redis.RedisError as e:
             self.logger.error(f"Redis error releasing concurrency slot: {e}")
     
@@ -435,15 +589,11 @@ class ProductionRateLimiter:
         limit = self.LIMITS[limit_type]
         limit_requests = int(custom_limit) if custom_limit is not None else int(limit.requests)
 
-        # Calculate next UTC midnight for daily limits (86400 seconds = 24 hours)
-        from datetime import datetime, timezone, timedelta
+        # Daily limits (86400 seconds) reset at the next UTC midnight
         now_timestamp = int(time.time())
 
         if limit.window == 86400:  # Daily limit
-            # Get next UTC midnight
-            now_utc = datetime.now(timezone.utc)
-            next_midnight = (now_utc + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            reset_time = int(next_midnight.timestamp())
+            window_start, reset_time = self._daily_window()
         else:
             # For non-daily limits, use rolling window
             reset_time = now_timestamp + limit.window
@@ -462,21 +612,22 @@ class ProductionRateLimiter:
         key = self._get_key(limit_type, identifier)
 
         try:
-            # For daily limits, use UTC midnight as window start
             if limit.window == 86400:
-                # Get today's UTC midnight
-                now_utc = datetime.now(timezone.utc)
-                today_midnight = now_utc.replace(hour=0, minute=0, second=0, microsecond=0)
-                window_start = int(today_midnight.timestamp())
+                counter = redis_client.get(self._get_window_key(limit_type, identifier, window_start))
+                if counter is not None:
+                    current_count = int(counter)
+                else:
+                    # Nothing counted yet today; usage may still be in the legacy sorted set
+                    current_count = redis_client.zcount(key, f"({window_start}", "+inf")
             else:
                 # For other limits, use sliding window
                 window_start = now_timestamp - limit.window
 
-            # Clean old entries
-            redis_client.zremrangebyscore(key, 0, window_start)
+                # Clean old entries
+                redis_client.zremrangebyscore(key, 0, window_start)
 
-            # Get current count
-            current_count = redis_client.zcard(key)
+                # Get current count
+                current_count = redis_client.zcard(key)
 
             return {
                 "limit": limit_requests,
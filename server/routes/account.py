@@ -5,6 +5,7 @@ from flask import Blueprint, jsonify, request
 
 from auth import AuthService, require_auth
 from profile_service import ProfileService
+from rate_limiter import rate_limiter
 
 
 def create_account_blueprint() -> Blueprint:
@@ -92,6 +93,7 @@ def create_account_blueprint() -> Blueprint:
 
                 user.email = new_email
                 db.commit()
+                rate_limiter.invalidate_user(str(user_id))
                 logging.info(f"Email updated for user {user_id}")
                 return (
                     jsonify({"success": True, "message": "Email updated successfully"}),
@@ -23,6 +23,9 @@ def create_cli_blueprint() -> Blueprint:
             from database_config import JobApplication, SessionLocal
 
             user_id = request.current_user["id"]
+            if request.args.get("membership", "false").lower() == "true":
+                return _membership_response(user_id, request.args.get("since"))
+
             limit = min(int(request.args.get("limit", 50)), 200)
             urls_only = request.args.get("urls_only", "false").lower() == "true"
             db = SessionLocal()
@@ -1020,3 +1023,47 @@ def create_cli_blueprint() -> Blueprint:
 
     return cli_bp
 
+
+
+def _membership_response(user_id, since):
+    """
+    Applied-jobs membership keys for the CLI cache.
+
+    Without `since` every application is returned (full sync); with an ISO
+    `since` only applications changed at/after it, as added/removed keys.
+    """
+    from datetime import datetime
+
+    from sqlalchemy import func
+
+    from applied_jobs_membership import APPLIED_STATUSES, membership_delta
+    from database_config import JobApplication, SessionLocal
+
+    changed_at = func.coalesce(JobApplication.updated_at, JobApplication.created_at)
+    if since:
+        try:
+            since_dt = datetime.fromisoformat(since)
+        except ValueError:
+            return jsonify({"error": "since must be an ISO-8601 timestamp"}), 400
+
+    db = SessionLocal()
+    try:
+        user_rows = db.query(
+            JobApplication.job_url,
+            JobApplication.company_name,
+            JobApplication.job_title,
+            JobApplication.status,
+            changed_at,
+        ).filter(JobApplication.user_id == user_id)
+        query = user_rows
+        if since:
+            query = query.filter(changed_at >= since_dt)
+
+        def remaining_applied():
+            # Keys shared with another application (same company|title) stay
+            return user_rows.filter(JobApplication.status.in_(APPLIED_STATUSES)).all()
+
+        payload = membership_delta(query.all(), full=not since, since=since, remaining=remaining_applied)
+    finally:
+        db.close()
+    return jsonify({"success": True, **payload}), 200
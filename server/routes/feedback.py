@@ -12,6 +12,7 @@ from bug_bounty import (
     normalize_severity,
     validate_bug_report_payload,
 )
+from rate_limiter import rate_limiter
 
 
 def create_feedback_blueprint(
@@ -238,6 +239,7 @@ def create_feedback_blueprint(
                 db.commit()
 
                 invalidate_credits_cache(str(report.user_id))
+                rate_limiter.invalidate_user(str(report.user_id))
 
                 try:
                     email_service.send_bug_report_approved_email(
@@ -7,6 +7,7 @@ from auth import require_admin, require_auth
 from backup_manager import backup_manager, run_full_backup
 from database_optimizer import get_database_health
 from job_queue import job_queue
+from latex_compile_service import get_compile_stats
 from rate_limiter import get_rate_limit_status
 from security_manager import get_security_status, security_manager
 
@@ -44,6 +45,7 @@ def create_monitoring_blueprint() -> Blueprint:
                 "database": get_database_health(),
                 "security": get_security_status(),
                 "backups": backup_manager.get_backup_status(),
+                "latex_compile": get_compile_stats(),
             }
             return jsonify(status), 200
         except Exception as exc: